@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Backfill Audit Store
+====================
+
+Load existing logs/audit.log records into the indexed audit store
+(monitoring.audit_store), so query_audit_logs also returns events logged
+before the store existed.
+
+Run once, from the directory the API runs in (paths are relative, like
+the audit logger's). Running it twice stores the records twice.
+
+Usage:
+    python scripts/backfill_audit_store.py
+    python scripts/backfill_audit_store.py --log-file logs/audit.log --store-dir logs/audit
+
+NO MOCKING - Reads the real audit log, writes the real store.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env")
+
+from monitoring.audit_store import AuditStore
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Backfill the audit store from audit.log")
+    parser.add_argument("--log-file", default="logs/audit.log")
+    parser.add_argument("--store-dir", default=None, help="Default: AUDIT_STORE_DIR or logs/audit")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 70)
+    print("AUDIT STORE BACKFILL")
+    print("=" * 70)
+
+    log_file = Path(args.log_file)
+    if not log_file.exists():
+        print(f"[ERROR] {log_file} not found")
+        sys.exit(1)
+
+    store = AuditStore(args.store_dir)
+    if store.partitions():
+        print(f"[WARNING] {store.root} already has partitions; records may be duplicated")
+
+    stored, skipped = 0, 0
+    with open(log_file, "r") as f:
+        for line in f:
+            try:
+                # The audit formatter embeds the record as a JSON object
+                record = json.loads(line)["message"]
+                if isinstance(record, str):
+                    record = json.loads(record)
+                store.append(record)
+                stored += 1
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                skipped += 1
+
+    store.close()
+    print(f"[OK] {stored} records stored, {skipped} lines skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Backfill Policy Usage Rollups
+=============================
+
+Fold an existing data/policy_usage.jsonl into the daily rollups
+(rag.usage_rollups) that PolicyUsageTracker.generate_usage_report reads.
+
+The log is streamed one line at a time, so it never has to fit in
+memory. Safe to run repeatedly and while the API is running: only lines
+after the stored offset are folded. --rebuild discards the rollups and
+folds the whole log again.
+
+Usage:
+    python scripts/backfill_policy_rollups.py
+    python scripts/backfill_policy_rollups.py --log-file data/policy_usage.jsonl --rebuild
+
+NO MOCKING - Reads the real usage log, writes the real rollups.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env")
+
+from rag.usage_rollups import PolicyUsageRollups
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fold the policy usage log into daily rollups")
+    parser.add_argument("--log-file", default=str(project_root / "data" / "policy_usage.jsonl"))
+    parser.add_argument("--rebuild", action="store_true", help="Discard existing rollups first")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 70)
+    print("POLICY USAGE ROLLUP BACKFILL")
+    print("=" * 70)
+
+    log_file = Path(args.log_file)
+    if not log_file.exists():
+        print(f"[ERROR] {log_file} not found")
+        sys.exit(1)
+
+    rollups = PolicyUsageRollups(log_file)
+    folded = rollups.rebuild() if args.rebuild else rollups.update()
+
+    print(f"[OK] {folded} events folded into {rollups.state_file}")
+    for day in sorted(rollups.days)[-7:]:
+        print(f"     {day}: {rollups.days[day].events} events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+MetricsCollector Write Benchmark
+================================
+
+Measure record_metric throughput and get_summary latency of the
+ring-buffer MetricsCollector against the former list-of-snapshots
+storage (append, then rescan every series on each write).
+
+Usage:
+    python scripts/benchmark_metrics.py
+    python scripts/benchmark_metrics.py --records 50000 --series 20
+
+NO MOCKING - Real collector, real timings.
+"""
+
+import sys
+import time
+import argparse
+import threading
+import statistics
+from pathlib import Path
+from datetime import datetime, timedelta
+from collections import defaultdict
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from monitoring.metrics import MetricsCollector, MetricSnapshot
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark MetricsCollector writes")
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--series", type=int, default=10, help="Distinct endpoint tags")
+    return parser.parse_args()
+
+
+class ListCollector:
+    """Former storage: snapshot list per metric, full cleanup on every write"""
+
+    def __init__(self, retention_seconds: int = 3600):
+        self.retention_seconds = retention_seconds
+        self.metrics = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def record_metric(self, name, value, tags=None):
+        snapshot = MetricSnapshot(timestamp=datetime.now(), value=value, tags=tags or {})
+        with self.lock:
+            self.metrics[name].append(snapshot)
+            cutoff = datetime.now() - timedelta(seconds=self.retention_seconds)
+            for metric_name in list(self.metrics.keys()):
+                self.metrics[metric_name] = [s for s in self.metrics[metric_name] if s.timestamp > cutoff]
+
+    def get_summary(self, name):
+        values = sorted(s.value for s in self.metrics[name])
+        return (min(values), max(values), statistics.mean(values), statistics.median(values),
+                values[min(int(len(values) * 0.95), len(values) - 1)],
+                values[min(int(len(values) * 0.99), len(values) - 1)])
+
+
+def run(collector, records: int, series: int):
+    start = time.perf_counter()
+    for i in range(records):
+        collector.record_metric("response_time_ms", float(i % 500), {"endpoint": f"/api/{i % series}"})
+    write_seconds = time.perf_counter() - start
+
+    collector.get_summary("response_time_ms")  # Warm up
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        collector.get_summary("response_time_ms")
+        timings.append((time.perf_counter() - start) * 1000)
+    summary_ms = statistics.median(timings)
+
+    return records / write_seconds, summary_ms
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 70)
+    print("METRICS COLLECTOR BENCHMARK")
+    print("=" * 70)
+    print(f"[INFO] {args.records} records over {args.series} tag sets\n")
+
+    # The former storage is quadratic; cap its run so the benchmark finishes
+    baseline_records = min(args.records, 5000)
+    results = {
+        f'list snapshots ({baseline_records} records)': run(ListCollector(), baseline_records, args.series),
+        f'ring buffers ({args.records} records)': run(MetricsCollector(), args.records, args.series),
+    }
+
+    print(f"{'storage':<38}{'writes/sec':>14}{'summary ms':>14}")
+    for name, (writes_per_sec, summary_ms) in results.items():
+        print(f"{name:<38}{writes_per_sec:>14,.0f}{summary_ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
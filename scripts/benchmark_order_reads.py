@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Order + Outlet Read Benchmark
+=============================
+
+Compare the ways document endpoints (download_do, download_invoice,
+post_to_xero) load an order and its outlet:
+
+- before:  two sequential reads (order, then outlet), each run through
+           execute_with_timeout in its own thread pool - the shape of the
+           former OrderReadNode/OutletReadNode workflow round-trips
+- joined:  get_order_with_outlet, one joined primary-key query
+- cached:  get_order_with_outlet(use_cache=True) within the read-cache TTL
+
+Usage:
+    python scripts/benchmark_order_reads.py
+    python scripts/benchmark_order_reads.py --order-id 42 --iterations 500
+
+NO MOCKING - Uses real PostgreSQL database.
+"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env")
+
+from database_operations import (
+    get_db_session,
+    get_order_by_id,
+    get_outlet_by_id,
+    get_order_with_outlet,
+    list_orders,
+    invalidate_order_read_cache,
+)
+from utils.timeout import execute_with_timeout
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark order + outlet reads")
+    parser.add_argument("--order-id", type=int, help="Order to read (default: most recent)")
+    parser.add_argument("--iterations", type=int, default=200)
+    return parser.parse_args()
+
+
+def read_before(order_id: int):
+    def read_order():
+        with get_db_session() as session:
+            return get_order_by_id(session, order_id)
+
+    def read_outlet(outlet_id):
+        with get_db_session() as session:
+            return get_outlet_by_id(session, outlet_id)
+
+    order = execute_with_timeout(read_order, timeout_seconds=60)
+    outlet = execute_with_timeout(read_outlet, args=(order['outlet_id'],), timeout_seconds=60)
+    return order, outlet
+
+
+def read_joined(order_id: int):
+    with get_db_session() as session:
+        return get_order_with_outlet(session, order_id)
+
+
+def read_cached(order_id: int):
+    with get_db_session() as session:
+        return get_order_with_outlet(session, order_id, use_cache=True)
+
+
+def measure(func, order_id: int, iterations: int):
+    func(order_id)  # Warm up connections
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(order_id)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'p50': statistics.median(timings),
+        'p95': timings[int(len(timings) * 0.95) - 1],
+        'mean': statistics.fmean(timings),
+    }
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 70)
+    print("ORDER + OUTLET READ BENCHMARK")
+    print("=" * 70)
+
+    order_id = args.order_id
+    if order_id is None:
+        with get_db_session() as session:
+            recent = list_orders(session, limit=1)
+        if not recent:
+            print("[ERROR] No orders in database")
+            sys.exit(1)
+        order_id = recent[0]['id']
+
+    print(f"[INFO] Order {order_id}, {args.iterations} iterations\n")
+    invalidate_order_read_cache()
+
+    results = {
+        'before (2 reads via thread pool)': measure(read_before, order_id, args.iterations),
+        'joined query': measure(read_joined, order_id, args.iterations),
+        'joined + read cache': measure(read_cached, order_id, args.iterations),
+    }
+
+    print(f"{'path':<34}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<34}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['mean']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -63,6 +63,9 @@ from agents.async_customer_service_agent import AsyncCustomerServiceAgent
 # Import cache
 from services.multilevel_cache import MultiLevelCache
 
+# Import latency percentile sketch
+from monitoring.sketches import DDSketch
+
 
 # ============================================================================
 # DATA MODELS
@@ -448,18 +451,20 @@ class PerformanceBenchmarkSuite:
                 p50=0, p95=0, p99=0, min=0, max=0, mean=0, std_dev=0, samples=0
             )
 
-        sorted_latencies = sorted(latencies)
-        n = len(sorted_latencies)
+        sketch = DDSketch()
+        for latency in latencies:
+            sketch.add(latency)
+        p50, p95, p99 = sketch.quantiles((0.50, 0.95, 0.99))
 
         return LatencyMetrics(
-            p50=sorted_latencies[int(n * 0.50)],
-            p95=sorted_latencies[int(n * 0.95)] if n > 1 else sorted_latencies[0],
-            p99=sorted_latencies[int(n * 0.99)] if n > 1 else sorted_latencies[0],
-            min=min(sorted_latencies),
-            max=max(sorted_latencies),
-            mean=statistics.mean(sorted_latencies),
-            std_dev=statistics.stdev(sorted_latencies) if n > 1 else 0,
-            samples=n
+            p50=p50,
+            p95=p95,
+            p99=p99,
+            min=sketch.min,
+            max=sketch.max,
+            mean=sketch.mean,
+            std_dev=statistics.stdev(latencies) if len(latencies) > 1 else 0,
+            samples=sketch.count
         )
 
     # ========================================================================
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Bulk Data Export
+================
+
+Stream orders, invoices, delivery orders or PII-scrubbed conversation
+messages to a file with constant memory (server-side cursors).
+
+Usage:
+    # Full export of invoices as CSV
+    python scripts/export_data.py invoices --format csv --output invoices.csv
+
+    # Date range (inclusive from, exclusive to)
+    python scripts/export_data.py orders --from 2025-01-01 --to 2025-02-01 --output jan.ndjson
+
+    # Incremental: only rows added since the last run (cursor kept in a state file)
+    python scripts/export_data.py conversation_messages --format parquet \\
+        --state-file exports/messages.cursor --output exports/messages_$(date +%F).parquet
+
+Recommended Cron Schedule:
+    # Nightly incremental export at 3 AM
+    0 3 * * * /path/to/python /path/to/export_data.py orders --state-file /var/lib/tria/orders.cursor --output /exports/orders_$(date +\\%F).ndjson
+
+NO MOCKING - Uses real PostgreSQL database.
+"""
+
+import sys
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env")
+
+from services.bulk_export import (
+    stream_export,
+    EXPORT_ENTITIES,
+    EXPORT_FORMATS,
+    DEFAULT_BATCH_SIZE,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Stream a bulk export of TRIA data")
+    parser.add_argument("entity", choices=list(EXPORT_ENTITIES))
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--from", dest="created_from", type=datetime.fromisoformat,
+                        help="Inclusive lower bound (ISO 8601)")
+    parser.add_argument("--to", dest="created_to", type=datetime.fromisoformat,
+                        help="Exclusive upper bound (ISO 8601)")
+    parser.add_argument("--since-cursor", help="Only export rows after this cursor")
+    parser.add_argument("--state-file", type=Path,
+                        help="Read since-cursor from and write the next cursor to this file")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--output", type=Path, help="Output file (default: stdout)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    since_cursor = args.since_cursor
+    if not since_cursor and args.state_file and args.state_file.exists():
+        since_cursor = args.state_file.read_text().strip() or None
+
+    next_cursor, body = stream_export(
+        args.entity,
+        fmt=args.format,
+        created_from=args.created_from,
+        created_to=args.created_to,
+        since_cursor=since_cursor,
+        batch_size=args.batch_size,
+    )
+
+    total_bytes = 0
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "wb") as f:
+            for chunk in body:
+                f.write(chunk)
+                total_bytes += len(chunk)
+    else:
+        for chunk in body:
+            sys.stdout.buffer.write(chunk)
+            total_bytes += len(chunk)
+        sys.stdout.buffer.flush()
+
+    # Only advance the cursor after the export has been fully written
+    if args.state_file and next_cursor:
+        args.state_file.parent.mkdir(parents=True, exist_ok=True)
+        args.state_file.write_text(next_cursor)
+
+    print(
+        f"[OK] Exported {args.entity} ({args.format}, {total_bytes} bytes), "
+        f"next cursor: {next_cursor}",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ValueError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        sys.exit(2)
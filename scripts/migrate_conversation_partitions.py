@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Migrate Conversation Tables to Monthly Range Partitions
+========================================================
+
+Converts conversation_messages (by timestamp) and conversation_sessions
+(by start_time) into range-partitioned tables with one partition per
+month, so data retention can drop whole months instead of deleting rows.
+
+Changes (per table):
+- Rename existing table to <table>_legacy
+- Create partitioned parent with the same columns and defaults
+- Primary key becomes (id, <partition column>); sessions get the
+  (session_id, start_time) unique constraint declared on the ORM model
+- Recreate the ORM model's indexes on the parent, including the
+  single-column lookup indexes (propagated to every partition)
+- Create monthly partitions from the oldest row through N months ahead
+- Copy rows month by month (one transaction per month)
+- Hand the id sequence over to the new table
+- Optionally drop <table>_legacy
+
+Run during a maintenance window: writes to the tables must be stopped
+while rows are copied.
+
+Usage:
+    # Show the plan without changing anything
+    python scripts/migrate_conversation_partitions.py --dry-run
+
+    # Migrate, keep legacy tables for verification
+    python scripts/migrate_conversation_partitions.py
+
+    # Migrate and drop legacy tables
+    python scripts/migrate_conversation_partitions.py --drop-legacy
+
+NO MOCKING - Uses real PostgreSQL database.
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env")
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import AddConstraint, CreateIndex, UniqueConstraint
+
+from src.models.conversation_orm import ConversationMessage, ConversationSession
+from src.privacy.partition_manager import (
+    PARTITIONED_TABLES,
+    DEFAULT_MONTHS_AHEAD,
+    is_partitioned,
+    month_start,
+    add_months,
+    create_partition,
+)
+
+
+# Table -> (ORM model, primary key); constraints and indexes come from the model
+TABLE_DEFINITIONS = {
+    'conversation_messages': {
+        'model': ConversationMessage,
+        'primary_key': '(id, timestamp)',
+    },
+    'conversation_sessions': {
+        'model': ConversationSession,
+        'primary_key': '(id, start_time)',
+    },
+}
+
+
+def schema_statements(table: str):
+    """
+    DDL for the model's unique constraints and indexes on the partitioned parent
+
+    Unique constraints on a partitioned table must include the partition
+    column, so a unique index or constraint without it is an error here
+    rather than a silently dropped guarantee.
+    """
+    model_table = TABLE_DEFINITIONS[table]['model'].__table__
+    column = PARTITIONED_TABLES[table]
+    dialect = postgresql.dialect()
+    statements = []
+
+    for constraint in model_table.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            if column not in constraint.columns.keys():
+                raise ValueError(f"{table}: unique constraint {constraint.name} must include {column}")
+            statements.append(str(AddConstraint(constraint).compile(dialect=dialect)))
+
+    for index in sorted(model_table.indexes, key=lambda i: i.name):
+        if index.unique and column not in index.columns.keys():
+            raise ValueError(f"{table}: unique index {index.name} must include {column}")
+        statements.append(str(CreateIndex(index).compile(dialect=dialect)))
+
+    return statements
+
+
+def migrate_table(conn, table: str, months_ahead: int, dry_run: bool, drop_legacy: bool):
+    """Convert one table to a monthly range-partitioned table"""
+    column = PARTITIONED_TABLES[table]
+    definition = TABLE_DEFINITIONS[table]
+    legacy = f"{table}_legacy"
+    cursor = conn.cursor()
+
+    if is_partitioned(cursor, table):
+        print(f"[SKIP] {table} is already partitioned")
+        return
+
+    cursor.execute(f"SELECT MIN({column}), COUNT(*) FROM {table}")
+    oldest, row_count = cursor.fetchone()
+    first_month = month_start(oldest or datetime.now(timezone.utc))
+    last_month = add_months(month_start(datetime.now(timezone.utc)), months_ahead)
+
+    months = []
+    current = first_month
+    while current <= last_month:
+        months.append(current)
+        current = add_months(current, 1)
+
+    print(f"\n{table}: {row_count} rows, {len(months)} monthly partitions "
+          f"({months[0].strftime('%Y-%m')} .. {months[-1].strftime('%Y-%m')})")
+
+    if dry_run:
+        print("[DRY RUN] No changes made")
+        return
+
+    # Indexes keep their names, so the legacy copies must be renamed away
+    print(f"[1/5] Renaming {table} -> {legacy}...")
+    cursor.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+    cursor.execute("""
+        SELECT indexname FROM pg_indexes WHERE tablename = %s
+    """, (legacy,))
+    for (index_name,) in cursor.fetchall():
+        cursor.execute(f"ALTER INDEX {index_name} RENAME TO {index_name}_legacy")
+
+    print(f"[2/5] Creating partitioned {table} (RANGE {column})...")
+    cursor.execute(
+        f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) "
+        f"PARTITION BY RANGE ({column})"
+    )
+    cursor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY {definition['primary_key']}")
+    for statement in schema_statements(table):
+        cursor.execute(statement)
+
+    print(f"[3/5] Creating {len(months)} partitions...")
+    for month in months:
+        create_partition(cursor, table, month)
+
+    # The id sequence is owned by the legacy column; keep it alive
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", (legacy,))
+    sequence = cursor.fetchone()[0]
+    if sequence:
+        cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+    conn.commit()
+
+    print("[4/5] Copying rows month by month...")
+    for month in months:
+        cursor.execute(
+            f"INSERT INTO {table} SELECT * FROM {legacy} "
+            f"WHERE {column} >= %s AND {column} < %s",
+            (month, add_months(month, 1))
+        )
+        copied = cursor.rowcount
+        conn.commit()
+        if copied:
+            print(f"      {month.strftime('%Y-%m')}: {copied} rows")
+
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    migrated = cursor.fetchone()[0]
+    if migrated != row_count:
+        raise RuntimeError(
+            f"Row count mismatch for {table}: legacy={row_count}, partitioned={migrated}. "
+            f"Legacy table {legacy} kept for investigation."
+        )
+
+    if drop_legacy:
+        print(f"[5/5] Dropping {legacy}...")
+        cursor.execute(f"DROP TABLE {legacy}")
+        conn.commit()
+    else:
+        print(f"[5/5] Keeping {legacy} (drop manually after verification)")
+
+    print(f"[OK] {table} migrated ({migrated} rows)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Partition conversation tables by month")
+    parser.add_argument('--dry-run', action='store_true', help='Show plan without changes')
+    parser.add_argument('--months-ahead', type=int, default=DEFAULT_MONTHS_AHEAD,
+                        help=f'Future partitions to create (default: {DEFAULT_MONTHS_AHEAD})')
+    parser.add_argument('--drop-legacy', action='store_true',
+                        help='Drop <table>_legacy after a successful copy')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("PARTITIONING CONVERSATION TABLES BY MONTH")
+    print("=" * 70)
+
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url:
+        print("[ERROR] DATABASE_URL not set")
+        sys.exit(1)
+
+    import psycopg2
+    conn = psycopg2.connect(database_url)
+
+    try:
+        for table in PARTITIONED_TABLES:
+            migrate_table(conn, table, args.months_ahead, args.dry_run, args.drop_legacy)
+
+        print("\n" + "=" * 70)
+        print("MIGRATION COMPLETE")
+        print("=" * 70)
+        print("[OK] Data retention will now drop expired partitions "
+              "(run_full_cleanup strategy='auto')")
+
+    except Exception as e:
+        conn.rollback()
+        print(f"\n[ERROR] Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    finally:
+        conn.close()
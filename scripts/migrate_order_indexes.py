@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Add Keyset Pagination Indexes to Orders
+========================================
+
+Creates the composite indexes used by GET /api/v1/orders
+(database_operations.list_orders_page) on existing databases.
+New databases get them from models.order_orm via create_tables().
+
+Changes:
+- idx_order_created_id (created_at, id)
+- idx_order_status_created_id (status, created_at, id)
+- idx_order_outlet_created_id (outlet_id, created_at, id)
+
+Indexes are built CONCURRENTLY so the orders table stays writable.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env")
+
+from database import get_db_engine
+from sqlalchemy import text
+
+INDEXES = [
+    ("idx_order_created_id", "orders(created_at, id)"),
+    ("idx_order_status_created_id", "orders(status, created_at, id)"),
+    ("idx_order_outlet_created_id", "orders(outlet_id, created_at, id)"),
+]
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print("ADDING ORDER PAGINATION INDEXES")
+    print("=" * 70)
+
+    engine = get_db_engine()
+
+    try:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for i, (name, target) in enumerate(INDEXES, start=1):
+                print(f"\n[{i}/{len(INDEXES)}] Creating {name}...")
+                conn.execute(text(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}'
+                ))
+                print("[OK] Index ready")
+
+        print("\n" + "=" * 70)
+        print("MIGRATION COMPLETE")
+        print("=" * 70)
+
+    except Exception as e:
+        print(f"\n[ERROR] Migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+User Interaction Summary Maintenance
+=====================================
+
+Catch up or rebuild user_interaction_summaries outside the API process.
+
+The API keeps summaries current with a background aggregator; this script
+is for the initial backfill, data repair, or deployments that run the
+aggregation as a cron job instead.
+
+Usage:
+    # Recompute all summaries from retained conversations (initial backfill)
+    python scripts/rebuild_user_summaries.py --rebuild
+
+    # Fold new sessions/messages since the last watermark, then exit
+    python scripts/rebuild_user_summaries.py --once
+
+    # Run the incremental consumer in the foreground
+    python scripts/rebuild_user_summaries.py --interval 30
+
+Recommended Cron Schedule (if the API aggregator is disabled):
+    # Every minute
+    * * * * * /path/to/python /path/to/rebuild_user_summaries.py --once >> /var/log/tria/analytics.log 2>&1
+
+NO MOCKING - Uses real PostgreSQL database.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env")
+
+from memory.user_analytics import UserAnalyticsAggregator
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Maintain user interaction summaries")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rebuild", action="store_true",
+                      help="Recompute all summaries and reset watermarks")
+    mode.add_argument("--once", action="store_true",
+                      help="Process new rows until caught up, then exit")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--interval", type=float, default=30.0,
+                        help="Seconds between catch-up passes in foreground mode")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 70)
+    print("USER INTERACTION SUMMARIES")
+    print("=" * 70)
+
+    aggregator = UserAnalyticsAggregator(
+        batch_size=args.batch_size,
+        interval_seconds=args.interval
+    )
+
+    if args.rebuild:
+        result = aggregator.rebuild()
+        print(f"[OK] Rebuilt {result['users']} summaries")
+        print(f"     Session watermark: {result['session_watermark']}")
+        print(f"     Message watermark: {result['message_watermark']}")
+        return
+
+    if args.once:
+        totals = aggregator.run_until_caught_up()
+        print(f"[OK] {totals['batches']} batches: {totals['sessions']} sessions, "
+              f"{totals['messages']} messages, {totals['users']} user updates")
+        return
+
+    print(f"[INFO] Running incremental consumer every {args.interval}s (Ctrl+C to stop)")
+    try:
+        while True:
+            totals = aggregator.run_until_caught_up()
+            if totals['sessions'] or totals['messages']:
+                print(f"[OK] Folded {totals['sessions']} sessions, {totals['messages']} messages")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n[INFO] Stopped")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n[ERROR] {e}")
+        sys.exit(1)
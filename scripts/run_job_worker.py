@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Background Job Worker
+=====================
+
+Process durable background jobs (production.job_queue): Xero invoice
+posting and order finalization queued by the API.
+
+Run one or more of these next to the API. Workers claim jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so adding processes adds throughput
+without double-processing; Xero calls across all workers share the
+Redis-backed rate limiter.
+
+Usage:
+    # Run until Ctrl+C / SIGTERM
+    python scripts/run_job_worker.py
+
+    # Only Xero invoice posting
+    python scripts/run_job_worker.py --job-type xero.post_invoice
+
+    # Drain runnable jobs, then exit (cron / one-off)
+    python scripts/run_job_worker.py --once
+
+    # Re-queue a dead-lettered job
+    python scripts/run_job_worker.py --retry 17
+
+NO MOCKING - Uses real Xero API and PostgreSQL database.
+"""
+
+import sys
+import signal
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env")
+
+from database import get_db_engine
+from models.order_orm import create_tables
+from production.job_queue import JobQueue, JobWorker, registered_job_types
+# Imported for its side effect: registers the xero.* job handlers
+import integrations.xero_jobs  # noqa: F401
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run background job worker")
+    parser.add_argument("--job-type", action="append", dest="job_types",
+                        help="Only process this job type (repeatable)")
+    parser.add_argument("--once", action="store_true",
+                        help="Process runnable jobs until none remain, then exit")
+    parser.add_argument("--retry", type=int, metavar="JOB_ID",
+                        help="Re-queue a dead job and exit")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="Seconds to sleep when the queue is empty")
+    parser.add_argument("--lease", type=float, default=300.0,
+                        help="Seconds a claimed job stays locked to this worker")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 70)
+    print("BACKGROUND JOB WORKER")
+    print("=" * 70)
+
+    engine = get_db_engine()
+    create_tables(engine)
+    queue = JobQueue(engine=engine, lease_seconds=args.lease)
+
+    if args.retry is not None:
+        if queue.retry(args.retry):
+            print(f"[OK] Job {args.retry} re-queued")
+        else:
+            print(f"[WARNING] Job {args.retry} not found or not dead")
+        return
+
+    worker = JobWorker(queue=queue, job_types=args.job_types, poll_interval=args.poll_interval)
+    print(f"[INFO] Worker: {worker.worker_id}")
+    print(f"[INFO] Job types: {', '.join(args.job_types or registered_job_types())}")
+    print(f"[INFO] Queue: {queue.counts()}")
+
+    if args.once:
+        processed = worker.run_once()
+        print(f"[OK] Processed {processed} job(s): {worker.stats}")
+        return
+
+    # Finish the current job before exiting on SIGTERM (e.g. container stop)
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+
+    print("[INFO] Polling for jobs (Ctrl+C to stop)")
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"\n[INFO] Stopped: {worker.stats}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n[ERROR] Worker failed: {e}")
+        sys.exit(1)
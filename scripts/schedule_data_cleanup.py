@@ -8,6 +8,8 @@ Production-ready script to enforce PDPA data retention policies.
 Features:
 - Automated cleanup of conversations older than 90 days
 - Anonymization of user summaries older than 2 years
+- Partition-drop retention and upcoming-partition creation when the
+  conversation tables are partitioned by month
 - Comprehensive logging and error handling
 - Dry-run mode for testing
 - Email notifications (optional)
@@ -26,6 +28,9 @@ Usage:
     # With email notifications
     python scripts/schedule_data_cleanup.py --notify-email admin@example.com
 
+    # Force row deletes even if tables are partitioned
+    python scripts/schedule_data_cleanup.py --strategy delete
+
 Recommended Cron Schedule:
     # Daily at 2 AM (low traffic time)
     0 2 * * * /path/to/python /path/to/schedule_data_cleanup.py >> /var/log/tria/cleanup.log 2>&1
@@ -56,6 +61,7 @@ from src.privacy.data_retention import (
     get_retention_statistics,
     CleanupResult
 )
+from src.privacy.partition_manager import ensure_future_partitions
 
 
 # ============================================================================
@@ -198,7 +204,8 @@ def run_cleanup(
     summary_retention_days: int = 730,
     dry_run: bool = False,
     notify_email: Optional[str] = None,
-    save_report: bool = True
+    save_report: bool = True,
+    strategy: str = 'auto'
 ) -> int:
     """
     Run data retention cleanup
@@ -209,6 +216,7 @@ def run_cleanup(
         dry_run: If True, report actions without executing
         notify_email: Email address for notifications
         save_report: If True, save JSON report to file
+        strategy: Conversation cleanup strategy ('auto', 'partition', 'delete')
 
     Returns:
         Exit code (0 = success, 1 = errors encountered)
@@ -221,6 +229,7 @@ def run_cleanup(
     logging.info(f"Mode: {'DRY RUN' if dry_run else 'PRODUCTION'}")
     logging.info(f"Conversation retention: {conversation_retention_days} days")
     logging.info(f"Summary retention: {summary_retention_days} days")
+    logging.info(f"Conversation cleanup strategy: {strategy}")
     logging.info(f"Started at: {start_time.isoformat()}")
     logging.info("=" * 80)
 
@@ -234,6 +243,10 @@ def run_cleanup(
         logging.info("\n[1/4] Connecting to database...")
         conn = get_database_connection()
 
+        # Keep upcoming monthly partitions in place (no-op if not partitioned)
+        if not dry_run:
+            ensure_future_partitions(conn)
+
         # ====================================================================
         # STEP 2: Get current statistics
         # ====================================================================
@@ -254,7 +267,8 @@ def run_cleanup(
             conn,
             conversation_retention_days=conversation_retention_days,
             summary_retention_days=summary_retention_days,
-            dry_run=dry_run
+            dry_run=dry_run,
+            strategy=strategy
         )
 
         # ====================================================================
@@ -286,6 +300,7 @@ def run_cleanup(
                 'configuration': {
                     'conversation_retention_days': conversation_retention_days,
                     'summary_retention_days': summary_retention_days,
+                    'strategy': strategy,
                 },
                 'statistics_before': stats,
                 'results': {
@@ -387,6 +402,14 @@ Recommended Cron Schedule:
         help='Days before anonymizing user summaries (default: 730 = 2 years)'
     )
 
+    parser.add_argument(
+        '--strategy',
+        choices=['auto', 'partition', 'delete'],
+        default='auto',
+        help='Conversation cleanup strategy: drop expired monthly partitions, '
+             'batched row deletes, or auto-detect (default: auto)'
+    )
+
     parser.add_argument(
         '--notify-email',
         type=str,
@@ -430,7 +453,8 @@ Recommended Cron Schedule:
         summary_retention_days=args.summary_retention,
         dry_run=args.dry_run,
         notify_email=args.notify_email,
-        save_report=not args.no_report
+        save_report=not args.no_report,
+        strategy=args.strategy
     )
 
     sys.exit(exit_code)
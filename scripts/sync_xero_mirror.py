@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Xero Item and Contact Mirror Sync
+==================================
+
+Populate or refresh the local mirror of Xero items and contacts used by
+order-time customer verification and inventory checks.
+
+The API keeps the mirror current with a background delta sync and Xero
+webhooks; use this script for the initial load, after restoring the
+database, or when the API runs without the background sync.
+
+Usage:
+    # Initial load / reconcile deletions
+    python scripts/sync_xero_mirror.py --full
+
+    # Delta sync (If-Modified-Since the newest mirrored change)
+    python scripts/sync_xero_mirror.py
+
+    # Items only
+    python scripts/sync_xero_mirror.py --only items
+
+NO MOCKING - Uses real Xero API and PostgreSQL database.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv(project_root / ".env")
+
+from database import get_db_engine
+from models.order_orm import create_tables
+from integrations.xero_mirror import XeroMirror
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sync the local Xero item/contact mirror")
+    parser.add_argument("--full", action="store_true",
+                        help="Fetch everything and remove rows deleted in Xero")
+    parser.add_argument("--only", choices=["items", "contacts"],
+                        help="Sync a single resource")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 70)
+    print(f"XERO MIRROR {'FULL' if args.full else 'DELTA'} SYNC")
+    print("=" * 70)
+
+    engine = get_db_engine()
+    create_tables(engine)
+    mirror = XeroMirror(engine=engine)
+
+    if args.only != "contacts":
+        count = mirror.sync_items(full=args.full)
+        print(f"[OK] Items synced: {count}")
+
+    if args.only != "items":
+        count = mirror.sync_contacts(full=args.full)
+        print(f"[OK] Contacts synced: {count}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"\n[ERROR] Sync failed: {e}")
+        sys.exit(1)
@@ -8,7 +8,7 @@ Features:
 - Parallel task execution (intent + RAG + tone + context)
 - Streaming responses for perceived latency reduction
 - Correlation IDs for request tracing
-- Timing logs for performance monitoring
+- Timing logs and profiler stages (monitoring.profiler) for performance monitoring
 - Graceful error handling with fallbacks
 - Maintains all features from EnhancedCustomerServiceAgent
 
@@ -25,7 +25,6 @@ import json
 import logging
 import time
 import asyncio
-import uuid
 from typing import Dict, List, Optional, Any, AsyncIterator
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -65,6 +64,8 @@ from monitoring.metrics import (
     error_metrics,
     memory_metrics
 )
+from monitoring.profiler import stage, profiled
+from monitoring.tracing import openai_http_client, get_correlation_id, correlation_scope
 
 
 # Configure logging
@@ -209,7 +210,7 @@ class AsyncCustomerServiceAgent:
             timeout=30
         )
 
-        self.openai_client = OpenAI(api_key=self.api_key, timeout=timeout)
+        self.openai_client = OpenAI(api_key=self.api_key, timeout=timeout, http_client=openai_http_client())
 
         # Initialize cache
         self.cache = get_cache() if enable_cache else None
@@ -254,8 +255,23 @@ class AsyncCustomerServiceAgent:
         Raises:
             RuntimeError: If processing fails
         """
-        # Generate correlation ID if not provided
-        correlation_id = correlation_id or str(uuid.uuid4())
+        # Use the request's correlation ID (trace ID) unless one is given;
+        # bound for this call only, so it never leaks into later calls
+        with correlation_scope(correlation_id or get_correlation_id()) as correlation_id:
+            return await self._handle_message(
+                message, conversation_history, user_context, user_id, ip_address, correlation_id
+            )
+
+    async def _handle_message(
+        self,
+        message: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        user_context: Optional[Dict[str, Any]],
+        user_id: Optional[str],
+        ip_address: Optional[str],
+        correlation_id: str
+    ) -> AsyncCustomerServiceResponse:
+        """handle_message() body, run with correlation_id bound"""
 
         # Start performance tracking
         start_time = time.time()
@@ -281,7 +297,8 @@ class AsyncCustomerServiceAgent:
         try:
             # Validate and sanitize input
             validation_start = time.time()
-            validation_result = validate_and_sanitize(message, max_length=5000, strict_mode=False)
+            with stage("agent.validation"):
+                validation_result = validate_and_sanitize(message, max_length=5000, strict_mode=False)
             timing_info["validation_ms"] = (time.time() - validation_start) * 1000
 
             if not validation_result.is_valid:
@@ -397,13 +414,14 @@ class AsyncCustomerServiceAgent:
                 context_task = self._get_context_async(user_id, user_context, correlation_id)
 
                 # Execute in parallel - max(2s, 5s, 1s, 1s) = 5s (not 9s!)
-                intent_result, knowledge_results, tone_guidelines, context = await asyncio.gather(
-                    intent_task,
-                    rag_task,
-                    tone_task,
-                    context_task,
-                    return_exceptions=True  # Don't fail entire operation if one task fails
-                )
+                with stage("agent.parallel"):
+                    intent_result, knowledge_results, tone_guidelines, context = await asyncio.gather(
+                        intent_task,
+                        rag_task,
+                        tone_task,
+                        context_task,
+                        return_exceptions=True  # Don't fail entire operation if one task fails
+                    )
 
                 parallel_duration = (time.time() - parallel_start) * 1000
                 timing_info["parallel_execution_ms"] = parallel_duration
@@ -448,7 +466,8 @@ class AsyncCustomerServiceAgent:
             # Check for cached full response (after we have intent)
             if self.enable_cache and self.cache:
                 cache_start = time.time()
-                cached_response = self.cache.get_response(message, intent_result.intent)
+                with stage("agent.cache_check"):
+                    cached_response = self.cache.get_response(message, intent_result.intent)
                 timing_info["cache_check_ms"] = (time.time() - cache_start) * 1000
 
                 if cached_response:
@@ -645,8 +664,24 @@ class AsyncCustomerServiceAgent:
             async for chunk in agent.handle_message_stream("What's your return policy?"):
                 print(chunk, end="", flush=True)
         """
-        # Generate correlation ID if not provided
-        correlation_id = correlation_id or str(uuid.uuid4())
+        # Use the request's correlation ID (trace ID) unless one is given;
+        # bound for this call only, so it never leaks into later calls
+        with correlation_scope(correlation_id or get_correlation_id()) as correlation_id:
+            async for chunk in self._handle_message_stream(
+                message, conversation_history, user_context, user_id, ip_address, correlation_id
+            ):
+                yield chunk
+
+    async def _handle_message_stream(
+        self,
+        message: str,
+        conversation_history: Optional[List[Dict[str, str]]],
+        user_context: Optional[Dict[str, Any]],
+        user_id: Optional[str],
+        ip_address: Optional[str],
+        correlation_id: str
+    ) -> AsyncIterator[str]:
+        """handle_message_stream() body, run with correlation_id bound"""
 
         logger.info(
             f"[{correlation_id}] Starting streaming response",
@@ -689,13 +724,14 @@ class AsyncCustomerServiceAgent:
             tone_task = self._get_tone_async("general_query", message, "neutral", correlation_id)
             context_task = self._get_context_async(user_id, user_context, correlation_id)
 
-            intent_result, knowledge_results, tone_guidelines, context = await asyncio.gather(
-                intent_task,
-                rag_task,
-                tone_task,
-                context_task,
-                return_exceptions=True
-            )
+            with stage("agent.parallel"):
+                intent_result, knowledge_results, tone_guidelines, context = await asyncio.gather(
+                    intent_task,
+                    rag_task,
+                    tone_task,
+                    context_task,
+                    return_exceptions=True
+                )
 
             # Handle exceptions from parallel tasks
             if isinstance(intent_result, Exception):
@@ -792,6 +828,7 @@ class AsyncCustomerServiceAgent:
     # ASYNC HELPER METHODS
     # ========================================================================
 
+    @profiled("agent.intent")
     async def _classify_intent_async(
         self,
         message: str,
@@ -836,6 +873,7 @@ class AsyncCustomerServiceAgent:
                 reasoning=f"Classification failed: {str(e)}"
             )
 
+    @profiled("agent.knowledge")
     async def _retrieve_knowledge_async(
         self,
         message: str,
@@ -885,6 +923,7 @@ class AsyncCustomerServiceAgent:
             logger.error(f"[{correlation_id}] RAG retrieval failed: {str(e)}")
             return []
 
+    @profiled("agent.tone")
     async def _get_tone_async(
         self,
         intent: str,
@@ -932,6 +971,7 @@ class AsyncCustomerServiceAgent:
             logger.error(f"[{correlation_id}] Tone retrieval failed: {str(e)}")
             return ""
 
+    @profiled("agent.context")
     async def _get_context_async(
         self,
         user_id: Optional[str],
@@ -1011,6 +1051,7 @@ class AsyncCustomerServiceAgent:
     # ASYNC INTENT HANDLERS
     # ========================================================================
 
+    @profiled("agent.response")
     async def _handle_greeting_async(
         self,
         message: str,
@@ -1037,6 +1078,7 @@ class AsyncCustomerServiceAgent:
             correlation_id=correlation_id
         )
 
+    @profiled("agent.response")
     async def _handle_order_placement_async(
         self,
         message: str,
@@ -1076,6 +1118,7 @@ class AsyncCustomerServiceAgent:
             correlation_id=correlation_id
         )
 
+    @profiled("agent.response")
     async def _handle_order_status_async(
         self,
         message: str,
@@ -1116,6 +1159,7 @@ class AsyncCustomerServiceAgent:
             correlation_id=correlation_id
         )
 
+    @profiled("agent.response")
     async def _handle_inquiry_with_rag_async(
         self,
         message: str,
@@ -1186,6 +1230,7 @@ class AsyncCustomerServiceAgent:
                 correlation_id=correlation_id
             )
 
+    @profiled("agent.response")
     async def _handle_complaint_async(
         self,
         message: str,
@@ -1269,6 +1314,7 @@ class AsyncCustomerServiceAgent:
                 correlation_id=correlation_id
             )
 
+    @profiled("agent.response")
     async def _handle_general_query_async(
         self,
         message: str,
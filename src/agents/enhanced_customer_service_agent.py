@@ -57,6 +57,7 @@ from monitoring.metrics import (
     error_metrics,
     memory_metrics
 )
+from monitoring.tracing import openai_http_client
 
 
 # Configure logging
@@ -191,7 +192,7 @@ class EnhancedCustomerServiceAgent:
             timeout=30  # Shorter timeout for faster model
         )
 
-        self.openai_client = OpenAI(api_key=self.api_key, timeout=timeout)
+        self.openai_client = OpenAI(api_key=self.api_key, timeout=timeout, http_client=openai_http_client())
 
         # Initialize cache
         self.cache = get_cache() if enable_cache else None
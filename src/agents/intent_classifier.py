@@ -17,6 +17,7 @@ from datetime import datetime
 from openai import OpenAI
 
 from prompts.system_prompts import build_intent_classification_prompt
+from monitoring.tracing import openai_http_client
 
 
 # Configure logging
@@ -130,7 +131,7 @@ class IntentClassifier:
         self.timeout = timeout
 
         # Initialize OpenAI client
-        self.client = OpenAI(api_key=self.api_key, timeout=self.timeout)
+        self.client = OpenAI(api_key=self.api_key, timeout=self.timeout, http_client=openai_http_client())
 
         logger.info(
             f"IntentClassifier initialized with model={model}, "
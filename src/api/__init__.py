@@ -6,9 +6,19 @@ API routes and middleware for TRIA AI-BPO platform.
 """
 
 from .routes.chat_stream import router as chat_stream_router
+from .routes.orders import router as orders_router
+from .routes.exports import router as exports_router
+from .routes.db_stats import router as db_stats_router
+from .routes.jobs import router as jobs_router
+from .routes.documents import router as documents_router
 from .middleware.sse_middleware import SSEMiddleware
 
 __all__ = [
     "chat_stream_router",
+    "orders_router",
+    "exports_router",
+    "db_stats_router",
+    "jobs_router",
+    "documents_router",
     "SSEMiddleware"
 ]
@@ -0,0 +1,125 @@
+"""
+TRIA AI-BPO Database Query Statistics Routes
+=============================================
+
+FastAPI routes for the opt-in statement statistics collected by
+monitoring.query_stats (enable with DB_QUERY_STATS=true).
+
+Endpoints:
+- GET /db/query-stats: Top statements by total/avg/p99 latency, calls or rows
+- POST /db/query-stats/explain: EXPLAIN (ANALYZE, BUFFERS) of the top-N
+  statements (disabled in production)
+
+NO MOCKING - Real statistics and real query plans.
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from config import config
+from database import get_db_engine
+from monitoring.query_stats import get_query_stats_collector, explain_statement
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(prefix="/db", tags=["database"])
+
+
+# ============================================================================
+# STATISTICS ENDPOINTS
+# ============================================================================
+
+@router.get("/query-stats")
+def get_query_stats(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: str = Query("total_ms"),
+):
+    """
+    Top database statements by cost
+
+    **Query Parameters:**
+    - limit: Number of statements (1-200, default 20)
+    - order_by: `total_ms`, `avg_ms`, `p99_ms`, `calls` or `rows`
+
+    **Response:**
+    ```json
+    {
+      "enabled": true,
+      "statements": [
+        {"fingerprint": "3f1c2a9b7e10", "statement": "SELECT ... WHERE outlets.name ILIKE ?",
+         "calls": 812, "total_ms": 5230.4, "avg_ms": 6.44, "p99_ms": 31.2, "max_ms": 48.9, "rows": 812}
+      ]
+    }
+    ```
+
+    **Raises:**
+    - HTTPException 400: Unknown order_by field
+    """
+    collector = get_query_stats_collector()
+
+    try:
+        top = collector.top(limit, order_by=order_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "enabled": collector.enabled,
+        "order_by": order_by,
+        "statements": [stats.to_dict() for stats in top],
+    }
+
+
+@router.post("/query-stats/explain")
+def explain_top_statements(
+    top: int = Query(5, ge=1, le=20),
+    order_by: str = Query("total_ms"),
+    fingerprint: Optional[str] = None,
+    timeout_ms: int = Query(10000, ge=100, le=60000),
+):
+    """
+    EXPLAIN (ANALYZE, BUFFERS) the most expensive statements
+
+    Uses the parameters of each statement's last execution. ANALYZE runs
+    the query, so only SELECT statements are explained, every EXPLAIN is
+    rolled back, and the endpoint is disabled when ENVIRONMENT=production.
+
+    **Query Parameters:**
+    - top: Number of statements to explain (1-20, default 5)
+    - order_by: Ranking field (see GET /db/query-stats)
+    - fingerprint: Explain only this statement
+    - timeout_ms: statement_timeout per EXPLAIN
+
+    **Raises:**
+    - HTTPException 400: Unknown order_by field
+    - HTTPException 403: Called in production
+    - HTTPException 404: Unknown fingerprint
+    """
+    if config.ENVIRONMENT == "production":
+        raise HTTPException(status_code=403, detail="EXPLAIN ANALYZE is disabled in production")
+
+    collector = get_query_stats_collector()
+
+    if fingerprint:
+        stats = collector.get(fingerprint)
+        if stats is None:
+            raise HTTPException(status_code=404, detail=f"Unknown fingerprint '{fingerprint}'")
+        candidates = [stats]
+    else:
+        try:
+            candidates = collector.top(top, order_by=order_by)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    engine = get_db_engine()
+    plans = []
+    for stats in candidates:
+        plan = explain_statement(engine, stats, timeout_ms=timeout_ms)
+        plan["stats"] = stats.to_dict()
+        plans.append(plan)
+
+    return {"count": len(plans), "plans": plans}
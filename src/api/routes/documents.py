@@ -0,0 +1,228 @@
+"""
+TRIA AI-BPO Document Routes
+============================
+
+FastAPI routes for bulk customer documents, e.g. the day's Delivery
+Orders for dispatch in one download instead of one request per order.
+
+Endpoints:
+- GET /documents/delivery-orders: Zip of DO workbooks for a day or a list of orders
+- GET /documents/invoices: Zip of invoice PDFs for a date range (cached PDFs reused)
+
+NO MOCKING - Real orders from PostgreSQL, rendered by the documents render pool.
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+
+from config import config
+from database_operations import (
+    get_db_session,
+    list_orders_with_outlets,
+    get_invoices_by_order_ids,
+    get_products_by_skus,
+)
+from documents.delivery_order import (
+    build_delivery_orders,
+    render_delivery_orders_zip,
+    MAX_BULK_ORDERS,
+)
+from documents.invoice_pdf import (
+    build_invoices,
+    unpriced_skus,
+    render_invoices_zip,
+    MAX_BATCH_INVOICES,
+)
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+
+# ============================================================================
+# DELIVERY ORDERS
+# ============================================================================
+
+@router.get("/delivery-orders")
+async def download_delivery_orders(
+    day: Optional[date] = Query(None, alias="date"),
+    order_id: Optional[List[int]] = Query(None),
+    status: Optional[str] = Query(None),
+):
+    """
+    Download Delivery Orders for many orders as one zip archive
+
+    **Query Parameters:**
+    - date: Orders created on this day (YYYY-MM-DD), e.g. daily dispatch
+    - order_id: Specific orders (repeatable); combined with date if both given
+    - status: Optional order status filter (e.g. `completed`)
+
+    **Response:**
+    - application/zip with one `<do_number>_<outlet>.xlsx` per order, plus
+      ERRORS.txt listing orders skipped because of incomplete data
+    - X-Document-Count / X-Document-Errors headers
+
+    **Raises:**
+    - HTTPException 400: Neither date nor order_id given, or more than
+      MAX_BULK_ORDERS orders match (narrow the filter)
+    - HTTPException 404: No matching orders
+    """
+    if day is None and not order_id:
+        raise HTTPException(status_code=400, detail="Provide date or at least one order_id")
+    if order_id and len(order_id) > MAX_BULK_ORDERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ORDERS} orders per archive")
+
+    try:
+        rows = await asyncio.to_thread(_load_delivery_order_rows, day, order_id, status)
+    except Exception as e:
+        logger.error(f"Failed to load orders for Delivery Orders: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to load orders: {str(e)}")
+
+    if not rows:
+        raise HTTPException(status_code=404, detail="No matching orders")
+    if len(rows) > MAX_BULK_ORDERS:
+        # Never return a silently truncated archive
+        raise HTTPException(
+            status_code=400,
+            detail=f"More than {MAX_BULK_ORDERS} orders match; narrow the filter (e.g. add status or order_id)"
+        )
+
+    documents, errors = build_delivery_orders(rows)
+
+    try:
+        archive = await render_delivery_orders_zip(documents, errors)
+    except Exception as e:
+        logger.error(f"Failed to render Delivery Orders: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to render Delivery Orders: {str(e)}")
+
+    filename = f"DO_{day.isoformat() if day else 'orders'}.zip"
+    return Response(
+        content=archive,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Document-Count": str(len(documents)),
+            "X-Document-Errors": str(len(errors)),
+        }
+    )
+
+
+def _load_delivery_order_rows(day: Optional[date], order_ids: Optional[List[int]], status: Optional[str]):
+    """
+    (order, outlet) rows for a DO archive, up to MAX_BULK_ORDERS + 1 so the
+    caller can detect an over-limit filter (sync; call via asyncio.to_thread)
+    """
+    start = datetime.combine(day, time.min) if day else None
+    with get_db_session() as session:
+        return list_orders_with_outlets(
+            session,
+            order_ids=order_ids,
+            created_from=start,
+            created_to=start + timedelta(days=1) if start else None,
+            status=status,
+            limit=MAX_BULK_ORDERS + 1
+        )
+
+
+# ============================================================================
+# INVOICES
+# ============================================================================
+
+@router.get("/invoices")
+async def download_invoices(
+    date_from: date = Query(...),
+    date_to: Optional[date] = Query(None),
+    status: Optional[str] = Query(None),
+):
+    """
+    Download invoice PDFs for orders created in a date range as one zip
+
+    PDFs are rendered concurrently in the render pool; invoices rendered
+    before (e.g. by GET /api/download_invoice/{order_id}) are served from
+    the document cache.
+
+    **Query Parameters:**
+    - date_from: First day (YYYY-MM-DD)
+    - date_to: Last day, inclusive (default: date_from)
+    - status: Optional order status filter (e.g. `completed`)
+
+    **Response:**
+    - application/zip with one `Invoice_<number>.pdf` per order, plus
+      ERRORS.txt listing orders skipped because of incomplete data
+    - X-Document-Count / X-Document-Errors headers
+
+    **Raises:**
+    - HTTPException 400: Invalid range, or more than MAX_BATCH_INVOICES
+      orders match (narrow the range or filter)
+    - HTTPException 404: No matching orders
+    """
+    date_to = date_to or date_from
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+
+    try:
+        orders, invoices, products = await asyncio.to_thread(_load_invoice_rows, date_from, date_to, status)
+    except Exception as e:
+        logger.error(f"Failed to load orders for invoices: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to load orders: {str(e)}")
+
+    if not orders:
+        raise HTTPException(status_code=404, detail="No matching orders")
+    if len(orders) > MAX_BATCH_INVOICES:
+        # Never return a silently truncated archive
+        raise HTTPException(
+            status_code=400,
+            detail=f"More than {MAX_BATCH_INVOICES} orders match; narrow the date range or add a status filter"
+        )
+
+    rows = [(order, outlet, invoices.get(order['id'])) for order, outlet in orders]
+    documents, errors = build_invoices(rows, products, Decimal(str(config.TAX_RATE)))
+
+    try:
+        archive = await render_invoices_zip(documents, errors)
+    except Exception as e:
+        logger.error(f"Failed to render invoices: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to render invoices: {str(e)}")
+
+    filename = f"Invoices_{date_from.isoformat()}_{date_to.isoformat()}.zip"
+    return Response(
+        content=archive,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Document-Count": str(len(documents)),
+            "X-Document-Errors": str(len(errors)),
+        }
+    )
+
+
+def _load_invoice_rows(date_from: date, date_to: date, status: Optional[str]):
+    """
+    Orders, recorded invoices and catalog prices for an invoice archive
+    (sync; call via asyncio.to_thread)
+
+    Loads up to MAX_BATCH_INVOICES + 1 orders so the caller can detect an
+    over-limit range; invoices and prices are skipped in that case.
+    """
+    with get_db_session() as session:
+        orders = list_orders_with_outlets(
+            session,
+            created_from=datetime.combine(date_from, time.min),
+            created_to=datetime.combine(date_to + timedelta(days=1), time.min),
+            status=status,
+            limit=MAX_BATCH_INVOICES + 1
+        )
+        if len(orders) > MAX_BATCH_INVOICES:
+            return orders, {}, {}
+        invoices = get_invoices_by_order_ids(session, [order['id'] for order, _ in orders])
+        products = get_products_by_skus(session, unpriced_skus(order for order, _ in orders))
+        return orders, invoices, products
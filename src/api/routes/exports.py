@@ -0,0 +1,97 @@
+"""
+TRIA AI-BPO Bulk Export Route
+==============================
+
+FastAPI route for streaming bulk exports (finance reconciliation,
+analytics) without per-order downloads or direct table reads.
+
+Endpoint: GET /exports/{entity}
+Response: application/x-ndjson | text/csv | application/vnd.apache.parquet
+
+NO MOCKING - Real PostgreSQL server-side cursors via services.bulk_export.
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from services.bulk_export import (
+    stream_export,
+    EXPORT_MEDIA_TYPES,
+    DEFAULT_BATCH_SIZE,
+)
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+# ============================================================================
+# EXPORT ENDPOINT
+# ============================================================================
+
+@router.get("/{entity}")
+def export_entity(
+    entity: str,
+    format: str = "ndjson",
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    since_cursor: Optional[str] = None,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=100, le=10000),
+) -> StreamingResponse:
+    """
+    Stream a bulk export of one entity
+
+    **Path:**
+    - entity: `orders`, `invoices`, `delivery_orders` or `conversation_messages`
+      (message content is PII-scrubbed and context is omitted)
+
+    **Query Parameters:**
+    - format: `ndjson` (default), `csv` or `parquet`
+    - created_from / created_to: Date range on the entity timestamp (ISO 8601)
+    - since_cursor: Incremental mode; pass the previous response's
+      `X-Export-Cursor` header to get only rows added since then
+    - batch_size: Rows per server-side cursor fetch (100-10000)
+
+    **Response Headers:**
+    - X-Export-Cursor: Cursor of the last exported row, for the next
+      incremental run (absent when no row matched and no since_cursor
+      was given)
+
+    **Raises:**
+    - HTTPException 400: Unknown entity/format or malformed cursor
+    - HTTPException 500: Database error before streaming started
+    """
+    try:
+        next_cursor, body = stream_export(
+            entity,
+            fmt=format,
+            created_from=created_from,
+            created_to=created_to,
+            since_cursor=since_cursor,
+            batch_size=batch_size,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[EXPORT] Failed to start {entity} export: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    extension = "ndjson" if format == "ndjson" else format
+    filename = f"{entity}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if next_cursor:
+        headers["X-Export-Cursor"] = next_cursor
+
+    # Sync iterator: Starlette drains it in a threadpool, off the event loop
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers,
+    )
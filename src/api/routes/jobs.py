@@ -0,0 +1,116 @@
+"""
+TRIA AI-BPO Background Job Routes
+==================================
+
+FastAPI routes for polling and managing durable background jobs
+(production.job_queue), e.g. Xero posting queued by the chatbot or
+POST /api/post_to_xero/{order_id}.
+
+Endpoints:
+- GET /jobs: Recent jobs, filterable by status and type
+- GET /jobs/stats: Job counts per status
+- GET /jobs/{job_id}: Job status, attempts, last error and result
+- POST /jobs/{job_id}/retry: Re-queue a dead-lettered job
+
+NO MOCKING - Real job rows from PostgreSQL.
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from production.job_queue import get_job_queue, JOB_STATUSES
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+# ============================================================================
+# STATUS ENDPOINTS
+# ============================================================================
+
+@router.get("")
+def list_jobs(
+    status: Optional[str] = Query(None),
+    job_type: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Recent background jobs, most recently updated first
+
+    **Query Parameters:**
+    - status: `queued`, `running`, `succeeded` or `dead`
+    - job_type: e.g. `xero.order_workflow`
+    - limit: Number of jobs (1-500, default 50)
+    """
+    if status and status not in JOB_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid status '{status}'. Allowed: {list(JOB_STATUSES)}"
+        )
+
+    try:
+        jobs = get_job_queue().list_jobs(status=status, job_type=job_type, limit=limit)
+    except Exception as e:
+        logger.error(f"Failed to list jobs: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to list jobs: {str(e)}")
+
+    return {"count": len(jobs), "jobs": jobs}
+
+
+@router.get("/stats")
+def job_stats():
+    """Number of jobs per status (a growing `dead` count needs attention)"""
+    try:
+        return {"counts": get_job_queue().counts()}
+    except Exception as e:
+        logger.error(f"Failed to count jobs: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to count jobs: {str(e)}")
+
+
+@router.get("/{job_id}")
+def get_job(job_id: int):
+    """
+    Job status for polling
+
+    **Response:**
+    ```json
+    {
+      "id": 17,
+      "job_type": "xero.post_invoice",
+      "status": "queued",
+      "attempts": 2,
+      "max_attempts": 8,
+      "run_after": "2025-01-15T14:31:40+00:00",
+      "last_error": "RateLimitExceeded: ...",
+      "result": null
+    }
+    ```
+    """
+    job = get_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.post("/{job_id}/retry")
+def retry_job(job_id: int):
+    """Re-queue a dead-lettered job with a fresh attempt budget"""
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    if not queue.retry(job_id):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job {job_id} is '{job['status']}'; only dead jobs can be retried"
+        )
+
+    logger.info(f"Dead job {job_id} ({job['job_type']}) re-queued")
+    return queue.get(job_id)
@@ -0,0 +1,103 @@
+"""
+TRIA AI-BPO Order Listing Route
+================================
+
+FastAPI route for paging through orders without ad-hoc SQL scripts.
+
+Endpoint: GET /orders
+Pagination: keyset on (created_at, id), newest first
+
+NO MOCKING - Real PostgreSQL queries via database_operations.
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from database_operations import (
+    get_db_session,
+    list_orders_page,
+    ORDER_HEAVY_FIELDS,
+    MAX_ORDER_PAGE_SIZE,
+)
+
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter(prefix="/orders", tags=["orders"])
+
+
+# ============================================================================
+# LISTING ENDPOINT
+# ============================================================================
+
+@router.get("")
+def list_orders_endpoint(
+    limit: int = Query(50, ge=1, le=MAX_ORDER_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    outlet_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    include: Optional[str] = None,
+):
+    """
+    List orders newest-first with keyset pagination
+
+    **Query Parameters:**
+    - limit: Page size (1-500, default 50)
+    - cursor: `next_cursor` from the previous page
+    - status: Filter by order status (e.g. `pending`, `completed`)
+    - outlet_id: Filter by outlet
+    - created_from: Inclusive lower bound on created_at (ISO 8601)
+    - created_to: Exclusive upper bound on created_at (ISO 8601)
+    - include: Comma-separated heavy fields to return
+      (`whatsapp_message`, `parsed_items`); omitted by default
+
+    **Response:**
+    ```json
+    {
+      "orders": [{"id": 42, "outlet_id": 3, "status": "pending", ...}],
+      "count": 1,
+      "next_cursor": "MjAyNS0wMS0xNVQxNDozMDoyMiswMDowMHw0Mg"
+    }
+    ```
+
+    `next_cursor` is null on the last page. Keep the same filters when
+    following a cursor.
+
+    **Raises:**
+    - HTTPException 400: Malformed cursor or unknown include field
+    - HTTPException 500: Database error
+    """
+    include_fields = [f.strip() for f in include.split(",") if f.strip()] if include else []
+
+    try:
+        with get_db_session() as session:
+            page = list_orders_page(
+                session,
+                limit=limit,
+                cursor=cursor,
+                status=status,
+                outlet_id=outlet_id,
+                created_from=created_from,
+                created_to=created_to,
+                include_fields=include_fields,
+            )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"[ORDERS] Failed to list orders: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {
+        "orders": page["orders"],
+        "count": len(page["orders"]),
+        "next_cursor": page["next_cursor"],
+        "available_include_fields": list(ORDER_HEAVY_FIELDS),
+    }
@@ -13,6 +13,11 @@ Events handled:
 - Invoice CREATE: New invoice created in Xero
 - Invoice UPDATE: Invoice updated (includes payment status changes)
 - Invoice DELETE: Invoice deleted
+- Contact CREATE/UPDATE: Local Xero contact mirror refreshed
+- Invoice CREATE/UPDATE: Mirrored items on the invoice refreshed (stock on hand)
+
+Mirror refreshes call the Xero API, so they run as background tasks and
+the webhook still answers within Xero's 5 second limit.
 
 Usage:
     POST https://tria.himeet.ai/api/xero/webhook
@@ -21,16 +26,20 @@ Usage:
 """
 
 import hmac
+import asyncio
 import hashlib
 import base64
 import logging
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Set
 from datetime import datetime
 from fastapi import Request, HTTPException
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+# Strong references to in-flight mirror refreshes (asyncio keeps weak ones)
+_background_tasks: Set[asyncio.Task] = set()
+
 
 class XeroWebhookEvent(BaseModel):
     """Single webhook event from Xero"""
@@ -207,6 +216,30 @@ async def process_webhook_event(event: XeroWebhookEvent):
         logger.info(f"Unhandled event category: {event.eventCategory}")
 
 
+def _schedule_mirror_refresh(description: str, refresh: Callable[..., Any], *args) -> None:
+    """Run a blocking mirror refresh in a worker thread without awaiting it"""
+    async def _run():
+        try:
+            await asyncio.to_thread(refresh, *args)
+        except Exception as e:
+            # The periodic delta sync will catch up
+            logger.warning(f"Xero mirror refresh failed ({description}): {e}")
+
+    task = asyncio.create_task(_run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _get_mirror():
+    """Xero mirror, or None if the database is unavailable"""
+    try:
+        from integrations.xero_mirror import get_xero_mirror
+        return get_xero_mirror()
+    except Exception as e:
+        logger.warning(f"Xero mirror unavailable for webhook processing: {e}")
+        return None
+
+
 async def handle_invoice_event(event: XeroWebhookEvent):
     """
     Handle invoice-related webhook events.
@@ -244,6 +277,14 @@ async def handle_invoice_event(event: XeroWebhookEvent):
         )
         # TODO: Mark invoice as deleted in local database
 
+    # Approved invoices change stock on hand of tracked items
+    if event.eventType in ("CREATE", "UPDATE"):
+        mirror = _get_mirror()
+        if mirror:
+            _schedule_mirror_refresh(
+                f"invoice {event.resourceId}", mirror.refresh_invoice_items, event.resourceId
+            )
+
 
 async def handle_contact_event(event: XeroWebhookEvent):
     """
@@ -254,8 +295,9 @@ async def handle_contact_event(event: XeroWebhookEvent):
         UPDATE: Contact details updated
         DELETE: Contact deleted
 
-    Note:
-        Currently logs for monitoring. Implement if customer sync needed.
+    The mirrored contact is invalidated immediately so customer
+    verification falls back to the Xero API, then re-fetched in the
+    background.
     """
     logger.info(
         f"Contact {event.eventType.lower()} in Xero: {event.resourceId}",
@@ -265,4 +307,13 @@ async def handle_contact_event(event: XeroWebhookEvent):
             "resource_url": event.resourceUrl
         }
     )
-    # TODO: Implement contact sync if needed
+
+    mirror = _get_mirror()
+    if mirror:
+        try:
+            await asyncio.to_thread(mirror.invalidate_contact, event.resourceId)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate mirrored contact {event.resourceId}: {e}")
+        _schedule_mirror_refresh(
+            f"contact {event.resourceId}", mirror.refresh_contact, event.resourceId
+        )
@@ -30,6 +30,7 @@ except ImportError:
     redis = None
 
 from cache.response_cache import LRUCache  # Fallback to in-memory
+from monitoring.tracing import trace_calls
 
 logger = logging.getLogger(__name__)
 
@@ -145,7 +146,11 @@ class RedisCache:
             )
 
             # Create Redis client
-            self.redis_client = redis.Redis(connection_pool=self.connection_pool)
+            self.redis_client = trace_calls(
+                redis.Redis(connection_pool=self.connection_pool),
+                "redis",
+                {"db.system": "redis"}
+            )
 
             # Test connection
             self.redis_client.ping()
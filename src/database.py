@@ -11,6 +11,8 @@ Features:
 - Connection recycling (prevents stale connections)
 - UTF-8 encoding for all connections
 - Production-ready error handling
+- Optional per-statement statistics (DB_QUERY_STATS=true, see monitoring.query_stats)
+- Statement spans when tracing is enabled (see monitoring.tracing)
 
 NO MOCKUPS - Real PostgreSQL connection only.
 NO FALLBACKS - Fails explicitly if database unavailable.
@@ -95,6 +97,15 @@ def get_db_engine(database_url: Optional[str] = None) -> Engine:
                 }
             )
 
+            # Opt-in per-statement timing (DB_QUERY_STATS=true)
+            if os.getenv('DB_QUERY_STATS', 'false').lower() == 'true':
+                from monitoring.query_stats import get_query_stats_collector
+                get_query_stats_collector().instrument(_engine)
+
+            # Statement spans when tracing is configured (see monitoring.tracing)
+            from monitoring.tracing import instrument_engine
+            instrument_engine(_engine)
+
             # Test the connection immediately
             with _engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
@@ -8,12 +8,17 @@ Replaces Kailash WorkflowBuilder patterns with direct SQLAlchemy queries.
 NO MOCKING - Real PostgreSQL operations.
 """
 
-from typing import List, Dict, Any, Optional
+import os
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 from contextlib import contextmanager
-from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy import and_, or_
+from datetime import datetime
+import base64
+from sqlalchemy.orm import Session, sessionmaker, load_only
+from sqlalchemy import and_, or_, tuple_
 
 from database import get_db_engine
+from cache.response_cache import LRUCache
 from models.order_orm import Product, Outlet, Order, DeliveryOrder, Invoice
 from models.conversation_orm import ConversationSession, ConversationMessage, UserInteractionSummary
 
@@ -151,6 +156,23 @@ def get_product_by_sku(session: Session, sku: str) -> Optional[Dict[str, Any]]:
     return product.to_dict() if product else None
 
 
+def get_products_by_skus(session: Session, skus: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get products for many SKUs in one query
+
+    Args:
+        session: SQLAlchemy session
+        skus: Product SKUs
+
+    Returns:
+        Dictionary of SKU -> product dictionary (unknown SKUs are absent)
+    """
+    if not skus:
+        return {}
+    products = session.query(Product).filter(Product.sku.in_(set(skus))).all()
+    return {product.sku: product.to_dict() for product in products}
+
+
 # ============================================================================
 # ORDER OPERATIONS
 # ============================================================================
@@ -200,6 +222,69 @@ def get_order_by_id(session: Session, order_id: int) -> Optional[Dict[str, Any]]
     return order.to_dict() if order else None
 
 
+# Short-lived cache for get_order_with_outlet(use_cache=True): document
+# downloads re-read the same order within seconds. 0 disables it.
+# Orders and outlets are only written on creation today; any code path
+# that updates an order must call invalidate_order_read_cache(order_id).
+# Paths that act on an order (e.g. posting to Xero) read uncached.
+ORDER_READ_CACHE_TTL = int(os.getenv('ORDER_READ_CACHE_TTL', '5'))
+
+_order_read_cache = LRUCache(max_size=1000, default_ttl=max(ORDER_READ_CACHE_TTL, 1))
+_order_read_lock = threading.Lock()
+
+
+def get_order_with_outlet(
+    session: Session,
+    order_id: int,
+    use_cache: bool = False
+) -> Optional[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+    """
+    Get an order and its outlet in one joined query
+
+    Args:
+        session: SQLAlchemy session
+        order_id: Order ID
+        use_cache: Serve from / fill the short-TTL read cache
+            (ORDER_READ_CACHE_TTL seconds). Cached dictionaries are shared:
+            callers must not modify them.
+
+    Returns:
+        (order dict, outlet dict or None if the outlet row is missing),
+        or None if the order does not exist
+    """
+    use_cache = use_cache and ORDER_READ_CACHE_TTL > 0
+    if use_cache:
+        with _order_read_lock:
+            cached = _order_read_cache.get(str(order_id))
+        if cached is not None:
+            return cached
+
+    row = (
+        session.query(Order, Outlet)
+        .outerjoin(Outlet, Outlet.id == Order.outlet_id)
+        .filter(Order.id == order_id)
+        .first()
+    )
+    if row is None:
+        return None
+
+    order, outlet = row
+    result = (order.to_dict(), outlet.to_dict() if outlet else None)
+    if use_cache:
+        with _order_read_lock:
+            _order_read_cache.put(str(order_id), result)
+    return result
+
+
+def invalidate_order_read_cache(order_id: Optional[int] = None) -> None:
+    """Drop one order (or all orders) from the get_order_with_outlet cache"""
+    with _order_read_lock:
+        if order_id is None:
+            _order_read_cache.clear()
+        else:
+            _order_read_cache.cache.pop(str(order_id), None)
+
+
 def list_orders(session: Session, limit: int = 100, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
     """
     List orders from database
@@ -224,6 +309,229 @@ def list_orders(session: Session, limit: int = 100, filters: Optional[Dict[str,
     return [order.to_dict() for order in orders]
 
 
+def list_orders_with_outlets(
+    session: Session,
+    order_ids: Optional[List[int]] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    status: Optional[str] = None,
+    limit: int = 500
+) -> List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+    """
+    List orders together with their outlets in one joined query
+
+    Used for bulk document generation (e.g. daily Delivery Orders).
+
+    Args:
+        session: SQLAlchemy session
+        order_ids: Specific order IDs
+        created_from: Orders created at or after this time
+        created_to: Orders created before this time
+        status: Optional status filter
+        limit: Maximum number of orders
+
+    Returns:
+        List of (order dict, outlet dict or None) in order ID order
+    """
+    query = session.query(Order, Outlet).outerjoin(Outlet, Outlet.id == Order.outlet_id)
+
+    if order_ids:
+        query = query.filter(Order.id.in_(order_ids))
+    if created_from is not None:
+        query = query.filter(Order.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(Order.created_at < created_to)
+    if status:
+        query = query.filter(Order.status == status)
+
+    rows = query.order_by(Order.id).limit(limit).all()
+    return [(order.to_dict(), outlet.to_dict() if outlet else None) for order, outlet in rows]
+
+
+def get_invoices_by_order_ids(session: Session, order_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Get the recorded invoice of each order in one query
+
+    Args:
+        session: SQLAlchemy session
+        order_ids: Order IDs
+
+    Returns:
+        Dictionary of order ID -> latest invoice dictionary (orders
+        without an invoice are absent)
+    """
+    if not order_ids:
+        return {}
+    invoices = (
+        session.query(Invoice)
+        .filter(Invoice.order_id.in_(set(order_ids)))
+        .order_by(Invoice.created_at, Invoice.id)
+        .all()
+    )
+    # Later invoices overwrite earlier ones
+    return {invoice.order_id: invoice.to_dict() for invoice in invoices}
+
+
+# Large columns skipped by list_orders_page unless explicitly requested
+ORDER_HEAVY_FIELDS = ('whatsapp_message', 'parsed_items')
+
+# Columns always returned by list_orders_page
+ORDER_LIST_FIELDS = (
+    'id', 'outlet_id', 'total_amount', 'status', 'anomaly_detected',
+    'escalated', 'created_at', 'completed_at',
+)
+
+MAX_ORDER_PAGE_SIZE = 500
+
+
+def encode_keyset_cursor(timestamp: datetime, row_id: int) -> str:
+    """
+    Encode a (timestamp, id) keyset cursor
+
+    Args:
+        timestamp: Timestamp of the last row seen
+        row_id: Primary key of the last row seen
+
+    Returns:
+        Opaque URL-safe cursor string
+    """
+    raw = f"{timestamp.isoformat()}|{row_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_keyset_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_keyset_cursor
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        Tuple of (timestamp, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        timestamp, row_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def encode_order_cursor(created_at: datetime, order_id: int) -> str:
+    """Encode a keyset cursor for order pagination (see encode_keyset_cursor)"""
+    return encode_keyset_cursor(created_at, order_id)
+
+
+def decode_order_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode an order pagination cursor (see decode_keyset_cursor)"""
+    return decode_keyset_cursor(cursor)
+
+
+def list_orders_page(
+    session: Session,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    outlet_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    include_fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    List orders newest-first using keyset pagination on (created_at, id)
+
+    Unlike OFFSET pagination, each page is a single index range scan
+    (idx_order_created_id / idx_order_status_created_id /
+    idx_order_outlet_created_id), so page N costs the same as page 1.
+
+    Args:
+        session: SQLAlchemy session
+        limit: Page size (capped at MAX_ORDER_PAGE_SIZE)
+        cursor: Cursor from a previous page's next_cursor
+        status: Optional status filter
+        outlet_id: Optional outlet filter
+        created_from: Optional inclusive lower bound on created_at
+        created_to: Optional exclusive upper bound on created_at
+        include_fields: Optional heavy fields to include
+                        (any of ORDER_HEAVY_FIELDS)
+
+    Returns:
+        Dictionary with:
+        - orders: List of order dictionaries (projected columns only)
+        - next_cursor: Cursor for the next page, or None on the last page
+
+    Raises:
+        ValueError: If cursor is malformed or include_fields is unknown
+    """
+    include_fields = list(include_fields or [])
+    unknown = [f for f in include_fields if f not in ORDER_HEAVY_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown include fields: {unknown}. Allowed: {list(ORDER_HEAVY_FIELDS)}"
+        )
+
+    limit = max(1, min(limit, MAX_ORDER_PAGE_SIZE))
+    fields = list(ORDER_LIST_FIELDS) + include_fields
+
+    query = session.query(Order).options(
+        load_only(*[getattr(Order, f) for f in fields])
+    )
+
+    if status:
+        query = query.filter(Order.status == status)
+    if outlet_id is not None:
+        query = query.filter(Order.outlet_id == outlet_id)
+    if created_from:
+        query = query.filter(Order.created_at >= created_from)
+    if created_to:
+        query = query.filter(Order.created_at < created_to)
+
+    if cursor:
+        cursor_created_at, cursor_id = decode_order_cursor(cursor)
+        query = query.filter(
+            tuple_(Order.created_at, Order.id) < tuple_(cursor_created_at, cursor_id)
+        )
+
+    query = query.order_by(Order.created_at.desc(), Order.id.desc())
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    orders = []
+    for order in rows:
+        orders.append({
+            field: _serialize_order_field(getattr(order, field))
+            for field in fields
+        })
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_order_cursor(last.created_at, last.id)
+
+    return {
+        'orders': orders,
+        'next_cursor': next_cursor,
+    }
+
+
+def _serialize_order_field(value: Any) -> Any:
+    """Serialize a projected order column to a JSON-friendly value"""
+    from decimal import Decimal
+
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
 # ============================================================================
 # CONVERSATION OPERATIONS
 # ============================================================================
@@ -0,0 +1,53 @@
+"""
+Tria AIBPO - Document Rendering Module
+
+Renders customer documents off the API event loop:
+- render_pool: Process pool for CPU-bound rendering
+- delivery_order: Delivery Order workbooks from DO_Template.xlsx
+- invoice_pdf: Invoice PDFs (ReportLab), cached by content revision
+- document_cache: Content-addressed on-disk cache with ETag helpers
+
+Kept free of database and agent imports so render workers start quickly.
+"""
+
+from .render_pool import get_render_pool, run_in_render_pool, shutdown_render_pool
+from .document_cache import DocumentCache, get_document_cache, etag_matches
+from .delivery_order import (
+    DocumentDataError,
+    DeliveryOrderDocument,
+    build_delivery_order,
+    build_delivery_orders,
+    render_delivery_order_async,
+    render_delivery_orders_zip,
+)
+from .invoice_pdf import (
+    MissingProductError,
+    InvoiceDocument,
+    build_invoice,
+    build_invoices,
+    unpriced_skus,
+    get_invoice_pdf,
+    render_invoices_zip,
+)
+
+__all__ = [
+    'get_render_pool',
+    'run_in_render_pool',
+    'shutdown_render_pool',
+    'DocumentCache',
+    'get_document_cache',
+    'etag_matches',
+    'DocumentDataError',
+    'DeliveryOrderDocument',
+    'build_delivery_order',
+    'build_delivery_orders',
+    'render_delivery_order_async',
+    'render_delivery_orders_zip',
+    'MissingProductError',
+    'InvoiceDocument',
+    'build_invoice',
+    'build_invoices',
+    'unpriced_skus',
+    'get_invoice_pdf',
+    'render_invoices_zip'
+]
@@ -0,0 +1,273 @@
+"""
+Delivery Order Renderer
+=======================
+
+Renders Delivery Order workbooks from DO_Template.xlsx for
+GET /api/download_do/{order_id} and bulk daily dispatch downloads.
+
+Architecture:
+- build_delivery_order validates order/outlet data in the API process and
+  produces a small picklable DeliveryOrderDocument
+- render_delivery_order runs in the document render pool; each worker
+  parses the 23-sheet template once, fills the DO cells, saves, and puts
+  the original cell values back, so later renders start from a clean
+  template (reloaded automatically if the file changes on disk)
+- render_delivery_orders_zip renders many DOs concurrently across the
+  pool and packs them into one zip archive
+- No database or agent imports, so spawned workers start quickly
+
+NO MOCKING - Real openpyxl rendering.
+"""
+
+import os
+import io
+import asyncio
+import logging
+import threading
+import zipfile
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import openpyxl
+
+from documents.render_pool import run_in_render_pool
+
+logger = logging.getLogger(__name__)
+
+
+DO_TEMPLATE_PATH = Path(__file__).parent.parent.parent / "data" / "templates" / "DO_Template.xlsx"
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# First row of line items on the DO sheet
+LINE_ITEM_START_ROW = 8
+
+# Upper bound on DOs in one bulk archive
+MAX_BULK_ORDERS = 500
+
+
+class DocumentDataError(ValueError):
+    """Order or outlet data is incomplete; the document cannot be rendered"""
+    pass
+
+
+@dataclass
+class DeliveryOrderDocument:
+    """Validated data for one Delivery Order"""
+    order_id: int
+    do_number: str
+    outlet_name: str
+    outlet_address: str
+    delivery_date: str  # YYYY-MM-DD
+    lines: List[Tuple[str, int]] = field(default_factory=list)  # (description, quantity)
+
+    @property
+    def total_quantity(self) -> int:
+        return sum(quantity for _, quantity in self.lines)
+
+    @property
+    def filename(self) -> str:
+        return f"DO_{self.outlet_name.replace(' ', '_')}_{self.delivery_date}.xlsx"
+
+
+# ============================================================================
+# DOCUMENT DATA
+# ============================================================================
+
+def build_delivery_order(
+    order: Dict[str, Any],
+    outlet: Optional[Dict[str, Any]],
+    delivery_date: Optional[date] = None
+) -> DeliveryOrderDocument:
+    """
+    Validate order and outlet data and build the DO document
+
+    Args:
+        order: Order dictionary (parsed_items in catalog format)
+        outlet: Outlet dictionary
+        delivery_date: Delivery date (default: today)
+
+    Returns:
+        DeliveryOrderDocument
+
+    Raises:
+        DocumentDataError: If outlet or line item data is missing
+    """
+    order_id = order['id']
+    outlet_id = order.get('outlet_id')
+
+    # PRODUCTION-READY: No fallbacks - fail if outlet data missing
+    if not outlet:
+        raise DocumentDataError(f"Outlet data not found for outlet_id {outlet_id}")
+    if not outlet.get('name'):
+        raise DocumentDataError(
+            f"Outlet name missing in database for outlet_id {outlet_id}. Data integrity issue."
+        )
+    if not outlet.get('address'):
+        raise DocumentDataError(
+            f"Outlet address missing in database for outlet_id {outlet_id}. Data integrity issue."
+        )
+
+    lines = []
+    for item in (order.get('parsed_items') or {}).get('line_items', []):
+        description = item.get('description')
+        if not description:
+            raise DocumentDataError(
+                f"Line item missing description in order {order_id}. Data integrity issue."
+            )
+        lines.append((description, item.get('quantity', 0)))
+
+    delivery_date = delivery_date or datetime.now().date()
+    return DeliveryOrderDocument(
+        order_id=order_id,
+        do_number=f"DO-{delivery_date.strftime('%Y%m%d')}-{order_id:05d}",
+        outlet_name=outlet['name'],
+        outlet_address=outlet['address'],
+        delivery_date=delivery_date.isoformat(),
+        lines=lines
+    )
+
+
+def delivery_order_cells(document: DeliveryOrderDocument) -> Dict[str, Any]:
+    """Cell values written to the first sheet of the DO template"""
+    cells = {
+        'A2': f"Delivery Order: {document.do_number}",
+        'A4': f"Customer: {document.outlet_name}",
+        'A5': f"Address: {document.outlet_address}",
+        'A6': f"Delivery Date: {document.delivery_date}",
+    }
+
+    row_num = LINE_ITEM_START_ROW
+    for description, quantity in document.lines:
+        cells[f'A{row_num}'] = f"{description}: {quantity} units"
+        row_num += 1
+
+    cells[f'A{row_num}'] = f"Total: {document.total_quantity} items"
+    return cells
+
+
+# ============================================================================
+# RENDERING (runs in render pool workers)
+# ============================================================================
+
+# Parsed template per worker process: path -> (mtime, workbook, image bytes)
+_template_cache: Dict[str, Tuple[float, Any, List[Tuple[Any, bytes]]]] = {}
+_template_lock = threading.Lock()
+
+
+def _get_template(template_path: str):
+    mtime = os.path.getmtime(template_path)
+    cached = _template_cache.get(template_path)
+    if cached is None or cached[0] != mtime:
+        workbook = openpyxl.load_workbook(template_path)
+        # openpyxl closes embedded image streams when saving; keep the bytes
+        # so every save can hand it a fresh stream
+        images = [(image, image._data()) for sheet in workbook.worksheets for image in sheet._images]
+        cached = _template_cache[template_path] = (mtime, workbook, images)
+
+    _, workbook, images = cached
+    for image, data in images:
+        image.ref = io.BytesIO(data)
+    return workbook
+
+
+def render_delivery_order(document: DeliveryOrderDocument, template_path: str = str(DO_TEMPLATE_PATH)) -> bytes:
+    """
+    Render one DO workbook from the cached template
+
+    Args:
+        document: Validated DO data
+        template_path: Path to DO_Template.xlsx
+
+    Returns:
+        .xlsx file content
+
+    Raises:
+        FileNotFoundError: If the template does not exist
+    """
+    cells = delivery_order_cells(document)
+    output = io.BytesIO()
+
+    # The cached workbook is shared by every render in this process
+    with _template_lock:
+        workbook = _get_template(template_path)
+        sheet = workbook.worksheets[0]
+        originals = {coord: sheet[coord].value for coord in cells}
+        try:
+            for coord, value in cells.items():
+                sheet[coord] = value
+            workbook.save(output)
+        finally:
+            for coord, value in originals.items():
+                sheet[coord].value = value
+
+    return output.getvalue()
+
+
+def build_zip(files: Sequence[Tuple[str, bytes]]) -> bytes:
+    """Pack (filename, content) pairs into a zip archive"""
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, content in files:
+            archive.writestr(filename, content)
+    return output.getvalue()
+
+
+# ============================================================================
+# ASYNC API
+# ============================================================================
+
+async def render_delivery_order_async(document: DeliveryOrderDocument) -> bytes:
+    """Render one DO in the render pool"""
+    if not DO_TEMPLATE_PATH.exists():
+        raise FileNotFoundError("DO template not found")
+    return await run_in_render_pool(render_delivery_order, document, str(DO_TEMPLATE_PATH))
+
+
+async def render_delivery_orders_zip(
+    documents: Sequence[DeliveryOrderDocument],
+    errors: Optional[Sequence[str]] = None
+) -> bytes:
+    """
+    Render many DOs concurrently and pack them into one zip
+
+    Args:
+        documents: Validated DOs
+        errors: Orders that could not be rendered; written to ERRORS.txt
+
+    Returns:
+        Zip archive content (one <do_number>_<outlet>.xlsx per order)
+    """
+    contents = await asyncio.gather(*(render_delivery_order_async(document) for document in documents))
+
+    files = [
+        (f"{document.do_number}_{document.outlet_name.replace(' ', '_')}.xlsx", content)
+        for document, content in zip(documents, contents)
+    ]
+    if errors:
+        files.append(("ERRORS.txt", "\n".join(errors).encode('utf-8')))
+
+    return await asyncio.to_thread(build_zip, files)
+
+
+def build_delivery_orders(
+    rows: Iterable[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]
+) -> Tuple[List[DeliveryOrderDocument], List[str]]:
+    """
+    Build DOs for a batch of (order, outlet) pairs
+
+    Orders with incomplete data are reported in errors instead of failing
+    the whole batch.
+
+    Returns:
+        (documents, errors)
+    """
+    documents, errors = [], []
+    for order, outlet in rows:
+        try:
+            documents.append(build_delivery_order(order, outlet))
+        except DocumentDataError as e:
+            errors.append(f"Order {order['id']}: {e}")
+    return documents, errors
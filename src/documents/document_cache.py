@@ -0,0 +1,102 @@
+"""
+Document Cache
+==============
+
+Content-addressed on-disk cache for rendered documents (invoice PDFs).
+
+Keys embed the document revision (a hash of its content), so entries are
+never updated in place: a changed invoice gets a new key, and stale
+revisions are simply no longer read. Writes go to a temp file and are
+renamed into place, so concurrent API workers never serve a partial file.
+
+Location: DOCUMENT_CACHE_DIR (default: data/generated/documents)
+
+NO MOCKING - Real filesystem.
+"""
+
+import os
+import logging
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "generated" / "documents"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches the ETag (weak comparison)
+
+    Args:
+        if_none_match: Header value, e.g. '"abc", W/"def"' or '*'
+        etag: Current ETag including quotes
+
+    Returns:
+        True if the client's copy is current (respond 304)
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    if '*' in candidates:
+        return True
+    return _strip_weak(etag) in {_strip_weak(candidate) for candidate in candidates}
+
+
+def _strip_weak(tag: str) -> str:
+    """ETag without its W/ (weak) prefix"""
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+class DocumentCache:
+    """
+    Filesystem cache keyed by relative paths such as
+    invoices/<order_id>/<revision>.pdf
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or os.getenv('DOCUMENT_CACHE_DIR') or DEFAULT_CACHE_DIR)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid cache key: {key}")
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached content, or None on a miss"""
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, content: bytes) -> None:
+        """Store content atomically"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+_global_cache: Optional[DocumentCache] = None
+
+
+def get_document_cache() -> DocumentCache:
+    """Get or create the global document cache"""
+    global _global_cache
+    if _global_cache is None:
+        _global_cache = DocumentCache()
+        logger.info(f"Document cache at {_global_cache.root}")
+    return _global_cache
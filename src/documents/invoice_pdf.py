@@ -0,0 +1,368 @@
+"""
+Invoice PDF Renderer
+====================
+
+Renders invoice PDFs for GET /api/download_invoice/{order_id} and batch
+invoice archives, with rendered PDFs cached on disk.
+
+Architecture:
+- build_invoice validates order/outlet/product data in the API process and
+  produces a picklable InvoiceDocument with all amounts computed
+- The document's revision is a hash of everything printed on the PDF, so
+  a cached PDF is reused until the invoice content actually changes and
+  doubles as the HTTP ETag
+- render_invoice_pdf (ReportLab) runs in the document render pool
+- get_invoice_pdf serves from the document cache, rendering on a miss
+
+NO MOCKING - Real ReportLab rendering.
+"""
+
+import io
+import json
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from documents.delivery_order import DocumentDataError, build_zip
+from documents.document_cache import DocumentCache, get_document_cache
+from documents.render_pool import run_in_render_pool
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when the PDF layout changes so cached PDFs are re-rendered
+INVOICE_LAYOUT_VERSION = 1
+
+PDF_MEDIA_TYPE = "application/pdf"
+
+# Upper bound on invoices in one batch archive
+MAX_BATCH_INVOICES = 500
+
+
+class MissingProductError(DocumentDataError):
+    """A line item's SKU is not in the product catalog"""
+    pass
+
+
+@dataclass
+class InvoiceDocument:
+    """Validated, fully priced invoice"""
+    order_id: int
+    invoice_number: str
+    invoice_date: str  # YYYY-MM-DD
+    outlet_name: str
+    outlet_address: str
+    lines: List[Tuple[str, int, Decimal, Decimal]] = field(default_factory=list)  # (description, qty, unit price, line total)
+    subtotal: Decimal = Decimal('0.00')
+    tax_rate: Decimal = Decimal('0')
+    tax: Decimal = Decimal('0.00')
+    total: Decimal = Decimal('0.00')
+
+    @property
+    def revision(self) -> str:
+        """Content hash of everything printed on the invoice"""
+        content = json.dumps(
+            {'layout': INVOICE_LAYOUT_VERSION, **asdict(self)},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()[:32]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.revision}"'
+
+    @property
+    def cache_key(self) -> str:
+        return f"invoices/{self.order_id}/{self.revision}.pdf"
+
+    @property
+    def filename(self) -> str:
+        return f"Invoice_{self.invoice_number}.pdf"
+
+
+# ============================================================================
+# DOCUMENT DATA
+# ============================================================================
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if value:
+        return datetime.fromisoformat(value).date()
+    return datetime.now().date()
+
+
+def build_invoice(
+    order: Dict[str, Any],
+    outlet: Optional[Dict[str, Any]],
+    products: Dict[str, Dict[str, Any]],
+    tax_rate: Decimal,
+    invoice: Optional[Dict[str, Any]] = None
+) -> InvoiceDocument:
+    """
+    Validate data and compute invoice amounts
+
+    The invoice number and date come from the recorded invoice when there
+    is one, otherwise from the order's creation date, so re-downloading
+    an invoice yields the same document.
+
+    Line prices stamped on the order by the price book take precedence
+    over products, so stamped orders always regenerate the same invoice.
+
+    Args:
+        order: Order dictionary (parsed_items in catalog format)
+        outlet: Outlet dictionary
+        products: SKU -> product dictionary (with unit_price) for unstamped lines
+        tax_rate: e.g. Decimal('0.09')
+        invoice: Recorded invoice row for the order, if any
+
+    Returns:
+        InvoiceDocument
+
+    Raises:
+        DocumentDataError: If outlet or line item data is missing
+        MissingProductError: If a SKU is not in the catalog
+    """
+    order_id = order['id']
+    outlet_id = order.get('outlet_id')
+
+    # PRODUCTION-READY: No fallbacks - fail if outlet data missing
+    if not outlet:
+        raise DocumentDataError(f"Outlet data not found for outlet_id {outlet_id}")
+    if not outlet.get('name'):
+        raise DocumentDataError(
+            f"Outlet name missing in database for outlet_id {outlet_id}. Data integrity issue."
+        )
+    if not outlet.get('address'):
+        raise DocumentDataError(
+            f"Outlet address missing in database for outlet_id {outlet_id}. Data integrity issue."
+        )
+
+    lines = []
+    subtotal = Decimal('0.00')
+    for item in (order.get('parsed_items') or {}).get('line_items', []):
+        sku = item.get('sku', '')
+        quantity = item.get('quantity', 0)
+        description = item.get('description')
+
+        if not description:
+            raise DocumentDataError(
+                f"Line item missing description in order {order_id}. Data integrity issue."
+            )
+
+        # PRODUCTION-READY: All pricing comes from the catalog - the price
+        # stamped on the order from the price book, else the current catalog
+        if item.get('unit_price') is not None:
+            unit_price = Decimal(str(item['unit_price']))
+        else:
+            product = products.get(sku)
+            if not product or product.get('unit_price') is None:
+                raise MissingProductError(f"Product {sku} not found in catalog")
+            unit_price = Decimal(str(product['unit_price']))
+
+        line_total = unit_price * Decimal(str(quantity))
+        subtotal += line_total
+        lines.append((description, quantity, unit_price, line_total))
+
+    tax = subtotal * tax_rate
+
+    if invoice and invoice.get('invoice_number'):
+        invoice_number = invoice['invoice_number']
+        invoice_date = _as_date(invoice.get('created_at'))
+    else:
+        invoice_date = _as_date(order.get('created_at'))
+        invoice_number = f"INV-{invoice_date.strftime('%Y%m%d')}-{order_id:05d}"
+
+    return InvoiceDocument(
+        order_id=order_id,
+        invoice_number=invoice_number,
+        invoice_date=invoice_date.isoformat(),
+        outlet_name=outlet['name'],
+        outlet_address=outlet['address'],
+        lines=lines,
+        subtotal=subtotal,
+        tax_rate=tax_rate,
+        tax=tax,
+        total=subtotal + tax
+    )
+
+
+def unpriced_skus(orders: Iterable[Dict[str, Any]]) -> List[str]:
+    """SKUs of line items without a stamped unit price (need a catalog lookup)"""
+    return [
+        item.get('sku', '')
+        for order in orders
+        for item in (order.get('parsed_items') or {}).get('line_items', [])
+        if item.get('unit_price') is None
+    ]
+
+
+def build_invoices(
+    rows: Iterable[Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]],
+    products: Dict[str, Dict[str, Any]],
+    tax_rate: Decimal
+) -> Tuple[List[InvoiceDocument], List[str]]:
+    """
+    Build invoices for a batch of (order, outlet, invoice) rows
+
+    Orders with incomplete data are reported in errors instead of failing
+    the whole batch.
+
+    Returns:
+        (documents, errors)
+    """
+    documents, errors = [], []
+    for order, outlet, invoice in rows:
+        try:
+            documents.append(build_invoice(order, outlet, products, tax_rate, invoice))
+        except DocumentDataError as e:
+            errors.append(f"Order {order['id']}: {e}")
+    return documents, errors
+
+
+# ============================================================================
+# RENDERING (runs in render pool workers)
+# ============================================================================
+
+def render_invoice_pdf(document: InvoiceDocument) -> bytes:
+    """
+    Render the invoice PDF
+
+    Args:
+        document: Validated invoice
+
+    Returns:
+        PDF content
+    """
+    buffer = io.BytesIO()
+    # invariant: no timestamps or random IDs, so equal documents give equal bytes
+    doc = SimpleDocTemplate(buffer, pagesize=letter, invariant=1)
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Company header
+    elements.append(Paragraph("<b>TRIA AI-BPO Solutions</b>", styles['Heading1']))
+    elements.append(Paragraph("123 Business Street, Singapore 123456", styles['Normal']))
+    elements.append(Paragraph("Tel: +65 1234 5678 | Email: info@tria-bpo.com", styles['Normal']))
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Invoice title
+    invoice_date = date.fromisoformat(document.invoice_date)
+    elements.append(Paragraph(f"<b>INVOICE #{document.invoice_number}</b>", styles['Heading2']))
+    elements.append(Paragraph(f"Date: {invoice_date.strftime('%d %B %Y')}", styles['Normal']))
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Bill to
+    elements.append(Paragraph("<b>Bill To:</b>", styles['Heading3']))
+    elements.append(Paragraph(document.outlet_name, styles['Normal']))
+    elements.append(Paragraph(document.outlet_address.replace('\n', '<br/>'), styles['Normal']))
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Line items table
+    data = [['Item', 'Quantity', 'Unit Price', 'Amount']]
+    for description, quantity, unit_price, line_total in document.lines:
+        data.append([
+            description,
+            f"{quantity} units",
+            f"${float(unit_price):.2f}",
+            f"${float(line_total):.2f}"
+        ])
+
+    # Add totals
+    data.extend([
+        ['', '', 'Subtotal:', f'${float(document.subtotal):.2f}'],
+        ['', '', f'GST ({float(document.tax_rate)*100:.0f}%):', f'${float(document.tax):.2f}'],
+        ['', '', '<b>Total:</b>', f'<b>${float(document.total):.2f} SGD</b>'],
+    ])
+
+    table = Table(data, colWidths=[3*inch, 1.5*inch, 1.5*inch, 1.5*inch])
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (2, 0), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -4), colors.beige),
+        ('GRID', (0, 0), (-1, -4), 1, colors.black),
+        ('LINEBELOW', (2, -3), (-1, -3), 2, colors.black),
+        ('LINEBELOW', (2, -2), (-1, -2), 1, colors.black),
+        ('LINEBELOW', (2, -1), (-1, -1), 2, colors.black),
+        ('FONTNAME', (2, -1), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (2, -1), (-1, -1), 12),
+    ]))
+
+    elements.append(table)
+    elements.append(Spacer(1, 0.5*inch))
+
+    # Payment terms
+    elements.append(Paragraph("<b>Payment Terms:</b> Net 30 days", styles['Normal']))
+    elements.append(Paragraph("Thank you for your business!", styles['Normal']))
+
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+# ============================================================================
+# ASYNC API
+# ============================================================================
+
+async def get_invoice_pdf(document: InvoiceDocument, cache: Optional[DocumentCache] = None) -> bytes:
+    """
+    Cached invoice PDF, rendered in the render pool on a miss
+
+    Args:
+        document: Validated invoice
+        cache: Document cache (default: global cache)
+
+    Returns:
+        PDF content
+    """
+    cache = cache or get_document_cache()
+
+    content = await asyncio.to_thread(cache.get, document.cache_key)
+    if content is not None:
+        return content
+
+    content = await run_in_render_pool(render_invoice_pdf, document)
+    try:
+        await asyncio.to_thread(cache.put, document.cache_key, content)
+    except OSError as e:
+        logger.warning(f"Failed to cache invoice {document.invoice_number}: {e}")
+    return content
+
+
+async def render_invoices_zip(
+    documents: Sequence[InvoiceDocument],
+    errors: Optional[Sequence[str]] = None
+) -> bytes:
+    """
+    Cached/rendered invoice PDFs for many orders in one zip
+
+    Args:
+        documents: Validated invoices
+        errors: Orders that could not be rendered; written to ERRORS.txt
+
+    Returns:
+        Zip archive content (one Invoice_<number>.pdf per order)
+    """
+    contents = await asyncio.gather(*(get_invoice_pdf(document) for document in documents))
+
+    files = [(document.filename, content) for document, content in zip(documents, contents)]
+    if errors:
+        files.append(("ERRORS.txt", "\n".join(errors).encode('utf-8')))
+
+    return await asyncio.to_thread(build_zip, files)
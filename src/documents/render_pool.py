@@ -0,0 +1,85 @@
+"""
+Document Render Pool
+====================
+
+Process pool for CPU-bound document rendering (Delivery Order workbooks,
+invoice PDFs) so openpyxl/ReportLab work does not block the API event loop.
+
+Architecture:
+- One lazily created ProcessPoolExecutor per API process, sized by
+  DOCUMENT_RENDER_WORKERS (default: min(4, CPU count))
+- Worker processes are spawned, not forked, so they never inherit locks
+  held by API threads (DB pools, Redis clients, logging)
+- Render functions live in the documents package, which imports no
+  database or agent modules, so workers start quickly
+- Render functions keep per-process caches (e.g. the parsed DO template),
+  so each worker pays the template parse once instead of once per request
+- DOCUMENT_RENDER_WORKERS=0 renders in the default thread pool instead
+  (still off the event loop; useful where processes cannot be spawned)
+
+NO MOCKING - Real process pool.
+"""
+
+import os
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _default_workers() -> int:
+    return min(4, os.cpu_count() or 1)
+
+
+# ============================================================================
+# GLOBAL POOL
+# ============================================================================
+_global_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_render_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get or create the document render pool
+
+    Returns:
+        ProcessPoolExecutor, or None when DOCUMENT_RENDER_WORKERS=0
+    """
+    global _global_pool
+    if _global_pool is None:
+        workers = int(os.getenv('DOCUMENT_RENDER_WORKERS', str(_default_workers())))
+        if workers <= 0:
+            return None
+        _global_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        logger.info(f"Document render pool started with {workers} worker process(es)")
+    return _global_pool
+
+
+async def run_in_render_pool(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a picklable, module-level render function off the event loop
+
+    Args:
+        func: Render function (must be importable by worker processes)
+        *args, **kwargs: Picklable arguments
+
+    Returns:
+        The function's return value (exceptions are re-raised)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_render_pool(), partial(func, *args, **kwargs))
+
+
+def shutdown_render_pool(wait: bool = True) -> None:
+    """Stop the worker processes (called on API shutdown)"""
+    global _global_pool
+    if _global_pool is not None:
+        _global_pool.shutdown(wait=wait, cancel_futures=True)
+        _global_pool = None
+        logger.info("Document render pool stopped")
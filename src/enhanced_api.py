@@ -12,6 +12,7 @@ NO MOCKING - All agent details show real system activity.
 import os
 import sys
 import json
+import asyncio
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, List
@@ -38,11 +39,13 @@ from process_order_with_catalog import (
     calculate_order_total,
     format_line_items_for_display
 )
+from price_book import get_price_book
 
 # Import semantic search module
 from semantic_search import (
     semantic_product_search,
-    format_search_results_for_llm
+    format_search_results_for_llm,
+    get_openai_client
 )
 
 # Import chatbot agents and memory components
@@ -57,6 +60,11 @@ from services.multilevel_cache import get_cache, MultiLevelCache
 from cache.chat_response_cache import get_chat_cache, ChatResponseCache
 from prompts.prompt_manager import get_prompt_manager, PromptManager
 from api.routes.chat_stream import router as chat_stream_router
+from api.routes.orders import router as orders_router
+from api.routes.exports import router as exports_router
+from api.routes.db_stats import router as db_stats_router
+from api.routes.jobs import router as jobs_router
+from api.routes.documents import router as documents_router
 from api.middleware.sse_middleware import SSEMiddleware
 
 # Import Multi-Agent System for production-grade A2A coordination
@@ -73,6 +81,7 @@ from production import (
     IdempotencyMiddleware,
     get_circuit_breaker_status
 )
+from production.lifecycle_manager import flush_log_sinks, flush_tracing
 
 # Audit logging for compliance (GDPR, SOC2)
 from monitoring.audit_logger import audit_log, AuditEvent, AuditMiddleware
@@ -85,26 +94,39 @@ from monitoring.prometheus_metrics import (
     record_openai_call,
     record_xero_request,
     record_order_created,
-    http_requests_total,
-    http_request_duration_seconds
+    record_http_request,
+    route_template
 )
 
+# Per-request stage timing (Server-Timing, stage histograms, slow request log)
+from monitoring.profiler import ProfilingMiddleware, stage, metadata_timings
+
+# Correlation IDs and OpenTelemetry-compatible spans for external calls
+from monitoring.tracing import TracingMiddleware
+
 # Workflow timeout protection (prevents hanging workflows)
 from utils.timeout import execute_with_timeout, WorkflowTimeoutError
+from documents import (
+    DocumentDataError,
+    MissingProductError,
+    build_delivery_order,
+    render_delivery_order_async,
+    build_invoice,
+    unpriced_skus,
+    get_invoice_pdf,
+    etag_matches,
+    shutdown_render_pool,
+)
+from documents.delivery_order import XLSX_MEDIA_TYPE
+from documents.invoice_pdf import PDF_MEDIA_TYPE
 
 # FastAPI imports
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse, Response
 from pydantic import BaseModel
 import uvicorn
-import openpyxl
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
 
 # Database imports - replaced Kailash with direct SQLAlchemy
 from database_operations import (
@@ -116,7 +138,10 @@ from database_operations import (
     get_product_by_sku,
     create_order,
     get_order_by_id,
-    list_orders
+    get_order_with_outlet,
+    list_orders,
+    get_products_by_skus,
+    get_invoices_by_order_ids
 )
 
 # Conversation memory imports
@@ -166,6 +191,10 @@ class MetricsMiddleware(BaseHTTPMiddleware):
     Records:
     - Request count by method, endpoint, and status code
     - Request duration by method and endpoint
+
+    The endpoint label is the matched route template (e.g.
+    /api/download_invoice/{order_id}), not the raw path, and the number of
+    distinct labels is capped (see monitoring.prometheus_metrics).
     """
 
     async def dispatch(self, request: Request, call_next):
@@ -174,20 +203,13 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         # Process request
         response = await call_next(request)
 
-        # Record metrics
-        duration = time.time() - start_time
-
-        # Track request count and duration
-        http_requests_total.labels(
+        # Record metrics (route is resolved once the router has matched)
+        record_http_request(
             method=request.method,
-            endpoint=request.url.path,
-            status=response.status_code
-        ).inc()
-
-        http_request_duration_seconds.labels(
-            method=request.method,
-            endpoint=request.url.path
-        ).observe(duration)
+            template=route_template(request.scope),
+            status=response.status_code,
+            duration_seconds=time.time() - start_time
+        )
 
         return response
 
@@ -195,6 +217,12 @@ class MetricsMiddleware(BaseHTTPMiddleware):
 # Add metrics middleware
 app.add_middleware(MetricsMiddleware)
 
+# Stage profiling wraps everything else but tracing (added last = outermost)
+app.add_middleware(ProfilingMiddleware)
+
+# Correlation ID and SERVER span for every request
+app.add_middleware(TracingMiddleware)
+
 
 # Global state
 session_manager: Optional[SessionManager] = None
@@ -251,6 +279,14 @@ async def startup_event():
         create_order_tables(engine)
         create_conversation_tables(engine)
 
+        # Pre-create upcoming monthly partitions (no-op if not partitioned)
+        from privacy.partition_manager import ensure_future_partitions
+        raw_connection = engine.raw_connection()
+        try:
+            ensure_future_partitions(raw_connection)
+        finally:
+            raw_connection.close()
+
         print("[OK] Database initialized with SQLAlchemy ORM")
         print("     - Product, Outlet, Order, DeliveryOrder, Invoice")
         print("     - ConversationSession, ConversationMessage, UserInteractionSummary")
@@ -263,6 +299,38 @@ async def startup_event():
     session_manager = SessionManager(runtime=None)
     print("[OK] SessionManager initialized")
 
+    # Mirror Xero items/contacts locally so orders do not call Xero per lookup.
+    # Every worker starts the thread; an advisory lock lets one of them sync.
+    if config.xero_configured:
+        try:
+            from integrations.xero_mirror import get_xero_mirror
+            get_xero_mirror().start()
+            print("[OK] Xero item/contact mirror sync started")
+        except Exception as e:
+            print(f"[WARNING] Failed to start Xero mirror sync: {e}")
+            print("         Order lookups will call the Xero API directly")
+
+    # Xero posting is queued; workers normally run as separate processes
+    # (scripts/run_job_worker.py). JOB_WORKER_IN_PROCESS=true runs one here.
+    if config.xero_configured and os.getenv("JOB_WORKER_IN_PROCESS", "false").lower() == "true":
+        try:
+            import integrations.xero_jobs  # noqa: F401 - registers job handlers
+            from production.job_queue import JobWorker
+            JobWorker().start()
+            print("[OK] In-process background job worker started")
+        except Exception as e:
+            print(f"[WARNING] Failed to start background job worker: {e}")
+            print("         Run scripts/run_job_worker.py to process queued Xero jobs")
+
+    # Keep user interaction summaries current off the request path
+    try:
+        from memory.user_analytics import get_user_analytics_aggregator
+        get_user_analytics_aggregator().start()
+        print("[OK] User analytics aggregator started (incremental summaries)")
+    except Exception as e:
+        print(f"[WARNING] Failed to start user analytics aggregator: {e}")
+        print("         User interaction summaries will not be updated")
+
     # Initialize advanced caching system
     try:
         cache = await get_cache()
@@ -375,6 +443,27 @@ async def startup_event():
     app.include_router(chat_stream_router, prefix="/api/v1")
     print("[OK] Streaming chat endpoint enabled at /api/v1/chat/stream")
 
+    # Include order listing router
+    app.include_router(orders_router, prefix="/api/v1")
+    print("[OK] Order listing endpoint enabled at /api/v1/orders")
+
+    # Include bulk export router
+    app.include_router(exports_router, prefix="/api/v1")
+    print("[OK] Bulk export endpoint enabled at /api/v1/exports/{entity}")
+
+    # Include database query statistics router
+    app.include_router(db_stats_router, prefix="/api/v1")
+    print("[OK] Query statistics enabled at /api/v1/db/query-stats")
+
+    # Include background job status router
+    app.include_router(jobs_router, prefix="/api/v1")
+    print("[OK] Background job status enabled at /api/v1/jobs/{job_id}")
+
+    # Include bulk document router
+    app.include_router(documents_router, prefix="/api/v1")
+    print("[OK] Bulk Delivery Orders enabled at /api/v1/documents/delivery-orders")
+    print("[OK] Batch invoice PDFs enabled at /api/v1/documents/invoices")
+
     # Initialize Multi-Agent System for production-grade order processing
     try:
         tax_rate = float(os.getenv("TAX_RATE", "0.08"))
@@ -398,6 +487,17 @@ async def startup_event():
     print("=" * 60 + "\n")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release process-level resources on shutdown"""
+    # Stop document render workers (spawned lazily on first download)
+    shutdown_render_pool(wait=False)
+    # Write out queued audit, cost and analytics records
+    await flush_log_sinks()
+    # Send spans still queued for the OTLP collector
+    await flush_tracing()
+
+
 # Request/Response models
 class OrderRequest(BaseModel):
     """Request model for order processing"""
@@ -455,6 +555,32 @@ class ChatbotResponse(BaseModel):
     order_id: Optional[int] = None  # When order is processed
 
 
+def _enqueue_xero_order_workflow(order_id: Optional[int]) -> Optional[Dict[str, Any]]:
+    """
+    Queue the Xero order-to-invoice workflow for a newly created order
+
+    Never fails the order: if the queue is unavailable the error is logged
+    and the order can be posted later via POST /api/post_to_xero/{order_id}.
+
+    Returns:
+        {"job_id", "status", "status_url"} or None if not queued
+    """
+    if not order_id or not config.xero_configured:
+        return None
+
+    try:
+        from integrations.xero_jobs import enqueue_order_workflow
+        job = enqueue_order_workflow(order_id)
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "status_url": f"/api/v1/jobs/{job['id']}"
+        }
+    except Exception as e:
+        logger.error(f"Failed to queue Xero workflow for order {order_id}: {e}")
+        return None
+
+
 # API Endpoints
 
 @app.get("/health")
@@ -515,7 +641,10 @@ async def health_check():
             xero_client = get_xero_client()
 
             # Use the check_connection method to verify Xero connectivity
-            connection_result = xero_client.check_connection()
+            # Lowest Xero priority; never wait for a rate limit token
+            from production.rate_limiting import xero_priority, XeroPriority
+            with xero_priority(XeroPriority.HEALTH_CHECK, max_wait=0):
+                connection_result = xero_client.check_connection()
 
             if connection_result.get("connected"):
                 health_status["xero"] = connection_result.get("status", "connected")
@@ -641,7 +770,7 @@ async def chatbot_endpoint(request: ChatbotRequest):
 
         if not outlet_id_resolved and request.outlet_name:
             # Look up outlet by name using direct database query
-            with get_db_session() as db_session:
+            with stage("outlet_lookup"), get_db_session() as db_session:
                 outlet = get_outlet_by_name(db_session, request.outlet_name)
                 if outlet:
                     outlet_id_resolved = outlet.get('id')
@@ -660,37 +789,40 @@ async def chatbot_endpoint(request: ChatbotRequest):
             logger.info(f"[CHATBOT] Resuming session: {created_session_id[:8]}...")
         else:
             # Create new session (intent will be updated after classification)
-            created_session_id = session_manager.create_session(
-                user_id=user_id,
-                outlet_id=outlet_id_resolved,
-                language=request.language or "en",
-                initial_intent=None,  # Will be set after classification
-                intent_confidence=0.0
-            )
+            with stage("session_create"):
+                created_session_id = session_manager.create_session(
+                    user_id=user_id,
+                    outlet_id=outlet_id_resolved,
+                    language=request.language or "en",
+                    initial_intent=None,  # Will be set after classification
+                    intent_confidence=0.0
+                )
             logger.info(f"[CHATBOT] Created new session: {created_session_id[:8]}...")
 
         # ====================================================================
         # STEP 2: LOG USER MESSAGE (with PII scrubbing)
         # ====================================================================
-        session_manager.log_message(
-            session_id=created_session_id,
-            role="user",
-            content=request.message,
-            intent="pending",  # Will be updated after classification
-            confidence=0.0,
-            language=request.language or "en",
-            context={"channel": "chatbot", "request_time": datetime.now().isoformat()},
-            enable_pii_scrubbing=True  # Automatic PII protection
-        )
+        with stage("log_message"):
+            session_manager.log_message(
+                session_id=created_session_id,
+                role="user",
+                content=request.message,
+                intent="pending",  # Will be updated after classification
+                confidence=0.0,
+                language=request.language or "en",
+                context={"channel": "chatbot", "request_time": datetime.now().isoformat()},
+                enable_pii_scrubbing=True  # Automatic PII protection
+            )
 
         # ====================================================================
         # STEP 3: INTENT CLASSIFICATION
         # ====================================================================
         # Get conversation history for context
-        conversation_history = session_manager.get_conversation_history(
-            session_id=created_session_id,
-            limit=5
-        )
+        with stage("history_fetch"):
+            conversation_history = session_manager.get_conversation_history(
+                session_id=created_session_id,
+                limit=5
+            )
 
         # Format history for intent classifier (filter out invalid messages)
         formatted_history = []
@@ -707,10 +839,11 @@ async def chatbot_endpoint(request: ChatbotRequest):
         cached_response = None
         if chat_cache:
             try:
-                cached_response = chat_cache.get_response(
-                    message=request.message,
-                    conversation_history=formatted_history
-                )
+                with stage("cache_check"):
+                    cached_response = chat_cache.get_response(
+                        message=request.message,
+                        conversation_history=formatted_history
+                    )
 
                 if cached_response:
                     # Cache hit! Return cached response immediately
@@ -723,6 +856,9 @@ async def chatbot_endpoint(request: ChatbotRequest):
                     cached_response["metadata"]["from_cache"] = True
                     cached_response["metadata"]["cache_hit_time"] = time.time() - start_time
                     cached_response["session_id"] = created_session_id
+                    timings = metadata_timings()
+                    if timings:
+                        cached_response["metadata"]["timings"] = timings
 
                     # Return ChatbotResponse from cached data
                     return ChatbotResponse(
@@ -747,10 +883,11 @@ async def chatbot_endpoint(request: ChatbotRequest):
             record_cache_miss()  # Prometheus metric
 
         # Classify intent
-        intent_result = intent_classifier.classify_intent(
-            message=request.message,
-            conversation_history=formatted_history
-        )
+        with stage("intent"):
+            intent_result = intent_classifier.classify_intent(
+                message=request.message,
+                conversation_history=formatted_history
+            )
 
         logger.info(
             f"[CHATBOT] Intent: {intent_result.intent} "
@@ -806,13 +943,14 @@ async def chatbot_endpoint(request: ChatbotRequest):
                     openai_key = config.OPENAI_API_KEY
 
                     logger.info(f"[PRE-PROCESSING] Running semantic search...")
-                    relevant_products = semantic_product_search(
-                        message=request.message,
-                        database_url=database_url,
-                        api_key=openai_key,
-                        top_n=10,
-                        min_similarity=0.3
-                    )
+                    with stage("semantic_search"):
+                        relevant_products = semantic_product_search(
+                            message=request.message,
+                            database_url=database_url,
+                            api_key=openai_key,
+                            top_n=10,
+                            min_similarity=0.3
+                        )
 
                     if len(relevant_products) == 0:
                         raise ValueError("No products matched your order description")
@@ -841,14 +979,14 @@ Return a JSON object with:
   "notes": "any special instructions"
 }}"""
 
-                    # Call GPT-4
-                    from openai import OpenAI
-                    client = OpenAI(api_key=openai_key)
-                    completion = client.chat.completions.create(
-                        model="gpt-4",
-                        messages=[{"role": "user", "content": gpt_prompt}],
-                        temperature=0.1
-                    )
+                    # Call GPT-4 (shared client: one connection pool for all requests)
+                    client = get_openai_client(openai_key)
+                    with stage("gpt_parse"):
+                        completion = client.chat.completions.create(
+                            model="gpt-4",
+                            messages=[{"role": "user", "content": gpt_prompt}],
+                            temperature=0.1
+                        )
                     gpt_response = completion.choices[0].message.content
 
                     # Parse JSON
@@ -860,6 +998,12 @@ Return a JSON object with:
                     else:
                         parsed_order = json.loads(gpt_response)
 
+                    # Stamp catalog prices and price book version on the order
+                    try:
+                        parsed_order = get_price_book().stamp(parsed_order)
+                    except Exception as e:
+                        logger.warning(f"[PRE-PROCESSING] Price book unavailable: {e}")
+
                     line_items = parsed_order.get("line_items", [])
                     outlet_name_from_gpt = parsed_order.get("outlet_name")
                     logger.info(f"[PRE-PROCESSING] Parsed {len(line_items)} line items")
@@ -877,7 +1021,7 @@ Return a JSON object with:
                         engine = get_db_engine()
 
                         try:
-                            with engine.connect() as conn:
+                            with stage("outlet_match"), engine.connect() as conn:
                                 query = text("""
                                     SELECT id, name FROM outlets
                                     WHERE REPLACE(REPLACE(LOWER(name), '-', ''), ' ', '')
@@ -939,13 +1083,14 @@ Return a JSON object with:
                         logger.info("[CHATBOT] Using Multi-Agent System for order processing")
 
                         # Process order with multi-agent system
-                        mas_result = await multi_agent_system.process_order(
-                            line_items=line_items,
-                            outlet_id=outlet_id,
-                            outlet_name=outlet_name_full or outlet_name_from_gpt or "Unknown Outlet",
-                            products_map=products_map,
-                            parsed_order=parsed_order
-                        )
+                        with stage("multi_agent"):
+                            mas_result = await multi_agent_system.process_order(
+                                line_items=line_items,
+                                outlet_id=outlet_id,
+                                outlet_name=outlet_name_full or outlet_name_from_gpt or "Unknown Outlet",
+                                products_map=products_map,
+                                parsed_order=parsed_order
+                            )
 
                         # Extract results
                         created_order_id = mas_result.order_id
@@ -960,6 +1105,9 @@ Return a JSON object with:
                             f"order_id={created_order_id}, total=${total}"
                         )
 
+                        # Xero posting runs in a background worker, not in this request
+                        xero_job = _enqueue_xero_order_workflow(created_order_id)
+
                         # ================================================================
                         # BUILD RESPONSE (only for successful order processing)
                         # ================================================================
@@ -997,7 +1145,8 @@ Return a JSON object with:
                             "agents_activated": len(agent_timeline),
                             "order_id": created_order_id,
                             "total_amount": float(total),
-                            "multi_agent_system": True  # Flag to indicate MAS was used
+                            "multi_agent_system": True,  # Flag to indicate MAS was used
+                            "xero_job": xero_job
                         }
 
                         # Store agent_timeline for response
@@ -1108,22 +1257,24 @@ Return a JSON object with:
                 collections = ["faqs", "policies"]
 
             # Retrieve relevant knowledge from RAG
-            rag_context = knowledge_base.retrieve_context(
-                query=request.message,
-                collections=collections,
-                top_n_per_collection=3
-            )
+            with stage("rag_retrieval"):
+                rag_context = knowledge_base.retrieve_context(
+                    query=request.message,
+                    collections=collections,
+                    top_n_per_collection=3
+                )
 
             # Generate response using async customer service agent (includes GPT-4 + RAG)
             # PERFORMANCE FIX: Using async agent for parallel execution (18s → <10s)
-            cs_response = await async_customer_service_agent.handle_message(
-                message=request.message,
-                conversation_history=formatted_history,
-                user_context={
-                    "outlet_id": outlet_id_resolved,
-                    "language": request.language
-                }
-            )
+            with stage("agent_response"):
+                cs_response = await async_customer_service_agent.handle_message(
+                    message=request.message,
+                    conversation_history=formatted_history,
+                    user_context={
+                        "outlet_id": outlet_id_resolved,
+                        "language": request.language
+                    }
+                )
 
             response_text = cs_response.response_text
             citations = cs_response.knowledge_used
@@ -1168,14 +1319,15 @@ Return a JSON object with:
 
             # Use async customer service agent for general response
             # PERFORMANCE FIX: Using async agent for parallel execution (18s → <10s)
-            cs_response = await async_customer_service_agent.handle_message(
-                message=request.message,
-                conversation_history=formatted_history,
-                user_context={
-                    "outlet_id": outlet_id_resolved,
-                    "language": request.language
-                }
-            )
+            with stage("agent_response"):
+                cs_response = await async_customer_service_agent.handle_message(
+                    message=request.message,
+                    conversation_history=formatted_history,
+                    user_context={
+                        "outlet_id": outlet_id_resolved,
+                        "language": request.language
+                    }
+                )
 
             response_text = cs_response.response_text
 
@@ -1187,41 +1339,42 @@ Return a JSON object with:
         # ====================================================================
         # STEP 5: LOG ASSISTANT RESPONSE
         # ====================================================================
-        session_manager.log_message(
-            session_id=created_session_id,
-            role="assistant",
-            content=response_text,
-            intent=intent_result.intent,
-            confidence=intent_result.confidence,
-            language=request.language or "en",
-            context={
-                "citations_count": len(citations),
-                "action_taken": action_metadata.get("action", "unknown"),
-                "response_time": time.time() - start_time
-            },
-            enable_pii_scrubbing=False  # Don't scrub assistant responses
-        )
+        with stage("response_logging"):
+            session_manager.log_message(
+                session_id=created_session_id,
+                role="assistant",
+                content=response_text,
+                intent=intent_result.intent,
+                confidence=intent_result.confidence,
+                language=request.language or "en",
+                context={
+                    "citations_count": len(citations),
+                    "action_taken": action_metadata.get("action", "unknown"),
+                    "response_time": time.time() - start_time
+                },
+                enable_pii_scrubbing=False  # Don't scrub assistant responses
+            )
 
-        # ====================================================================
-        # STEP 6: UPDATE SESSION CONTEXT
-        # ====================================================================
-        session_manager.update_session_context(
-            session_id=created_session_id,
-            context_updates={
-                "last_intent": intent_result.intent,
-                "last_confidence": intent_result.confidence,
-                "total_exchanges": len(conversation_history) // 2 + 1,
-                "last_interaction": datetime.now().isoformat()
-            }
-        )
+            # ====================================================================
+            # STEP 6: UPDATE SESSION CONTEXT
+            # ====================================================================
+            session_manager.update_session_context(
+                session_id=created_session_id,
+                context_updates={
+                    "last_intent": intent_result.intent,
+                    "last_confidence": intent_result.confidence,
+                    "total_exchanges": len(conversation_history) // 2 + 1,
+                    "last_interaction": datetime.now().isoformat()
+                }
+            )
 
-        # Update user analytics
-        session_manager.update_user_analytics(
-            user_id=user_id,
-            outlet_id=outlet_id_resolved,
-            language=request.language or "en",
-            intent=intent_result.intent
-        )
+            # Update user analytics
+            session_manager.update_user_analytics(
+                user_id=user_id,
+                outlet_id=outlet_id_resolved,
+                language=request.language or "en",
+                intent=intent_result.intent
+            )
 
         # ====================================================================
         # STEP 7: RETURN STRUCTURED RESPONSE
@@ -1278,12 +1431,13 @@ Return a JSON object with:
                 }
 
                 # Cache for 30 minutes (1800 seconds)
-                chat_cache.set_response(
-                    message=request.message,
-                    conversation_history=formatted_history,
-                    response=cache_data,
-                    ttl=1800
-                )
+                with stage("cache_save"):
+                    chat_cache.set_response(
+                        message=request.message,
+                        conversation_history=formatted_history,
+                        response=cache_data,
+                        ttl=1800
+                    )
 
                 logger.info(f"[CACHE SAVE] Cached response for: {request.message[:50]}...")
             except Exception as cache_error:
@@ -1294,24 +1448,30 @@ Return a JSON object with:
         # AUDIT LOG: Record chatbot interaction for compliance
         # ====================================================================
         try:
-            audit_log(
-                event_type=AuditEvent.DATA_ACCESS,
-                user_id=request.user_id or "anonymous",
-                resource="chatbot",
-                action="query",
-                details={
-                    "intent": intent_result.intent if intent_result else "unknown",
-                    "message_length": len(request.message),
-                    "has_order_id": response_order_id is not None,
-                    "has_citations": len(citations) > 0 if citations else False
-                },
-                success=True,
-                ip_address=None  # FastAPI request object needed for IP
-            )
+            with stage("audit_log"):
+                audit_log(
+                    event_type=AuditEvent.DATA_ACCESS,
+                    user_id=request.user_id or "anonymous",
+                    resource="chatbot",
+                    action="query",
+                    details={
+                        "intent": intent_result.intent if intent_result else "unknown",
+                        "message_length": len(request.message),
+                        "has_order_id": response_order_id is not None,
+                        "has_citations": len(citations) > 0 if citations else False
+                    },
+                    success=True,
+                    ip_address=None  # FastAPI request object needed for IP
+                )
         except Exception as audit_error:
             logger.warning(f"Audit logging failed: {audit_error}")
             # Don't fail the request if audit logging fails
 
+        # Stage timings (after the cache save, so they are never cached)
+        timings = metadata_timings()
+        if timings:
+            response_data.metadata = {**response_data.metadata, "timings": timings}
+
         return response_data
 
     except HTTPException:
@@ -1600,6 +1760,15 @@ Now process the customer message and return the JSON:
                 detail="GPT-4 response parsing failed - no valid order data extracted"
             )
 
+        # Stamp catalog prices and price book version on the order, so the
+        # invoice can be regenerated exactly without re-querying products
+        try:
+            price_book = get_price_book()
+            parsed_order = price_book.stamp(parsed_order)
+        except Exception as e:
+            logger.warning(f"Price book unavailable, pricing from search results: {e}")
+            price_book = None
+
         agent_end = time.time()
 
         # Format line items for display
@@ -1753,7 +1922,7 @@ Now process the customer message and return the JSON:
         # Calculate pricing dynamically from catalog
         from decimal import Decimal
 
-        totals = calculate_order_total(line_items, products_map)
+        totals = calculate_order_total(line_items, products_map, price_book=price_book)
         subtotal = totals['subtotal']
         tax = totals['tax']
         total = totals['total']
@@ -1768,8 +1937,8 @@ Now process the customer message and return the JSON:
         for item in line_items:
             sku = item.get('sku', 'Unknown')
             qty = item.get('quantity', 0)
-            if sku in products_map:
-                unit_price = Decimal(str(products_map[sku]['unit_price']))
+            if item.get('unit_price') is not None or sku in products_map:
+                unit_price = Decimal(str(item.get('unit_price') or products_map[sku]['unit_price']))
                 line_total = unit_price * Decimal(str(qty))
                 line_pricing.append(f"{sku}: {qty} x ${float(unit_price):.2f} = ${float(line_total):.2f}")
 
@@ -1783,8 +1952,7 @@ Now process the customer message and return the JSON:
         ]
 
         if xero_configured:
-            finance_details.append("Posted to Xero API (LIVE)")
-            finance_details.append("Status: AUTHORISED")
+            finance_details.append("Xero: Queued for background posting")
         else:
             finance_details.append("Xero: Ready (credentials needed)")
             finance_details.append("Invoice saved to database")
@@ -1900,6 +2068,9 @@ Now process the customer message and return the JSON:
                 detail=f"Database error during order creation: {str(e)}"
             )
 
+        # Xero workflow runs in a background worker, not in this request
+        xero_job = _enqueue_xero_order_workflow(created_order_id)
+
         total_time = time.time() - start_time
 
         # ====================================================================
@@ -1971,6 +2142,7 @@ Now process the customer message and return the JSON:
                 "tax": float(tax),
                 "total": float(total),
                 "total_processing_time": f"{total_time:.2f}s",
+                "xero_job": xero_job,
                 "semantic_search_results": len(relevant_products),
                 "real_data_sources": [
                     "OpenAI Embeddings API (semantic product search)",
@@ -1995,54 +2167,32 @@ Now process the customer message and return the JSON:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _load_order_with_outlet(order_id: int):
+    """Order and outlet in one joined query (sync; call via asyncio.to_thread)"""
+    with get_db_session() as session:
+        return get_order_with_outlet(session, order_id, use_cache=True)
+
+
 @app.get("/api/download_do/{order_id}")
 async def download_delivery_order(order_id: int):
     """
     Generate and download Delivery Order as Excel file
 
-    Uses DO_Template.xlsx and fills in REAL order details from database
+    Uses DO_Template.xlsx and fills in REAL order details from database.
+    The database read runs in a thread and rendering in the documents
+    render pool, both off the event loop.
+    For many orders at once use GET /api/v1/documents/delivery-orders.
     """
     try:
-        if not db or not runtime:
-            raise HTTPException(status_code=503, detail="Service not initialized")
+        # Order and outlet in one joined query (short-TTL read cache)
+        order_row = await asyncio.to_thread(_load_order_with_outlet, order_id)
 
-        # Fetch REAL order from database using OrderReadNode
-        order_workflow = WorkflowBuilder()
-        order_workflow.add_node("OrderReadNode", "get_order", {
-            "id": order_id
-        })
-
-        # Execute workflow with timeout protection
-        order_results, _ = execute_with_timeout(
-            runtime.execute,
-            args=(order_workflow.build(),),
-            timeout_seconds=60
-        )
-        order_data = order_results.get('get_order')
-
-        if not order_data:
+        if not order_row:
             raise HTTPException(status_code=404, detail=f"Order {order_id} not found")
 
-        # PRODUCTION-READY: Extract order details in NEW catalog format
-        # parsed_items now contains: {"outlet_name": "...", "line_items": [...], "is_urgent": bool}
-        parsed_items = order_data.get('parsed_items', {})
-        line_items = parsed_items.get('line_items', [])
+        order_data, outlet_data = order_row
         outlet_id = order_data.get('outlet_id')
 
-        # Fetch outlet information
-        outlet_workflow = WorkflowBuilder()
-        outlet_workflow.add_node("OutletReadNode", "get_outlet", {
-            "id": outlet_id
-        })
-
-        # Execute workflow with timeout protection
-        outlet_results, _ = execute_with_timeout(
-            runtime.execute,
-            args=(outlet_workflow.build(),),
-            timeout_seconds=60
-        )
-        outlet_data = outlet_results.get('get_outlet', {})
-
         # PRODUCTION-READY: No fallbacks - fail if outlet data missing
         if not outlet_data:
             raise HTTPException(
@@ -2050,73 +2200,23 @@ async def download_delivery_order(order_id: int):
                 detail=f"Outlet data not found for outlet_id {outlet_id}"
             )
 
-        outlet_name = outlet_data.get('name')
-        outlet_address = outlet_data.get('address')
-
-        if not outlet_name:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Outlet name missing in database for outlet_id {outlet_id}. Data integrity issue."
-            )
-        if not outlet_address:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Outlet address missing in database for outlet_id {outlet_id}. Data integrity issue."
-            )
-
-        # Load DO template
-        template_path = project_root / "data" / "templates" / "DO_Template.xlsx"
+        # Validate data here; the workbook is rendered in the render pool
+        # from a template each worker parses once
+        try:
+            document = build_delivery_order(order_data, outlet_data)
+        except DocumentDataError as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
-        if not template_path.exists():
+        try:
+            content = await render_delivery_order_async(document)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="DO template not found")
 
-        # Load workbook
-        wb = openpyxl.load_workbook(template_path)
-        ws = wb.worksheets[0]
-
-        # Generate DO details
-        delivery_date = datetime.now().strftime('%Y-%m-%d')
-        do_number = f"DO-{datetime.now().strftime('%Y%m%d')}-{order_id:05d}"
-
-        # PRODUCTION-READY: Fill in template with dynamic line items from catalog
-        ws['A2'] = f"Delivery Order: {do_number}"
-        ws['A4'] = f"Customer: {outlet_name}"
-        ws['A5'] = f"Address: {outlet_address}"
-        ws['A6'] = f"Delivery Date: {delivery_date}"
-
-        # Add line items dynamically (starting from row 8)
-        row_num = 8
-        total_items = 0
-        for item in line_items:
-            # PRODUCTION-READY: No fallbacks - fail if data missing
-            description = item.get('description')
-            quantity = item.get('quantity', 0)
-
-            if not description:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Line item missing description in order {order_id}. Data integrity issue."
-                )
-            ws[f'A{row_num}'] = f"{description}: {quantity} units"
-            total_items += quantity
-            row_num += 1
-
-        # Add total on next row
-        ws[f'A{row_num}'] = f"Total: {total_items} items"
-
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-
-        # Generate filename
-        filename = f"DO_{outlet_name.replace(' ', '_')}_{delivery_date}.xlsx"
-
         return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            BytesIO(content),
+            media_type=XLSX_MEDIA_TYPE,
             headers={
-                "Content-Disposition": f"attachment; filename={filename}"
+                "Content-Disposition": f"attachment; filename={document.filename}"
             }
         )
 
@@ -2128,54 +2228,48 @@ async def download_delivery_order(order_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _load_invoice_data(order_id: int):
+    """
+    Order/outlet, catalog prices and recorded invoice for one order
+    (sync; call via asyncio.to_thread)
+
+    Returns:
+        (order_row or None, products, invoice_record or None)
+    """
+    with get_db_session() as session:
+        order_row = get_order_with_outlet(session, order_id, use_cache=True)
+        if not order_row:
+            return None, {}, None
+
+        # Catalog prices for lines without a stamped price, and the
+        # recorded invoice (number/date), one query each
+        products = get_products_by_skus(session, unpriced_skus([order_row[0]]))
+        invoice_record = get_invoices_by_order_ids(session, [order_id]).get(order_id)
+        return order_row, products, invoice_record
+
+
 @app.get("/api/download_invoice/{order_id}")
-async def download_invoice(order_id: int):
+async def download_invoice(order_id: int, if_none_match: Optional[str] = Header(None)):
     """
     Generate and download Invoice as PDF
 
-    Creates professional invoice PDF with REAL order data from database
+    Creates professional invoice PDF with REAL order data from database.
+    PDFs are rendered in the documents render pool and cached by invoice
+    revision (a hash of the invoice content), which is also the ETag:
+    re-downloads are served from the cache, and a matching If-None-Match
+    returns 304 without rendering. For a date range of invoices use
+    GET /api/v1/documents/invoices.
     """
     try:
-        if not db or not runtime:
-            raise HTTPException(status_code=503, detail="Service not initialized")
+        # Database reads run in a thread, off the event loop
+        order_row, products, invoice_record = await asyncio.to_thread(_load_invoice_data, order_id)
 
-        # Fetch REAL order from database
-        order_workflow = WorkflowBuilder()
-        order_workflow.add_node("OrderReadNode", "get_order", {
-            "id": order_id
-        })
-
-        # Execute workflow with timeout protection
-        order_results, _ = execute_with_timeout(
-            runtime.execute,
-            args=(order_workflow.build(),),
-            timeout_seconds=60
-        )
-        order_data = order_results.get('get_order')
-
-        if not order_data:
+        if not order_row:
             raise HTTPException(status_code=404, detail=f"Order {order_id} not found")
 
-        # PRODUCTION-READY: Extract order details in NEW catalog format
-        # parsed_items now contains: {"outlet_name": "...", "line_items": [...], "is_urgent": bool}
-        parsed_items = order_data.get('parsed_items', {})
-        line_items = parsed_items.get('line_items', [])
+        order_data, outlet_data = order_row
         outlet_id = order_data.get('outlet_id')
 
-        # Fetch outlet information
-        outlet_workflow = WorkflowBuilder()
-        outlet_workflow.add_node("OutletReadNode", "get_outlet", {
-            "id": outlet_id
-        })
-
-        # Execute workflow with timeout protection
-        outlet_results, _ = execute_with_timeout(
-            runtime.execute,
-            args=(outlet_workflow.build(),),
-            timeout_seconds=60
-        )
-        outlet_data = outlet_results.get('get_outlet', {})
-
         # PRODUCTION-READY: No fallbacks - fail if outlet data missing
         if not outlet_data:
             raise HTTPException(
@@ -2183,481 +2277,101 @@ async def download_invoice(order_id: int):
                 detail=f"Outlet data not found for outlet_id {outlet_id}"
             )
 
-        outlet_name = outlet_data.get('name')
-        outlet_address = outlet_data.get('address')
-
-        if not outlet_name:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Outlet name missing in database for outlet_id {outlet_id}. Data integrity issue."
-            )
-        if not outlet_address:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Outlet address missing in database for outlet_id {outlet_id}. Data integrity issue."
-            )
-
-        # Generate invoice number
-        invoice_number = f"INV-{datetime.now().strftime('%Y%m%d')}-{order_id:05d}"
-
-        # PRODUCTION-READY: Fetch product prices from database for each SKU
-        # No hardcoded prices - all pricing comes from catalog
-        from decimal import Decimal
-
-        invoice_lines = []
-        subtotal = Decimal('0.00')
-
-        for item in line_items:
-            sku = item.get('sku', '')
-            quantity = item.get('quantity', 0)
-            description = item.get('description')
-
-            # PRODUCTION-READY: No fallbacks - fail if data missing
-            if not description:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Line item missing description in order {order_id}. Data integrity issue."
-                )
-
-            # Fetch product from database to get price
-            product_workflow = WorkflowBuilder()
-            product_workflow.add_node("ProductListNode", "get_product", {
-                "filters": {"sku": sku},
-                "limit": 1
-            })
-
-            # Execute workflow with timeout protection
-            product_results, _ = execute_with_timeout(
-                runtime.execute,
-                args=(product_workflow.build(),),
-                timeout_seconds=60
+        # TAX_RATE validated at startup via config module
+        try:
+            document = build_invoice(
+                order_data,
+                outlet_data,
+                products,
+                Decimal(str(config.TAX_RATE)),
+                invoice_record
             )
-            product_data = product_results.get('get_product', [])
-
-            if isinstance(product_data, list) and len(product_data) > 0:
-                if isinstance(product_data[0], dict):
-                    if 'records' in product_data[0]:
-                        records = product_data[0]['records']
-                        if len(records) > 0:
-                            unit_price = Decimal(str(records[0].get('unit_price', 0)))
-                        else:
-                            raise HTTPException(status_code=404, detail=f"Product {sku} not found in catalog")
-                    elif 'unit_price' in product_data[0]:
-                        unit_price = Decimal(str(product_data[0]['unit_price']))
-                    else:
-                        raise HTTPException(status_code=404, detail=f"Product {sku} not found in catalog")
-                else:
-                    raise HTTPException(status_code=404, detail=f"Product {sku} not found in catalog")
-            else:
-                raise HTTPException(status_code=404, detail=f"Product {sku} not found in catalog")
+        except MissingProductError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except DocumentDataError as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
-            line_total = unit_price * Decimal(str(quantity))
-            subtotal += line_total
+        headers = {"ETag": document.etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(if_none_match, document.etag):
+            return Response(status_code=304, headers=headers)
 
-            invoice_lines.append({
-                'description': description,
-                'quantity': quantity,
-                'unit_price': unit_price,
-                'line_total': line_total
-            })
+        content = await get_invoice_pdf(document)
 
-        # Calculate tax and total - NO HARDCODING, NO FALLBACKS
-        # TAX_RATE validated at startup via config module
-        tax_rate = Decimal(str(config.TAX_RATE))
-        tax = subtotal * tax_rate
-        total = subtotal + tax
-
-        # Create PDF in memory
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        elements = []
-        styles = getSampleStyleSheet()
-
-        # Company header
-        elements.append(Paragraph("<b>TRIA AI-BPO Solutions</b>", styles['Heading1']))
-        elements.append(Paragraph("123 Business Street, Singapore 123456", styles['Normal']))
-        elements.append(Paragraph("Tel: +65 1234 5678 | Email: info@tria-bpo.com", styles['Normal']))
-        elements.append(Spacer(1, 0.3*inch))
-
-        # Invoice title
-        elements.append(Paragraph(f"<b>INVOICE #{invoice_number}</b>", styles['Heading2']))
-        elements.append(Paragraph(f"Date: {datetime.now().strftime('%d %B %Y')}", styles['Normal']))
-        elements.append(Spacer(1, 0.3*inch))
-
-        # Bill to
-        elements.append(Paragraph("<b>Bill To:</b>", styles['Heading3']))
-        elements.append(Paragraph(outlet_name, styles['Normal']))
-        elements.append(Paragraph(outlet_address.replace('\n', '<br/>'), styles['Normal']))
-        elements.append(Spacer(1, 0.3*inch))
-
-        # PRODUCTION-READY: Build line items table with dynamic catalog data
-        data = [['Item', 'Quantity', 'Unit Price', 'Amount']]
-
-        # Add each line item from catalog
-        for line in invoice_lines:
-            data.append([
-                line['description'],
-                f"{line['quantity']} units",
-                f"${float(line['unit_price']):.2f}",
-                f"${float(line['line_total']):.2f}"
-            ])
-
-        # Add totals
-        data.extend([
-            ['', '', 'Subtotal:', f'${float(subtotal):.2f}'],
-            ['', '', f'GST ({float(tax_rate)*100:.0f}%):', f'${float(tax):.2f}'],
-            ['', '', '<b>Total:</b>', f'<b>${float(total):.2f} SGD</b>'],
-        ])
-
-        table = Table(data, colWidths=[3*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (2, 0), (-1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -4), colors.beige),
-            ('GRID', (0, 0), (-1, -4), 1, colors.black),
-            ('LINEBELOW', (2, -3), (-1, -3), 2, colors.black),
-            ('LINEBELOW', (2, -2), (-1, -2), 1, colors.black),
-            ('LINEBELOW', (2, -1), (-1, -1), 2, colors.black),
-            ('FONTNAME', (2, -1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (2, -1), (-1, -1), 12),
-        ]))
-
-        elements.append(table)
-        elements.append(Spacer(1, 0.5*inch))
-
-        # Payment terms
-        elements.append(Paragraph("<b>Payment Terms:</b> Net 30 days", styles['Normal']))
-        elements.append(Paragraph("Thank you for your business!", styles['Normal']))
-
-        # Build PDF
-        doc.build(elements)
-        buffer.seek(0)
-
-        # Generate filename
-        filename = f"Invoice_{invoice_number}.pdf"
-
-        return StreamingResponse(
-            buffer,
-            media_type="application/pdf",
+        return Response(
+            content=content,
+            media_type=PDF_MEDIA_TYPE,
             headers={
-                "Content-Disposition": f"attachment; filename={filename}"
+                **headers,
+                "Content-Disposition": f"attachment; filename={document.filename}"
             }
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/post_to_xero/{order_id}")
-async def post_invoice_to_xero(order_id: int):
+@app.post("/api/post_to_xero/{order_id}", status_code=202)
+def post_invoice_to_xero(order_id: int):
     """
-    Post invoice to Xero Demo Company (Global)
-
-    Fetches REAL order data and posts to Xero API
-    Requires XERO_REFRESH_TOKEN and XERO_TENANT_ID in .env
-    """
-    try:
-        if not db or not runtime:
-            raise HTTPException(status_code=503, detail="Service not initialized")
+    Queue posting the invoice for an order to Xero
 
-        # Check Xero credentials (from centralized config)
-        xero_refresh_token = config.XERO_REFRESH_TOKEN
-        xero_tenant_id = config.XERO_TENANT_ID
-        xero_client_id = config.XERO_CLIENT_ID
-        xero_client_secret = config.XERO_CLIENT_SECRET
+    The Xero calls (token refresh, contact, invoice) run in a background
+    worker at the shared rate limit; poll status_url for the result.
+    Repeat calls for the same order return the existing job.
 
-        if not all([xero_refresh_token, xero_tenant_id, xero_client_id, xero_client_secret]):
-            return {
-                "success": False,
-                "message": "Xero credentials not configured. Run setup_xero_oauth.py to complete setup.",
-                "details": {
-                    "has_refresh_token": bool(xero_refresh_token),
-                    "has_tenant_id": bool(xero_tenant_id),
-                    "has_client_id": bool(xero_client_id),
-                    "has_client_secret": bool(xero_client_secret),
-                    "setup_command": "python setup_xero_oauth.py"
-                }
+    Plain def: the order read and enqueue are synchronous database calls,
+    so FastAPI runs this in its threadpool instead of on the event loop.
+    """
+    if not config.xero_configured:
+        return {
+            "success": False,
+            "message": "Xero credentials not configured. Run setup_xero_oauth.py to complete setup.",
+            "details": {
+                "has_refresh_token": bool(config.XERO_REFRESH_TOKEN),
+                "has_tenant_id": bool(config.XERO_TENANT_ID),
+                "has_client_id": bool(config.XERO_CLIENT_ID),
+                "has_client_secret": bool(config.XERO_CLIENT_SECRET),
+                "setup_command": "python setup_xero_oauth.py"
             }
+        }
 
-        # Fetch REAL order from database
-        order_workflow = WorkflowBuilder()
-        order_workflow.add_node("OrderReadNode", "get_order", {
-            "id": order_id
-        })
-
-        # Execute workflow with timeout protection
-        order_results, _ = execute_with_timeout(
-            runtime.execute,
-            args=(order_workflow.build(),),
-            timeout_seconds=60
-        )
-        order_data = order_results.get('get_order')
-
-        if not order_data:
+    try:
+        # Reject unknown orders/outlets here instead of dead-lettering the job.
+        # Read uncached: this gates a Xero post, so it must see current rows.
+        with get_db_session() as session:
+            order_row = get_order_with_outlet(session, order_id)
+        if not order_row:
             raise HTTPException(status_code=404, detail=f"Order {order_id} not found")
-
-        # PRODUCTION-READY: Extract order details in NEW catalog format
-        # parsed_items now contains: {"outlet_name": "...", "line_items": [...], "is_urgent": bool}
-        parsed_items = order_data.get('parsed_items', {})
-        line_items = parsed_items.get('line_items', [])
-        outlet_id = order_data.get('outlet_id')
-
-        # Fetch outlet information
-        outlet_workflow = WorkflowBuilder()
-        outlet_workflow.add_node("OutletReadNode", "get_outlet", {
-            "id": outlet_id
-        })
-
-        # Execute workflow with timeout protection
-        outlet_results, _ = execute_with_timeout(
-            runtime.execute,
-            args=(outlet_workflow.build(),),
-            timeout_seconds=60
-        )
-        outlet_data = outlet_results.get('get_outlet', {})
-
-        # PRODUCTION-READY: No fallbacks - fail if outlet data missing
-        if not outlet_data:
+        if not order_row[1]:
             raise HTTPException(
                 status_code=404,
-                detail=f"Outlet data not found for outlet_id {outlet_id}"
-            )
-
-        outlet_name = outlet_data.get('name')
-        outlet_address = outlet_data.get('address')
-
-        if not outlet_name:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Outlet name missing in database for outlet_id {outlet_id}. Data integrity issue."
-            )
-        if not outlet_address:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Outlet address missing in database for outlet_id {outlet_id}. Data integrity issue."
+                detail=f"Outlet data not found for outlet_id {order_row[0].get('outlet_id')}"
             )
 
-        # Generate invoice number
-        invoice_number = f"INV-{datetime.now().strftime('%Y%m%d')}-{order_id:05d}"
-
-        # PRODUCTION-READY: Fetch product prices from database for each SKU
-        # No hardcoded prices - all pricing comes from catalog
-        from decimal import Decimal
-
-        xero_line_items = []
-        subtotal = Decimal('0.00')
-
-        for item in line_items:
-            sku = item.get('sku', '')
-            quantity = item.get('quantity', 0)
-            description = item.get('description')
+        from integrations.xero_jobs import enqueue_post_invoice
+        job = enqueue_post_invoice(order_id)
 
-            # PRODUCTION-READY: No fallbacks - fail if data missing
-            if not description:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Line item missing description in order {order_id}. Data integrity issue."
-                )
-
-            # Fetch product from database to get price
-            product_workflow = WorkflowBuilder()
-            product_workflow.add_node("ProductListNode", "get_product", {
-                "filters": {"sku": sku},
-                "limit": 1
-            })
-
-            # Execute workflow with timeout protection
-            product_results, _ = execute_with_timeout(
-                runtime.execute,
-                args=(product_workflow.build(),),
-                timeout_seconds=60
-            )
-            product_data = product_results.get('get_product', [])
-
-            if isinstance(product_data, list) and len(product_data) > 0:
-                if isinstance(product_data[0], dict):
-                    if 'records' in product_data[0]:
-                        records = product_data[0]['records']
-                        if len(records) > 0:
-                            unit_price = Decimal(str(records[0].get('unit_price', 0)))
-                        else:
-                            raise HTTPException(status_code=404, detail=f"Product {sku} not found in catalog")
-                    elif 'unit_price' in product_data[0]:
-                        unit_price = Decimal(str(product_data[0]['unit_price']))
-                    else:
-                        raise HTTPException(status_code=404, detail=f"Product {sku} not found in catalog")
-                else:
-                    raise HTTPException(status_code=404, detail=f"Product {sku} not found in catalog")
-            else:
-                raise HTTPException(status_code=404, detail=f"Product {sku} not found in catalog")
-
-            line_total = unit_price * Decimal(str(quantity))
-            subtotal += line_total
-
-            # Build Xero line item with catalog data
-            # NO HARDCODING, NO FALLBACKS - Xero config validated at startup
-            xero_account_code = config.XERO_SALES_ACCOUNT_CODE
-            xero_tax_type = config.XERO_TAX_TYPE
-
-            xero_line_items.append({
-                'Description': description,
-                'Quantity': quantity,
-                'UnitAmount': float(unit_price),
-                'AccountCode': xero_account_code,
-                'TaxType': xero_tax_type
-            })
-
-        # Calculate tax and total - NO HARDCODING, NO FALLBACKS
-        # TAX_RATE validated at startup via config module
-        tax_rate = Decimal(str(config.TAX_RATE))
-        tax = subtotal * tax_rate
-        total = subtotal + tax
-
-        # ====================================================================
-        # ACTUAL XERO API INTEGRATION
-        # ====================================================================
-        try:
-            import requests
-
-            # Step 1: Refresh access token
-            token_url = 'https://identity.xero.com/connect/token'
-            token_response = requests.post(token_url, data={
-                'grant_type': 'refresh_token',
-                'refresh_token': xero_refresh_token,
-                'client_id': xero_client_id,
-                'client_secret': xero_client_secret
-            })
-
-            if token_response.status_code != 200:
-                return {
-                    "success": False,
-                    "message": "Failed to refresh Xero access token",
-                    "details": {"error": token_response.text}
-                }
-
-            token_data = token_response.json()
-            access_token = token_data.get('access_token')
-
-            # Step 2: Create/find contact (customer)
-            contacts_url = 'https://api.xero.com/api.xro/2.0/Contacts'
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Xero-Tenant-Id': xero_tenant_id,
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            }
-
-            contact_data = {
-                'Contacts': [{
-                    'Name': outlet_name,
-                    'Addresses': [{
-                        'AddressType': 'STREET',
-                        'AddressLine1': outlet_address
-                    }]
-                }]
-            }
-
-            contact_response = requests.post(contacts_url, headers=headers, json=contact_data)
-
-            if contact_response.status_code != 200:
-                return {
-                    "success": False,
-                    "message": "Failed to create/update Xero contact",
-                    "details": {"error": contact_response.text}
-                }
-
-            contact_id = contact_response.json()['Contacts'][0]['ContactID']
-
-            # Step 3: Create invoice with line items from catalog
-            invoice_url = 'https://api.xero.com/api.xro/2.0/Invoices'
-
-            # PRODUCTION-READY: Use dynamic line items built from catalog
-            # xero_line_items already contains all products with catalog prices
-            invoice_data = {
-                'Invoices': [{
-                    'Type': 'ACCREC',  # Accounts Receivable (sales invoice)
-                    'Contact': {'ContactID': contact_id},
-                    'InvoiceNumber': invoice_number,
-                    'Date': datetime.now().strftime('%Y-%m-%d'),
-                    'DueDate': (datetime.now() + pd.Timedelta(days=30)).strftime('%Y-%m-%d'),
-                    'LineAmountTypes': 'Exclusive',  # Tax calculated separately
-                    'LineItems': xero_line_items,  # Dynamic catalog-based line items
-                    'Status': 'AUTHORISED',  # Ready to be sent
-                    'CurrencyCode': 'SGD',
-                    'Reference': f'Order #{order_id}'
-                }]
-            }
-
-            invoice_response = requests.post(invoice_url, headers=headers, json=invoice_data)
-
-            if invoice_response.status_code != 200:
-                return {
-                    "success": False,
-                    "message": "Failed to create Xero invoice",
-                    "details": {
-                        "error": invoice_response.text,
-                        "status_code": invoice_response.status_code
-                    }
-                }
-
-            # Success! Invoice created in Xero
-            xero_invoice = invoice_response.json()['Invoices'][0]
-            xero_invoice_id = xero_invoice['InvoiceID']
-
-            # PRODUCTION-READY: Build response with dynamic catalog data
-            line_items_summary = [
-                f"{item['Description']}: {item['Quantity']} units @ ${item['UnitAmount']:.2f}"
-                for item in xero_line_items
-            ]
-
-            return {
-                "success": True,
-                "message": "Invoice successfully posted to Xero Demo Company (Global)",
-                "details": {
-                    "invoice_number": invoice_number,
-                    "xero_invoice_id": xero_invoice_id,
-                    "order_id": order_id,
-                    "outlet": outlet_name,
-                    "contact_id": contact_id,
-                    "line_items": line_items_summary,
-                    "total_items": len(xero_line_items),
-                    "subtotal": f"${float(subtotal):.2f}",
-                    "tax": f"${float(tax):.2f}",
-                    "total": f"${float(total):.2f} SGD",
-                    "status": xero_invoice.get('Status'),
-                    "amount_due": xero_invoice.get('AmountDue'),
-                    "date": datetime.now().strftime('%Y-%m-%d'),
-                    "due_date": (datetime.now() + pd.Timedelta(days=30)).strftime('%Y-%m-%d'),
-                    "xero_url": f"https://go.xero.com/AccountsReceivable/Edit.aspx?InvoiceID={xero_invoice_id}",
-                    "posted_at": datetime.now().isoformat()
-                }
-            }
-
-        except requests.exceptions.RequestException as e:
-            return {
-                "success": False,
-                "message": "Network error while connecting to Xero API",
-                "details": {"error": str(e)}
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "message": "Unexpected error during Xero API integration",
-                "details": {"error": str(e)}
+        return {
+            "success": True,
+            "message": "Invoice queued for posting to Xero" if job["created"]
+                       else f"Invoice posting already {job['status']} for this order",
+            "details": {
+                "order_id": order_id,
+                "job_id": job["id"],
+                "status": job["status"],
+                "attempts": job["attempts"],
+                "status_url": f"/api/v1/jobs/{job['id']}"
             }
+        }
 
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.error(f"Failed to queue Xero invoice for order {order_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -2944,11 +2658,14 @@ async def xero_webhook_handler(request: Request):
 
 
 @app.get("/api/v1/generated-outputs")
-async def get_generated_outputs(
+def get_generated_outputs(
     category: Optional[str] = None,
     date: Optional[str] = None,
     status: Optional[str] = None,
-    group_by: Optional[str] = None
+    group_by: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    days: int = 30
 ):
     """
     Get generated outputs from agent operations with filtering and grouping.
@@ -2959,6 +2676,15 @@ async def get_generated_outputs(
     - Inventory withdrawals for clients with current stock levels
     - All operations grouped by day or functionality
 
+    Outputs are read from the persistent agent timeline store
+    (agent_timeline_events), which every Xero workflow appends to - including
+    workflows run by background job workers. Filters are applied in SQL and
+    results are paginated, and grouped views are served from pre-aggregated
+    daily rollups, so response time does not grow with history.
+
+    Plain def: the timeline store queries are synchronous, so FastAPI runs
+    this in its threadpool instead of on the event loop.
+
     Query Parameters:
         category (optional): Filter by functionality
             - "inventory": Inventory operations and stock movements
@@ -2977,28 +2703,35 @@ async def get_generated_outputs(
             - "error": Failed or encountered issues
 
         group_by (optional): Group results
-            - "date": Group by date for daily summaries
-            - "category": Group by functionality
+            - "date": Event counts per day for daily summaries
+            - "category": Event counts per functionality
             - "summary": Get comprehensive summary with all groupings
 
+        limit (optional): Page size for filtered results (default 50, max 200)
+        cursor (optional): next_cursor from the previous page
+        days (optional): Window for grouped views and summary (default 30)
+
     Returns:
-        Filtered/grouped agent timeline with detailed outputs
+        Filtered page or grouped counts of the agent timeline
 
     Example Requests:
         GET /api/v1/generated-outputs
-            → All operations with full details
+            → Latest 50 operations with full details
 
         GET /api/v1/generated-outputs?category=inventory
-            → All inventory operations (stock checks, withdrawals)
+            → Inventory operations (stock checks, withdrawals)
 
         GET /api/v1/generated-outputs?date=2025-01-15
-            → All operations from January 15, 2025
+            → Operations from January 15, 2025
 
         GET /api/v1/generated-outputs?category=finance&status=completed
-            → All completed finance operations (invoices posted)
+            → Completed finance operations (invoices posted)
+
+        GET /api/v1/generated-outputs?category=finance&cursor=<next_cursor>
+            → Next page of finance operations
 
-        GET /api/v1/generated-outputs?group_by=date
-            → Operations grouped by date for daily reports
+        GET /api/v1/generated-outputs?group_by=date&days=7
+            → Operation counts per day for the last week
 
         GET /api/v1/generated-outputs?group_by=summary
             → Comprehensive summary with documents, inventory movements, etc.
@@ -3006,6 +2739,7 @@ async def get_generated_outputs(
     Example Response (summary mode):
         {
             "summary": {
+                "window_days": 30,
                 "total_operations": 5,
                 "by_category": {
                     "inventory": 1,
@@ -3043,48 +2777,60 @@ async def get_generated_outputs(
                     "date": "2025-01-15T14:30:22"
                 }
             ],
-            "by_date": {...},
-            "by_category": {...}
+            "by_date": {"2025-01-15": [{"agent_name": "💰 Finance Controller", ...}]},
+            "by_category": {"finance": [{"agent_name": "💰 Finance Controller", ...}], ...},
+            "rollups": {
+                "by_date": {"2025-01-15": {"total": 5, "by_category": {...}, "by_status": {...}}},
+                "by_category": {"finance": {"total": 1, "by_status": {...}, "avg_duration_ms": 840.2}}
+            }
         }
     """
     try:
-        from integrations.xero_order_orchestrator import get_xero_orchestrator
+        from integrations.timeline_store import get_timeline_store
 
-        orchestrator = get_xero_orchestrator()
+        store = get_timeline_store()
+        days = max(1, min(days, 366))
 
         # If requesting summary view
         if group_by == "summary":
-            return orchestrator.get_generated_outputs_summary()
+            return store.summary(days=days)
 
         # If requesting grouping
         if group_by == "date":
             return {
                 "grouped_by": "date",
-                "data": orchestrator.get_timeline_grouped_by_date()
+                "window_days": days,
+                "data": store.rollups_by_date(days=days, category=category)
             }
         elif group_by == "category":
             return {
                 "grouped_by": "category",
-                "data": orchestrator.get_timeline_grouped_by_category()
+                "window_days": days,
+                "data": store.rollups_by_category(days=days)
             }
 
-        # Otherwise, return filtered timeline
-        filtered_timeline = orchestrator.get_timeline_filtered(
+        # Otherwise, return one page of the filtered timeline
+        page = store.query(
             category=category,
             date=date,
-            status=status
+            status=status,
+            limit=limit,
+            cursor=cursor
         )
 
         return {
-            "total_results": len(filtered_timeline),
+            "total_results": len(page["data"]),
             "filters_applied": {
                 "category": category,
                 "date": date,
                 "status": status
             },
-            "data": filtered_timeline
+            "data": page["data"],
+            "next_cursor": page["next_cursor"]
         }
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date or cursor: {str(e)}")
     except Exception as e:
         logger.error(f"Error fetching generated outputs: {e}")
         raise HTTPException(
@@ -3158,6 +2904,21 @@ async def prompt_metrics_endpoint():
     return prompt_manager.get_metrics()
 
 
+@app.get("/api/v1/metrics/xero-rate-limit")
+async def xero_rate_limit_metrics_endpoint():
+    """
+    Get Xero rate limiter state
+
+    Returns:
+    - Backend (shared Redis bucket or in-process fallback)
+    - Queue depth per priority class in this worker
+    - Estimated wait per priority class
+    - Granted / waited / rejected counts
+    """
+    from production.rate_limiting import xero_rate_limiter
+    return await xero_rate_limiter.get_stats_async()
+
+
 @app.get("/api/v1/prompts/ab-config")
 async def ab_config_endpoint(prompt_type: Optional[str] = None):
     """
@@ -3212,12 +2973,20 @@ async def root():
             "chatbot": "POST /api/chatbot",
             "process_order": "POST /api/process_order_enhanced",
             "list_outlets": "GET /api/outlets",
+            "list_orders": "GET /api/v1/orders",
+            "bulk_export": "GET /api/v1/exports/{entity}",
+            "query_stats": "GET /api/v1/db/query-stats",
+            "explain_queries": "POST /api/v1/db/query-stats/explain",
             "download_do": "GET /api/download_do/{order_id}",
+            "bulk_delivery_orders": "GET /api/v1/documents/delivery-orders?date=YYYY-MM-DD",
             "download_invoice": "GET /api/download_invoice/{order_id}",
+            "batch_invoices": "GET /api/v1/documents/invoices?date_from=YYYY-MM-DD",
             "post_to_xero": "POST /api/post_to_xero/{order_id}",
+            "job_status": "GET /api/v1/jobs/{job_id}",
             "streaming_chat": "POST /api/v1/chat/stream",
             "cache_metrics": "GET /api/v1/metrics/cache",
             "prompt_metrics": "GET /api/v1/metrics/prompts",
+            "xero_rate_limit": "GET /api/v1/metrics/xero-rate-limit",
             "ab_config": "GET /api/v1/prompts/ab-config"
         },
         "chatbot_status": {
@@ -8,10 +8,16 @@ This module provides integration clients for external services:
 
 from .xero_client import XeroClient, get_xero_client
 from .xero_order_orchestrator import XeroOrderOrchestrator, get_xero_orchestrator
+from .xero_mirror import XeroMirror, get_xero_mirror
+from .timeline_store import AgentTimelineStore, get_timeline_store
 
 __all__ = [
     'XeroClient',
     'get_xero_client',
     'XeroOrderOrchestrator',
-    'get_xero_orchestrator'
+    'get_xero_orchestrator',
+    'XeroMirror',
+    'get_xero_mirror',
+    'AgentTimelineStore',
+    'get_timeline_store'
 ]
@@ -0,0 +1,410 @@
+"""
+Agent Timeline Store
+====================
+
+Persistent, append-only store for the agent timeline produced by
+XeroOrderOrchestrator, behind /api/v1/generated-outputs.
+
+Features:
+- One agent_timeline_events row per agent per workflow, written as each
+  workflow stage finishes (survives restarts, shared by API and job workers)
+- Server-side filtering by category, status and date with keyset
+  pagination on (recorded_at, id); every filter has a matching index
+- Daily/category/status counts maintained in agent_timeline_rollups in
+  the same transaction as the insert, so grouped views and summaries
+  read rollup rows instead of scanning history
+- Document lists (DOs, invoices) and inventory movements read the most
+  recent N events through partial indexes
+
+NO MOCKING - Real PostgreSQL database.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date as date_type, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import Engine, insert, select, tuple_, func
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from database import get_db_engine
+from database_operations import encode_keyset_cursor, decode_keyset_cursor
+from models.order_orm import AgentTimelineEvent, AgentTimelineRollup
+
+logger = logging.getLogger(__name__)
+
+
+TIMELINE_CATEGORIES = ('inventory', 'delivery', 'finance', 'orders', 'general')
+
+MAX_PAGE_SIZE = 200
+
+# Default window for grouped views
+DEFAULT_ROLLUP_DAYS = 30
+
+
+# ============================================================================
+# ROW MAPPING
+# ============================================================================
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    return datetime.fromisoformat(value)
+
+
+def timeline_entry_to_row(
+    entry: Dict[str, Any],
+    workflow_id: str,
+    order_ref: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Map an in-memory agent_timeline entry to an agent_timeline_events row
+
+    Args:
+        entry: Entry built by XeroOrderOrchestrator._update_agent_status
+        workflow_id: Identifier shared by all entries of one workflow run
+        order_ref: Outlet or order reference
+
+    Returns:
+        Column values for AgentTimelineEvent
+    """
+    metadata = entry.get('metadata') or {}
+    started_at = _parse_timestamp(entry.get('started_at') or entry.get('start_time'))
+    category = entry.get('category', 'general')
+    if entry.get('date'):
+        event_date = date_type.fromisoformat(entry['date'])
+    else:
+        event_date = (started_at or datetime.now()).date()
+
+    return {
+        'workflow_id': workflow_id,
+        'order_ref': order_ref,
+        'agent_name': entry['agent_name'],
+        'category': category if category in TIMELINE_CATEGORIES else 'general',
+        'status': entry.get('status', 'idle'),
+        'progress': entry.get('progress', 0),
+        'current_task': entry.get('current_task') or None,
+        'details': entry.get('details') or [],
+        'metadata': metadata,
+        'stage': entry.get('stage'),
+        'duration_ms': entry.get('duration_ms'),
+        'do_number': metadata.get('do_number'),
+        'invoice_number': metadata.get('invoice_number'),
+        'event_date': event_date,
+        'started_at': started_at,
+        'completed_at': _parse_timestamp(entry.get('completed_at')),
+    }
+
+
+def rollup_deltas(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate event rows into (event_date, category, status) count increments"""
+    deltas: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        key = (row['event_date'], row['category'], row['status'])
+        delta = deltas.setdefault(key, {
+            'event_date': key[0], 'category': key[1], 'status': key[2],
+            'event_count': 0, 'total_duration_ms': 0.0,
+        })
+        delta['event_count'] += 1
+        delta['total_duration_ms'] += row.get('duration_ms') or 0.0
+    return list(deltas.values())
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class AgentTimelineStore:
+    """
+    Append and query persisted agent timeline events
+
+    Usage:
+        store = get_timeline_store()
+        store.append(orchestrator.agent_timeline, workflow_id="wf-1a2b", order_ref="Store 1")
+        page = store.query(category="finance", status="completed", limit=50)
+        store.query(category="finance", cursor=page["next_cursor"])
+    """
+
+    def __init__(self, engine: Optional[Engine] = None):
+        self.engine = engine or get_db_engine()
+
+    def append(
+        self,
+        entries: List[Dict[str, Any]],
+        workflow_id: str,
+        order_ref: Optional[str] = None
+    ) -> int:
+        """
+        Persist the entries of one workflow run and update rollups
+
+        Args:
+            entries: agent_timeline entries (final state)
+            workflow_id: Workflow run identifier
+            order_ref: Outlet or order reference
+
+        Returns:
+            Number of events written
+        """
+        if not entries:
+            return 0
+
+        rows = [timeline_entry_to_row(entry, workflow_id, order_ref) for entry in entries]
+        rollup_table = AgentTimelineRollup.__table__
+
+        upsert = pg_insert(rollup_table).values(rollup_deltas(rows))
+        upsert = upsert.on_conflict_do_update(
+            index_elements=['event_date', 'category', 'status'],
+            set_={
+                'event_count': rollup_table.c.event_count + upsert.excluded.event_count,
+                'total_duration_ms': rollup_table.c.total_duration_ms + upsert.excluded.total_duration_ms,
+            }
+        )
+
+        with self.engine.begin() as conn:
+            conn.execute(insert(AgentTimelineEvent.__table__), rows)
+            conn.execute(upsert)
+
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Event pages
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        date: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        One page of events, newest first
+
+        Args:
+            category: inventory, delivery, finance, orders or general
+            date: YYYY-MM-DD
+            status: idle, processing, completed or error
+            limit: Page size (max MAX_PAGE_SIZE)
+            cursor: next_cursor from the previous page
+
+        Returns:
+            {"data": [...], "next_cursor": str or None}
+
+        Raises:
+            ValueError: If date or cursor is malformed
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        query = select(AgentTimelineEvent)
+        if category:
+            query = query.where(AgentTimelineEvent.category == category)
+        if status:
+            query = query.where(AgentTimelineEvent.status == status)
+        if date:
+            query = query.where(AgentTimelineEvent.event_date == date_type.fromisoformat(date))
+        if cursor:
+            recorded_at, row_id = decode_keyset_cursor(cursor)
+            query = query.where(
+                tuple_(AgentTimelineEvent.recorded_at, AgentTimelineEvent.id) < tuple_(recorded_at, row_id)
+            )
+
+        query = query.order_by(AgentTimelineEvent.recorded_at.desc(), AgentTimelineEvent.id.desc())
+
+        with Session(self.engine) as session:
+            events = session.scalars(query.limit(limit + 1)).all()
+
+            has_more = len(events) > limit
+            events = events[:limit]
+            return {
+                'data': [event.to_dict() for event in events],
+                'next_cursor': encode_keyset_cursor(events[-1].recorded_at, events[-1].id) if has_more else None,
+            }
+
+    def _recent_events(self, condition, limit: int) -> List[Dict[str, Any]]:
+        query = select(AgentTimelineEvent).where(condition).order_by(
+            AgentTimelineEvent.recorded_at.desc(), AgentTimelineEvent.id.desc()
+        ).limit(limit)
+        with Session(self.engine) as session:
+            return [event.to_dict() for event in session.scalars(query)]
+
+    # ------------------------------------------------------------------
+    # Rollups
+    # ------------------------------------------------------------------
+
+    def _rollup_rows(self, days: int, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        table = AgentTimelineRollup.__table__
+        query = select(table).where(table.c.event_date >= date_type.today() - timedelta(days=days - 1))
+        if category:
+            query = query.where(table.c.category == category)
+        with self.engine.connect() as conn:
+            return [dict(row) for row in conn.execute(query).mappings()]
+
+    def rollups_by_date(self, days: int = DEFAULT_ROLLUP_DAYS, category: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Event counts per day (most recent first) with category/status breakdown
+
+        Example Output:
+            {"2025-01-15": {"total": 5, "by_category": {"finance": 1, ...},
+                            "by_status": {"completed": 5}}}
+        """
+        grouped: Dict[str, Dict[str, Any]] = {}
+        for row in self._rollup_rows(days, category):
+            day = grouped.setdefault(row['event_date'].isoformat(), {
+                'total': 0, 'by_category': defaultdict(int), 'by_status': defaultdict(int)
+            })
+            day['total'] += row['event_count']
+            day['by_category'][row['category']] += row['event_count']
+            day['by_status'][row['status']] += row['event_count']
+
+        return {
+            day: {'total': counts['total'], 'by_category': dict(counts['by_category']),
+                  'by_status': dict(counts['by_status'])}
+            for day, counts in sorted(grouped.items(), reverse=True)
+        }
+
+    def rollups_by_category(self, days: int = DEFAULT_ROLLUP_DAYS) -> Dict[str, Any]:
+        """
+        Event counts per category with status breakdown and average stage time
+
+        Example Output:
+            {"finance": {"total": 12, "by_status": {"completed": 11, "error": 1},
+                         "avg_duration_ms": 840.2}, ...}
+        """
+        grouped = {
+            category: {'total': 0, 'by_status': defaultdict(int), 'duration_ms': 0.0}
+            for category in TIMELINE_CATEGORIES
+        }
+        for row in self._rollup_rows(days):
+            counts = grouped.setdefault(row['category'], {'total': 0, 'by_status': defaultdict(int), 'duration_ms': 0.0})
+            counts['total'] += row['event_count']
+            counts['by_status'][row['status']] += row['event_count']
+            counts['duration_ms'] += row['total_duration_ms']
+
+        return {
+            category: {
+                'total': counts['total'],
+                'by_status': dict(counts['by_status']),
+                'avg_duration_ms': round(counts['duration_ms'] / counts['total'], 1) if counts['total'] else None,
+            }
+            for category, counts in grouped.items()
+        }
+
+    def grouped_recent_events(self, days: int = DEFAULT_ROLLUP_DAYS, limit: int = MAX_PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Latest events in the window grouped by date and by category
+
+        Returns:
+            {"by_date": {"2025-01-15": [entry, ...]},
+             "by_category": {"inventory": [entry, ...], ...}}
+        """
+        since = date_type.today() - timedelta(days=days - 1)
+        by_date: Dict[str, List[Dict[str, Any]]] = {}
+        by_category: Dict[str, List[Dict[str, Any]]] = {category: [] for category in TIMELINE_CATEGORIES}
+        for event in self._recent_events(AgentTimelineEvent.event_date >= since, limit):
+            by_date.setdefault(event['date'], []).append(event)
+            by_category.setdefault(event['category'], []).append(event)
+        return {'by_date': by_date, 'by_category': by_category}
+
+    def summary(self, days: int = DEFAULT_ROLLUP_DAYS, limit: int = 20) -> Dict[str, Any]:
+        """
+        Generated outputs summary: counts from rollups, latest documents,
+        inventory movements and the latest events grouped by date and category
+
+        Args:
+            days: Rollup window
+            limit: Maximum documents / inventory events listed
+
+        Returns:
+            Summary in the /api/v1/generated-outputs?group_by=summary shape
+        """
+        by_category = self.rollups_by_category(days)
+        completed_by_category = {
+            category: counts['by_status'].get('completed', 0) for category, counts in by_category.items()
+        }
+
+        delivery_orders = [
+            {
+                'do_number': event['metadata']['do_number'],
+                'customer': event['metadata'].get('customer'),
+                'total_amount': event['metadata'].get('total_amount'),
+                'total_quantity': event['metadata'].get('total_quantity'),
+                'date': event['completed_at'] or event['recorded_at'],
+            }
+            for event in self._recent_events(AgentTimelineEvent.do_number.isnot(None), limit)
+        ]
+        invoices = [
+            {
+                'invoice_number': event['metadata']['invoice_number'],
+                'customer': event['metadata'].get('customer'),
+                'total_amount': event['metadata'].get('total_amount'),
+                'tax_amount': event['metadata'].get('tax_amount'),
+                'date': event['completed_at'] or event['recorded_at'],
+            }
+            for event in self._recent_events(AgentTimelineEvent.invoice_number.isnot(None), limit)
+        ]
+
+        inventory_movements = []
+        inventory_events = self._recent_events(
+            (AgentTimelineEvent.category == 'inventory') & (AgentTimelineEvent.status == 'completed'), limit
+        )
+        for event in inventory_events:
+            for item in event['metadata'].get('inventory_summary', []):
+                if item.get('status') == 'available' and 'before' in item:
+                    inventory_movements.append({
+                        'product': item.get('product_name'),
+                        'sku': item.get('sku'),
+                        'before': item.get('before'),
+                        'withdrawn': item.get('requested'),
+                        'after': item.get('after'),
+                        'date': event['completed_at'] or event['recorded_at'],
+                    })
+
+        return {
+            'summary': {
+                'window_days': days,
+                'total_operations': sum(completed_by_category.values()),
+                'by_category': completed_by_category,
+                'documents_generated': {
+                    'delivery_orders': delivery_orders,
+                    'invoices': invoices
+                }
+            },
+            **self.grouped_recent_events(days),
+            'rollups': {
+                'by_date': self.rollups_by_date(days),
+                'by_category': by_category,
+            },
+            'inventory_movements': inventory_movements
+        }
+
+    def count(self) -> int:
+        """Total events stored (from rollups)"""
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(func.coalesce(func.sum(AgentTimelineRollup.__table__.c.event_count), 0))
+            ).scalar()
+
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+_global_store: Optional[AgentTimelineStore] = None
+
+
+def get_timeline_store() -> AgentTimelineStore:
+    """
+    Get or create global agent timeline store
+
+    Returns:
+        AgentTimelineStore instance
+    """
+    global _global_store
+    if _global_store is None:
+        _global_store = AgentTimelineStore()
+    return _global_store
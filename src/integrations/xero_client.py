@@ -21,9 +21,11 @@ Production-grade implementation:
 
 import logging
 import re
+import threading
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from urllib.parse import quote
 
 # Official Xero SDK imports
 from xero_python.api_client import ApiClient, Configuration
@@ -45,6 +47,7 @@ from config import config
 # Production infrastructure
 from production.retry import retry_with_backoff, retry_on_rate_limit, circuit_breaker
 from production.rate_limiting import rate_limit_xero
+from monitoring.tracing import trace_calls, trace_span
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +112,63 @@ def validate_xero_where_clause_input(value: str, field_name: str = "input") -> s
     return sanitized
 
 
+# Xero GET requests fail above ~2,000 URL characters; leave room for the
+# base URL, tenant path and other query parameters
+XERO_WHERE_MAX_ENCODED_LENGTH = 1500
+
+
+def build_or_where_clauses(
+    field: str,
+    values: List[str],
+    max_encoded_length: int = XERO_WHERE_MAX_ENCODED_LENGTH
+) -> List[str]:
+    """
+    Build `Field=="a" OR Field=="b"` WHERE clauses, chunked to URL limits.
+
+    Values must already be validated with validate_xero_where_clause_input().
+
+    Args:
+        field: Xero field name (e.g. "Code", "Name")
+        values: Sanitized values to match
+        max_encoded_length: Maximum URL-encoded length of each clause
+
+    Returns:
+        List of WHERE clauses covering all values (one API call each)
+
+    Raises:
+        ValueError: If a single value does not fit within max_encoded_length
+    """
+    clauses = []
+    current: List[str] = []
+
+    for value in values:
+        term = f'{field}=="{value}"'
+        if len(quote(term)) > max_encoded_length:
+            raise ValueError(f"{field} value too long for a Xero WHERE clause: {value[:50]}")
+
+        candidate = " OR ".join(current + [term])
+        if current and len(quote(candidate)) > max_encoded_length:
+            clauses.append(" OR ".join(current))
+            current = [term]
+        else:
+            current.append(term)
+
+    if current:
+        clauses.append(" OR ".join(current))
+
+    return clauses
+
+
+def normalize_item_code(code: str) -> str:
+    """
+    Comparison key for a Xero item code.
+
+    Xero matches `Code=="..."` case-insensitively, so "abc-1" finds the
+    item coded "ABC-1"; bulk results are matched back the same way.
+    """
+    return code.strip().upper()
+
+
 @dataclass
 class XeroCustomer:
     """Xero customer/contact information"""
@@ -131,6 +191,24 @@ class XeroProduct:
     is_sold: bool = True
 
 
+def match_products_by_code(
+    product_codes: List[str],
+    products: List[XeroProduct]
+) -> Dict[str, Optional[XeroProduct]]:
+    """
+    Map each requested code to the Xero item it matched (case-insensitive).
+
+    Args:
+        product_codes: Codes as requested (whitespace and case as given)
+        products: Items returned by Xero for those codes
+
+    Returns:
+        Dict keyed by each requested code; None for codes not found
+    """
+    found = {normalize_item_code(product.code): product for product in products if product.code}
+    return {code: found.get(normalize_item_code(code)) for code in product_codes}
+
+
 @dataclass
 class XeroDraftOrder:
     """Draft delivery order (using Purchase Order as placeholder)"""
@@ -166,6 +244,7 @@ class XeroClient:
     _api_client: Optional[ApiClient] = None
     _accounting_api: Optional[AccountingApi] = None
     _token_expiry: Optional[datetime] = None
+    _token_lock = threading.Lock()
 
     def __new__(cls):
         """Singleton pattern implementation"""
@@ -221,7 +300,8 @@ class XeroClient:
 
             # Refresh token to get access token
             # NOTE: refresh_access_token() requires an ApiClient instance
-            token.refresh_access_token(self._api_client)
+            with trace_span("xero refresh_access_token", attributes={"peer.service": "xero"}):
+                token.refresh_access_token(self._api_client)
 
             # Store token expiry
             if hasattr(token, 'expires_at') and token.expires_at:
@@ -234,8 +314,8 @@ class XeroClient:
             api_config.oauth2_token = token
             api_config.oauth2_token_saver = self._token_saver
 
-            # Create accounting API
-            self._accounting_api = AccountingApi(self._api_client)
+            # Create accounting API (each call is a span when tracing is enabled)
+            self._accounting_api = trace_calls(AccountingApi(self._api_client), "xero")
 
             logger.info(f"Xero SDK API client initialized, token expires at {self._token_expiry}")
 
@@ -253,11 +333,23 @@ class XeroClient:
         if hasattr(token, 'refresh_token') and token.refresh_token:
             self.refresh_token = token.refresh_token
 
+    def _token_expiring(self) -> bool:
+        return bool(self._token_expiry) and datetime.now() >= self._token_expiry - timedelta(minutes=5)
+
     def _ensure_token_valid(self):
-        """Ensure access token is valid, refresh if needed"""
-        if self._token_expiry and datetime.now() >= self._token_expiry - timedelta(minutes=5):
-            logger.info("Token expiring soon, refreshing...")
-            self._initialize_api_client()
+        """
+        Ensure access token is valid, refresh if needed
+
+        Workflow stages call this concurrently on the shared client; the
+        lock plus re-check means only the first caller refreshes (Xero
+        refresh tokens are single-use) and the rest reuse its token.
+        """
+        if not self._token_expiring():
+            return
+        with self._token_lock:
+            if self._token_expiring():
+                logger.info("Token expiring soon, refreshing...")
+                self._initialize_api_client()
 
     @circuit_breaker("xero")
     @retry_on_rate_limit(max_attempts=5)
@@ -286,20 +378,7 @@ class XeroClient:
             )
 
             if contacts and contacts.contacts and len(contacts.contacts) > 0:
-                contact = contacts.contacts[0]
-
-                # Extract phone number if available
-                phone = None
-                if contact.phones and len(contact.phones) > 0:
-                    phone = contact.phones[0].phone_number
-
-                customer = XeroCustomer(
-                    contact_id=contact.contact_id,
-                    name=contact.name,
-                    email=contact.email_address,
-                    phone=phone,
-                    is_customer=contact.is_customer if contact.is_customer is not None else True
-                )
+                customer = self._contact_to_customer(contacts.contacts[0])
 
                 logger.info(f"Customer found: {customer.name} (ID: {customer.contact_id})")
                 return customer
@@ -341,22 +420,7 @@ class XeroClient:
             )
 
             if items_response and items_response.items and len(items_response.items) > 0:
-                item = items_response.items[0]
-
-                # Extract unit price from sales details
-                unit_price = 0.0
-                if item.sales_details and item.sales_details.unit_price:
-                    unit_price = float(item.sales_details.unit_price)
-
-                product = XeroProduct(
-                    item_id=item.item_id,
-                    code=item.code,
-                    name=item.name if item.name else item.code,
-                    description=item.description,
-                    unit_price=unit_price,
-                    quantity_on_hand=float(item.quantity_on_hand) if item.quantity_on_hand is not None else None,
-                    is_sold=item.is_sold if item.is_sold is not None else True
-                )
+                product = self._item_to_product(items_response.items[0])
 
                 logger.info(f"Product found: {product.name} (Code: {product.code})")
                 return product
@@ -371,6 +435,114 @@ class XeroClient:
             logger.error(f"Error checking inventory: {e}")
             raise
 
+    def check_inventory_bulk(self, product_codes: List[str]) -> Dict[str, Optional[XeroProduct]]:
+        """
+        Look up many products in as few Xero API calls as possible.
+
+        Codes are combined into `Code=="A" OR Code=="B" ...` WHERE clauses,
+        chunked to stay under Xero's URL length limit. Each chunk is one
+        rate-limited, retried, circuit-broken API call, so a 15-line order
+        costs one call instead of fifteen.
+
+        Codes match case-insensitively, like check_inventory().
+
+        Args:
+            product_codes: Product/item codes (duplicates are ignored)
+
+        Returns:
+            Dict keyed by each requested code; None for codes not found
+        """
+        unique_codes = list(dict.fromkeys(product_codes))
+        if not unique_codes:
+            return {}
+
+        # SECURITY: Validate every code before it goes into a WHERE clause
+        # Codes differing only in case match the same item: send each once
+        where_values: Dict[str, str] = {}
+        for code in unique_codes:
+            safe_code = validate_xero_where_clause_input(code, "product_code")
+            where_values.setdefault(normalize_item_code(safe_code), safe_code)
+        where_clauses = build_or_where_clauses("Code", list(where_values.values()))
+
+        products: List[XeroProduct] = []
+        for where in where_clauses:
+            products.extend(self._get_items_where(where))
+
+        results = match_products_by_code(unique_codes, products)
+
+        logger.info(
+            f"Bulk inventory lookup: {sum(1 for p in results.values() if p)}/{len(unique_codes)} "
+            f"products found in {len(where_clauses)} API call(s)"
+        )
+        return results
+
+    @circuit_breaker("xero")
+    @retry_on_rate_limit(max_attempts=5)
+    @retry_with_backoff(max_attempts=3)
+    @rate_limit_xero
+    def _get_items_where(self, where: str) -> List[XeroProduct]:
+        """
+        Fetch all items matching a WHERE clause in a single API call.
+
+        Args:
+            where: Xero WHERE clause built from validated input
+
+        Returns:
+            List of matching XeroProduct
+        """
+        try:
+            self._ensure_token_valid()
+
+            items_response = self._accounting_api.get_items(
+                xero_tenant_id=self.tenant_id,
+                where=where
+            )
+
+            if not items_response or not items_response.items:
+                return []
+            return [self._item_to_product(item) for item in items_response.items]
+
+        except AccountingBadRequestException as e:
+            logger.error(f"Xero API error fetching items: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching items: {e}")
+            raise
+
+    @staticmethod
+    def _contact_to_customer(contact: Contact) -> XeroCustomer:
+        """Convert an SDK Contact to XeroCustomer"""
+        # Extract phone number if available
+        phone = None
+        if contact.phones and len(contact.phones) > 0:
+            phone = contact.phones[0].phone_number
+
+        return XeroCustomer(
+            contact_id=contact.contact_id,
+            name=contact.name,
+            email=contact.email_address,
+            phone=phone,
+            is_customer=contact.is_customer if contact.is_customer is not None else True
+        )
+
+    @staticmethod
+    def _item_to_product(item: Item) -> XeroProduct:
+        """Convert an SDK Item to XeroProduct"""
+        # Extract unit price from sales details
+        unit_price = 0.0
+        if item.sales_details and item.sales_details.unit_price:
+            unit_price = float(item.sales_details.unit_price)
+
+        return XeroProduct(
+            item_id=item.item_id,
+            code=item.code,
+            name=item.name if item.name else item.code,
+            description=item.description,
+            unit_price=unit_price,
+            quantity_on_hand=float(item.quantity_on_hand) if item.quantity_on_hand is not None else None,
+            is_sold=item.is_sold if item.is_sold is not None else True
+        )
+
     @circuit_breaker("xero")
     @retry_on_rate_limit(max_attempts=5)
     @retry_with_backoff(max_attempts=3)
@@ -515,7 +687,8 @@ class XeroClient:
         contact_id: str,
         line_items: List[Dict[str, Any]],
         reference: Optional[str] = None,
-        due_date: Optional[datetime] = None
+        due_date: Optional[datetime] = None,
+        idempotency_key: Optional[str] = None
     ) -> XeroInvoice:
         """
         Create and post an invoice in Xero.
@@ -526,6 +699,9 @@ class XeroClient:
                 [{"item_code": str, "quantity": float, "unit_price": float, "description": str, "tax_type": str}]
             reference: Optional reference number
             due_date: Optional due date (defaults to 30 days from now)
+            idempotency_key: Sent as Xero's Idempotency-Key header; a repeat
+                request with the same key returns the original invoice
+                instead of creating another one
 
         Returns:
             XeroInvoice with invoice details
@@ -578,9 +754,11 @@ class XeroClient:
             invoices = Invoices(invoices=[invoice])
 
             # Call API
+            idempotency = {'idempotency_key': idempotency_key} if idempotency_key else {}
             created_invs = self._accounting_api.create_invoices(
                 xero_tenant_id=self.tenant_id,
-                invoices=invoices
+                invoices=invoices,
+                **idempotency
             )
 
             if created_invs and created_invs.invoices and len(created_invs.invoices) > 0:
@@ -616,6 +794,111 @@ class XeroClient:
         """Alias for check_inventory for backward compatibility"""
         return self.check_inventory(code)
 
+    # ========================================================================
+    # MIRROR SYNC METHODS (see integrations.xero_mirror)
+    # ========================================================================
+
+    @circuit_breaker("xero")
+    @retry_on_rate_limit(max_attempts=5)
+    @retry_with_backoff(max_attempts=3)
+    @rate_limit_xero
+    def list_items(self, modified_since: Optional[datetime] = None) -> List[Item]:
+        """
+        Fetch all items, or only those modified since a point in time.
+
+        Args:
+            modified_since: Sent as If-Modified-Since (UTC) when provided
+
+        Returns:
+            List of SDK Item objects (includes updated_date_utc)
+        """
+        self._ensure_token_valid()
+
+        kwargs = {'if_modified_since': modified_since} if modified_since else {}
+        items_response = self._accounting_api.get_items(xero_tenant_id=self.tenant_id, **kwargs)
+
+        return list(items_response.items) if items_response and items_response.items else []
+
+    @circuit_breaker("xero")
+    @retry_on_rate_limit(max_attempts=5)
+    @retry_with_backoff(max_attempts=3)
+    @rate_limit_xero
+    def list_contacts_page(
+        self,
+        page: int = 1,
+        modified_since: Optional[datetime] = None
+    ) -> List[Contact]:
+        """
+        Fetch one page (up to 100) of contacts, including archived ones.
+
+        Args:
+            page: 1-based page number
+            modified_since: Sent as If-Modified-Since (UTC) when provided
+
+        Returns:
+            List of SDK Contact objects; empty when past the last page
+        """
+        self._ensure_token_valid()
+
+        kwargs = {'if_modified_since': modified_since} if modified_since else {}
+        contacts = self._accounting_api.get_contacts(
+            xero_tenant_id=self.tenant_id,
+            page=page,
+            include_archived=True,
+            **kwargs
+        )
+
+        return list(contacts.contacts) if contacts and contacts.contacts else []
+
+    @circuit_breaker("xero")
+    @retry_on_rate_limit(max_attempts=5)
+    @retry_with_backoff(max_attempts=3)
+    @rate_limit_xero
+    def get_contact(self, contact_id: str) -> Optional[Contact]:
+        """
+        Fetch a single contact by ContactID.
+
+        Args:
+            contact_id: Xero ContactID
+
+        Returns:
+            SDK Contact, or None if not found
+        """
+        self._ensure_token_valid()
+
+        contacts = self._accounting_api.get_contact(
+            xero_tenant_id=self.tenant_id,
+            contact_id=contact_id
+        )
+
+        return contacts.contacts[0] if contacts and contacts.contacts else None
+
+    @circuit_breaker("xero")
+    @retry_on_rate_limit(max_attempts=5)
+    @retry_with_backoff(max_attempts=3)
+    @rate_limit_xero
+    def get_invoice_item_codes(self, invoice_id: str) -> List[str]:
+        """
+        Item codes on an invoice (used to refresh stock after invoice events).
+
+        Args:
+            invoice_id: Xero InvoiceID
+
+        Returns:
+            Distinct item codes on the invoice's line items
+        """
+        self._ensure_token_valid()
+
+        invoices = self._accounting_api.get_invoice(
+            xero_tenant_id=self.tenant_id,
+            invoice_id=invoice_id
+        )
+        if not invoices or not invoices.invoices:
+            return []
+
+        line_items = invoices.invoices[0].line_items or []
+        return list(dict.fromkeys(li.item_code for li in line_items if li.item_code))
+
     # ========================================================================
     # COMPENSATING TRANSACTION METHODS (Cleanup/Rollback)
     # ========================================================================
@@ -0,0 +1,235 @@
+"""
+Xero Background Jobs
+====================
+
+Job handlers that move Xero work out of the HTTP request path. The chatbot
+and /api/post_to_xero enqueue these; worker processes
+(scripts/run_job_worker.py) run them through the shared Xero rate limiter.
+
+Job types:
+- xero.order_workflow: full order-to-invoice workflow for a stored order
+  (customer verification, inventory, draft order, finalize, invoice)
+- xero.post_invoice: verify customer and post the invoice for an order
+
+Both are idempotent per order, across job types:
+- The check for an existing invoice, the Xero post and recording the
+  invoice run under a per-order advisory lock, so two jobs for the same
+  order never post concurrently and the second one sees the first's invoice
+- The invoice is sent with a Xero Idempotency-Key derived from the order
+  id, so a job retried after a crash between the post and recording the
+  invoice gets the original invoice back instead of a second one
+
+NO MOCKING - Real Xero API and PostgreSQL database.
+"""
+
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from config import config
+from database import get_db_engine
+from database_operations import get_db_session, get_order_with_outlet
+from models.order_orm import Invoice
+from production.job_queue import JobQueue, PermanentJobError, get_job_queue, register_job_handler
+from integrations.xero_order_orchestrator import XeroOrderOrchestrator
+
+logger = logging.getLogger(__name__)
+
+
+ORDER_WORKFLOW_JOB = 'xero.order_workflow'
+POST_INVOICE_JOB = 'xero.post_invoice'
+
+# pg_advisory_xact_lock namespace for per-order Xero posting
+ORDER_POST_LOCK_NAMESPACE = 2034_0001
+
+# Workflow errors that retrying cannot fix
+_PERMANENT_WORKFLOW_ERRORS = ('Customer not found', 'Inventory issues')
+
+
+# ============================================================================
+# ENQUEUE HELPERS
+# ============================================================================
+
+def enqueue_order_workflow(order_id: int, queue: Optional[JobQueue] = None) -> Dict[str, Any]:
+    """
+    Queue the Xero order-to-invoice workflow for a stored order
+
+    Args:
+        order_id: Order ID
+        queue: Job queue (defaults to the global queue)
+
+    Returns:
+        Job dictionary (existing job if already queued for this order)
+    """
+    return (queue or get_job_queue()).enqueue(
+        ORDER_WORKFLOW_JOB,
+        {'order_id': order_id},
+        idempotency_key=f"{ORDER_WORKFLOW_JOB}:{order_id}"
+    )
+
+
+def enqueue_post_invoice(order_id: int, queue: Optional[JobQueue] = None) -> Dict[str, Any]:
+    """
+    Queue posting the invoice for a stored order to Xero
+
+    Args:
+        order_id: Order ID
+        queue: Job queue (defaults to the global queue)
+
+    Returns:
+        Job dictionary (existing job if already queued for this order)
+    """
+    return (queue or get_job_queue()).enqueue(
+        POST_INVOICE_JOB,
+        {'order_id': order_id},
+        idempotency_key=f"{POST_INVOICE_JOB}:{order_id}"
+    )
+
+
+# ============================================================================
+# HANDLERS
+# ============================================================================
+
+@register_job_handler(ORDER_WORKFLOW_JOB)
+def run_order_workflow(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Run XeroOrderOrchestrator.execute_workflow for payload['order_id']"""
+    order_id = payload['order_id']
+    order, _ = _load_order(order_id)
+
+    with _order_post_lock(order_id):
+        existing = _get_posted_invoice(order_id)
+        if existing:
+            return {'order_id': order_id, 'invoice': existing, 'already_posted': True}
+
+        orchestrator = XeroOrderOrchestrator()
+        result = orchestrator.execute_workflow(
+            order['parsed_items'],
+            invoice_idempotency_key=invoice_idempotency_key(order_id)
+        )
+
+        if not result['success']:
+            error = result.get('error', 'Workflow failed')
+            if error.startswith(_PERMANENT_WORKFLOW_ERRORS):
+                raise PermanentJobError(error)
+            raise RuntimeError(error)
+
+        invoice = _record_invoice(order_id, result['invoice'])
+    return {
+        'order_id': order_id,
+        'invoice': invoice,
+        'draft_order_id': result['draft_order'].order_id,
+        'workflow_id': result['workflow_id'],
+        'stage_timings': result['stage_timings'],
+    }
+
+
+@register_job_handler(POST_INVOICE_JOB)
+def run_post_invoice(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Verify the outlet's Xero contact and post the invoice for payload['order_id']"""
+    order_id = payload['order_id']
+    order, outlet = _load_order(order_id)
+
+    with _order_post_lock(order_id):
+        existing = _get_posted_invoice(order_id)
+        if existing:
+            return {'order_id': order_id, 'invoice': existing, 'already_posted': True}
+
+        orchestrator = XeroOrderOrchestrator()
+        workflow_id = f"{POST_INVOICE_JOB}:{order_id}"
+        try:
+            customer, _ = orchestrator.verify_customer_in_xero(outlet['name'])
+            if not customer:
+                raise PermanentJobError(f"Customer not found in Xero: {outlet['name']}")
+
+            line_items = order['parsed_items'].get('line_items', [])
+            invoice = orchestrator.post_invoice_to_xero(
+                customer, line_items, outlet['name'],
+                idempotency_key=invoice_idempotency_key(order_id)
+            )
+            if not invoice:
+                raise RuntimeError(f"Xero did not return an invoice for order {order_id}")
+        finally:
+            orchestrator.persist_timeline(workflow_id, order_ref=outlet['name'])
+
+        return {
+            'order_id': order_id,
+            'invoice': _record_invoice(order_id, invoice),
+            'workflow_id': workflow_id,
+        }
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def invoice_idempotency_key(order_id: int) -> str:
+    """Xero Idempotency-Key for an order's invoice, shared by all job types"""
+    return f"order-{order_id}-invoice"
+
+
+@contextmanager
+def _order_post_lock(order_id: int):
+    """
+    Hold a transaction-level advisory lock for order_id
+
+    Serialises the posted-invoice check, the Xero post and recording the
+    invoice across workers and job types. The lock is released when the
+    transaction ends, including when the worker's connection drops.
+    """
+    with get_db_engine().begin() as lock_conn:
+        lock_conn.execute(
+            text("SELECT pg_advisory_xact_lock(:namespace, :order_id)"),
+            {'namespace': ORDER_POST_LOCK_NAMESPACE, 'order_id': order_id}
+        )
+        yield
+
+def _load_order(order_id: int):
+    """Order and outlet dictionaries; missing data is a permanent failure"""
+    with get_db_session() as session:
+        row = get_order_with_outlet(session, order_id)
+    if not row:
+        raise PermanentJobError(f"Order {order_id} not found")
+    order, outlet = row
+
+    if not outlet or not outlet.get('name'):
+        raise PermanentJobError(f"Outlet data not found for outlet_id {order['outlet_id']}")
+    if not order.get('parsed_items', {}).get('line_items'):
+        raise PermanentJobError(f"Order {order_id} has no line items")
+    return order, outlet
+
+
+def _get_posted_invoice(order_id: int) -> Optional[Dict[str, Any]]:
+    with get_db_session() as session:
+        invoice = session.query(Invoice).filter(
+            Invoice.order_id == order_id,
+            Invoice.posted_to_xero.is_(True)
+        ).first()
+        return invoice.to_dict() if invoice else None
+
+
+def _record_invoice(order_id: int, xero_invoice) -> Dict[str, Any]:
+    """Store the posted Xero invoice so retries and later jobs see it"""
+    total = Decimal(str(xero_invoice.total))
+    subtotal = (total / (1 + Decimal(str(config.TAX_RATE)))).quantize(Decimal('0.01'))
+
+    with get_db_session() as session:
+        invoice = Invoice(
+            order_id=order_id,
+            invoice_number=xero_invoice.invoice_number,
+            xero_invoice_id=xero_invoice.invoice_id,
+            xero_url=f"https://go.xero.com/AccountsReceivable/Edit.aspx?InvoiceID={xero_invoice.invoice_id}",
+            subtotal=subtotal,
+            tax=total - subtotal,
+            total=total,
+            status=xero_invoice.status,
+            posted_to_xero=True,
+            posted_at=datetime.now()
+        )
+        session.add(invoice)
+        session.flush()
+        logger.info(f"[JOBS] Recorded Xero invoice {invoice.invoice_number} for order {order_id}")
+        return invoice.to_dict()
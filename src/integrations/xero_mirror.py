@@ -0,0 +1,614 @@
+"""
+Local Mirror of Xero Items and Contacts
+=======================================
+
+PostgreSQL copy of Xero inventory items and contacts so that customer
+verification and inventory checks at order time do not call Xero.
+
+Freshness:
+- Delta sync: a background thread (and scripts/sync_xero_mirror.py)
+  fetches items/contacts with If-Modified-Since = highest UpdatedDateUTC
+  already mirrored. Contacts are paged (100 per page).
+- Full sync: once last_full_sync_at is older than full_sync_every sync
+  intervals, all items/contacts are fetched and rows no longer present
+  in Xero are removed (Xero deletes are not visible to If-Modified-Since).
+- One syncer: every API worker runs the background thread, but a cycle
+  only syncs while holding a transaction-level advisory lock, and only
+  when the sync state in PostgreSQL says a sync is due. N workers share
+  one sync schedule (and one slice of the Xero rate limit); restarts do
+  not trigger a full sync.
+- Webhooks: CONTACT events invalidate and re-fetch the contact; INVOICE
+  events re-fetch the items on the invoice (stock on hand changes when
+  invoices are approved). Xero does not send item webhooks.
+- Trust window: mirror rows are used while the last successful sync (or
+  the row's own write) is younger than max_age_seconds; otherwise the
+  lookup is a miss.
+
+Lookups:
+- get_items(codes) / get_contact_by_name(name) return mirror hits only;
+  callers fall back to XeroClient for misses and write the API results
+  back with store_products() / store_customer().
+- Any mirror failure degrades to a miss - Xero stays the source of truth.
+- Sync and refresh calls run at XeroPriority.BACKFILL so they yield the
+  Xero rate limit to order processing.
+
+NO MOCKING - Real PostgreSQL tables and real Xero API for sync.
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import Engine, case, delete, func, select, text, true, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from database import get_db_engine
+from models.order_orm import XeroItemMirror, XeroContactMirror, XeroSyncState
+from integrations.xero_client import XeroClient, XeroCustomer, XeroProduct, get_xero_client
+from production.rate_limiting import XeroPriority, with_xero_priority
+
+logger = logging.getLogger(__name__)
+
+
+ITEMS_RESOURCE = 'items'
+CONTACTS_RESOURCE = 'contacts'
+
+DEFAULT_MAX_AGE_SECONDS = 900
+DEFAULT_SYNC_INTERVAL_SECONDS = 300
+DEFAULT_FULL_SYNC_EVERY = 288  # cycles; daily at the default interval
+
+# Xero returns at most 100 contacts per page
+CONTACTS_PAGE_SIZE = 100
+
+# pg_try_advisory_xact_lock key for the background syncer
+ADVISORY_LOCK_KEY = 2032_0001
+
+
+def normalize_contact_name(name: str) -> str:
+    """Case- and whitespace-insensitive key for contact name lookups"""
+    return " ".join(name.split()).lower()
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def plan_sync(
+    states: Dict[str, Dict[str, Any]],
+    now: datetime,
+    sync_interval_seconds: float,
+    full_sync_interval_seconds: float
+) -> Optional[bool]:
+    """
+    Decide which sync is due from the persisted sync state
+
+    Args:
+        states: Resource -> xero_sync_state row ({} if never synced)
+        now: Current time
+        sync_interval_seconds: Delta sync interval
+        full_sync_interval_seconds: Full sync interval
+
+    Returns:
+        True for a full sync, False for a delta sync, None if nothing is due
+    """
+    full_cutoff = now - timedelta(seconds=full_sync_interval_seconds)
+    delta_cutoff = now - timedelta(seconds=sync_interval_seconds)
+
+    def older(value: Optional[datetime], cutoff: datetime) -> bool:
+        return value is None or _utc(value) <= cutoff
+
+    if any(older(state.get('last_full_sync_at'), full_cutoff) for state in states.values()):
+        return True
+    if any(older(state.get('last_synced_at'), delta_cutoff) for state in states.values()):
+        return False
+    return None
+
+
+def _insert(conn, table):
+    """INSERT ... ON CONFLICT construct for the connection's dialect"""
+    return sqlite_insert(table) if conn.dialect.name == 'sqlite' else pg_insert(table)
+
+
+def _greatest(left, right):
+    """GREATEST() that ignores NULLs, on any dialect"""
+    return case((right > left, right), else_=func.coalesce(left, right))
+
+
+class XeroMirror:
+    """
+    Read-through mirror of Xero items and contacts
+
+    Usage:
+        mirror = get_xero_mirror()
+        mirror.start()                         # background delta sync
+
+        products = mirror.get_items(["SKU-1", "SKU-2"])   # hits only
+        customer = mirror.get_contact_by_name("Canadian Pizza")
+    """
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        xero_client: Optional[XeroClient] = None,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        sync_interval_seconds: float = DEFAULT_SYNC_INTERVAL_SECONDS,
+        full_sync_every: int = DEFAULT_FULL_SYNC_EVERY
+    ):
+        """
+        Initialize mirror
+
+        Args:
+            engine: SQLAlchemy engine (defaults to the global engine)
+            xero_client: Xero client for sync (defaults to the singleton, created lazily)
+            max_age_seconds: How long mirror rows are trusted after a sync
+            sync_interval_seconds: Delay between background delta syncs
+            full_sync_every: Run a full sync every N sync intervals
+        """
+        self.engine = engine or get_db_engine()
+        self._xero_client = xero_client
+        self.max_age_seconds = max_age_seconds
+        self.sync_interval_seconds = sync_interval_seconds
+        self.full_sync_every = full_sync_every
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'item_hits': 0,
+            'item_misses': 0,
+            'contact_hits': 0,
+            'contact_misses': 0,
+            'syncs': 0,
+            'sync_errors': 0,
+            'last_sync_at': None,
+        }
+
+    @property
+    def xero_client(self) -> XeroClient:
+        if self._xero_client is None:
+            self._xero_client = get_xero_client()
+        return self._xero_client
+
+    # ========================================================================
+    # LOOKUPS
+    # ========================================================================
+
+    def get_items(self, codes: Iterable[str]) -> Dict[str, XeroProduct]:
+        """
+        Mirror hits for item codes
+
+        Args:
+            codes: Item codes to look up
+
+        Returns:
+            Dict of code -> XeroProduct for trusted mirror rows only
+        """
+        codes = [code.strip() for code in dict.fromkeys(codes) if code and code.strip()]
+        if not codes:
+            return {}
+
+        table = XeroItemMirror.__table__
+        try:
+            with self.engine.connect() as conn:
+                trusted = self._trusted_clause(conn, ITEMS_RESOURCE, table)
+                rows = conn.execute(
+                    select(table).where(table.c.code.in_(codes), trusted)
+                ).mappings().all()
+        except Exception as e:
+            logger.warning(f"Xero item mirror unavailable, falling back to API: {e}")
+            return {}
+
+        products = {row['code']: self._row_to_product(row) for row in rows}
+        self.stats['item_hits'] += len(products)
+        self.stats['item_misses'] += len(codes) - len(products)
+        return products
+
+    def get_contact_by_name(self, name: str) -> Optional[XeroCustomer]:
+        """
+        Mirror hit for an active contact by name
+
+        Args:
+            name: Contact name (case and whitespace insensitive)
+
+        Returns:
+            XeroCustomer, or None on a miss
+        """
+        table = XeroContactMirror.__table__
+        try:
+            with self.engine.connect() as conn:
+                trusted = self._trusted_clause(conn, CONTACTS_RESOURCE, table)
+                row = conn.execute(
+                    select(table)
+                    .where(
+                        table.c.name_normalized == normalize_contact_name(name),
+                        table.c.status == 'ACTIVE',
+                        trusted,
+                    )
+                    .order_by(table.c.xero_updated_at.desc().nulls_last())
+                    .limit(1)
+                ).mappings().first()
+        except Exception as e:
+            logger.warning(f"Xero contact mirror unavailable, falling back to API: {e}")
+            return None
+
+        if row is None:
+            self.stats['contact_misses'] += 1
+            return None
+
+        self.stats['contact_hits'] += 1
+        return XeroCustomer(
+            contact_id=row['contact_id'],
+            name=row['name'],
+            email=row['email'],
+            phone=row['phone'],
+            is_customer=row['is_customer'],
+        )
+
+    def _trusted_clause(self, conn, resource: str, table):
+        """Rows are trusted if the last sync, or the row's own write, is recent"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.max_age_seconds)
+        last_synced_at = conn.execute(
+            select(XeroSyncState.last_synced_at).where(XeroSyncState.resource == resource)
+        ).scalar()
+
+        if last_synced_at is not None and _utc(last_synced_at) >= cutoff:
+            return true()
+        return table.c.synced_at >= cutoff
+
+    @staticmethod
+    def _row_to_product(row) -> XeroProduct:
+        return XeroProduct(
+            item_id=row['item_id'],
+            code=row['code'],
+            name=row['name'],
+            description=row['description'],
+            unit_price=float(row['unit_price']) if row['unit_price'] is not None else 0.0,
+            quantity_on_hand=float(row['quantity_on_hand']) if row['quantity_on_hand'] is not None else None,
+            is_sold=row['is_sold'],
+        )
+
+    # ========================================================================
+    # WRITE-THROUGH (API fallback results)
+    # ========================================================================
+
+    def store_products(self, products: Iterable[Optional[XeroProduct]]) -> None:
+        """Write products fetched from the API into the mirror (best effort)"""
+        rows = [self._product_row(p, None) for p in products if p]
+        if not rows:
+            return
+        try:
+            with self.engine.begin() as conn:
+                self._upsert_items(conn, rows)
+        except Exception as e:
+            logger.warning(f"Failed to write items to Xero mirror: {e}")
+
+    def store_customer(self, customer: Optional[XeroCustomer]) -> None:
+        """Write a contact fetched from the API into the mirror (best effort)"""
+        if not customer:
+            return
+        try:
+            with self.engine.begin() as conn:
+                self._upsert_contacts(conn, [self._customer_row(customer, 'ACTIVE', None)])
+        except Exception as e:
+            logger.warning(f"Failed to write contact to Xero mirror: {e}")
+
+    @staticmethod
+    def _product_row(product: XeroProduct, xero_updated_at: Optional[datetime]) -> Dict[str, Any]:
+        return {
+            'item_id': product.item_id,
+            'code': product.code,
+            'name': product.name,
+            'description': product.description,
+            'unit_price': product.unit_price,
+            'quantity_on_hand': product.quantity_on_hand,
+            'is_sold': product.is_sold,
+            'xero_updated_at': _utc(xero_updated_at),
+            'synced_at': datetime.now(timezone.utc),
+        }
+
+    @staticmethod
+    def _customer_row(customer: XeroCustomer, status: str, xero_updated_at: Optional[datetime]) -> Dict[str, Any]:
+        return {
+            'contact_id': customer.contact_id,
+            'name': customer.name,
+            'name_normalized': normalize_contact_name(customer.name),
+            'email': customer.email,
+            'phone': customer.phone,
+            'is_customer': customer.is_customer,
+            'status': status,
+            'xero_updated_at': _utc(xero_updated_at),
+            'synced_at': datetime.now(timezone.utc),
+        }
+
+    @staticmethod
+    def _upsert_items(conn, rows: List[Dict[str, Any]]) -> None:
+        table = XeroItemMirror.__table__
+
+        # A code can move to a new ItemID (item deleted and recreated)
+        conn.execute(
+            delete(table).where(
+                table.c.code.in_([r['code'] for r in rows]),
+                tuple_(table.c.code, table.c.item_id).notin_([(r['code'], r['item_id']) for r in rows]),
+            )
+        )
+
+        stmt = _insert(conn, table).values(rows)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.item_id],
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0] if column != 'item_id'
+            } | {
+                # Write-through rows carry no UpdatedDateUTC; keep the synced one
+                'xero_updated_at': func.coalesce(stmt.excluded.xero_updated_at, table.c.xero_updated_at),
+            }
+        ))
+
+    @staticmethod
+    def _upsert_contacts(conn, rows: List[Dict[str, Any]]) -> None:
+        table = XeroContactMirror.__table__
+        stmt = _insert(conn, table).values(rows)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.contact_id],
+            set_={
+                column: stmt.excluded[column]
+                for column in rows[0] if column != 'contact_id'
+            } | {
+                'xero_updated_at': func.coalesce(stmt.excluded.xero_updated_at, table.c.xero_updated_at),
+            }
+        ))
+
+    # ========================================================================
+    # SYNC
+    # ========================================================================
+
+    @with_xero_priority(XeroPriority.BACKFILL)
+    def sync_items(self, full: bool = False) -> int:
+        """
+        Delta (or full) sync of Xero items
+
+        Args:
+            full: Fetch everything and delete rows missing from Xero
+
+        Returns:
+            Number of items written
+        """
+        started_at = datetime.now(timezone.utc)
+        state = self._get_state(ITEMS_RESOURCE)
+        modified_since = None if full else state.get('modified_since')
+
+        items = self.xero_client.list_items(modified_since=modified_since)
+        rows = [
+            self._product_row(XeroClient._item_to_product(item), item.updated_date_utc)
+            for item in items if item.code
+        ]
+
+        with self.engine.begin() as conn:
+            if rows:
+                self._upsert_items(conn, rows)
+            if full and rows:
+                table = XeroItemMirror.__table__
+                conn.execute(delete(table).where(table.c.item_id.notin_([r['item_id'] for r in rows])))
+            self._save_state(conn, ITEMS_RESOURCE, rows, started_at, full)
+
+        logger.info(f"Xero item mirror {'full' if full else 'delta'} sync: {len(rows)} items")
+        return len(rows)
+
+    @with_xero_priority(XeroPriority.BACKFILL)
+    def sync_contacts(self, full: bool = False) -> int:
+        """
+        Delta (or full) sync of Xero contacts, paging through results
+
+        Args:
+            full: Fetch everything and delete rows missing from Xero
+
+        Returns:
+            Number of contacts written
+        """
+        started_at = datetime.now(timezone.utc)
+        state = self._get_state(CONTACTS_RESOURCE)
+        modified_since = None if full else state.get('modified_since')
+
+        rows = []
+        page = 1
+        while True:
+            contacts = self.xero_client.list_contacts_page(page=page, modified_since=modified_since)
+            for contact in contacts:
+                if not contact.name:
+                    continue
+                status = contact.contact_status.value if contact.contact_status else 'ACTIVE'
+                rows.append(self._customer_row(
+                    XeroClient._contact_to_customer(contact), status, contact.updated_date_utc
+                ))
+            if len(contacts) < CONTACTS_PAGE_SIZE:
+                break
+            page += 1
+
+        with self.engine.begin() as conn:
+            if rows:
+                self._upsert_contacts(conn, rows)
+            if full and rows:
+                table = XeroContactMirror.__table__
+                conn.execute(delete(table).where(table.c.contact_id.notin_([r['contact_id'] for r in rows])))
+            self._save_state(conn, CONTACTS_RESOURCE, rows, started_at, full)
+
+        logger.info(f"Xero contact mirror {'full' if full else 'delta'} sync: {len(rows)} contacts")
+        return len(rows)
+
+    def sync(self, full: bool = False) -> Dict[str, int]:
+        """Sync items and contacts"""
+        result = {
+            'items': self.sync_items(full=full),
+            'contacts': self.sync_contacts(full=full),
+        }
+        self.stats['syncs'] += 1
+        self.stats['last_sync_at'] = datetime.now(timezone.utc).isoformat()
+        return result
+
+    def sync_if_due(self, now: Optional[datetime] = None) -> Optional[Dict[str, int]]:
+        """
+        Run the sync that is due, unless another worker is syncing
+
+        The advisory lock is held by an open transaction for the whole
+        sync, so concurrent workers skip the cycle instead of queueing.
+
+        Returns:
+            sync() result, or None if the lock is taken or no sync is due
+        """
+        with self.engine.begin() as lock_conn:
+            locked = lock_conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {'key': ADVISORY_LOCK_KEY}
+            ).scalar()
+            if not locked:
+                return None
+
+            full = plan_sync(
+                {resource: self._get_state(resource) for resource in (ITEMS_RESOURCE, CONTACTS_RESOURCE)},
+                now or datetime.now(timezone.utc),
+                self.sync_interval_seconds,
+                self.sync_interval_seconds * self.full_sync_every,
+            )
+            if full is None:
+                return None
+            return self.sync(full=full)
+
+    def _get_state(self, resource: str) -> Dict[str, Any]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(XeroSyncState.__table__).where(XeroSyncState.resource == resource)
+            ).mappings().first()
+        return dict(row) if row else {}
+
+    @staticmethod
+    def _save_state(conn, resource: str, rows: List[Dict[str, Any]], started_at: datetime, full: bool) -> None:
+        table = XeroSyncState.__table__
+        newest = max((r['xero_updated_at'] for r in rows if r['xero_updated_at']), default=None)
+
+        values = {
+            'resource': resource,
+            'modified_since': newest,
+            # Changes made while the sync ran are picked up next time
+            'last_synced_at': started_at,
+            'last_full_sync_at': started_at if full else None,
+        }
+        stmt = _insert(conn, table).values(values)
+        conn.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.resource],
+            set_={
+                'modified_since': _greatest(table.c.modified_since, stmt.excluded.modified_since),
+                'last_synced_at': stmt.excluded.last_synced_at,
+                'last_full_sync_at': func.coalesce(stmt.excluded.last_full_sync_at, table.c.last_full_sync_at),
+            }
+        ))
+
+    # ========================================================================
+    # WEBHOOK HANDLING
+    # ========================================================================
+
+    def invalidate_contact(self, contact_id: str) -> None:
+        """Remove a contact so the next lookup goes to Xero"""
+        table = XeroContactMirror.__table__
+        with self.engine.begin() as conn:
+            conn.execute(delete(table).where(table.c.contact_id == contact_id))
+
+    def invalidate_items(self, codes: Iterable[str]) -> None:
+        """Remove items so the next lookup goes to Xero"""
+        codes = list(codes)
+        if not codes:
+            return
+        table = XeroItemMirror.__table__
+        with self.engine.begin() as conn:
+            conn.execute(delete(table).where(table.c.code.in_(codes)))
+
+    @with_xero_priority(XeroPriority.BACKFILL)
+    def refresh_contact(self, contact_id: str) -> bool:
+        """
+        Re-fetch one contact after a CONTACT webhook event
+
+        Returns:
+            True if the contact was re-mirrored, False if it was only invalidated
+        """
+        self.invalidate_contact(contact_id)
+
+        contact = self.xero_client.get_contact(contact_id)
+        if contact is None or not contact.name:
+            return False
+
+        status = contact.contact_status.value if contact.contact_status else 'ACTIVE'
+        with self.engine.begin() as conn:
+            self._upsert_contacts(conn, [self._customer_row(
+                XeroClient._contact_to_customer(contact), status, contact.updated_date_utc
+            )])
+        return True
+
+    @with_xero_priority(XeroPriority.BACKFILL)
+    def refresh_invoice_items(self, invoice_id: str) -> int:
+        """
+        Re-fetch the items on an invoice after an INVOICE webhook event
+
+        Returns:
+            Number of items refreshed
+        """
+        codes = self.xero_client.get_invoice_item_codes(invoice_id)
+        if not codes:
+            return 0
+
+        self.invalidate_items(codes)
+        products = self.xero_client.check_inventory_bulk(codes)
+        self.store_products(products.values())
+        return sum(1 for p in products.values() if p)
+
+    # ========================================================================
+    # BACKGROUND SYNC
+    # ========================================================================
+
+    def start(self) -> None:
+        """Start the background delta sync thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="xero-mirror-sync", daemon=True)
+        self._thread.start()
+        logger.info(f"Xero mirror sync started (interval: {self.sync_interval_seconds}s)")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Signal the background thread to stop and wait for it"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info("Xero mirror sync stopped")
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.sync_if_due()
+            except Exception as e:
+                self.stats['sync_errors'] += 1
+                logger.error(f"Xero mirror sync failed: {e}")
+            self._stop_event.wait(self.sync_interval_seconds)
+
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+_global_mirror: Optional[XeroMirror] = None
+
+
+def get_xero_mirror() -> XeroMirror:
+    """
+    Get or create global Xero mirror
+
+    Returns:
+        XeroMirror instance
+    """
+    global _global_mirror
+    if _global_mirror is None:
+        _global_mirror = XeroMirror()
+    return _global_mirror
@@ -11,7 +11,9 @@ End-to-end workflow orchestrator that integrates:
 6. Order finalization
 7. Invoice generation and posting
 
-All orchestrated with AI agents providing status updates.
+All orchestrated with AI agents providing status updates. Independent
+stages (customer verification, inventory check, price lookup) run in
+parallel via utils.stage_graph.
 
 Production-grade implementation:
 - Real Xero integration (no mocks)
@@ -20,8 +22,10 @@ Production-grade implementation:
 - Centralized configuration
 """
 
+import uuid
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+import threading
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
 from enum import Enum
 
@@ -32,13 +36,29 @@ from integrations.xero_client import (
     XeroDraftOrder,
     XeroInvoice
 )
+from integrations.xero_mirror import XeroMirror, get_xero_mirror
+from integrations.timeline_store import AgentTimelineStore, get_timeline_store
 from config import config
 from database import get_db_engine
 from sqlalchemy import text
 from utils.compensating_transactions import CompensatingTransactionManager
+from utils.stage_graph import Stage, StageFailure, run_stage_graph
+from production.rate_limiting import XeroPriority, with_xero_priority, xero_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# Workflow stages running at once; also capped at the Xero burst capacity
+WORKFLOW_STAGE_CONCURRENCY = 3
+
+# Agent whose timeline entry receives each stage's timing
+STAGE_AGENTS = {
+    'verify_customer': "🎧 Customer Service",
+    'check_inventory': "📦 Inventory Manager",
+    'create_draft_order': "🚚 Delivery Coordinator",
+    'finalize_order': "🎯 Operations Orchestrator",
+    'post_invoice': "💰 Finance Controller",
+}
+
 
 class AgentStatus(str, Enum):
     """Agent execution status"""
@@ -78,9 +98,25 @@ class XeroOrderOrchestrator:
     """
 
     def __init__(self):
-        """Initialize orchestrator with Xero client"""
+        """Initialize orchestrator with Xero client and local Xero mirror"""
         self.xero_client = get_xero_client()
         self.agent_timeline: List[Dict[str, Any]] = []
+        self._timeline_lock = threading.RLock()  # Parallel stages update the timeline
+        self._persisted_agents: Set[str] = set()  # Timeline entries already stored
+
+        # Mirror reads avoid Xero calls per order; API remains the fallback
+        try:
+            self.xero_mirror: Optional[XeroMirror] = get_xero_mirror()
+        except Exception as e:
+            logger.warning(f"Xero mirror unavailable, using Xero API for lookups: {e}")
+            self.xero_mirror = None
+
+        # Finished stages are persisted for /api/v1/generated-outputs
+        try:
+            self.timeline_store: Optional[AgentTimelineStore] = get_timeline_store()
+        except Exception as e:
+            logger.warning(f"Timeline store unavailable, agent timelines will not be persisted: {e}")
+            self.timeline_store = None
 
     def _update_agent_status(
         self,
@@ -111,50 +147,129 @@ class XeroOrderOrchestrator:
             "💰 Finance Controller": "finance"
         }
 
-        now = datetime.now()
+        with self._timeline_lock:
+            now = datetime.now()
 
-        # Find existing agent or create new
-        agent_entry = next(
-            (a for a in self.agent_timeline if a['agent_name'] == agent_name),
-            None
-        )
+            # Find existing agent or create new
+            agent_entry = next(
+                (a for a in self.agent_timeline if a['agent_name'] == agent_name),
+                None
+            )
 
-        if agent_entry:
-            agent_entry['status'] = status.value
-            agent_entry['progress'] = progress
-            agent_entry['updated_at'] = now.isoformat()
-            agent_entry['updated_timestamp'] = now.timestamp()
-            if current_task:
-                agent_entry['current_task'] = current_task
-            if details:
-                agent_entry['details'] = details
-            if metadata:
-                # Merge metadata instead of replacing
-                if 'metadata' not in agent_entry:
-                    agent_entry['metadata'] = {}
-                agent_entry['metadata'].update(metadata)
-            if status == AgentStatus.COMPLETED:
-                agent_entry['end_time'] = now.timestamp()
-                agent_entry['completed_at'] = now.isoformat()
-        else:
-            self.agent_timeline.append({
-                'agent_name': agent_name,
-                'status': status.value,
-                'progress': progress,
-                'current_task': current_task or '',
-                'details': details or [],
-                'category': category_map.get(agent_name, 'general'),
-                'date': now.strftime('%Y-%m-%d'),
-                'time': now.strftime('%H:%M:%S'),
-                'start_time': now.timestamp(),
-                'started_at': now.isoformat(),
-                'updated_at': now.isoformat(),
-                'updated_timestamp': now.timestamp(),
-                'end_time': None,
-                'completed_at': None,
-                'metadata': metadata or {}
-            })
+            if agent_entry:
+                agent_entry['status'] = status.value
+                agent_entry['progress'] = progress
+                agent_entry['updated_at'] = now.isoformat()
+                agent_entry['updated_timestamp'] = now.timestamp()
+                if current_task:
+                    agent_entry['current_task'] = current_task
+                if details:
+                    agent_entry['details'] = details
+                if metadata:
+                    # Merge metadata instead of replacing
+                    if 'metadata' not in agent_entry:
+                        agent_entry['metadata'] = {}
+                    agent_entry['metadata'].update(metadata)
+                if status == AgentStatus.COMPLETED:
+                    agent_entry['end_time'] = now.timestamp()
+                    agent_entry['completed_at'] = now.isoformat()
+            else:
+                self.agent_timeline.append({
+                    'agent_name': agent_name,
+                    'status': status.value,
+                    'progress': progress,
+                    'current_task': current_task or '',
+                    'details': details or [],
+                    'category': category_map.get(agent_name, 'general'),
+                    'date': now.strftime('%Y-%m-%d'),
+                    'time': now.strftime('%H:%M:%S'),
+                    'start_time': now.timestamp(),
+                    'started_at': now.isoformat(),
+                    'updated_at': now.isoformat(),
+                    'updated_timestamp': now.timestamp(),
+                    'end_time': None,
+                    'completed_at': None,
+                    'metadata': metadata or {}
+                })
+
+    def _record_stage_timing(self, agent_name: str, timing: Dict[str, Any]):
+        """
+        Attach workflow stage timing to an agent's timeline entry.
+
+        Args:
+            agent_name: Agent that ran the stage
+            timing: StageTiming.to_dict() (stage, status, started_at, duration_ms)
+        """
+        with self._timeline_lock:
+            agent_entry = next(
+                (a for a in self.agent_timeline if a['agent_name'] == agent_name),
+                None
+            )
+            if agent_entry:
+                agent_entry['stage'] = timing['stage']
+                agent_entry['stage_started_at'] = timing['started_at']
+                agent_entry['duration_ms'] = timing['duration_ms']
+
+    def persist_timeline(
+        self,
+        workflow_id: str,
+        order_ref: Optional[str] = None,
+        agent_names: Optional[List[str]] = None
+    ) -> int:
+        """
+        Append agent timeline entries to the persistent timeline store.
+
+        Each agent's entry is stored once per workflow; entries already
+        persisted (e.g. when their stage finished) are skipped.
+
+        Never raises: a storage failure must not fail the Xero workflow.
+
+        Args:
+            workflow_id: Identifier for this workflow run
+            order_ref: Outlet or order reference
+            agent_names: Only persist these agents' entries (default: all)
 
+        Returns:
+            Number of events persisted
+        """
+        if not self.timeline_store:
+            return 0
+        try:
+            with self._timeline_lock:
+                entries = [
+                    dict(entry) for entry in self.agent_timeline
+                    if entry['agent_name'] not in self._persisted_agents
+                    and (agent_names is None or entry['agent_name'] in agent_names)
+                ]
+                self._persisted_agents.update(entry['agent_name'] for entry in entries)
+            return self.timeline_store.append(entries, workflow_id=workflow_id, order_ref=order_ref)
+        except Exception as e:
+            logger.error(f"Failed to persist agent timeline for workflow {workflow_id}: {e}")
+            return 0
+
+    def _get_unit_prices(self, line_items: List[Dict[str, Any]]) -> Dict[str, float]:
+        """
+        Catalog unit prices for all SKUs in one query.
+
+        Args:
+            line_items: Order line items
+
+        Returns:
+            Dict of SKU -> unit price (SKUs missing from the catalog are absent)
+        """
+        skus = sorted({item['sku'] for item in line_items if item.get('sku')})
+        if not skus:
+            return {}
+
+        engine = get_db_engine(config.DATABASE_URL)
+        with engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT sku, unit_price FROM products WHERE sku = ANY(:skus)"),
+                {'skus': skus}
+            ).fetchall()
+        return {sku: float(unit_price) for sku, unit_price in rows}
+
+    @with_xero_priority(XeroPriority.ORDER)
     def verify_customer_in_xero(
         self,
         customer_name: str
@@ -179,8 +294,12 @@ class XeroOrderOrchestrator:
         )
 
         try:
-            # Check if customer exists
-            customer = self.xero_client.verify_customer(customer_name)
+            # Check if customer exists (local mirror first, Xero API on a miss)
+            customer = self.xero_mirror.get_contact_by_name(customer_name) if self.xero_mirror else None
+            if customer is None:
+                customer = self.xero_client.verify_customer(customer_name)
+                if customer and self.xero_mirror:
+                    self.xero_mirror.store_customer(customer)
 
             if customer:
                 logger.info(f"Customer found in Xero: {customer.name} (ID: {customer.contact_id})")
@@ -224,6 +343,7 @@ class XeroOrderOrchestrator:
             )
             raise
 
+    @with_xero_priority(XeroPriority.ORDER)
     def check_inventory_in_xero(
         self,
         line_items: List[Dict[str, Any]]
@@ -253,6 +373,17 @@ class XeroOrderOrchestrator:
         inventory_summary = []
 
         try:
+            # Local mirror first, then one bulk Xero lookup for the misses
+            skus = [item['sku'] for item in line_items if item.get('sku')]
+            products = self.xero_mirror.get_items(skus) if self.xero_mirror else {}
+
+            missing = [sku for sku in skus if sku not in products]
+            if missing:
+                fetched = self.xero_client.check_inventory_bulk(missing)
+                products.update(fetched)
+                if self.xero_mirror:
+                    self.xero_mirror.store_products(fetched.values())
+
             for item in line_items:
                 sku = item.get('sku')
                 requested_qty = item.get('quantity', 0)
@@ -262,8 +393,7 @@ class XeroOrderOrchestrator:
                     all_available = False
                     continue
 
-                # Check product in Xero
-                product = self.xero_client.check_inventory(sku)
+                product = products.get(sku)
 
                 if product:
                     # Product exists in Xero
@@ -379,11 +509,13 @@ class XeroOrderOrchestrator:
             )
             raise
 
+    @with_xero_priority(XeroPriority.ORDER)
     def create_draft_delivery_order(
         self,
         customer: XeroCustomer,
         line_items: List[Dict[str, Any]],
-        outlet_name: str
+        outlet_name: str,
+        unit_prices: Optional[Dict[str, float]] = None
     ) -> Optional[XeroDraftOrder]:
         """
         Create a draft delivery order in Xero.
@@ -392,6 +524,7 @@ class XeroOrderOrchestrator:
             customer: Xero customer object
             line_items: Order line items
             outlet_name: Outlet/customer name for reference
+            unit_prices: SKU -> catalog price (loaded if not provided)
 
         Returns:
             XeroDraftOrder if successful, None otherwise
@@ -408,29 +541,18 @@ class XeroOrderOrchestrator:
 
         try:
             # Build Xero line items with pricing from our database
-            xero_line_items = []
-            engine = get_db_engine(config.DATABASE_URL)
+            if unit_prices is None:
+                unit_prices = self._get_unit_prices(line_items)
 
-            for item in line_items:
-                sku = item.get('sku')
-                quantity = item.get('quantity', 0)
-                description = item.get('description', '')
-
-                # Get unit price from database
-                with engine.connect() as conn:
-                    result = conn.execute(
-                        text("SELECT unit_price FROM products WHERE sku = :sku"),
-                        {'sku': sku}
-                    )
-                    row = result.fetchone()
-                    unit_price = float(row[0]) if row else 0.0
-
-                xero_line_items.append({
-                    'item_code': sku,
-                    'description': description,
-                    'quantity': quantity,
-                    'unit_price': unit_price
-                })
+            xero_line_items = [
+                {
+                    'item_code': item.get('sku'),
+                    'description': item.get('description', ''),
+                    'quantity': item.get('quantity', 0),
+                    'unit_price': unit_prices.get(item.get('sku'), 0.0)
+                }
+                for item in line_items
+            ]
 
             # Create draft order in Xero
             reference = f"DO-{outlet_name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
@@ -493,6 +615,7 @@ class XeroOrderOrchestrator:
             )
             raise
 
+    @with_xero_priority(XeroPriority.ORDER)
     def finalize_order_in_xero(
         self,
         draft_order: XeroDraftOrder
@@ -553,11 +676,14 @@ class XeroOrderOrchestrator:
             )
             raise
 
+    @with_xero_priority(XeroPriority.ORDER)
     def post_invoice_to_xero(
         self,
         customer: XeroCustomer,
         line_items: List[Dict[str, Any]],
-        outlet_name: str
+        outlet_name: str,
+        unit_prices: Optional[Dict[str, float]] = None,
+        idempotency_key: Optional[str] = None
     ) -> Optional[XeroInvoice]:
         """
         Create and post invoice to Xero.
@@ -566,6 +692,9 @@ class XeroOrderOrchestrator:
             customer: Xero customer object
             line_items: Order line items
             outlet_name: Outlet/customer name for reference
+            unit_prices: SKU -> catalog price (loaded if not provided)
+            idempotency_key: Xero Idempotency-Key for the invoice (see
+                XeroClient.create_invoice)
 
         Returns:
             XeroInvoice if successful, None otherwise
@@ -582,37 +711,27 @@ class XeroOrderOrchestrator:
 
         try:
             # Build Xero line items with pricing and tax
-            xero_line_items = []
-            engine = get_db_engine(config.DATABASE_URL)
+            if unit_prices is None:
+                unit_prices = self._get_unit_prices(line_items)
 
-            for item in line_items:
-                sku = item.get('sku')
-                quantity = item.get('quantity', 0)
-                description = item.get('description', '')
-
-                # Get unit price from database
-                with engine.connect() as conn:
-                    result = conn.execute(
-                        text("SELECT unit_price FROM products WHERE sku = :sku"),
-                        {'sku': sku}
-                    )
-                    row = result.fetchone()
-                    unit_price = float(row[0]) if row else 0.0
-
-                xero_line_items.append({
-                    'item_code': sku,
-                    'description': description,
-                    'quantity': quantity,
-                    'unit_price': unit_price,
+            xero_line_items = [
+                {
+                    'item_code': item.get('sku'),
+                    'description': item.get('description', ''),
+                    'quantity': item.get('quantity', 0),
+                    'unit_price': unit_prices.get(item.get('sku'), 0.0),
                     'tax_type': config.XERO_TAX_TYPE
-                })
+                }
+                for item in line_items
+            ]
 
             # Create invoice in Xero
             reference = f"INV-{outlet_name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
             invoice = self.xero_client.create_invoice(
                 contact_id=customer.contact_id,
                 line_items=xero_line_items,
-                reference=reference
+                reference=reference,
+                idempotency_key=idempotency_key
             )
 
             # Prepare detailed invoice line items for output
@@ -679,23 +798,29 @@ class XeroOrderOrchestrator:
             )
             raise
 
+    @with_xero_priority(XeroPriority.ORDER)
     def execute_workflow(
         self,
-        parsed_order: Dict[str, Any]
+        parsed_order: Dict[str, Any],
+        invoice_idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Execute the complete order-to-invoice workflow with compensating transactions.
 
-        Workflow (with automatic rollback on failure):
-        1. Verify customer in Xero
-        2. Check inventory availability
-        3. Create draft delivery order ← REGISTER CLEANUP
-        4. (Customer confirms - simulated for demo)
-        5. Finalize order ← REGISTER CLEANUP
-        6. Post invoice ← REGISTER CLEANUP
+        Stages run as a dependency graph (utils.stage_graph). Independent
+        stages run concurrently, bounded by WORKFLOW_STAGE_CONCURRENCY and the
+        Xero burst capacity, so they never need more rate-limit tokens at once
+        than a single burst:
 
-        If any step fails after step 3, all completed Xero operations are
-        automatically rolled back to prevent orphaned resources.
+            verify_customer ─┐
+            check_inventory ─┼─> create_draft_order ─> finalize_order ─> post_invoice
+            load_prices ─────┘                         (customer confirmation
+                                                        simulated for demo)
+
+        Compensating actions are registered as soon as the draft order and
+        invoice exist. If any stage fails, stages already running finish and
+        all completed Xero operations are rolled back (LIFO) to prevent
+        orphaned resources.
 
         Args:
             parsed_order: Parsed order from chatbot with structure:
@@ -704,16 +829,21 @@ class XeroOrderOrchestrator:
                     "line_items": [{"sku": str, "quantity": int, "description": str}],
                     "is_urgent": bool
                 }
+            invoice_idempotency_key: Xero Idempotency-Key for the invoice, so
+                a retried workflow cannot post the same order twice
 
         Returns:
             Workflow result with structure:
                 {
                     "success": bool,
                     "stage": OrderWorkflowStage,
-                    "customer": XeroCustomer (if successful),
+                    "customer": XeroCustomer (if verified),
                     "draft_order": XeroDraftOrder (if created),
                     "invoice": XeroInvoice (if posted),
-                    "agent_timeline": List[Dict],
+                    "workflow_id": str (persisted timeline reference),
+                    "agent_timeline": List[Dict] (entries carry stage and duration_ms),
+                    "stage_timings": List[Dict],
+                    "failed_stage": str (if failed),
                     "error": str (if failed)
                 }
         """
@@ -722,128 +852,166 @@ class XeroOrderOrchestrator:
         outlet_name = parsed_order.get('outlet_name', 'Unknown')
         line_items = parsed_order.get('line_items', [])
 
-        self.agent_timeline = []  # Reset timeline
+        with self._timeline_lock:
+            self.agent_timeline = []  # Reset timeline
+            self._persisted_agents = set()
+        workflow_id = f"wf-{uuid.uuid4().hex[:16]}"
 
         # Initialize compensating transaction manager
         transaction = CompensatingTransactionManager(f"xero_order_{outlet_name}")
 
-        try:
-            # Stage 1: Verify customer (no compensating action needed - Xero handles idempotently)
-            customer, was_created = self.verify_customer_in_xero(outlet_name)
+        # Stage functions receive the results of completed stages.
+        # StageFailure = expected business outcome, returned as the error.
+        def verify_customer(results):
+            customer, _ = self.verify_customer_in_xero(outlet_name)
             if not customer:
-                return {
-                    "success": False,
-                    "stage": OrderWorkflowStage.ERROR,
-                    "agent_timeline": self.agent_timeline,
-                    "error": f"Customer not found in Xero: {outlet_name}"
-                }
+                raise StageFailure(f"Customer not found in Xero: {outlet_name}")
+            return customer
 
-            # Stage 2: Check inventory (no compensating action needed - read-only operation)
+        def check_inventory(results):
             inventory_ok, issues = self.check_inventory_in_xero(line_items)
             if not inventory_ok:
-                return {
-                    "success": False,
-                    "stage": OrderWorkflowStage.ERROR,
-                    "customer": customer,
-                    "agent_timeline": self.agent_timeline,
-                    "error": f"Inventory issues: {', '.join(issues)}"
-                }
+                raise StageFailure(f"Inventory issues: {', '.join(issues)}")
+            return issues
 
-            # Stage 3: Create draft delivery order
-            # CRITICAL: Register compensating action AFTER successful creation
-            draft_order = self.create_draft_delivery_order(customer, line_items, outlet_name)
-            if not draft_order:
-                return {
-                    "success": False,
-                    "stage": OrderWorkflowStage.ERROR,
-                    "customer": customer,
-                    "agent_timeline": self.agent_timeline,
-                    "error": "Failed to create draft delivery order"
-                }
+        def load_prices(results):
+            return self._get_unit_prices(line_items)
 
-            # COMPENSATING ACTION: Delete draft order if later steps fail
-            transaction.add_compensating_action(
-                step_name="create_draft_order",
-                compensate_func=self.xero_client.delete_draft_order,
-                compensate_args=(draft_order.order_id,),
-                context={
-                    "order_id": draft_order.order_id,
-                    "customer": customer.name,
-                    "outlet": outlet_name
-                }
+        def create_draft_order(results):
+            draft_order = self.create_draft_delivery_order(
+                results['verify_customer'], line_items, outlet_name,
+                unit_prices=results['load_prices']
             )
+            if not draft_order:
+                raise StageFailure("Failed to create draft delivery order")
+            return draft_order
 
-            # Stage 4: Customer confirmation (simulated for demo)
+        def finalize_order(results):
             logger.info("Customer confirmation: APPROVED (simulated for demo)")
-
-            # Stage 5: Finalize order
             # NOTE: Once finalized, the order cannot be easily deleted (only cancelled)
-            # We keep the compensating action to attempt cleanup even for finalized orders
-            finalized = self.finalize_order_in_xero(draft_order)
-            if not finalized:
-                # Rollback draft order before returning error
-                transaction.rollback()
-                return {
-                    "success": False,
-                    "stage": OrderWorkflowStage.ERROR,
-                    "customer": customer,
-                    "draft_order": draft_order,
-                    "agent_timeline": self.agent_timeline,
-                    "error": "Failed to finalize delivery order"
-                }
-
-            # Stage 6: Post invoice
-            # CRITICAL: Register compensating action AFTER successful creation
-            invoice = self.post_invoice_to_xero(customer, line_items, outlet_name)
+            # The draft's compensating action still attempts cleanup
+            if not self.finalize_order_in_xero(results['create_draft_order']):
+                raise StageFailure("Failed to finalize delivery order")
+            return True
+
+        def post_invoice(results):
+            invoice = self.post_invoice_to_xero(
+                results['verify_customer'], line_items, outlet_name,
+                unit_prices=results['load_prices'],
+                idempotency_key=invoice_idempotency_key
+            )
             if not invoice:
-                # Rollback all Xero operations (draft order, finalized order)
-                transaction.rollback()
-                return {
-                    "success": False,
-                    "stage": OrderWorkflowStage.ERROR,
-                    "customer": customer,
-                    "draft_order": draft_order,
-                    "agent_timeline": self.agent_timeline,
-                    "error": "Failed to create invoice"
-                }
+                raise StageFailure("Failed to create invoice")
+            return invoice
 
-            # COMPENSATING ACTION: Void invoice if later steps fail
-            transaction.add_compensating_action(
-                step_name="create_invoice",
-                compensate_func=self.xero_client.void_invoice,
-                compensate_args=(invoice.invoice_id,),
-                context={
-                    "invoice_id": invoice.invoice_id,
-                    "invoice_number": invoice.invoice_number,
-                    "customer": customer.name
-                }
-            )
+        # Runs in this thread as each stage completes
+        def register_compensation(stage_name, result):
+            if stage_name == 'create_draft_order':
+                transaction.add_compensating_action(
+                    step_name="create_draft_order",
+                    compensate_func=self.xero_client.delete_draft_order,
+                    compensate_args=(result.order_id,),
+                    context={
+                        "order_id": result.order_id,
+                        "contact_id": result.contact_id,
+                        "outlet": outlet_name
+                    }
+                )
+            elif stage_name == 'post_invoice':
+                transaction.add_compensating_action(
+                    step_name="create_invoice",
+                    compensate_func=self.xero_client.void_invoice,
+                    compensate_args=(result.invoice_id,),
+                    context={
+                        "invoice_id": result.invoice_id,
+                        "invoice_number": result.invoice_number,
+                        "outlet": outlet_name
+                    }
+                )
 
+        # Store each agent's entry as soon as its stage finishes, so the
+        # timeline survives a worker crash later in the workflow
+        def persist_stage(timing):
+            agent_name = STAGE_AGENTS.get(timing.name)
+            if agent_name:
+                self._record_stage_timing(agent_name, timing.to_dict())
+                self.persist_timeline(workflow_id, order_ref=outlet_name, agent_names=[agent_name])
+
+        stages = [
+            Stage('verify_customer', verify_customer),
+            Stage('check_inventory', check_inventory),
+            Stage('load_prices', load_prices),
+            Stage('create_draft_order', create_draft_order,
+                  depends_on=('verify_customer', 'check_inventory', 'load_prices')),
+            Stage('finalize_order', finalize_order, depends_on=('create_draft_order',)),
+            Stage('post_invoice', post_invoice, depends_on=('finalize_order',)),
+        ]
+        max_concurrency = max(1, min(WORKFLOW_STAGE_CONCURRENCY, int(xero_rate_limiter.capacity)))
+
+        try:
+            graph = run_stage_graph(stages, max_concurrency=max_concurrency,
+                                    on_complete=register_compensation, on_finish=persist_stage)
+        except Exception as e:
+            logger.error(f"Workflow error: {e} - Rolling back Xero operations")
+            transaction.rollback(error=e)
+            self.persist_timeline(workflow_id, order_ref=outlet_name)
+            return {
+                "success": False,
+                "stage": OrderWorkflowStage.ERROR,
+                "workflow_id": workflow_id,
+                "agent_timeline": self.agent_timeline,
+                "error": f"Workflow error: {str(e)}"
+            }
+
+        stage_timings = [timing.to_dict() for timing in graph.timings]
+        # Agents whose stage never ran (skipped after a failure)
+        self.persist_timeline(workflow_id, order_ref=outlet_name)
+
+        completed = {
+            key: graph.results[stage]
+            for key, stage in (('customer', 'verify_customer'), ('draft_order', 'create_draft_order'))
+            if stage in graph.results
+        }
+
+        if graph.succeeded:
             # Success! Commit transaction (clears all compensating actions)
             transaction.commit()
 
-            logger.info(f"Workflow completed successfully for {outlet_name}")
+            invoice = graph.results['post_invoice']
+            logger.info(f"Workflow completed successfully for {outlet_name} in {graph.total_ms:.0f}ms")
             return {
                 "success": True,
                 "stage": OrderWorkflowStage.COMPLETED,
-                "customer": customer,
-                "draft_order": draft_order,
+                "workflow_id": workflow_id,
+                **completed,
                 "invoice": invoice,
                 "agent_timeline": self.agent_timeline,
+                "stage_timings": stage_timings,
                 "message": f"Order processed successfully! Invoice {invoice.invoice_number} posted to Xero."
             }
 
-        except Exception as e:
+        if isinstance(graph.error, StageFailure):
+            error_message = str(graph.error)
+            if transaction.actions:
+                transaction.rollback(error=graph.error)
+        else:
             # Automatic rollback on any exception
-            logger.error(f"Workflow error: {e} - Rolling back Xero operations")
-            transaction.rollback(error=e)
+            logger.error(
+                f"Workflow error in stage {graph.failed_stage}: {graph.error} - Rolling back Xero operations"
+            )
+            transaction.rollback(error=graph.error)
+            error_message = f"Workflow error: {str(graph.error)}"
 
-            return {
-                "success": False,
-                "stage": OrderWorkflowStage.ERROR,
-                "agent_timeline": self.agent_timeline,
-                "error": f"Workflow error: {str(e)}"
-            }
+        return {
+            "success": False,
+            "stage": OrderWorkflowStage.ERROR,
+            "workflow_id": workflow_id,
+            **completed,
+            "agent_timeline": self.agent_timeline,
+            "stage_timings": stage_timings,
+            "failed_stage": graph.failed_stage,
+            "error": error_message
+        }
 
     def get_timeline_filtered(
         self,
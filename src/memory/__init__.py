@@ -10,9 +10,12 @@ NO MOCKING - All operations use real database.
 
 from .session_manager import SessionManager
 from .context_builder import build_conversation_context, format_messages_for_gpt4
+from .user_analytics import UserAnalyticsAggregator, get_user_analytics_aggregator
 
 __all__ = [
     "SessionManager",
     "build_conversation_context",
-    "format_messages_for_gpt4"
+    "format_messages_for_gpt4",
+    "UserAnalyticsAggregator",
+    "get_user_analytics_aggregator"
 ]
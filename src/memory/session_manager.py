@@ -244,6 +244,10 @@ class SessionManager:
         """
         Update user analytics/interaction summary
 
+        Summaries are derived from conversation_sessions and
+        conversation_messages by UserAnalyticsAggregator in the background,
+        so the request path has nothing to write here.
+
         Args:
             user_id: User identifier
             outlet_id: Outlet ID if known
@@ -253,8 +257,6 @@ class SessionManager:
         Returns:
             True if updated successfully
         """
-        # TODO: Implement full analytics update in ConversationMemoryManager
-        # For now, just log and return True to prevent errors
         logger.debug(
             f"Analytics update for user {user_id[:8]}... "
             f"(outlet: {outlet_id}, lang: {language}, intent: {intent})"
@@ -0,0 +1,507 @@
+"""
+Incremental User Interaction Summaries
+======================================
+
+Background aggregation of conversation activity into
+user_interaction_summaries, off the chatbot request path.
+
+Architecture:
+- Source: conversation_sessions and conversation_messages rows are the
+  event log; the consumer tails them by id
+- Watermarks: the last folded id of each source lives in
+  analytics_watermarks and is advanced in the same transaction as the
+  summary upsert, so every row is applied exactly once
+- Batching: a batch of rows is folded into one delta per user in Python,
+  then written with a single multi-row INSERT ... ON CONFLICT DO UPDATE
+  that adds counters and merges common_intents JSONB by summing counts
+- Single consumer: a transaction-level advisory lock lets every API
+  worker run the loop while only one of them does work at a time
+- Commit lag: rows younger than commit_lag_seconds are left for the next
+  batch so ids from still-open transactions are not skipped
+
+Rebuild:
+- rebuild() recomputes every summary from the conversations currently
+  retained and resets the watermarks, in one transaction. Use for the
+  initial backfill or after data repair; it cannot recover counts for
+  conversations already removed by data retention.
+
+NO MOCKING - Real PostgreSQL upserts.
+"""
+
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import Engine, func, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from database import get_db_engine
+from models.conversation_orm import UserInteractionSummary
+
+logger = logging.getLogger(__name__)
+
+
+SESSIONS_WATERMARK = 'user_summaries.sessions'
+MESSAGES_WATERMARK = 'user_summaries.messages'
+
+# pg_try_advisory_xact_lock key for the summary consumer
+ADVISORY_LOCK_KEY = 2029_0001
+
+# Placeholder intent logged before classification completes
+IGNORED_INTENTS = frozenset({'pending'})
+
+
+@dataclass
+class SummaryDelta:
+    """
+    Change to apply to one user's interaction summary
+
+    Attributes:
+        user_id: User identifier
+        outlet_id: Latest known outlet (None keeps the stored value)
+        language: Latest session language (None keeps the stored value)
+        conversations: New sessions to add
+        messages: New messages to add
+        intents: Intent counts to add to common_intents
+        first_interaction: Earliest activity in this delta
+        last_interaction: Latest activity in this delta
+    """
+    user_id: str
+    outlet_id: Optional[int] = None
+    language: Optional[str] = None
+    conversations: int = 0
+    messages: int = 0
+    intents: Counter = field(default_factory=Counter)
+    first_interaction: Optional[datetime] = None
+    last_interaction: Optional[datetime] = None
+
+    def _touch(self, at: Optional[datetime]) -> None:
+        if at is None:
+            return
+        if self.first_interaction is None or at < self.first_interaction:
+            self.first_interaction = at
+        if self.last_interaction is None or at > self.last_interaction:
+            self.last_interaction = at
+
+    def add_session(self, outlet_id: Optional[int], language: Optional[str],
+                    start_time: Optional[datetime]) -> None:
+        """Fold one new conversation session into the delta"""
+        self.conversations += 1
+        if outlet_id is not None:
+            self.outlet_id = outlet_id
+        if language:
+            self.language = language
+        self._touch(start_time)
+
+    def add_message(self, intent: Optional[str], timestamp: Optional[datetime]) -> None:
+        """Fold one new message into the delta"""
+        self.messages += 1
+        if intent and intent not in IGNORED_INTENTS:
+            self.intents[intent] += 1
+        self._touch(timestamp)
+
+    def to_row(self) -> Dict[str, Any]:
+        """Insert values for user_interaction_summaries"""
+        return {
+            'user_id': self.user_id,
+            'outlet_id': self.outlet_id,
+            'total_conversations': self.conversations,
+            'total_messages': self.messages,
+            'common_intents': dict(self.intents),
+            'analytics_metadata': {},
+            'preferred_language': self.language or 'en',
+            'avg_satisfaction': 0.0,
+            'first_interaction': self.first_interaction,
+            'last_interaction': self.last_interaction,
+        }
+
+
+def fold_events(
+    session_rows: Iterable[Dict[str, Any]],
+    message_rows: Iterable[Dict[str, Any]]
+) -> Dict[str, SummaryDelta]:
+    """
+    Fold raw session and message rows into one delta per user
+
+    Args:
+        session_rows: Dicts with user_id, outlet_id, language, start_time
+        message_rows: Dicts with user_id, intent, timestamp
+
+    Returns:
+        Mapping of user_id to SummaryDelta
+    """
+    deltas: Dict[str, SummaryDelta] = {}
+
+    for row in session_rows:
+        delta = deltas.setdefault(row['user_id'], SummaryDelta(user_id=row['user_id']))
+        delta.add_session(row.get('outlet_id'), row.get('language'), row.get('start_time'))
+
+    for row in message_rows:
+        delta = deltas.setdefault(row['user_id'], SummaryDelta(user_id=row['user_id']))
+        delta.add_message(row.get('intent'), row.get('timestamp'))
+
+    return deltas
+
+
+def _summary_upsert(rows: List[Dict[str, Any]]):
+    """Multi-row upsert that adds counters and sums common_intents"""
+    table = UserInteractionSummary.__table__
+    stmt = pg_insert(table).values([
+        {('metadata' if k == 'analytics_metadata' else k): v for k, v in row.items()}
+        for row in rows
+    ])
+    excluded = stmt.excluded
+
+    # JSONB merge with per-key addition: {"order": 3} + {"order": 1} -> {"order": 4}
+    merged_intents = literal_column("""(
+        SELECT COALESCE(jsonb_object_agg(key, total), '{}'::jsonb)
+        FROM (
+            SELECT key, SUM(value::bigint) AS total
+            FROM (
+                SELECT key, value FROM jsonb_each_text(user_interaction_summaries.common_intents)
+                UNION ALL
+                SELECT key, value FROM jsonb_each_text(excluded.common_intents)
+            ) AS kv
+            GROUP BY key
+        ) AS sums
+    )""")
+
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={
+            'total_conversations': table.c.total_conversations + excluded.total_conversations,
+            'total_messages': table.c.total_messages + excluded.total_messages,
+            'common_intents': merged_intents,
+            'outlet_id': func.coalesce(excluded.outlet_id, table.c.outlet_id),
+            # Language comes from sessions; message-only deltas keep the stored one
+            'preferred_language': literal_column(
+                "CASE WHEN excluded.total_conversations > 0 "
+                "THEN excluded.preferred_language "
+                "ELSE user_interaction_summaries.preferred_language END"
+            ),
+            # LEAST/GREATEST ignore NULLs in PostgreSQL
+            'first_interaction': func.least(table.c.first_interaction, excluded.first_interaction),
+            'last_interaction': func.greatest(table.c.last_interaction, excluded.last_interaction),
+            'updated_at': func.now(),
+        }
+    )
+
+
+# Rebuild from retained conversations, bounded by the captured max ids
+_REBUILD_SQL = text("""
+    WITH sessions AS (
+        SELECT user_id,
+               COUNT(*) AS conversations,
+               MIN(start_time) AS first_interaction,
+               (ARRAY_AGG(outlet_id ORDER BY start_time DESC)
+                    FILTER (WHERE outlet_id IS NOT NULL))[1] AS outlet_id,
+               (ARRAY_AGG(language ORDER BY start_time DESC))[1] AS language
+        FROM conversation_sessions
+        WHERE id <= :max_session_id
+        GROUP BY user_id
+    ),
+    messages AS (
+        SELECT s.user_id, COUNT(*) AS messages, MAX(m.timestamp) AS last_interaction
+        FROM conversation_messages m
+        JOIN conversation_sessions s ON s.session_id = m.session_id
+        WHERE m.id <= :max_message_id
+        GROUP BY s.user_id
+    ),
+    intents AS (
+        SELECT user_id, jsonb_object_agg(intent, n) AS common_intents
+        FROM (
+            SELECT s.user_id, m.intent, COUNT(*) AS n
+            FROM conversation_messages m
+            JOIN conversation_sessions s ON s.session_id = m.session_id
+            WHERE m.id <= :max_message_id
+            AND m.intent IS NOT NULL
+            AND m.intent <> ALL(:ignored_intents)
+            GROUP BY s.user_id, m.intent
+        ) AS per_intent
+        GROUP BY user_id
+    )
+    INSERT INTO user_interaction_summaries (
+        user_id, outlet_id, total_conversations, total_messages, common_intents,
+        metadata, preferred_language, avg_satisfaction, first_interaction, last_interaction
+    )
+    SELECT se.user_id,
+           se.outlet_id,
+           se.conversations,
+           COALESCE(me.messages, 0),
+           COALESCE(i.common_intents, '{}'::jsonb),
+           '{}'::jsonb,
+           COALESCE(se.language, 'en'),
+           0.0,
+           se.first_interaction,
+           COALESCE(me.last_interaction, se.first_interaction)
+    FROM sessions se
+    LEFT JOIN messages me ON me.user_id = se.user_id
+    LEFT JOIN intents i ON i.user_id = se.user_id
+    ON CONFLICT (user_id) DO UPDATE SET
+        outlet_id = COALESCE(EXCLUDED.outlet_id, user_interaction_summaries.outlet_id),
+        total_conversations = EXCLUDED.total_conversations,
+        total_messages = EXCLUDED.total_messages,
+        common_intents = EXCLUDED.common_intents,
+        preferred_language = EXCLUDED.preferred_language,
+        first_interaction = EXCLUDED.first_interaction,
+        last_interaction = EXCLUDED.last_interaction,
+        updated_at = NOW()
+""")
+
+_SET_WATERMARK_SQL = text("""
+    INSERT INTO analytics_watermarks (name, last_id, updated_at)
+    VALUES (:name, :last_id, NOW())
+    ON CONFLICT (name) DO UPDATE SET last_id = EXCLUDED.last_id, updated_at = NOW()
+""")
+
+
+class UserAnalyticsAggregator:
+    """
+    Incremental consumer that keeps user_interaction_summaries current
+
+    Usage:
+        aggregator = UserAnalyticsAggregator()
+        aggregator.start()          # background thread in the API process
+        ...
+        aggregator.stop()
+
+        # or from a script / cron
+        aggregator.run_until_caught_up()
+        aggregator.rebuild()
+    """
+
+    def __init__(
+        self,
+        engine: Optional[Engine] = None,
+        batch_size: int = 5000,
+        interval_seconds: float = 30.0,
+        commit_lag_seconds: float = 5.0
+    ):
+        """
+        Initialize aggregator
+
+        Args:
+            engine: SQLAlchemy engine (defaults to the global engine)
+            batch_size: Maximum source rows read per source per batch
+            interval_seconds: Sleep between batches once caught up
+            commit_lag_seconds: Ignore rows younger than this (in-flight ids)
+        """
+        self.engine = engine or get_db_engine()
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.commit_lag_seconds = commit_lag_seconds
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'batches': 0,
+            'sessions_folded': 0,
+            'messages_folded': 0,
+            'users_updated': 0,
+            'errors': 0,
+            'last_batch_at': None,
+        }
+
+    # ------------------------------------------------------------------
+    # Batch processing
+    # ------------------------------------------------------------------
+
+    def process_batch(self) -> Dict[str, int]:
+        """
+        Fold one batch of new sessions and messages into the summaries
+
+        Returns:
+            Dictionary with sessions, messages and users counts; sessions
+            and messages are -1 if another worker holds the consumer lock
+        """
+        with self.engine.begin() as conn:
+            locked = conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {'key': ADVISORY_LOCK_KEY}
+            ).scalar()
+            if not locked:
+                return {'sessions': -1, 'messages': -1, 'users': 0}
+
+            session_wm = self._get_watermark(conn, SESSIONS_WATERMARK)
+            message_wm = self._get_watermark(conn, MESSAGES_WATERMARK)
+
+            session_rows = conn.execute(text("""
+                SELECT id, user_id, outlet_id, language, start_time
+                FROM conversation_sessions
+                WHERE id > :after
+                AND created_at < NOW() - make_interval(secs => :lag)
+                ORDER BY id
+                LIMIT :limit
+            """), {
+                'after': session_wm, 'lag': self.commit_lag_seconds, 'limit': self.batch_size
+            }).mappings().all()
+
+            message_rows = conn.execute(text("""
+                SELECT m.id, s.user_id, m.intent, m.timestamp
+                FROM conversation_messages m
+                JOIN conversation_sessions s ON s.session_id = m.session_id
+                WHERE m.id > :after
+                AND m.created_at < NOW() - make_interval(secs => :lag)
+                ORDER BY m.id
+                LIMIT :limit
+            """), {
+                'after': message_wm, 'lag': self.commit_lag_seconds, 'limit': self.batch_size
+            }).mappings().all()
+
+            if not session_rows and not message_rows:
+                return {'sessions': 0, 'messages': 0, 'users': 0}
+
+            deltas = fold_events(session_rows, message_rows)
+            conn.execute(_summary_upsert([d.to_row() for d in deltas.values()]))
+
+            if session_rows:
+                conn.execute(_SET_WATERMARK_SQL, {
+                    'name': SESSIONS_WATERMARK, 'last_id': session_rows[-1]['id']
+                })
+            if message_rows:
+                conn.execute(_SET_WATERMARK_SQL, {
+                    'name': MESSAGES_WATERMARK, 'last_id': message_rows[-1]['id']
+                })
+
+        self.stats['batches'] += 1
+        self.stats['sessions_folded'] += len(session_rows)
+        self.stats['messages_folded'] += len(message_rows)
+        self.stats['users_updated'] += len(deltas)
+        self.stats['last_batch_at'] = datetime.utcnow().isoformat()
+
+        logger.debug(
+            f"[ANALYTICS] Folded {len(session_rows)} sessions, {len(message_rows)} messages "
+            f"into {len(deltas)} user summaries"
+        )
+        return {'sessions': len(session_rows), 'messages': len(message_rows), 'users': len(deltas)}
+
+    def run_until_caught_up(self, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """
+        Process batches until no full batch remains
+
+        Args:
+            max_batches: Optional safety limit on batches
+
+        Returns:
+            Totals across all processed batches
+        """
+        totals = {'batches': 0, 'sessions': 0, 'messages': 0, 'users': 0}
+
+        while max_batches is None or totals['batches'] < max_batches:
+            result = self.process_batch()
+            if result['sessions'] < 0:
+                logger.info("[ANALYTICS] Another worker holds the consumer lock")
+                break
+
+            totals['batches'] += 1
+            totals['sessions'] += result['sessions']
+            totals['messages'] += result['messages']
+            totals['users'] += result['users']
+
+            if max(result['sessions'], result['messages']) < self.batch_size:
+                break
+
+        return totals
+
+    def rebuild(self) -> Dict[str, int]:
+        """
+        Recompute all summaries from retained conversations and reset watermarks
+
+        avg_satisfaction and metadata are preserved.
+
+        Returns:
+            Dictionary with users rebuilt and the new watermark ids
+        """
+        with self.engine.begin() as conn:
+            # Blocks until the incremental consumer finishes its batch
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': ADVISORY_LOCK_KEY})
+
+            max_session_id = conn.execute(
+                text("SELECT COALESCE(MAX(id), 0) FROM conversation_sessions")
+            ).scalar()
+            max_message_id = conn.execute(
+                text("SELECT COALESCE(MAX(id), 0) FROM conversation_messages")
+            ).scalar()
+
+            result = conn.execute(_REBUILD_SQL, {
+                'max_session_id': max_session_id,
+                'max_message_id': max_message_id,
+                'ignored_intents': list(IGNORED_INTENTS),
+            })
+
+            conn.execute(_SET_WATERMARK_SQL, {'name': SESSIONS_WATERMARK, 'last_id': max_session_id})
+            conn.execute(_SET_WATERMARK_SQL, {'name': MESSAGES_WATERMARK, 'last_id': max_message_id})
+
+        logger.info(
+            f"[ANALYTICS] Rebuilt {result.rowcount} user summaries "
+            f"(sessions <= {max_session_id}, messages <= {max_message_id})"
+        )
+        return {
+            'users': result.rowcount,
+            'session_watermark': max_session_id,
+            'message_watermark': max_message_id,
+        }
+
+    @staticmethod
+    def _get_watermark(conn, name: str) -> int:
+        value = conn.execute(
+            text("SELECT last_id FROM analytics_watermarks WHERE name = :name"),
+            {'name': name}
+        ).scalar()
+        return value or 0
+
+    # ------------------------------------------------------------------
+    # Background thread
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background consumer thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="user-analytics-aggregator", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"[ANALYTICS] Aggregator started (interval: {self.interval_seconds}s)")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Signal the background thread to stop and wait for it"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info("[ANALYTICS] Aggregator stopped")
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.run_until_caught_up()
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"[ANALYTICS] Aggregation batch failed: {e}")
+            self._stop_event.wait(self.interval_seconds)
+
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+_global_aggregator: Optional[UserAnalyticsAggregator] = None
+
+
+def get_user_analytics_aggregator() -> UserAnalyticsAggregator:
+    """
+    Get or create global user analytics aggregator
+
+    Returns:
+        UserAnalyticsAggregator instance
+    """
+    global _global_aggregator
+    if _global_aggregator is None:
+        _global_aggregator = UserAnalyticsAggregator()
+    return _global_aggregator
@@ -14,7 +14,7 @@ Architecture:
 NO MOCKING - Real PostgreSQL with production-ready patterns.
 """
 
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, Index
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Boolean, DateTime, Text, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
@@ -35,7 +35,9 @@ class ConversationSession(Base):
 
     # Primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
-    session_id = Column(String(36), unique=True, nullable=False, index=True,
+    # Unique together with start_time (the partition key, see
+    # privacy.partition_manager); session IDs are UUID4
+    session_id = Column(String(36), nullable=False, index=True,
                        default=lambda: str(uuid.uuid4()))
 
     # Core fields
@@ -63,6 +65,7 @@ class ConversationSession(Base):
 
     # Indexes for performance
     __table_args__ = (
+        UniqueConstraint('session_id', 'start_time', name='uq_session_session_id_start_time'),
         Index('idx_session_user_created', 'user_id', 'created_at'),
         Index('idx_session_outlet_created', 'outlet_id', 'created_at'),
         Index('idx_session_start_time', 'start_time'),
@@ -212,6 +215,29 @@ class UserInteractionSummary(Base):
         }
 
 
+class AnalyticsWatermark(Base):
+    """
+    Consumer position for incremental analytics pipelines
+
+    Stores the highest source row id already folded into an aggregate,
+    updated in the same transaction as the aggregate itself.
+    """
+    __tablename__ = 'analytics_watermarks'
+
+    name = Column(String(100), primary_key=True)  # e.g. "user_summaries.messages"
+    last_id = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False,
+                       server_default=func.now(), onupdate=func.now())
+
+    def to_dict(self):
+        """Convert to dictionary for API responses"""
+        return {
+            'name': self.name,
+            'last_id': self.last_id,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
 def create_tables(engine):
     """
     Create all conversation tables in PostgreSQL
@@ -8,7 +8,7 @@ Replaces DataFlow auto-generated nodes with standard ORM patterns.
 NO MOCKING - Real PostgreSQL with production-ready patterns.
 """
 
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, Text, Date, Numeric, Index
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Boolean, DateTime, Text, Date, Numeric, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
@@ -151,6 +151,10 @@ class Order(Base):
         Index('idx_order_outlet_created', 'outlet_id', 'created_at'),
         Index('idx_order_status', 'status'),
         Index('idx_order_escalated', 'escalated'),
+        # Keyset pagination on (created_at, id) - see list_orders_page
+        Index('idx_order_created_id', 'created_at', 'id'),
+        Index('idx_order_status_created_id', 'status', 'created_at', 'id'),
+        Index('idx_order_outlet_created_id', 'outlet_id', 'created_at', 'id'),
     )
 
     def to_dict(self):
@@ -279,6 +283,268 @@ class Invoice(Base):
         }
 
 
+class XeroItemMirror(Base):
+    """
+    Local copy of a Xero inventory item
+
+    Kept current by integrations.xero_mirror (delta sync + webhooks) so
+    order-time inventory checks do not need a Xero API call.
+    """
+    __tablename__ = 'xero_items_mirror'
+
+    # Primary key (Xero ItemID)
+    item_id = Column(String(64), primary_key=True)
+
+    # Core fields
+    code = Column(String(100), unique=True, nullable=False, index=True)
+    name = Column(String(200), nullable=False)
+    description = Column(Text, nullable=True)
+    unit_price = Column(Numeric(12, 4), nullable=False, default=0)
+    quantity_on_hand = Column(Numeric(14, 4), nullable=True)  # NULL when not tracked in Xero
+    is_sold = Column(Boolean, nullable=False, default=True)
+
+    # Sync bookkeeping
+    xero_updated_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Xero UpdatedDateUTC
+    synced_at = Column(DateTime(timezone=True), nullable=False,
+                       server_default=func.now(), index=True)
+
+    def to_dict(self):
+        """Convert to dictionary for API responses"""
+        return {
+            'item_id': self.item_id,
+            'code': self.code,
+            'name': self.name,
+            'description': self.description,
+            'unit_price': float(self.unit_price) if self.unit_price is not None else 0.0,
+            'quantity_on_hand': float(self.quantity_on_hand) if self.quantity_on_hand is not None else None,
+            'is_sold': self.is_sold,
+            'xero_updated_at': self.xero_updated_at.isoformat() if self.xero_updated_at else None,
+            'synced_at': self.synced_at.isoformat() if self.synced_at else None,
+        }
+
+
+class XeroContactMirror(Base):
+    """
+    Local copy of a Xero contact
+
+    Looked up by normalized name during customer verification.
+    """
+    __tablename__ = 'xero_contacts_mirror'
+
+    # Primary key (Xero ContactID)
+    contact_id = Column(String(64), primary_key=True)
+
+    # Core fields
+    name = Column(String(255), nullable=False)
+    name_normalized = Column(String(255), nullable=False, index=True)  # lower(trim(name))
+    email = Column(String(255), nullable=True)
+    phone = Column(String(50), nullable=True)
+    is_customer = Column(Boolean, nullable=False, default=True)
+    status = Column(String(20), nullable=False, default='ACTIVE')  # ACTIVE, ARCHIVED, GDPRREQUEST
+
+    # Sync bookkeeping
+    xero_updated_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    synced_at = Column(DateTime(timezone=True), nullable=False,
+                       server_default=func.now(), index=True)
+
+    def to_dict(self):
+        """Convert to dictionary for API responses"""
+        return {
+            'contact_id': self.contact_id,
+            'name': self.name,
+            'email': self.email,
+            'phone': self.phone,
+            'is_customer': self.is_customer,
+            'status': self.status,
+            'xero_updated_at': self.xero_updated_at.isoformat() if self.xero_updated_at else None,
+            'synced_at': self.synced_at.isoformat() if self.synced_at else None,
+        }
+
+
+class XeroSyncState(Base):
+    """
+    Delta sync position for a mirrored Xero resource
+
+    last_synced_at marks the end of the last successful sync; mirror rows
+    are trusted while it is recent. modified_since is the highest Xero
+    UpdatedDateUTC seen and is sent as If-Modified-Since next time.
+    """
+    __tablename__ = 'xero_sync_state'
+
+    resource = Column(String(50), primary_key=True)  # "items" or "contacts"
+    modified_since = Column(DateTime(timezone=True), nullable=True)
+    last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    last_full_sync_at = Column(DateTime(timezone=True), nullable=True)
+
+    def to_dict(self):
+        """Convert to dictionary for API responses"""
+        return {
+            'resource': self.resource,
+            'modified_since': self.modified_since.isoformat() if self.modified_since else None,
+            'last_synced_at': self.last_synced_at.isoformat() if self.last_synced_at else None,
+            'last_full_sync_at': self.last_full_sync_at.isoformat() if self.last_full_sync_at else None,
+        }
+
+
+class BackgroundJob(Base):
+    """
+    Durable background job (Xero posting, order finalization)
+
+    Claimed by workers with SELECT ... FOR UPDATE SKIP LOCKED; see
+    production.job_queue. idempotency_key makes enqueueing safe to repeat.
+    """
+    __tablename__ = 'background_jobs'
+
+    # Primary key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # Core fields
+    job_type = Column(String(100), nullable=False, index=True)
+    idempotency_key = Column(String(255), unique=True, nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(String(20), nullable=False, default='queued')  # queued, running, succeeded, dead
+    priority = Column(Integer, nullable=False, default=0)  # Lower runs first
+
+    # Retry bookkeeping
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=8)
+    run_after = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)  # Lease; expired leases are re-queued
+    last_error = Column(Text, nullable=True)
+    result = Column(JSONB, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), nullable=False,
+                       server_default=func.now(), index=True)
+    updated_at = Column(DateTime(timezone=True), nullable=False,
+                       server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Indexes
+    __table_args__ = (
+        # Claim query: WHERE status = 'queued' AND run_after <= now() ORDER BY priority, run_after
+        Index('idx_job_claim', 'status', 'priority', 'run_after'),
+        Index('idx_job_lease', 'status', 'locked_until'),
+    )
+
+    def to_dict(self):
+        """Convert to dictionary for API responses"""
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'idempotency_key': self.idempotency_key,
+            'payload': self.payload,
+            'status': self.status,
+            'priority': self.priority,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'run_after': self.run_after.isoformat() if self.run_after else None,
+            'locked_by': self.locked_by,
+            'last_error': self.last_error,
+            'result': self.result,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class AgentTimelineEvent(Base):
+    """
+    Final state of one agent's work in an order workflow (append-only)
+
+    Written by integrations.timeline_store as each workflow stage finishes;
+    read by /api/v1/generated-outputs with server-side filters.
+    """
+    __tablename__ = 'agent_timeline_events'
+
+    # Primary key
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # Workflow reference
+    workflow_id = Column(String(100), nullable=False, index=True)
+    order_ref = Column(String(255), nullable=True)  # Outlet / order reference
+
+    # Core fields (same shape as XeroOrderOrchestrator.agent_timeline entries)
+    agent_name = Column(String(100), nullable=False)
+    category = Column(String(20), nullable=False)  # inventory, delivery, finance, orders, general
+    status = Column(String(20), nullable=False)  # idle, processing, completed, error
+    progress = Column(Integer, nullable=False, default=0)
+    current_task = Column(Text, nullable=True)
+    details = Column(JSONB, nullable=False, default=list)
+    event_metadata = Column('metadata', JSONB, nullable=False, default=dict)
+    stage = Column(String(50), nullable=True)
+    duration_ms = Column(Float, nullable=True)
+
+    # Documents produced (extracted from metadata for the summary view)
+    do_number = Column(String(150), nullable=True)
+    invoice_number = Column(String(100), nullable=True)
+
+    # Timestamps
+    event_date = Column(Date, nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    recorded_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    # Indexes: every filter combination pages on (recorded_at, id)
+    __table_args__ = (
+        Index('idx_timeline_recorded_id', 'recorded_at', 'id'),
+        Index('idx_timeline_category_recorded_id', 'category', 'recorded_at', 'id'),
+        Index('idx_timeline_status_recorded_id', 'status', 'recorded_at', 'id'),
+        Index('idx_timeline_date_recorded_id', 'event_date', 'recorded_at', 'id'),
+        Index('idx_timeline_do_number', 'do_number', postgresql_where=do_number.isnot(None)),
+        Index('idx_timeline_invoice_number', 'invoice_number', postgresql_where=invoice_number.isnot(None)),
+    )
+
+    def to_dict(self):
+        """Convert to dictionary (agent_timeline entry shape)"""
+        return {
+            'id': self.id,
+            'workflow_id': self.workflow_id,
+            'order_ref': self.order_ref,
+            'agent_name': self.agent_name,
+            'category': self.category,
+            'status': self.status,
+            'progress': self.progress,
+            'current_task': self.current_task or '',
+            'details': self.details or [],
+            'metadata': self.event_metadata or {},
+            'stage': self.stage,
+            'duration_ms': self.duration_ms,
+            'date': self.event_date.isoformat() if self.event_date else None,
+            'time': self.started_at.strftime('%H:%M:%S') if self.started_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'recorded_at': self.recorded_at.isoformat() if self.recorded_at else None,
+        }
+
+
+class AgentTimelineRollup(Base):
+    """
+    Event counts per day, category and status
+
+    Incremented in the same transaction as each AgentTimelineEvent insert,
+    so grouped views read a handful of rows instead of scanning events.
+    """
+    __tablename__ = 'agent_timeline_rollups'
+
+    event_date = Column(Date, primary_key=True)
+    category = Column(String(20), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    event_count = Column(Integer, nullable=False, default=0)
+    total_duration_ms = Column(Float, nullable=False, default=0.0)
+
+    def to_dict(self):
+        """Convert to dictionary for API responses"""
+        return {
+            'date': self.event_date.isoformat() if self.event_date else None,
+            'category': self.category,
+            'status': self.status,
+            'count': self.event_count,
+            'total_duration_ms': self.total_duration_ms,
+        }
+
+
 def create_tables(engine):
     """
     Create all order management tables in PostgreSQL
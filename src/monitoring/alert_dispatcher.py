@@ -0,0 +1,196 @@
+"""
+Alert Notification Dispatcher
+=============================
+
+Sends AlertManager notifications off the metric-write path.
+
+- Triggered alerts are queued; a background thread collects everything
+  that arrives within ALERT_BATCH_SECONDS (default 2) of the first alert
+  and hands the batch to each channel once, so a burst of alerts becomes
+  one email / Slack message
+- Failed sends are retried with exponential backoff
+  (ALERT_NOTIFY_RETRIES, default 3; ALERT_RETRY_BASE_SECONDS, default 1);
+  a channel that sends alerts one at a time raises PartialSendError so
+  only the alerts not yet delivered are retried
+- The queue is bounded (ALERT_QUEUE_SIZE, default 1000); alerts beyond it
+  are dropped and counted rather than blocking the caller
+
+NO MOCKING - Real SMTP / HTTP calls through the channel senders.
+"""
+
+import os
+import queue
+import atexit
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .logger import app_logger
+
+
+# Channel sender: called with a batch of alerts, raises on failure
+ChannelSender = Callable[[List[Any]], None]
+
+_STOP = object()
+
+
+class PartialSendError(Exception):
+    """
+    Raised by a sender that delivered only the first `sent` alerts of a
+    batch; the dispatcher retries the rest
+    """
+
+    def __init__(self, sent: int, error: Exception):
+        super().__init__(str(error))
+        self.sent = sent
+        self.error = error
+
+
+class NotificationDispatcher:
+    """
+    Batched, retrying notification queue
+
+    Example:
+        >>> dispatcher = NotificationDispatcher({"slack": send_slack})
+        >>> dispatcher.dispatch(alert)   # returns immediately
+        >>> dispatcher.flush()
+    """
+
+    def __init__(
+        self,
+        senders: Dict[str, ChannelSender],
+        batch_seconds: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        retry_base_seconds: Optional[float] = None,
+        queue_size: Optional[int] = None
+    ):
+        """
+        Args:
+            senders: Channel name -> sender(alerts)
+            batch_seconds: How long to collect alerts into one batch
+            max_retries: Retries per channel and batch after the first attempt
+            retry_base_seconds: First retry delay (doubled per retry)
+            queue_size: Maximum queued alerts
+        """
+        self.senders = senders
+        self.batch_seconds = (
+            batch_seconds if batch_seconds is not None
+            else float(os.getenv("ALERT_BATCH_SECONDS", "2"))
+        )
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("ALERT_NOTIFY_RETRIES", "3"))
+        self.retry_base_seconds = (
+            retry_base_seconds if retry_base_seconds is not None
+            else float(os.getenv("ALERT_RETRY_BASE_SECONDS", "1"))
+        )
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size or int(os.getenv("ALERT_QUEUE_SIZE", "1000")))
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._idle = threading.Condition()
+        self._in_flight = 0
+
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def dispatch(self, alert: Any) -> bool:
+        """
+        Queue an alert for all channels (non-blocking)
+
+        Returns:
+            False if the queue was full and the alert was dropped
+        """
+        if not self.senders:
+            return True
+        self._ensure_worker()
+        with self._idle:
+            self._in_flight += 1
+        try:
+            self._queue.put_nowait(alert)
+            return True
+        except queue.Full:
+            self._done(1)
+            self.dropped += 1
+            app_logger.error("Alert notification queue full, alert dropped", rule_name=getattr(alert, "rule_name", None))
+            return False
+
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """Wait until queued alerts are sent (or have exhausted their retries)"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        self.flush(timeout)
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+                self._thread.start()
+                atexit.register(self.close, 5.0)
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            # Collect the rest of the burst
+            batch = [first]
+            deadline = time.monotonic() + self.batch_seconds
+            stop = False
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            for channel, sender in self.senders.items():
+                self._send_with_retry(channel, sender, batch)
+            self._done(len(batch))
+            if stop:
+                return
+
+    def _send_with_retry(self, channel: str, sender: ChannelSender, batch: List[Any]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                sender(batch)
+                self.sent += len(batch)
+                return
+            except Exception as e:
+                if isinstance(e, PartialSendError):
+                    # Never re-send what the channel already delivered
+                    self.sent += e.sent
+                    batch = batch[e.sent:]
+                    e = e.error
+                if attempt == self.max_retries:
+                    self.failed += len(batch)
+                    app_logger.error(
+                        f"Failed to send {channel} alert",
+                        error=e,
+                        alert_count=len(batch),
+                        attempts=attempt + 1
+                    )
+                    return
+                time.sleep(self.retry_base_seconds * (2 ** attempt))
+
+    def _done(self, count: int) -> None:
+        with self._idle:
+            self._in_flight -= count
+            if self._in_flight == 0:
+                self._idle.notify_all()
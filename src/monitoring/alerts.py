@@ -10,6 +10,11 @@ Features:
 3. Alert suppression (avoid notification spam)
 4. Alert history tracking
 5. Automatic recovery notifications
+6. Streaming evaluation: rules are re-evaluated when a metric they read is
+   written (at most every ALERT_EVAL_INTERVAL_SECONDS per rule), from
+   windowed aggregates whose cost doesn't grow with metric history
+7. Non-blocking notifications: batched and retried by a background
+   dispatcher (monitoring.alert_dispatcher)
 
 Alert Types:
 - High error rate
@@ -34,13 +39,17 @@ Usage:
         severity="critical"
     ))
 
-    # Check alerts
+    # Evaluate on metric writes (the global alert_manager is attached)
+    manager.attach()
+
+    # Or check everything now (custom checks and memory are only checked here)
     manager.check_alerts()
 """
 
 import os
 import time
 import smtplib
+import threading
 import requests
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, field
@@ -49,8 +58,31 @@ from enum import Enum
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-from .metrics import metrics_collector, cache_metrics, error_metrics, memory_metrics
+from .metrics import (
+    MetricsCollector,
+    CacheMetrics,
+    ErrorMetrics,
+    MemoryMetrics,
+    metrics_collector
+)
 from .logger import app_logger
+from .alert_dispatcher import NotificationDispatcher, PartialSendError
+
+
+# Metrics whose writes trigger re-evaluation of rules on each alert metric
+METRIC_SOURCES: Dict[str, tuple] = {
+    "error_rate_per_minute": ("errors_total",),
+    "response_time_p95": ("response_time_ms",),
+    "response_time_mean": ("response_time_ms",),
+    "cache_hit_rate": ("cache_requests",),
+    "memory_mb": ("memory_mb",),
+    "rate_limit_block_rate": ("rate_limit_requests",),
+    # Finished requests only: requests_total is counted when a request starts
+    "request_success_rate": ("requests_succeeded", "requests_failed"),
+}
+
+# Window for response time alerts (seconds)
+DEFAULT_RESPONSE_TIME_WINDOW = 300
 
 
 class AlertSeverity(Enum):
@@ -61,6 +93,10 @@ class AlertSeverity(Enum):
     CRITICAL = "critical"
 
 
+# Lowest to highest
+_SEVERITY_ORDER = list(AlertSeverity)
+
+
 class ComparisonOperator(Enum):
     """Comparison operators for alert conditions"""
     GREATER_THAN = "greater_than"
@@ -130,7 +166,8 @@ class AlertManager:
         self,
         email_enabled: bool = False,
         slack_enabled: bool = False,
-        webhook_enabled: bool = False
+        webhook_enabled: bool = False,
+        collector: Optional[MetricsCollector] = None
     ):
         """
         Initialize alert manager
@@ -139,11 +176,24 @@ class AlertManager:
             email_enabled: Enable email notifications
             slack_enabled: Enable Slack notifications
             webhook_enabled: Enable webhook notifications
+            collector: Metrics source (default: global metrics collector)
         """
+        self.collector = collector or metrics_collector
+        self.cache_metrics = CacheMetrics(self.collector)
+        self.error_metrics = ErrorMetrics(self.collector)
+        self.memory_metrics = MemoryMetrics(self.collector)
+
         self.rules: Dict[str, AlertRule] = {}
         self.alert_history: List[Alert] = []
         self.last_alert_time: Dict[str, datetime] = {}
 
+        # Streaming evaluation: source metric -> rule names
+        self.rules_by_source: Dict[str, List[str]] = {}
+        self.last_evaluated: Dict[str, float] = {}
+        self.eval_interval_seconds = float(os.getenv("ALERT_EVAL_INTERVAL_SECONDS", "1"))
+        self.response_time_window = int(os.getenv("ALERT_RESPONSE_TIME_WINDOW_SECONDS", DEFAULT_RESPONSE_TIME_WINDOW))
+        self.lock = threading.RLock()
+
         # Notification settings
         self.email_enabled = email_enabled
         self.slack_enabled = slack_enabled
@@ -159,6 +209,16 @@ class AlertManager:
         self.slack_webhook_url = os.getenv("ALERT_SLACK_WEBHOOK", "")
         self.webhook_url = os.getenv("ALERT_WEBHOOK_URL", "")
 
+        # Background notification delivery (batched, retried)
+        senders = {}
+        if email_enabled and self.alert_email_to:
+            senders["email"] = self._send_email_notification
+        if slack_enabled and self.slack_webhook_url:
+            senders["slack"] = self._send_slack_notification
+        if webhook_enabled and self.webhook_url:
+            senders["webhook"] = self._send_webhook_notification
+        self.dispatcher = NotificationDispatcher(senders)
+
         # Initialize default rules
         self._initialize_default_rules()
 
@@ -256,7 +316,9 @@ class AlertManager:
         Args:
             rule: AlertRule to add
         """
-        self.rules[rule.name] = rule
+        with self.lock:
+            self.rules[rule.name] = rule
+            self._index_rules()
         app_logger.info(
             "Alert rule added",
             rule_name=rule.name,
@@ -266,9 +328,56 @@ class AlertManager:
 
     def remove_rule(self, rule_name: str):
         """Remove alert rule by name"""
-        if rule_name in self.rules:
-            del self.rules[rule_name]
-            app_logger.info("Alert rule removed", rule_name=rule_name)
+        with self.lock:
+            if rule_name in self.rules:
+                del self.rules[rule_name]
+                self._index_rules()
+                app_logger.info("Alert rule removed", rule_name=rule_name)
+
+    def _index_rules(self):
+        """Rebuild the source metric -> rules index (custom checks are polled only)"""
+        index: Dict[str, List[str]] = {}
+        for rule in self.rules.values():
+            if rule.custom_check:
+                continue
+            for source in METRIC_SOURCES.get(rule.metric, ()):
+                index.setdefault(source, []).append(rule.name)
+        self.rules_by_source = index
+
+    def attach(self):
+        """Evaluate rules as the collector's metrics are written"""
+        self.collector.add_listener(self.on_metric)
+
+    def detach(self):
+        self.collector.remove_listener(self.on_metric)
+
+    def on_metric(self, name: str, value: float):
+        """
+        Metric write listener: re-evaluate the rules that read this metric
+
+        Runs on the writing thread. Each rule is evaluated at most every
+        eval_interval_seconds, and skipped if another thread is already
+        evaluating (the next write picks it up).
+        """
+        rule_names = self.rules_by_source.get(name)
+        if not rule_names:
+            return
+
+        now = time.monotonic()
+        due = [
+            rule_name for rule_name in rule_names
+            if now - self.last_evaluated.get(rule_name, 0.0) >= self.eval_interval_seconds
+        ]
+        if not due or not self.lock.acquire(blocking=False):
+            return
+        try:
+            for rule_name in due:
+                self.last_evaluated[rule_name] = now
+                rule = self.rules.get(rule_name)
+                if rule is not None:
+                    self._evaluate_rule(rule)
+        finally:
+            self.lock.release()
 
     def enable_rule(self, rule_name: str):
         """Enable alert rule"""
@@ -289,83 +398,95 @@ class AlertManager:
         """
         triggered_alerts = []
 
-        for rule_name, rule in self.rules.items():
-            if not rule.enabled:
-                continue
+        with self.lock:
+            now = time.monotonic()
+            for rule in list(self.rules.values()):
+                self.last_evaluated[rule.name] = now
+                alert = self._evaluate_rule(rule)
+                if alert:
+                    triggered_alerts.append(alert)
 
-            # Check cooldown period
-            if self._is_in_cooldown(rule_name, rule.cooldown_minutes):
-                continue
+        return triggered_alerts
 
-            # Get metric value
-            if rule.custom_check:
-                current_value = rule.custom_check()
-            else:
-                current_value = self._get_metric_value(rule.metric)
+    def _evaluate_rule(self, rule: AlertRule) -> Optional[Alert]:
+        """Evaluate one rule; record and dispatch an alert if it fires (caller holds the lock)"""
+        if not rule.enabled:
+            return None
 
-            if current_value is None:
-                continue
+        # Check cooldown period
+        if self._is_in_cooldown(rule.name, rule.cooldown_minutes):
+            return None
 
-            # Check condition
-            should_alert = self._check_condition(
-                current_value,
-                rule.threshold,
-                rule.comparison
-            )
+        # Get metric value
+        if rule.custom_check:
+            current_value = rule.custom_check()
+        else:
+            current_value = self._get_metric_value(rule.metric)
 
-            if should_alert:
-                alert = Alert(
-                    rule_name=rule_name,
-                    severity=rule.severity,
-                    message=rule.description or f"{rule_name} triggered",
-                    value=current_value,
-                    threshold=rule.threshold,
-                    metadata={
-                        "metric": rule.metric,
-                        "comparison": rule.comparison.value
-                    }
-                )
+        if current_value is None:
+            return None
 
-                triggered_alerts.append(alert)
-                self.alert_history.append(alert)
-                self.last_alert_time[rule_name] = datetime.now()
+        # Check condition
+        if not self._check_condition(current_value, rule.threshold, rule.comparison):
+            return None
 
-                # Send notifications
-                self._send_notifications(alert)
+        alert = Alert(
+            rule_name=rule.name,
+            severity=rule.severity,
+            message=rule.description or f"{rule.name} triggered",
+            value=current_value,
+            threshold=rule.threshold,
+            metadata={
+                "metric": rule.metric,
+                "comparison": rule.comparison.value
+            }
+        )
 
-                # Log alert
-                app_logger.warning(
-                    f"Alert triggered: {rule_name}",
-                    severity=alert.severity.value,
-                    value=current_value,
-                    threshold=rule.threshold,
-                    rule_name=rule_name
-                )
+        self.alert_history.append(alert)
+        self.last_alert_time[rule.name] = datetime.now()
 
-        return triggered_alerts
+        # Send notifications (queued; delivered in the background)
+        self._send_notifications(alert)
+
+        # Log alert
+        app_logger.warning(
+            f"Alert triggered: {rule.name}",
+            severity=alert.severity.value,
+            value=current_value,
+            threshold=rule.threshold,
+            rule_name=rule.name
+        )
+        return alert
 
     def _get_metric_value(self, metric_name: str) -> Optional[float]:
-        """Get current value for a metric"""
+        """
+        Get current value for a metric
+
+        Every value comes from fixed-size windowed aggregates (per-second
+        counter buckets, quantile sketch slices) or running counters, so
+        the cost doesn't depend on how much history is retained.
+        """
         if metric_name == "error_rate_per_minute":
-            return error_metrics.get_error_rate(60)
+            # get_error_rate is per second
+            return self.error_metrics.get_error_rate(60) * 60
         elif metric_name == "response_time_p95":
-            summary = metrics_collector.get_summary("response_time_ms")
+            summary = self.collector.get_sketch_summary("response_time_ms", self.response_time_window)
             return summary.p95_value if summary else None
         elif metric_name == "response_time_mean":
-            summary = metrics_collector.get_summary("response_time_ms")
+            summary = self.collector.get_sketch_summary("response_time_ms", self.response_time_window)
             return summary.mean_value if summary else None
         elif metric_name == "cache_hit_rate":
-            return cache_metrics.get_hit_rate()
+            return self.cache_metrics.get_hit_rate()
         elif metric_name == "memory_mb":
-            return memory_metrics.get_current_mb()
+            return self.memory_metrics.get_current_mb()
         elif metric_name == "rate_limit_block_rate":
-            blocked = metrics_collector.get_counter("rate_limit_blocked")
-            total = metrics_collector.get_counter("rate_limit_requests")
+            blocked = self.collector.get_counter("rate_limit_blocked")
+            total = self.collector.get_counter("rate_limit_requests")
             return (blocked / total * 100) if total > 0 else 0.0
         elif metric_name == "request_success_rate":
-            succeeded = metrics_collector.get_counter("requests_succeeded")
-            total = metrics_collector.get_counter("requests_total")
-            return (succeeded / total * 100) if total > 0 else 100.0
+            succeeded = self.collector.get_counter("requests_succeeded")
+            finished = succeeded + self.collector.get_counter("requests_failed")
+            return (succeeded / finished * 100) if finished > 0 else 100.0
         else:
             return None
 
@@ -395,35 +516,22 @@ class AlertManager:
         return elapsed < timedelta(minutes=cooldown_minutes)
 
     def _send_notifications(self, alert: Alert):
-        """Send alert notifications to all enabled channels"""
-        if self.email_enabled and self.alert_email_to:
-            try:
-                self._send_email_notification(alert)
-            except Exception as e:
-                app_logger.error("Failed to send email alert", error=e)
+        """Queue alert notifications for all enabled channels"""
+        self.dispatcher.dispatch(alert)
 
-        if self.slack_enabled and self.slack_webhook_url:
-            try:
-                self._send_slack_notification(alert)
-            except Exception as e:
-                app_logger.error("Failed to send Slack alert", error=e)
-
-        if self.webhook_enabled and self.webhook_url:
-            try:
-                self._send_webhook_notification(alert)
-            except Exception as e:
-                app_logger.error("Failed to send webhook alert", error=e)
-
-    def _send_email_notification(self, alert: Alert):
-        """Send email notification"""
+    def _send_email_notification(self, alerts: List[Alert]):
+        """Send one email for a batch of alerts"""
         if not self.smtp_user or not self.alert_email_to:
             return
 
-        subject = f"[{alert.severity.value.upper()}] TRIA Alert: {alert.rule_name}"
-
-        body = f"""
-TRIA System Alert
+        severity = max((alert.severity for alert in alerts), key=_SEVERITY_ORDER.index)
+        if len(alerts) == 1:
+            subject = f"[{severity.value.upper()}] TRIA Alert: {alerts[0].rule_name}"
+        else:
+            subject = f"[{severity.value.upper()}] TRIA Alerts: {len(alerts)} triggered"
 
+        sections = "\n".join(
+            f"""
 Severity: {alert.severity.value.upper()}
 Alert: {alert.rule_name}
 Message: {alert.message}
@@ -434,7 +542,12 @@ Time: {alert.timestamp.isoformat()}
 
 Metadata:
 {self._format_dict(alert.metadata)}
-
+"""
+            for alert in alerts
+        )
+        body = f"""
+TRIA System Alert
+{sections}
 ---
 This is an automated alert from TRIA monitoring system.
 """
@@ -451,20 +564,21 @@ This is an automated alert from TRIA monitoring system.
                 server.login(self.smtp_user, self.smtp_password)
             server.send_message(msg)
 
-        app_logger.info("Email alert sent", rule_name=alert.rule_name)
-
-    def _send_slack_notification(self, alert: Alert):
-        """Send Slack notification"""
-        # Color based on severity
-        color = {
-            AlertSeverity.INFO: "#36a64f",
-            AlertSeverity.WARNING: "#ff9800",
-            AlertSeverity.ERROR: "#f44336",
-            AlertSeverity.CRITICAL: "#9c27b0"
-        }.get(alert.severity, "#cccccc")
-
-        payload = {
-            "attachments": [{
+        app_logger.info("Email alert sent", rule_names=[alert.rule_name for alert in alerts])
+
+    def _send_slack_notification(self, alerts: List[Alert]):
+        """Send one Slack message (an attachment per alert) for a batch of alerts"""
+        attachments = []
+        for alert in alerts:
+            # Color based on severity
+            color = {
+                AlertSeverity.INFO: "#36a64f",
+                AlertSeverity.WARNING: "#ff9800",
+                AlertSeverity.ERROR: "#f44336",
+                AlertSeverity.CRITICAL: "#9c27b0"
+            }.get(alert.severity, "#cccccc")
+
+            attachments.append({
                 "color": color,
                 "title": f"{alert.severity.value.upper()}: {alert.rule_name}",
                 "text": alert.message,
@@ -482,30 +596,39 @@ This is an automated alert from TRIA monitoring system.
                 ],
                 "footer": "TRIA Monitoring",
                 "ts": int(alert.timestamp.timestamp())
-            }]
-        }
+            })
 
-        response = requests.post(self.slack_webhook_url, json=payload, timeout=10)
+        response = requests.post(self.slack_webhook_url, json={"attachments": attachments}, timeout=10)
         response.raise_for_status()
 
-        app_logger.info("Slack alert sent", rule_name=alert.rule_name)
-
-    def _send_webhook_notification(self, alert: Alert):
-        """Send generic webhook notification"""
-        payload = {
-            "rule_name": alert.rule_name,
-            "severity": alert.severity.value,
-            "message": alert.message,
-            "value": alert.value,
-            "threshold": alert.threshold,
-            "timestamp": alert.timestamp.isoformat(),
-            "metadata": alert.metadata
-        }
+        app_logger.info("Slack alert sent", rule_names=[alert.rule_name for alert in alerts])
 
-        response = requests.post(self.webhook_url, json=payload, timeout=10)
-        response.raise_for_status()
+    def _send_webhook_notification(self, alerts: List[Alert]):
+        """
+        Send generic webhook notifications (one request per alert, as receivers expect)
 
-        app_logger.info("Webhook alert sent", rule_name=alert.rule_name)
+        Raises:
+            PartialSendError: After a failed request, with the number of
+                alerts already delivered, so only the rest are retried
+        """
+        for sent, alert in enumerate(alerts):
+            payload = {
+                "rule_name": alert.rule_name,
+                "severity": alert.severity.value,
+                "message": alert.message,
+                "value": alert.value,
+                "threshold": alert.threshold,
+                "timestamp": alert.timestamp.isoformat(),
+                "metadata": alert.metadata
+            }
+
+            try:
+                response = requests.post(self.webhook_url, json=payload, timeout=10)
+                response.raise_for_status()
+            except Exception as e:
+                raise PartialSendError(sent, e) from e
+
+            app_logger.info("Webhook alert sent", rule_name=alert.rule_name)
 
     def _format_dict(self, d: Dict) -> str:
         """Format dictionary for email body"""
@@ -560,12 +683,17 @@ alert_manager = AlertManager(
     slack_enabled=bool(os.getenv("ALERT_SLACK_ENABLED", "")),
     webhook_enabled=bool(os.getenv("ALERT_WEBHOOK_ENABLED", ""))
 )
+alert_manager.attach()
 
 
 def check_alerts_periodically(interval_seconds: int = 60):
     """
     Background function to check alerts periodically
 
+    Metric-driven rules are already evaluated as metrics are written; this
+    loop covers custom checks and memory (sampled here), and acts as a
+    fallback when no metrics arrive.
+
     Args:
         interval_seconds: How often to check alerts (default: 60)
 
@@ -576,6 +704,7 @@ def check_alerts_periodically(interval_seconds: int = 60):
     """
     while True:
         try:
+            alert_manager.memory_metrics.record_current()
             triggered = alert_manager.check_alerts()
             if triggered:
                 app_logger.info(
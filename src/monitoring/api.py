@@ -8,6 +8,7 @@ Endpoints:
 - GET /health - Basic health check
 - GET /metrics - Current metrics summary
 - GET /metrics/detailed - Detailed metrics with breakdown
+- GET /metrics/sketches - Mergeable quantile sketches per metric
 - GET /metrics/errors - Error metrics and breakdown
 - GET /metrics/cache - Cache performance metrics
 - GET /metrics/rate-limit - Rate limiting metrics
@@ -94,7 +95,9 @@ def get_metrics_summary(time_window_minutes: int = 5) -> Dict[str, Any]:
     since = datetime.now() - timedelta(minutes=time_window_minutes)
 
     # Get response time summary
-    response_summary = metrics_collector.get_summary("response_time_ms", since=since)
+    response_summary = metrics_collector.get_sketch_summary(
+        "response_time_ms", window_seconds=time_window_minutes * 60
+    )
 
     return {
         "timestamp": datetime.now().isoformat(),
@@ -203,6 +206,24 @@ def detailed_metrics():
     return jsonify(detailed_data)
 
 
+@monitoring_bp.route('/metrics/sketches', methods=['GET'])
+def sketches_endpoint():
+    """
+    Quantile sketches of all metrics
+
+    Fixed-size DDSketch state per metric and time slice; merge the output
+    of several workers with MetricsCollector.merge_sketches for fleet-wide
+    percentiles, or store it to keep latency history.
+
+    Returns:
+        JSON response with sketches keyed by metric name
+    """
+    return jsonify({
+        "timestamp": datetime.now().isoformat(),
+        "sketches": metrics_collector.export_sketches()
+    })
+
+
 @monitoring_bp.route('/metrics/errors', methods=['GET'])
 def error_metrics_endpoint():
     """
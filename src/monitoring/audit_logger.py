@@ -41,6 +41,9 @@ from typing import Dict, Any, Optional
 from hashlib import sha256
 import os
 
+from monitoring.audit_store import AuditStore, get_audit_store
+from monitoring.log_sink import LogSink, LogSinkHandler, OVERFLOW_BLOCK, get_log_sink
+
 
 class AuditEvent(str, Enum):
     """Audit event types"""
@@ -82,14 +85,24 @@ class AuditEvent(str, Enum):
 class AuditLogger:
     """Structured audit logger with PII scrubbing"""
 
-    def __init__(self, log_file: str = "logs/audit.log"):
+    def __init__(
+        self,
+        log_file: str = "logs/audit.log",
+        store: Optional[AuditStore] = None,
+        sink: Optional[LogSink] = None
+    ):
         """
         Initialize audit logger
 
         Args:
             log_file: Path to audit log file
+            store: Indexed audit store for queries (default: global store)
+            sink: Background writer for the file and the store (default:
+                global log sink); audit records are never dropped
         """
         self.log_file = log_file
+        self.store = store or get_audit_store()
+        self.sink = sink or get_log_sink()
 
         # Create logs directory if it doesn't exist
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
@@ -98,8 +111,9 @@ class AuditLogger:
         self.logger = logging.getLogger("audit")
         self.logger.setLevel(logging.INFO)
 
-        # File handler for audit logs (separate from application logs)
-        file_handler = logging.FileHandler(log_file)
+        # File handler for audit logs (separate from application logs),
+        # written by the log sink's background thread
+        file_handler = LogSinkHandler(log_file, sink=self.sink, overflow=OVERFLOW_BLOCK)
         file_handler.setLevel(logging.INFO)
 
         # JSON formatter for structured logs
@@ -163,6 +177,14 @@ class AuditLogger:
         # Log as JSON
         self.logger.info(json.dumps(audit_record))
 
+        # Index for queries; the log file above remains the full trail.
+        # Queued records are inserted in batches (one transaction each).
+        self.sink.submit(self.store.append_many, audit_record, overflow=OVERFLOW_BLOCK)
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Wait until queued audit records are in the log file and the store"""
+        return self.sink.flush(timeout)
+
     def _scrub_pii(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Scrub PII from data
@@ -348,6 +370,58 @@ class AuditMiddleware:
         await self.app(scope, receive, send)
 
 
+def query_audit_log_page(
+    event_type: Optional[AuditEvent] = None,
+    user_id: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Query audit logs one page at a time, newest first
+
+    Only the monthly partitions overlapping the date range are read, via
+    indexes on event type, user and time (see monitoring.audit_store).
+
+    Args:
+        event_type: Filter by event type
+        user_id: Filter by user ID (as logged, i.e. hashed if an email)
+        start_date: Filter by start date (UTC)
+        end_date: Filter by end date (UTC)
+        limit: Maximum number of records to return
+        cursor: next_cursor from the previous page
+
+    Returns:
+        {"data": [audit records], "next_cursor": str or None}
+
+    Raises:
+        ValueError: If the cursor is malformed
+
+    Example:
+        # All ORDER_CREATED events for a user last month
+        page = query_audit_log_page(
+            event_type=AuditEvent.ORDER_CREATED,
+            user_id="user123",
+            start_date=datetime(2025, 9, 1),
+            end_date=datetime(2025, 9, 30, 23, 59, 59)
+        )
+        while page["next_cursor"]:
+            page = query_audit_log_page(..., cursor=page["next_cursor"])
+    """
+    audit_logger = get_audit_logger()
+    # Read-your-writes: include events still queued for the store
+    audit_logger.sink.flush(fsync=False)
+    return audit_logger.store.query(
+        event_type=event_type.value if event_type else None,
+        user_id=user_id,
+        start=start_date,
+        end=end_date,
+        limit=limit,
+        cursor=cursor
+    )
+
+
 def query_audit_logs(
     event_type: Optional[AuditEvent] = None,
     user_id: Optional[str] = None,
@@ -366,7 +440,8 @@ def query_audit_logs(
         limit: Maximum number of records to return
 
     Returns:
-        List of audit records
+        List of audit records, newest first (use query_audit_log_page to
+        page further)
 
     Example:
         from datetime import datetime, timedelta
@@ -375,45 +450,13 @@ def query_audit_logs(
         # Get all order creation events in last 24 hours
         records = query_audit_logs(
             event_type=AuditEvent.ORDER_CREATED,
-            start_date=datetime.now() - timedelta(days=1)
+            start_date=datetime.utcnow() - timedelta(days=1)
         )
     """
-    records = []
-
-    log_file = "logs/audit.log"
-    if not os.path.exists(log_file):
-        return records
-
-    with open(log_file, 'r') as f:
-        for line in f:
-            try:
-                # Parse JSON log line
-                log_entry = json.loads(line)
-                record = json.loads(log_entry.get("message", "{}"))
-
-                # Apply filters
-                if event_type and record.get("event_type") != event_type.value:
-                    continue
-
-                if user_id and record.get("user_id") != user_id:
-                    continue
-
-                if start_date:
-                    record_time = datetime.fromisoformat(record.get("timestamp_utc", ""))
-                    if record_time < start_date:
-                        continue
-
-                if end_date:
-                    record_time = datetime.fromisoformat(record.get("timestamp_utc", ""))
-                    if record_time > end_date:
-                        continue
-
-                records.append(record)
-
-                if len(records) >= limit:
-                    break
-
-            except (json.JSONDecodeError, ValueError):
-                continue
-
-    return records
+    return query_audit_log_page(
+        event_type=event_type,
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+        limit=limit
+    )["data"]
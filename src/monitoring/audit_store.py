@@ -0,0 +1,311 @@
+"""
+Audit Event Store
+=================
+
+Indexed, time-partitioned store for audit events, behind
+query_audit_logs.
+
+Layout (AUDIT_STORE_DIR, default logs/audit):
+- One SQLite file per UTC month: audit_YYYY-MM.sqlite3 (WAL mode, so API
+  workers append concurrently while compliance queries read)
+- Indexes on (ts, id), (event_type, ts, id), (user_id, ts, id) and
+  (user_id, event_type, ts, id): every filter combination is an index
+  range scan in newest-first order
+- Queries open only the partitions overlapping the requested time range,
+  newest first, and stop as soon as the page is full
+- Reverse-chronological keyset cursors on (ts, id)
+- Optional rotation: partitions older than AUDIT_RETENTION_MONTHS are
+  deleted when a new month starts (default: keep everything)
+
+NO MOCKING - Real SQLite databases on disk.
+"""
+
+import os
+import re
+import json
+import base64
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_STORE_DIR = Path("logs") / "audit"
+
+MAX_PAGE_SIZE = 1000
+
+# Fixed-width timestamps sort correctly as text
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+PARTITION_PATTERN = re.compile(r"^audit_(\d{4})-(\d{2})\.sqlite3$")
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS audit_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        user_id TEXT NOT NULL,
+        resource TEXT,
+        action TEXT,
+        success INTEGER NOT NULL,
+        record TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_audit_ts ON audit_events (ts, id)",
+    "CREATE INDEX IF NOT EXISTS ix_audit_event_ts ON audit_events (event_type, ts, id)",
+    "CREATE INDEX IF NOT EXISTS ix_audit_user_ts ON audit_events (user_id, ts, id)",
+    "CREATE INDEX IF NOT EXISTS ix_audit_user_event_ts ON audit_events (user_id, event_type, ts, id)",
+]
+
+
+def encode_audit_cursor(timestamp: str, row_id: int) -> str:
+    """Opaque cursor for the last (ts, id) seen"""
+    return base64.urlsafe_b64encode(f"{timestamp}|{row_id}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_audit_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor produced by encode_audit_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode((cursor + "=" * (-len(cursor) % 4)).encode("ascii")).decode("utf-8")
+        timestamp, row_id = raw.rsplit("|", 1)
+        datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+        return timestamp, int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def _month_key(value: datetime) -> Tuple[int, int]:
+    return value.year, value.month
+
+
+class AuditStore:
+    """
+    Monthly-partitioned SQLite audit event store
+
+    Example:
+        >>> store = AuditStore("logs/audit")
+        >>> store.append({"event_type": "order_created", "user_id": "u1", ...})
+        >>> page = store.query(event_type="order_created", user_id="u1", limit=50)
+        >>> page = store.query(event_type="order_created", cursor=page["next_cursor"])
+    """
+
+    def __init__(self, root: Optional[Path] = None, retention_months: Optional[int] = None):
+        """
+        Args:
+            root: Partition directory (default: AUDIT_STORE_DIR or logs/audit)
+            retention_months: Months of partitions to keep (default:
+                AUDIT_RETENTION_MONTHS, unset = keep all)
+        """
+        self.root = Path(root or os.getenv("AUDIT_STORE_DIR") or DEFAULT_STORE_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        if retention_months is None and os.getenv("AUDIT_RETENTION_MONTHS"):
+            retention_months = int(os.getenv("AUDIT_RETENTION_MONTHS"))
+        self.retention_months = retention_months
+        self._connections: Dict[Tuple[int, int], sqlite3.Connection] = {}
+        self.lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Partitions
+    # ------------------------------------------------------------------
+
+    def partition_path(self, month: Tuple[int, int]) -> Path:
+        return self.root / f"audit_{month[0]:04d}-{month[1]:02d}.sqlite3"
+
+    def partitions(self) -> List[Tuple[int, int]]:
+        """Existing partitions, newest first"""
+        months = []
+        for path in self.root.iterdir():
+            match = PARTITION_PATTERN.match(path.name)
+            if match:
+                months.append((int(match.group(1)), int(match.group(2))))
+        return sorted(months, reverse=True)
+
+    def _connection(self, month: Tuple[int, int], create: bool) -> Optional[sqlite3.Connection]:
+        """Cached connection to a partition (caller holds the lock)"""
+        connection = self._connections.get(month)
+        if connection is not None:
+            return connection
+
+        path = self.partition_path(month)
+        is_new = not path.exists()
+        if is_new and not create:
+            return None
+
+        connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        for statement in SCHEMA:
+            connection.execute(statement)
+        self._connections[month] = connection
+
+        if is_new:
+            self._rotate(month)
+        return connection
+
+    def _rotate(self, current: Tuple[int, int]) -> None:
+        """Delete partitions older than the retention period"""
+        if not self.retention_months:
+            return
+        year, month = current
+        oldest_index = year * 12 + (month - 1) - (self.retention_months - 1)
+        for old in self.partitions():
+            if old[0] * 12 + (old[1] - 1) < oldest_index:
+                connection = self._connections.pop(old, None)
+                if connection is not None:
+                    connection.close()
+                for suffix in ("", "-wal", "-shm"):
+                    Path(str(self.partition_path(old)) + suffix).unlink(missing_ok=True)
+                logger.info(f"Audit partition {old[0]:04d}-{old[1]:02d} removed (retention {self.retention_months} months)")
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Store one audit record (as built by AuditLogger.log)
+
+        The partition is chosen from record["timestamp_utc"].
+        """
+        self.append_many([record])
+
+    def append_many(self, records: List[Dict[str, Any]]) -> None:
+        """Store a batch of audit records, one transaction per partition"""
+        by_month: Dict[Tuple[int, int], List[Tuple]] = {}
+        for record in records:
+            timestamp = datetime.fromisoformat(record["timestamp_utc"])
+            by_month.setdefault(_month_key(timestamp), []).append((
+                timestamp.strftime(TIMESTAMP_FORMAT),
+                record["event_type"],
+                record.get("user_id") or "",
+                record.get("resource"),
+                record.get("action"),
+                1 if record.get("success", True) else 0,
+                json.dumps(record),
+            ))
+
+        with self.lock:
+            for month, rows in sorted(by_month.items()):
+                connection = self._connection(month, create=True)
+                connection.execute("BEGIN")
+                try:
+                    connection.executemany(
+                        """
+                        INSERT INTO audit_events (ts, event_type, user_id, resource, action, success, record)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        rows
+                    )
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        event_type: Optional[str] = None,
+        user_id: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Audit records, newest first
+
+        Args:
+            event_type: Filter by event type value (e.g. "order_created")
+            user_id: Filter by (scrubbed) user ID
+            start: Earliest timestamp (UTC, inclusive)
+            end: Latest timestamp (UTC, inclusive)
+            limit: Page size (max MAX_PAGE_SIZE)
+            cursor: next_cursor from the previous page
+
+        Returns:
+            {"data": [record, ...], "next_cursor": str or None}
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        after = decode_audit_cursor(cursor) if cursor else None
+
+        # Partitions overlapping [start, end] (and before the cursor)
+        upper = datetime.strptime(after[0], TIMESTAMP_FORMAT) if after else end
+        months = [
+            month for month in self.partitions()
+            if (upper is None or month <= _month_key(upper))
+            and (start is None or month >= _month_key(start))
+        ]
+
+        conditions, params = [], []
+        if event_type:
+            conditions.append("event_type = ?")
+            params.append(event_type)
+        if user_id:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        if start:
+            conditions.append("ts >= ?")
+            params.append(start.strftime(TIMESTAMP_FORMAT))
+        if end:
+            conditions.append("ts <= ?")
+            params.append(end.strftime(TIMESTAMP_FORMAT))
+        if after:
+            conditions.append("(ts < ? OR (ts = ? AND id < ?))")
+            params.extend([after[0], after[0], after[1]])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        rows: List[Tuple[str, int, str]] = []
+        with self.lock:
+            for month in months:
+                connection = self._connection(month, create=False)
+                if connection is None:
+                    continue
+                rows.extend(connection.execute(
+                    f"SELECT ts, id, record FROM audit_events {where} ORDER BY ts DESC, id DESC LIMIT ?",
+                    (*params, limit + 1 - len(rows))
+                ).fetchall())
+                if len(rows) > limit:
+                    break
+
+        page = rows[:limit]
+        return {
+            "data": [json.loads(record) for _, _, record in page],
+            "next_cursor": encode_audit_cursor(page[-1][0], page[-1][1]) if len(rows) > limit else None,
+        }
+
+    def close(self) -> None:
+        with self.lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+_global_store: Optional[AuditStore] = None
+
+
+def get_audit_store() -> AuditStore:
+    """Get or create the global audit store"""
+    global _global_store
+    if _global_store is None:
+        _global_store = AuditStore()
+    return _global_store
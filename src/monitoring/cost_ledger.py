@@ -0,0 +1,376 @@
+"""
+Cost Ledger
+===========
+
+Append-only API cost ledger with incrementally maintained aggregates,
+used by CostTracker.
+
+Storage (data/costs):
+- costs_YYYY-MM-DD.jsonl: one JSON line per API call (the ledger itself,
+  never rewritten)
+- costs_YYYY-MM.rollup.json: per-day aggregates for the month's closed
+  days, written once when a day closes (compaction)
+
+Aggregates:
+- Today's totals (cost, calls, tokens, per operation, per model) are
+  updated from the tail of today's file: each sync reads only the lines
+  appended since the last one, so calls made by other API workers are
+  counted too, and nothing is ever re-parsed
+- The month total is the closed days' rollup total (computed once per
+  month) plus today's running total, so today/month costs are O(1)
+- Appends are counted immediately and written by the background log sink
+  (monitoring.log_sink); when a line this process queued shows up in the
+  file tail it is recognised and not counted twice
+- Every worker closes the day at midnight: each flushes its queued lines,
+  then recomputes the day from the file and merges it into the rollup
+  file under a cross-process file lock, so the last writer has every
+  record that reached the file and no worker's days are dropped
+- Malformed ledger lines (e.g. a torn write) are logged and skipped
+
+NO MOCKING - Real files on disk.
+"""
+
+import os
+import json
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from monitoring.log_sink import LogSink, OVERFLOW_BLOCK, get_log_sink
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CostAggregate:
+    """Running totals for a set of API calls"""
+    cost: float = 0.0
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    by_operation: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    by_model: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Add one ledger record"""
+        tokens = record["input_tokens"] + record["output_tokens"]
+        self.cost += record["cost"]
+        self.calls += 1
+        self.input_tokens += record["input_tokens"]
+        self.output_tokens += record["output_tokens"]
+        for breakdown, key in ((self.by_operation, record["operation"]), (self.by_model, record["model"])):
+            entry = breakdown.setdefault(key, {"cost": 0.0, "calls": 0, "tokens": 0})
+            entry["cost"] += record["cost"]
+            entry["calls"] += 1
+            entry["tokens"] += tokens
+
+    def merge(self, other: "CostAggregate") -> None:
+        self.cost += other.cost
+        self.calls += other.calls
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        for breakdown, incoming in ((self.by_operation, other.by_operation), (self.by_model, other.by_model)):
+            for key, stats in incoming.items():
+                entry = breakdown.setdefault(key, {"cost": 0.0, "calls": 0, "tokens": 0})
+                for stat, value in stats.items():
+                    entry[stat] += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "cost": self.cost,
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "by_operation": self.by_operation,
+            "by_model": self.by_model,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CostAggregate":
+        return cls(**data)
+
+
+def _month_key(day: date) -> str:
+    return day.strftime("%Y-%m")
+
+
+def _parse_record(line: str, path: Path) -> Optional[Dict[str, Any]]:
+    """One ledger record, or None (logged) if the line is malformed"""
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Skipping malformed cost ledger line in {path.name}: {e}")
+        return None
+
+
+class CostLedger:
+    """
+    Append-only cost ledger with running aggregates
+
+    Thread-safe within a process; several processes may append to the
+    same directory (each keeps its own file offset).
+    """
+
+    def __init__(self, data_dir: Path, sink: Optional[LogSink] = None):
+        """
+        Args:
+            data_dir: Ledger directory
+            sink: Background writer for ledger lines (default: global log
+                sink; cost records are never dropped)
+        """
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.sink = sink or get_log_sink()
+        self.lock = threading.RLock()
+
+        self.today: date = datetime.now().date()
+        self.today_aggregate = CostAggregate()
+        self.today_records: List[Dict[str, Any]] = []
+        self._offset = 0
+        # Lines this process queued for today's file, already counted
+        self._pending: Counter = Counter()
+
+        # Rollups by month key; closed-day total of the current month
+        self._rollups: Dict[str, Dict[str, CostAggregate]] = {}
+        self._dirty: Set[str] = set()
+        self._closed_month_cost = 0.0
+
+        with self.lock:
+            self._start_month(self.today)
+            self.sync()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append one call record and update the aggregates"""
+        line = json.dumps(record)
+        with self.lock:
+            self.sync()
+            self.today_aggregate.add(record)
+            self.today_records.append(record)
+            self._pending[line] += 1
+            self.sink.write_line(self.day_path(self.today), line + "\n", overflow=OVERFLOW_BLOCK)
+
+    def sync(self) -> None:
+        """Fold lines appended since the last sync into today's totals; roll over at midnight"""
+        with self.lock:
+            now = datetime.now().date()
+            if now != self.today:
+                self._read_tail()
+                self._close_day(self.today)
+                self.today = now
+                self.today_aggregate = CostAggregate()
+                self.today_records = []
+                self._offset = 0
+                self._pending.clear()
+                self._start_month(now)
+            self._read_tail()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def today_cost(self) -> float:
+        with self.lock:
+            return self.today_aggregate.cost
+
+    def month_cost(self) -> float:
+        with self.lock:
+            return self._closed_month_cost + self.today_aggregate.cost
+
+    def aggregate(self, start: datetime, end: datetime) -> CostAggregate:
+        """
+        Totals for calls with start <= timestamp <= end
+
+        Whole days come from aggregates (today's running totals or the
+        monthly rollups); only partially covered days read raw records.
+        """
+        result = CostAggregate()
+        with self.lock:
+            day = start.date()
+            while day <= end.date():
+                day_start = datetime.combine(day, datetime.min.time())
+                day_end = day_start + timedelta(days=1)
+                whole_day = start <= day_start and (end >= day_end or (day == self.today and end >= datetime.now()))
+
+                if whole_day:
+                    day_aggregate = self.day_aggregate(day)
+                    if day_aggregate:
+                        result.merge(day_aggregate)
+                else:
+                    for record in self.day_records(day):
+                        if start <= datetime.fromisoformat(record["timestamp"]) <= end:
+                            result.add(record)
+                day += timedelta(days=1)
+            self._flush_rollups()
+        return result
+
+    def day_aggregate(self, day: date) -> Optional[CostAggregate]:
+        """Totals for one day (None if no calls)"""
+        if day == self.today:
+            return self.today_aggregate
+        if day > self.today:
+            return None
+        return self._rollup(day).get(day.isoformat())
+
+    def day_records(self, day: date) -> List[Dict[str, Any]]:
+        """Raw records of one day"""
+        if day == self.today:
+            return list(self.today_records)
+        records, _ = self._read_day(day)
+        return records
+
+    def day_path(self, day: date) -> Path:
+        return self.data_dir / f"costs_{day.isoformat()}.jsonl"
+
+    def rollup_path(self, month_key: str) -> Path:
+        return self.data_dir / f"costs_{month_key}.rollup.json"
+
+    @property
+    def lock_path(self) -> Path:
+        return self.data_dir / "costs.rollup.lock"
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _read_tail(self) -> None:
+        path = self.day_path(self.today)
+        if not path.exists():
+            return
+        with open(path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Only complete lines; a concurrent writer may be mid-line
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                text = line.decode("utf-8", errors="replace")
+                if self._pending[text]:
+                    # Queued (and counted) by this process
+                    self._pending[text] -= 1
+                    if not self._pending[text]:
+                        del self._pending[text]
+                    continue
+                record = _parse_record(text, path)
+                if record is not None:
+                    self.today_aggregate.add(record)
+                    self.today_records.append(record)
+        self._offset += end
+
+    def _read_day(self, day: date) -> Tuple[List[Dict[str, Any]], CostAggregate]:
+        records, aggregate = [], CostAggregate()
+        path = self.day_path(day)
+        if path.exists():
+            with open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        record = _parse_record(line, path)
+                        if record is not None:
+                            records.append(record)
+                            aggregate.add(record)
+        return records, aggregate
+
+    def _rollup(self, day: date) -> Dict[str, CostAggregate]:
+        """Closed-day aggregates of day's month, compacting days not yet rolled up"""
+        month_key = _month_key(day)
+        rollup = self._rollups.get(month_key)
+        if rollup is None:
+            rollup = self._load_rollup(month_key)
+            self._rollups[month_key] = rollup
+
+        if day.isoformat() not in rollup and day < self.today and self.day_path(day).exists():
+            _, aggregate = self._read_day(day)
+            rollup[day.isoformat()] = aggregate
+            self._dirty.add(month_key)
+        return rollup
+
+    def _load_rollup(self, month_key: str) -> Dict[str, CostAggregate]:
+        path = self.rollup_path(month_key)
+        if not path.exists():
+            return {}
+        with open(path, "r") as f:
+            data = json.load(f)
+        return {day: CostAggregate.from_dict(aggregate) for day, aggregate in data.get("days", {}).items()}
+
+    def _close_day(self, day: date) -> None:
+        """
+        Record a finished day in its month's rollup file
+
+        The in-memory aggregate only has this process's view; the day is
+        recomputed from the file after flushing this process's queued lines.
+        """
+        self.sink.flush()
+        month_key = _month_key(day)
+        if month_key not in self._rollups:
+            self._rollups[month_key] = self._load_rollup(month_key)
+        with self._file_lock():
+            _, self._rollups[month_key][day.isoformat()] = self._read_day(day)
+            self._dirty.add(month_key)
+            self._write_dirty_rollups()
+
+    def _flush_rollups(self) -> None:
+        if self._dirty:
+            with self._file_lock():
+                self._write_dirty_rollups()
+
+    def _write_dirty_rollups(self) -> None:
+        """Write dirty rollups, keeping days other workers added to the file (call under _file_lock)"""
+        for month_key in sorted(self._dirty):
+            rollup = self._rollups[month_key]
+            for day, aggregate in self._load_rollup(month_key).items():
+                rollup.setdefault(day, aggregate)
+            self._write_rollup(month_key, rollup)
+        self._dirty.clear()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Serialize rollup updates across worker processes (no-op without fcntl)"""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _write_rollup(self, month_key: str, rollup: Dict[str, CostAggregate]) -> None:
+        path = self.rollup_path(month_key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.data_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({
+                    "month": month_key,
+                    "days": {day: aggregate.to_dict() for day, aggregate in sorted(rollup.items())}
+                }, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def _start_month(self, today: date) -> None:
+        """Compact the month's closed days (once) and total them"""
+        self._closed_month_cost = 0.0
+        day = today.replace(day=1)
+        while day < today:
+            aggregate = self._rollup(day).get(day.isoformat())
+            if aggregate:
+                self._closed_month_cost += aggregate.cost
+            day += timedelta(days=1)
+        self._flush_rollups()
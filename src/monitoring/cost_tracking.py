@@ -7,7 +7,7 @@ Tracks API usage and estimated costs for monitoring and budgeting.
 Features:
 1. Token usage tracking
 2. Cost estimation per request
-3. Daily/monthly cost aggregation
+3. Daily/monthly cost aggregation (running totals, monthly rollup files)
 4. Budget alerts
 5. Cost breakdown by operation type
 
@@ -33,14 +33,13 @@ Usage:
 """
 
 import os
-import json
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
-from collections import defaultdict
 
 from .logger import app_logger
+from .cost_ledger import CostLedger
 
 
 # OpenAI pricing (per 1K tokens)
@@ -87,12 +86,38 @@ class APICall:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+def _call_to_record(call: APICall) -> Dict[str, Any]:
+    """Ledger line for an API call"""
+    return {
+        "timestamp": call.timestamp.isoformat(),
+        "operation": call.operation,
+        "model": call.model,
+        "input_tokens": call.input_tokens,
+        "output_tokens": call.output_tokens,
+        "cost": call.cost,
+        "metadata": call.metadata
+    }
+
+
+def _record_to_call(data: Dict[str, Any]) -> APICall:
+    return APICall(
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        operation=data["operation"],
+        model=data["model"],
+        input_tokens=data["input_tokens"],
+        output_tokens=data["output_tokens"],
+        cost=data["cost"],
+        metadata=data.get("metadata", {})
+    )
+
+
 class CostTracker:
     """
     Tracks API costs and usage
 
     Monitors token usage and estimates costs for budgeting.
-    Persists data to disk for historical analysis.
+    Persists data to disk for historical analysis (see monitoring.cost_ledger);
+    today/month totals for budget checks are kept incrementally.
     """
 
     def __init__(self, data_dir: Optional[str] = None):
@@ -107,18 +132,13 @@ class CostTracker:
         else:
             self.data_dir = Path(__file__).parent.parent.parent / "data" / "costs"
 
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-
-        # In-memory storage
-        self.calls: List[APICall] = []
+        # Append-only ledger with running today/month aggregates
+        self.ledger = CostLedger(self.data_dir)
 
         # Budget settings
         self.daily_budget = float(os.getenv("COST_DAILY_BUDGET", "10.0"))  # $10/day
         self.monthly_budget = float(os.getenv("COST_MONTHLY_BUDGET", "200.0"))  # $200/month
 
-        # Load today's data
-        self._load_today_data()
-
         app_logger.info(
             "CostTracker initialized",
             daily_budget=self.daily_budget,
@@ -181,11 +201,8 @@ class CostTracker:
             metadata=metadata
         )
 
-        # Store in memory
-        self.calls.append(call)
-
-        # Persist to disk
-        self._save_call(call)
+        # Append to the ledger (updates running aggregates)
+        self.ledger.append(_call_to_record(call))
 
         # Log the call
         app_logger.info(
@@ -222,70 +239,37 @@ class CostTracker:
         if not end_date:
             end_date = datetime.now()
 
-        # Filter calls in date range
-        calls_in_range = [
-            call for call in self.calls
-            if start_date <= call.timestamp <= end_date
-        ]
-
-        if not calls_in_range:
-            return {
-                "total_cost": 0.0,
-                "total_calls": 0,
-                "total_input_tokens": 0,
-                "total_output_tokens": 0,
-                "by_operation": {},
-                "by_model": {},
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat()
-            }
-
-        # Calculate totals
-        total_cost = sum(call.cost for call in calls_in_range)
-        total_input_tokens = sum(call.input_tokens for call in calls_in_range)
-        total_output_tokens = sum(call.output_tokens for call in calls_in_range)
-
-        # Break down by operation
-        by_operation = defaultdict(lambda: {"cost": 0.0, "calls": 0, "tokens": 0})
-        for call in calls_in_range:
-            by_operation[call.operation]["cost"] += call.cost
-            by_operation[call.operation]["calls"] += 1
-            by_operation[call.operation]["tokens"] += call.input_tokens + call.output_tokens
-
-        # Break down by model
-        by_model = defaultdict(lambda: {"cost": 0.0, "calls": 0, "tokens": 0})
-        for call in calls_in_range:
-            by_model[call.model]["cost"] += call.cost
-            by_model[call.model]["calls"] += 1
-            by_model[call.model]["tokens"] += call.input_tokens + call.output_tokens
+        # Whole days come from ledger aggregates; only partial days are filtered
+        self.ledger.sync()
+        aggregate = self.ledger.aggregate(start_date, end_date)
 
         return {
-            "total_cost": total_cost,
-            "total_calls": len(calls_in_range),
-            "total_input_tokens": total_input_tokens,
-            "total_output_tokens": total_output_tokens,
-            "total_tokens": total_input_tokens + total_output_tokens,
-            "by_operation": dict(by_operation),
-            "by_model": dict(by_model),
+            "total_cost": aggregate.cost,
+            "total_calls": aggregate.calls,
+            "total_input_tokens": aggregate.input_tokens,
+            "total_output_tokens": aggregate.output_tokens,
+            "total_tokens": aggregate.input_tokens + aggregate.output_tokens,
+            "by_operation": aggregate.by_operation,
+            "by_model": aggregate.by_model,
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat()
         }
 
     def get_today_cost(self) -> float:
         """Get total cost for today"""
-        summary = self.get_cost_summary()
-        return summary["total_cost"]
+        self.ledger.sync()
+        return self.ledger.today_cost()
 
     def get_month_cost(self) -> float:
         """Get total cost for current month"""
-        now = datetime.now()
-        start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        self.ledger.sync()
+        return self.ledger.month_cost()
 
-        # Load all data for the month
-        month_calls = self._load_month_data(now.year, now.month)
-
-        total = sum(call.cost for call in month_calls)
-        return total
+    @property
+    def calls(self) -> List[APICall]:
+        """Today's API calls"""
+        self.ledger.sync()
+        return [_record_to_call(record) for record in self.ledger.day_records(self.ledger.today)]
 
     def get_budget_status(self) -> Dict[str, Any]:
         """
@@ -352,80 +336,6 @@ class CostTracker:
             )
             self._monthly_exceeded_alert_sent = True
 
-    def _save_call(self, call: APICall):
-        """Save API call to disk"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        file_path = self.data_dir / f"costs_{today}.jsonl"
-
-        with open(file_path, "a") as f:
-            json.dump({
-                "timestamp": call.timestamp.isoformat(),
-                "operation": call.operation,
-                "model": call.model,
-                "input_tokens": call.input_tokens,
-                "output_tokens": call.output_tokens,
-                "cost": call.cost,
-                "metadata": call.metadata
-            }, f)
-            f.write("\n")
-
-    def _load_today_data(self):
-        """Load today's cost data from disk"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        file_path = self.data_dir / f"costs_{today}.jsonl"
-
-        if not file_path.exists():
-            return
-
-        with open(file_path, "r") as f:
-            for line in f:
-                data = json.loads(line)
-                call = APICall(
-                    timestamp=datetime.fromisoformat(data["timestamp"]),
-                    operation=data["operation"],
-                    model=data["model"],
-                    input_tokens=data["input_tokens"],
-                    output_tokens=data["output_tokens"],
-                    cost=data["cost"],
-                    metadata=data.get("metadata", {})
-                )
-                self.calls.append(call)
-
-    def _load_month_data(self, year: int, month: int) -> List[APICall]:
-        """Load all cost data for a specific month"""
-        month_calls = []
-
-        # Get all days in the month
-        if month == 12:
-            next_month = datetime(year + 1, 1, 1)
-        else:
-            next_month = datetime(year, month + 1, 1)
-
-        current_day = datetime(year, month, 1)
-
-        while current_day < next_month:
-            date_str = current_day.strftime("%Y-%m-%d")
-            file_path = self.data_dir / f"costs_{date_str}.jsonl"
-
-            if file_path.exists():
-                with open(file_path, "r") as f:
-                    for line in f:
-                        data = json.loads(line)
-                        call = APICall(
-                            timestamp=datetime.fromisoformat(data["timestamp"]),
-                            operation=data["operation"],
-                            model=data["model"],
-                            input_tokens=data["input_tokens"],
-                            output_tokens=data["output_tokens"],
-                            cost=data["cost"],
-                            metadata=data.get("metadata", {})
-                        )
-                        month_calls.append(call)
-
-            current_day += timedelta(days=1)
-
-        return month_calls
-
     def print_cost_report(self):
         """Print formatted cost report to console"""
         summary = self.get_cost_summary()
@@ -0,0 +1,372 @@
+"""
+Asynchronous Log Sink
+=====================
+
+Shared, non-blocking writer for audit, cost and analytics logs.
+
+Request handlers only enqueue; one background thread per process drains
+the queue and does the I/O:
+- Batching: everything queued since the last wake-up is written in one
+  pass - one write() per file, one call per batch handler (e.g. a single
+  SQLite transaction for the audit store)
+- Durability: files stay open and are fsynced every LOG_SINK_FSYNC_SECONDS
+  (default 1.0; 0 = fsync after every batch), and on flush/close
+- Backpressure: the queue holds LOG_SINK_QUEUE_SIZE items (default 10000).
+  When it is full, "block" waits for the writer (audit and cost records
+  always do) and "drop" discards the item and counts it (analytics
+  default, LOG_SINK_OVERFLOW)
+- Shutdown: flush_log_sinks() (LifecycleManager shutdown hook and the API
+  shutdown event) drains and fsyncs everything; atexit closes the sink as
+  a fallback
+
+Items for the same file or handler are written in the order they were
+queued.
+
+NO MOCKING - Real files on disk.
+"""
+
+import os
+import queue
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP = "drop"
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_FSYNC_SECONDS = 1.0
+
+# Items written per writer pass
+MAX_BATCH_SIZE = 1000
+
+# Files not written for this long are closed
+IDLE_FILE_SECONDS = 60.0
+
+BatchHandler = Callable[[List[Any]], None]
+
+# Queue control messages
+_FLUSH = object()
+_STOP = object()
+
+
+class LogSink:
+    """
+    Queue + background writer thread
+
+    Example:
+        >>> sink = get_log_sink()
+        >>> sink.write_line(Path("data/policy_usage.jsonl"), json.dumps(event) + "\\n")
+        >>> sink.submit(store.append_many, record, overflow=OVERFLOW_BLOCK)
+        >>> sink.flush()
+    """
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        fsync_seconds: Optional[float] = None,
+        overflow: Optional[str] = None
+    ):
+        """
+        Args:
+            queue_size: Queue capacity (default: LOG_SINK_QUEUE_SIZE or 10000)
+            fsync_seconds: fsync interval (default: LOG_SINK_FSYNC_SECONDS or 1.0)
+            overflow: Default policy when full, "block" or "drop"
+                (default: LOG_SINK_OVERFLOW or "drop")
+        """
+        self.queue_size = queue_size or int(os.getenv("LOG_SINK_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+        self.fsync_seconds = (
+            fsync_seconds if fsync_seconds is not None
+            else float(os.getenv("LOG_SINK_FSYNC_SECONDS", DEFAULT_FSYNC_SECONDS))
+        )
+        self.overflow = (overflow or os.getenv("LOG_SINK_OVERFLOW", OVERFLOW_DROP)).lower()
+        if self.overflow not in (OVERFLOW_BLOCK, OVERFLOW_DROP):
+            raise ValueError(f"Invalid overflow policy: {self.overflow!r} (expected 'block' or 'drop')")
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        # Held for every batch, so writes after close() can run inline
+        self._write_lock = threading.Lock()
+        self._closed = False
+
+        # Writer state (guarded by _write_lock)
+        self._files: "OrderedDict[Path, Tuple[IO[str], float]]" = OrderedDict()
+        self._unsynced: set = set()
+        self._last_fsync = time.monotonic()
+
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+
+    # ------------------------------------------------------------------
+    # Producers (request path)
+    # ------------------------------------------------------------------
+
+    def write_line(self, path: Union[str, Path], line: str, overflow: Optional[str] = None) -> bool:
+        """
+        Queue a line (including its newline) for appending to path
+
+        Returns:
+            False if the line was dropped because the queue was full
+        """
+        return self._put(Path(path), line, overflow)
+
+    def submit(self, handler: BatchHandler, item: Any, overflow: Optional[str] = None) -> bool:
+        """
+        Queue an item for handler, which is called with a list of items
+
+        Consecutive items for the same handler reach it as one batch.
+
+        Returns:
+            False if the item was dropped because the queue was full
+        """
+        return self._put(handler, item, overflow)
+
+    def _put(self, target: Union[Path, BatchHandler], item: Any, overflow: Optional[str]) -> bool:
+        if self._closed:
+            # Shutdown already drained the queue; keep late writes rather than lose them
+            self._write_batch([(target, item)])
+            return True
+
+        self._ensure_writer()
+        try:
+            if (overflow or self.overflow) == OVERFLOW_BLOCK:
+                self._queue.put((target, item))
+            else:
+                self._queue.put_nowait((target, item))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Log sink queue full ({self.queue_size}); {self.dropped} items dropped so far")
+            return False
+
+    # ------------------------------------------------------------------
+    # Control
+    # ------------------------------------------------------------------
+
+    def flush(self, timeout: Optional[float] = 10.0, fsync: bool = True) -> bool:
+        """
+        Wait until everything queued so far is written (and fsynced)
+
+        Returns:
+            False if the writer did not catch up within timeout
+        """
+        if self._closed or self._thread is None or not self._thread.is_alive():
+            self._sync_files(fsync)
+            return True
+
+        done = threading.Event()
+        try:
+            self._queue.put((_FLUSH, (done, fsync)), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Drain the queue, fsync and close all files, and stop the writer"""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._queue.put((_STOP, None))
+            self._thread.join(timeout)
+        # Items queued by producers racing with close()
+        late, waiters = [], []
+        while True:
+            try:
+                target, item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if target is _FLUSH:
+                waiters.append(item[0])
+            elif target is not _STOP:
+                late.append((target, item))
+        self._write_batch(late)
+        with self._write_lock:
+            self._close_files()
+        for done in waiters:
+            done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "queue_size": self.queue_size,
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "overflow": self.overflow,
+            "fsync_seconds": self.fsync_seconds,
+        }
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _ensure_writer(self) -> None:
+        # Also restarts the writer in forked worker processes
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                self._queue = queue.Queue(maxsize=self.queue_size)
+                self._files.clear()
+                self._unsynced.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="log-sink-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        wait = self.fsync_seconds if self.fsync_seconds > 0 else None
+        while True:
+            try:
+                first = self._queue.get(timeout=wait)
+            except queue.Empty:
+                with self._write_lock:
+                    self._maybe_fsync()
+                    self._close_idle_files()
+                continue
+
+            batch = [first]
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Write up to each control message, then act on it
+            pending: List[Tuple[Any, Any]] = []
+            for target, item in batch:
+                if target is _FLUSH or target is _STOP:
+                    self._write_batch(pending)
+                    pending = []
+                    if target is _STOP:
+                        return
+                    done, fsync = item
+                    self._sync_files(fsync)
+                    done.set()
+                else:
+                    pending.append((target, item))
+            self._write_batch(pending)
+
+    def _write_batch(self, batch: List[Tuple[Any, Any]]) -> None:
+        if not batch:
+            return
+        with self._write_lock:
+            # Group consecutive items per target, preserving order per target
+            groups: "OrderedDict[Any, List[Any]]" = OrderedDict()
+            for target, item in batch:
+                groups.setdefault(target, []).append(item)
+
+            for target, items in groups.items():
+                try:
+                    if isinstance(target, Path):
+                        f = self._file(target)
+                        f.write("".join(items))
+                        f.flush()
+                        self._unsynced.add(target)
+                    else:
+                        target(items)
+                    self.written += len(items)
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Log sink failed to write {len(items)} items to {target}: {e}")
+
+            self._maybe_fsync()
+
+    def _file(self, path: Path) -> IO[str]:
+        entry = self._files.get(path)
+        if entry is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            f = open(path, "a", encoding="utf-8")
+        else:
+            f = entry[0]
+        self._files[path] = (f, time.monotonic())
+        self._files.move_to_end(path)
+        return f
+
+    def _maybe_fsync(self) -> None:
+        if time.monotonic() - self._last_fsync >= self.fsync_seconds:
+            self._fsync_files()
+
+    def _fsync_files(self) -> None:
+        for path in list(self._unsynced):
+            entry = self._files.get(path)
+            if entry is not None:
+                try:
+                    os.fsync(entry[0].fileno())
+                except OSError as e:
+                    logger.error(f"Log sink fsync failed for {path}: {e}")
+        self._unsynced.clear()
+        self._last_fsync = time.monotonic()
+
+    def _sync_files(self, fsync: bool) -> None:
+        if fsync:
+            with self._write_lock:
+                self._fsync_files()
+
+    def _close_idle_files(self) -> None:
+        cutoff = time.monotonic() - IDLE_FILE_SECONDS
+        for path in [path for path, (_, last_write) in self._files.items() if last_write < cutoff]:
+            if path in self._unsynced:
+                continue
+            self._files.pop(path)[0].close()
+
+    def _close_files(self) -> None:
+        self._fsync_files()
+        for f, _ in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+class LogSinkHandler(logging.Handler):
+    """logging.Handler that appends formatted records to a file via the sink"""
+
+    def __init__(self, path: Union[str, Path], sink: Optional[LogSink] = None, overflow: Optional[str] = None):
+        super().__init__()
+        self.path = Path(path)
+        self.sink = sink
+        self.overflow = overflow
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            (self.sink or get_log_sink()).write_line(self.path, self.format(record) + "\n", self.overflow)
+        except Exception:
+            self.handleError(record)
+
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+_global_sink: Optional[LogSink] = None
+_global_sink_lock = threading.Lock()
+
+
+def get_log_sink() -> LogSink:
+    """Get or create the process-wide log sink"""
+    global _global_sink
+    if _global_sink is None:
+        with _global_sink_lock:
+            if _global_sink is None:
+                _global_sink = LogSink()
+                atexit.register(_global_sink.close)
+    return _global_sink
+
+
+def flush_log_sinks(timeout: Optional[float] = 10.0) -> bool:
+    """Write and fsync everything queued so far (no-op if nothing was logged)"""
+    if _global_sink is None:
+        return True
+    return _global_sink.flush(timeout)
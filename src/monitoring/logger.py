@@ -11,6 +11,8 @@ Features:
 4. Performance logging
 5. Error tracking with stack traces
 6. Request/response logging
+7. Correlation ID of the current request or job on every entry
+   (see monitoring.tracing)
 
 NO MOCKING - Real production logging
 """
@@ -24,6 +26,8 @@ from datetime import datetime
 from pathlib import Path
 import sys
 
+from monitoring.tracing import get_correlation_id
+
 # Create logs directory
 LOG_DIR = Path(__file__).parent.parent.parent / "logs"
 LOG_DIR.mkdir(exist_ok=True)
@@ -85,6 +89,10 @@ class StructuredLogger:
             "logger": self.logger.name
         }
 
+        correlation_id = (context or {}).get("correlation_id") or get_correlation_id()
+        if correlation_id:
+            entry["correlation_id"] = correlation_id
+
         # Add context
         if context:
             entry["context"] = context
@@ -5,13 +5,16 @@ Metrics Collection Module
 Production-grade metrics collection for monitoring system health and performance.
 
 Features:
-1. Response time metrics (min, max, mean, percentiles)
+1. Response time metrics (min, max, mean, percentiles), stored in numpy
+   ring buffers per metric and tag set (monitoring.timeseries), plus
+   mergeable windowed quantile sketches per metric (monitoring.sketches)
 2. Request counting and throughput
 3. Error rate tracking
 4. Cache performance metrics
 5. Rate limit metrics
 6. Memory usage monitoring
 7. Thread-safe metric aggregation
+8. Write listeners (e.g. AlertManager evaluates rules as metrics arrive)
 
 NO MOCKING - Real production metrics
 """
@@ -19,11 +22,21 @@ NO MOCKING - Real production metrics
 import time
 import psutil
 import threading
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict
-import statistics
+
+import numpy as np
+
+from monitoring.timeseries import (
+    TimeSeriesStore,
+    SlidingCounter,
+    DEFAULT_MAX_POINTS,
+    summarize,
+    percentile as series_percentile,
+)
+from monitoring.sketches import DDSketch, WindowedSketch
 
 
 @dataclass
@@ -52,21 +65,51 @@ class MetricsCollector:
     """
     Thread-safe metrics collector
 
-    Collects and aggregates metrics for monitoring dashboards.
+    Collects and aggregates metrics for monitoring dashboards. Values are
+    kept in a TimeSeriesStore (numpy ring buffer per metric and tag set).
     """
 
-    def __init__(self, retention_seconds: int = 3600):
+    def __init__(self, retention_seconds: int = 3600, max_points_per_series: int = DEFAULT_MAX_POINTS):
         """
         Initialize metrics collector
 
         Args:
             retention_seconds: How long to keep metrics in memory (default 1 hour)
+            max_points_per_series: Points kept per metric and tag set
         """
         self.retention_seconds = retention_seconds
-        self.metrics: Dict[str, List[MetricSnapshot]] = defaultdict(list)
+        self.store = TimeSeriesStore(
+            retention_seconds=retention_seconds,
+            max_points=max_points_per_series
+        )
+        self.sketches: Dict[str, WindowedSketch] = {}
         self.counters: Dict[str, int] = defaultdict(int)
+        # Per-second increments of each counter, for get_rate
+        self.counter_windows: Dict[str, SlidingCounter] = {}
+        self.listeners: List[Callable[[str, float], None]] = []
         self.lock = threading.Lock()
 
+    def add_listener(self, listener: Callable[[str, float], None]):
+        """
+        Call listener(name, value) after every metric write
+
+        Counters report their increment as the value. Listeners run on the
+        writing thread, so they must be cheap; exceptions are swallowed.
+        """
+        with self.lock:
+            self.listeners = self.listeners + [listener]
+
+    def remove_listener(self, listener: Callable[[str, float], None]):
+        with self.lock:
+            self.listeners = [existing for existing in self.listeners if existing != listener]
+
+    def _notify(self, name: str, value: float):
+        for listener in self.listeners:
+            try:
+                listener(name, value)
+            except Exception:
+                pass
+
     def record_metric(
         self,
         name: str,
@@ -81,15 +124,16 @@ class MetricsCollector:
             value: Metric value
             tags: Optional tags for filtering (e.g., {"endpoint": "/chat"})
         """
-        snapshot = MetricSnapshot(
-            timestamp=datetime.now(),
-            value=value,
-            tags=tags or {}
-        )
+        self.store.append(name, value, tags)
 
-        with self.lock:
-            self.metrics[name].append(snapshot)
-            self._cleanup_old_metrics()
+        sketch = self.sketches.get(name)
+        if sketch is None:
+            with self.lock:
+                sketch = self.sketches.setdefault(
+                    name, WindowedSketch(retention_seconds=self.retention_seconds)
+                )
+        sketch.add(value)
+        self._notify(name, value)
 
     def increment_counter(self, name: str, increment: int = 1):
         """
@@ -101,6 +145,11 @@ class MetricsCollector:
         """
         with self.lock:
             self.counters[name] += increment
+            window = self.counter_windows.get(name)
+            if window is None:
+                window = self.counter_windows[name] = SlidingCounter(self.retention_seconds)
+            window.add(increment)
+        self._notify(name, increment)
 
     def get_counter(self, name: str) -> int:
         """Get current counter value"""
@@ -111,6 +160,7 @@ class MetricsCollector:
         """Reset counter to zero"""
         with self.lock:
             self.counters[name] = 0
+            self.counter_windows.pop(name, None)
 
     def get_summary(
         self,
@@ -129,36 +179,92 @@ class MetricsCollector:
         Returns:
             MetricsSummary or None if no data
         """
-        with self.lock:
-            snapshots = self.metrics.get(name, [])
-
-            # Filter by tags
-            if tags:
-                snapshots = [
-                    s for s in snapshots
-                    if all(s.tags.get(k) == v for k, v in tags.items())
-                ]
-
-            # Filter by time
-            if since:
-                snapshots = [s for s in snapshots if s.timestamp >= since]
-
-            if not snapshots:
-                return None
-
-            values = [s.value for s in snapshots]
-
-            return MetricsSummary(
-                name=name,
-                count=len(values),
-                min_value=min(values),
-                max_value=max(values),
-                mean_value=statistics.mean(values),
-                median_value=statistics.median(values),
-                p95_value=self._percentile(values, 95),
-                p99_value=self._percentile(values, 99),
-                tags=tags or {}
-            )
+        values = self.store.values(name, tags=tags, since=since.timestamp() if since else None)
+        stats = summarize(values)
+        if not stats:
+            return None
+
+        return MetricsSummary(
+            name=name,
+            count=stats['count'],
+            min_value=stats['min'],
+            max_value=stats['max'],
+            mean_value=stats['mean'],
+            median_value=stats['median'],
+            p95_value=stats['p95'],
+            p99_value=stats['p99'],
+            tags=tags or {}
+        )
+
+    def get_sketch(self, name: str, window_seconds: Optional[float] = None) -> DDSketch:
+        """
+        Quantile sketch of a metric over the last window_seconds
+
+        Args:
+            name: Metric name
+            window_seconds: Window length (default: retention period)
+
+        Returns:
+            DDSketch (empty if the metric has no data)
+        """
+        sketch = self.sketches.get(name)
+        if sketch is None:
+            return DDSketch()
+        return sketch.merged(window_seconds)
+
+    def get_sketch_summary(
+        self,
+        name: str,
+        window_seconds: Optional[float] = None
+    ) -> Optional[MetricsSummary]:
+        """
+        Metric summary read from the quantile sketch
+
+        Cost is bounded by the sketch size, not the number of values;
+        percentiles are within 1% of the exact value. Use get_summary for
+        exact values or tag filters.
+
+        Args:
+            name: Metric name
+            window_seconds: Window length (default: retention period)
+
+        Returns:
+            MetricsSummary or None if no data
+        """
+        sketch = self.get_sketch(name, window_seconds)
+        if not sketch.count:
+            return None
+
+        median, p95, p99 = sketch.quantiles((0.5, 0.95, 0.99))
+        return MetricsSummary(
+            name=name,
+            count=sketch.count,
+            min_value=sketch.min,
+            max_value=sketch.max,
+            mean_value=sketch.mean,
+            median_value=median,
+            p95_value=p95,
+            p99_value=p99
+        )
+
+    def export_sketches(self) -> Dict[str, Dict[str, Any]]:
+        """Fixed-size, JSON-serializable sketches of all metrics (for persistence or merging)"""
+        return {name: sketch.to_dict() for name, sketch in list(self.sketches.items())}
+
+    def merge_sketches(self, exported: Dict[str, Dict[str, Any]]):
+        """
+        Merge sketches exported by another worker (or restored from disk)
+
+        Args:
+            exported: Output of export_sketches()
+        """
+        for name, data in exported.items():
+            incoming = WindowedSketch.from_dict(data)
+            with self.lock:
+                sketch = self.sketches.setdefault(
+                    name, WindowedSketch(retention_seconds=self.retention_seconds)
+                )
+            sketch.merge(incoming)
 
     def get_all_summaries(
         self,
@@ -166,11 +272,10 @@ class MetricsCollector:
     ) -> Dict[str, MetricsSummary]:
         """Get summaries for all metrics"""
         summaries = {}
-        with self.lock:
-            for name in self.metrics.keys():
-                summary = self.get_summary(name, since=since)
-                if summary:
-                    summaries[name] = summary
+        for name in self.store.names():
+            summary = self.get_summary(name, since=since)
+            if summary:
+                summaries[name] = summary
         return summaries
 
     def get_rate(
@@ -188,39 +293,14 @@ class MetricsCollector:
         Returns:
             Rate per second
         """
-        metric_name = f"{counter_name}_timestamps"
-        since = datetime.now() - timedelta(seconds=time_window_seconds)
-
         with self.lock:
-            snapshots = self.metrics.get(metric_name, [])
-            recent = [s for s in snapshots if s.timestamp >= since]
-
-            if not recent:
-                return 0.0
-
-            return len(recent) / time_window_seconds
+            window = self.counter_windows.get(counter_name)
+            recent = window.total(time_window_seconds) if window is not None else 0
+        return recent / time_window_seconds
 
     def _percentile(self, values: List[float], percentile: int) -> float:
         """Calculate percentile"""
-        if not values:
-            return 0.0
-        sorted_values = sorted(values)
-        index = int(len(sorted_values) * percentile / 100)
-        return sorted_values[min(index, len(sorted_values) - 1)]
-
-    def _cleanup_old_metrics(self):
-        """Remove metrics older than retention period"""
-        cutoff = datetime.now() - timedelta(seconds=self.retention_seconds)
-
-        for name in list(self.metrics.keys()):
-            self.metrics[name] = [
-                s for s in self.metrics[name]
-                if s.timestamp > cutoff
-            ]
-
-            # Remove empty lists
-            if not self.metrics[name]:
-                del self.metrics[name]
+        return series_percentile(np.asarray(values, dtype=np.float64), percentile)
 
 
 class ResponseTimeTracker:
@@ -421,7 +501,7 @@ def get_system_health() -> Dict[str, Any]:
     # Get recent summaries (last 5 minutes)
     since = datetime.now() - timedelta(minutes=5)
 
-    response_summary = metrics_collector.get_summary("response_time_ms", since=since)
+    response_summary = metrics_collector.get_sketch_summary("response_time_ms", window_seconds=300)
 
     return {
         "timestamp": datetime.now().isoformat(),
@@ -0,0 +1,371 @@
+"""
+Request Stage Profiler
+======================
+
+Span-based timing of the stages of a request (session create, history
+fetch, cache check, intent, retrieval, GPT parse, multi-agent processing,
+response logging, ...).
+
+- ProfilingMiddleware opens a profile per HTTP request; code marks stages
+  with `with stage("intent"):` or the @profiled("agent.tone") decorator
+- The current span lives in a ContextVar, so spans nest across awaits,
+  asyncio.gather() tasks and asyncio.to_thread() calls without passing
+  anything around
+- Off unless STAGE_PROFILING_ENABLED=true: the Server-Timing header
+  reveals internal stage timings to every caller, so enable it outside
+  production or behind a proxy that strips the header for public clients
+- Outside a profile (or with profiling disabled) stage() is a single
+  ContextVar lookup
+- When a request finishes:
+  - Stage durations go to the pipeline_stage_duration_seconds histogram
+  - Requests slower than SLOW_REQUEST_THRESHOLD_MS (default 2000) are
+    written with their full span tree to SLOW_REQUEST_LOG (default
+    logs/slow_requests.jsonl), sampled at SLOW_REQUEST_SAMPLE_RATE
+    (default 1.0), through the background log sink, with the correlation
+    ID that finds the request's trace (see monitoring.tracing)
+- The response carries a Server-Timing header with the stages finished
+  before the headers were sent; the chatbot endpoints also return them as
+  metadata.timings when STAGE_TIMINGS_IN_METADATA=true
+
+NO MOCKING - Real clocks, real log files.
+"""
+
+import os
+import json
+import random
+import asyncio
+import functools
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from monitoring.log_sink import LogSink, get_log_sink
+from monitoring.prometheus_metrics import record_pipeline_stage, route_template
+from monitoring.tracing import get_correlation_id
+
+
+PROFILING_ENABLED = os.getenv("STAGE_PROFILING_ENABLED", "false").lower() == "true"
+TIMINGS_IN_METADATA = os.getenv("STAGE_TIMINGS_IN_METADATA", "false").lower() == "true"
+
+DEFAULT_SLOW_LOG = Path("logs") / "slow_requests.jsonl"
+
+# Server-Timing entries per response (header size stays bounded)
+MAX_SERVER_TIMING_ENTRIES = 20
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("profiler_span", default=None)
+_current_profile: ContextVar[Optional["Profile"]] = ContextVar("profiler_profile", default=None)
+
+
+class Span:
+    """One timed stage; children are the stages started inside it"""
+
+    __slots__ = ("name", "start", "end", "attrs", "children")
+
+    def __init__(self, name: str, attrs: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.attrs = attrs
+        self.children: List["Span"] = []
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end is None:
+            return None
+        return (self.end - self.start) * 1000
+
+    def walk(self):
+        """This span and all descendants, depth first"""
+        yield self
+        for child in list(self.children):
+            yield from child.walk()
+
+    def to_dict(self, origin: Optional[float] = None) -> Dict[str, Any]:
+        """Span tree with offsets relative to origin (default: this span's start)"""
+        origin = self.start if origin is None else origin
+        data: Dict[str, Any] = {
+            "name": self.name,
+            "offset_ms": round((self.start - origin) * 1000, 2),
+            "duration_ms": round(self.duration_ms, 2) if self.end is not None else None,
+        }
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.children:
+            data["children"] = [child.to_dict(origin) for child in list(self.children)]
+        return data
+
+
+class stage:
+    """
+    Time a block as a child of the current span
+
+    Example:
+        >>> with stage("history_fetch"):
+        ...     history = session_manager.get_conversation_history(session_id)
+
+    Does nothing when no profile is active.
+    """
+
+    __slots__ = ("name", "attrs", "span", "token")
+
+    def __init__(self, name: str, **attrs: Any):
+        self.name = name
+        self.attrs = attrs
+        self.span: Optional[Span] = None
+
+    def __enter__(self) -> Optional[Span]:
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        self.span = Span(self.name, self.attrs or None)
+        parent.children.append(self.span)
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        span = self.span
+        if span is None:
+            return False
+        span.end = time.perf_counter()
+        if exc_type is not None:
+            span.attrs = {**(span.attrs or {}), "error": exc_type.__name__}
+        try:
+            _current_span.reset(self.token)
+        except ValueError:
+            # Async generator closed from another context (client disconnect)
+            pass
+        return False
+
+
+def profiled(name: str) -> Callable:
+    """Decorator form of stage() for sync and async functions"""
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class Profile:
+    """Root span of one request plus its bookkeeping"""
+
+    __slots__ = ("root", "_span_token", "_profile_token")
+
+    def __init__(self, name: str, attrs: Optional[Dict[str, Any]] = None):
+        self.root = Span(name, attrs)
+        self._span_token = _current_span.set(self.root)
+        self._profile_token = _current_profile.set(self)
+
+    def timings(self) -> Dict[str, float]:
+        """
+        Milliseconds per finished stage, summed over repeats, plus "total"
+
+        Stages run in parallel each count in full, so stages can add up to
+        more than the total.
+        """
+        timings: Dict[str, float] = {}
+        for span in self.root.walk():
+            if span is self.root or span.end is None:
+                continue
+            timings[span.name] = timings.get(span.name, 0.0) + (span.end - span.start) * 1000
+        end = self.root.end if self.root.end is not None else time.perf_counter()
+        timings["total"] = (end - self.root.start) * 1000
+        return {name: round(ms, 1) for name, ms in timings.items()}
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. 'intent;dur=812.4, total;dur=1503.2'"""
+        timings = self.timings()
+        total = timings.pop("total")
+        entries = [f"{name};dur={ms}" for name, ms in list(timings.items())[:MAX_SERVER_TIMING_ENTRIES - 1]]
+        entries.append(f"total;dur={total}")
+        return ", ".join(entries)
+
+    def finish(self, slow_log: Optional["SlowRequestLog"] = None, **attrs: Any) -> None:
+        """
+        Close the profile, record stage histograms and log it if slow
+
+        Args:
+            slow_log: Slow request log (default: global instance)
+            **attrs: Extra attributes for the root span (route, status, ...)
+        """
+        if self.root.end is not None:
+            return
+        self.root.end = time.perf_counter()
+        if attrs:
+            self.root.attrs = {**(self.root.attrs or {}), **attrs}
+        for token, var in ((self._span_token, _current_span), (self._profile_token, _current_profile)):
+            try:
+                var.reset(token)
+            except ValueError:
+                pass
+
+        for span in self.root.walk():
+            if span is not self.root and span.end is not None:
+                record_pipeline_stage(span.name, span.end - span.start)
+        (slow_log or get_slow_request_log()).maybe_log(self)
+
+
+def start_profile(name: str, enabled: Optional[bool] = None, **attrs: Any) -> Optional[Profile]:
+    """
+    Start profiling the current request
+
+    Args:
+        name: Root span name (e.g. "POST /api/chatbot")
+        enabled: Override STAGE_PROFILING_ENABLED
+        **attrs: Root span attributes
+
+    Returns:
+        Profile to finish(), or None if profiling is disabled or a profile
+        is already active in this context
+    """
+    if not (PROFILING_ENABLED if enabled is None else enabled):
+        return None
+    if _current_profile.get() is not None:
+        return None
+    return Profile(name, attrs or None)
+
+
+def current_profile() -> Optional[Profile]:
+    return _current_profile.get()
+
+
+def current_timings() -> Dict[str, float]:
+    """Stage timings of the active profile so far ({} outside a profile)"""
+    profile = _current_profile.get()
+    return profile.timings() if profile is not None else {}
+
+
+def metadata_timings() -> Optional[Dict[str, float]]:
+    """current_timings() if STAGE_TIMINGS_IN_METADATA is set, else None"""
+    if not TIMINGS_IN_METADATA:
+        return None
+    return current_timings() or None
+
+
+# ============================================================================
+# SLOW REQUEST LOG
+# ============================================================================
+
+class SlowRequestLog:
+    """Sampled JSONL log of slow requests with their span trees"""
+
+    def __init__(
+        self,
+        log_file: Optional[Path] = None,
+        threshold_ms: Optional[float] = None,
+        sample_rate: Optional[float] = None,
+        sink: Optional[LogSink] = None
+    ):
+        """
+        Args:
+            log_file: Log path (default: SLOW_REQUEST_LOG or logs/slow_requests.jsonl)
+            threshold_ms: Requests at least this slow are candidates
+                (default: SLOW_REQUEST_THRESHOLD_MS or 2000)
+            sample_rate: Fraction of slow requests written
+                (default: SLOW_REQUEST_SAMPLE_RATE or 1.0)
+            sink: Background writer (default: global log sink)
+        """
+        self.log_file = Path(log_file or os.getenv("SLOW_REQUEST_LOG") or DEFAULT_SLOW_LOG)
+        self.threshold_ms = (
+            threshold_ms if threshold_ms is not None
+            else float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "2000"))
+        )
+        self.sample_rate = (
+            sample_rate if sample_rate is not None
+            else float(os.getenv("SLOW_REQUEST_SAMPLE_RATE", "1.0"))
+        )
+        self.sink = sink
+
+    def maybe_log(self, profile: Profile) -> bool:
+        """Write the profile if it is slow and sampled; returns True if written"""
+        duration_ms = profile.root.duration_ms
+        if duration_ms is None or duration_ms < self.threshold_ms:
+            return False
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "name": profile.root.name,
+            "correlation_id": get_correlation_id(),
+            "duration_ms": round(duration_ms, 2),
+            "timings": profile.timings(),
+            "spans": profile.root.to_dict(),
+        }
+        (self.sink or get_log_sink()).write_line(self.log_file, json.dumps(entry, default=str) + "\n")
+        return True
+
+
+# ============================================================================
+# ASGI MIDDLEWARE
+# ============================================================================
+
+class ProfilingMiddleware:
+    """
+    Profile every HTTP request and add a Server-Timing header
+
+    Usage:
+        from monitoring.profiler import ProfilingMiddleware
+
+        app.add_middleware(ProfilingMiddleware)   # add last: outermost
+    """
+
+    def __init__(self, app, enabled: Optional[bool] = None):
+        """
+        Args:
+            app: ASGI app
+            enabled: Override STAGE_PROFILING_ENABLED
+        """
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = start_profile(f"{scope.get('method', '')} {scope.get('path', '')}", enabled=self.enabled)
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", profile.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            profile.finish(route=route_template(scope), status=status)
+
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+_global_slow_log: Optional[SlowRequestLog] = None
+
+
+def get_slow_request_log() -> SlowRequestLog:
+    """Get or create the global slow request log"""
+    global _global_slow_log
+    if _global_slow_log is None:
+        _global_slow_log = SlowRequestLog()
+    return _global_slow_log
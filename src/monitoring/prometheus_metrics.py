@@ -5,21 +5,41 @@ Prometheus Metrics Exporter
 Exposes metrics for Prometheus scraping at /metrics endpoint.
 
 Metrics tracked:
-- HTTP requests (total, duration, by endpoint)
+- HTTP requests (total, duration, by route template, bounded cardinality)
 - Cache performance (hits, misses, hit rate)
 - OpenAI API calls (total, cost estimation)
 - Xero API requests (total, errors)
 - Active sessions
+- Database statements by fingerprint (opt-in, see monitoring.query_stats)
+- Chatbot pipeline stage latency (see monitoring.profiler)
 """
 
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
 from fastapi import Response
+from typing import Any, Dict, Optional, Set
+import threading
 import time
 
 # ============================================================================
 # HTTP Request Metrics
 # ============================================================================
 
+# Latency buckets for our range: ~50ms cached/static responses up to 30s
+# LLM order processing (+Inf catches anything slower)
+HTTP_LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0]
+
+# Distinct endpoint labels before new routes are folded into OTHER_ROUTE
+MAX_ROUTE_LABELS = 200
+
+# Endpoint label for requests beyond MAX_ROUTE_LABELS
+OTHER_ROUTE = 'other'
+
+# Endpoint label for requests that matched no route (404s, scanners)
+UNMATCHED_ROUTE = 'unmatched'
+
+# HTTP methods kept as labels; anything else is recorded as OTHER
+HTTP_METHODS = frozenset({'GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS'})
+
 http_requests_total = Counter(
     'http_requests_total',
     'Total HTTP requests',
@@ -30,7 +50,7 @@ http_request_duration_seconds = Histogram(
     'http_request_duration_seconds',
     'HTTP request latency in seconds',
     ['method', 'endpoint'],
-    buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]  # Buckets for percentile calculation
+    buckets=HTTP_LATENCY_BUCKETS
 )
 
 # ============================================================================
@@ -94,6 +114,19 @@ xero_invoices_created_total = Counter(
     'Total Xero invoices created successfully'
 )
 
+xero_rate_limit_queue_depth = Gauge(
+    'xero_rate_limit_queue_depth',
+    'Xero calls waiting for a rate limit token in this process',
+    ['priority']
+)
+
+xero_rate_limit_wait_seconds = Histogram(
+    'xero_rate_limit_wait_seconds',
+    'Time Xero calls waited for a rate limit token',
+    ['priority'],
+    buckets=[0.0, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+)
+
 # ============================================================================
 # Session and Business Metrics
 # ============================================================================
@@ -113,6 +146,52 @@ order_value_usd = Counter(
     'Total order value in USD'
 )
 
+# ============================================================================
+# Database Query Metrics
+# ============================================================================
+
+db_query_duration_seconds = Histogram(
+    'db_query_duration_seconds',
+    'Database statement latency in seconds by normalized statement fingerprint',
+    ['fingerprint'],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+)
+
+db_query_rows_total = Counter(
+    'db_query_rows_total',
+    'Rows returned or affected by database statements',
+    ['fingerprint']
+)
+
+# ============================================================================
+# Background Job Metrics
+# ============================================================================
+
+background_jobs_total = Counter(
+    'background_jobs_total',
+    'Background job executions by outcome (succeeded, retried, dead)',
+    ['job_type', 'outcome']
+)
+
+background_job_duration_seconds = Histogram(
+    'background_job_duration_seconds',
+    'Background job handler execution time in seconds',
+    ['job_type'],
+    buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0]
+)
+
+# ============================================================================
+# Pipeline Stage Metrics
+# ============================================================================
+
+# Stage labels are span names fixed in code (see monitoring.profiler)
+pipeline_stage_duration_seconds = Histogram(
+    'pipeline_stage_duration_seconds',
+    'Time spent in each request pipeline stage in seconds',
+    ['stage'],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0]
+)
+
 # ============================================================================
 # Metrics Endpoint
 # ============================================================================
@@ -209,3 +288,117 @@ def update_active_sessions(count: int):
         count: Current number of active sessions
     """
     active_sessions.set(count)
+
+
+def route_template(scope: Dict[str, Any]) -> Optional[str]:
+    """
+    Path template of the route that handled a request, e.g.
+    /api/download_invoice/{order_id}
+
+    Read from the ASGI scope after the router has matched, so it must be
+    called once the response has been produced.
+
+    Args:
+        scope: ASGI request scope
+
+    Returns:
+        Route template, or None if no route matched
+    """
+    # Newer FastAPI keeps included routes unprefixed and records the
+    # effective (prefixed) path separately
+    context = (scope.get('fastapi') or {}).get('effective_route_context')
+    path = getattr(context, 'path', None)
+    if path:
+        return path
+
+    route = scope.get('route')
+    path = getattr(route, 'path', None)
+    if path:
+        return scope.get('root_path', '') + path
+    return None
+
+
+class RouteLabels:
+    """
+    Bounded set of endpoint labels
+
+    The first max_labels route templates keep their own label; later ones
+    share OTHER_ROUTE so the label set (and /metrics payload) stays bounded.
+    """
+
+    def __init__(self, max_labels: int = MAX_ROUTE_LABELS):
+        self.max_labels = max_labels
+        self.labels: Set[str] = set()
+        self.lock = threading.Lock()
+
+    def label(self, template: Optional[str]) -> str:
+        """Endpoint label for a route template (None: unmatched request)"""
+        if not template:
+            return UNMATCHED_ROUTE
+        if template in self.labels:
+            return template
+        with self.lock:
+            if template in self.labels:
+                return template
+            if len(self.labels) >= self.max_labels:
+                return OTHER_ROUTE
+            self.labels.add(template)
+            return template
+
+
+_route_labels = RouteLabels()
+
+
+def record_http_request(method: str, template: Optional[str], status: int, duration_seconds: float):
+    """
+    Record an HTTP request.
+
+    Args:
+        method: HTTP method
+        template: Matched route template (see route_template), None if unmatched
+        status: Response status code
+        duration_seconds: Time to produce the response
+    """
+    method = method if method in HTTP_METHODS else 'OTHER'
+    endpoint = _route_labels.label(template)
+
+    http_requests_total.labels(method=method, endpoint=endpoint, status=status).inc()
+    http_request_duration_seconds.labels(method=method, endpoint=endpoint).observe(duration_seconds)
+
+
+def record_db_query(fingerprint: str, duration_seconds: float, rows: int = 0):
+    """
+    Record a database statement execution.
+
+    Args:
+        fingerprint: Normalized statement fingerprint (see monitoring.query_stats)
+        duration_seconds: Execution time in seconds
+        rows: Rows returned or affected
+    """
+    db_query_duration_seconds.labels(fingerprint=fingerprint).observe(duration_seconds)
+    if rows:
+        db_query_rows_total.labels(fingerprint=fingerprint).inc(rows)
+
+
+def record_background_job(job_type: str, outcome: str, duration_seconds: float):
+    """
+    Record a background job execution.
+
+    Args:
+        job_type: Registered job type (e.g., "xero.order_workflow")
+        outcome: succeeded, retried or dead
+        duration_seconds: Handler execution time in seconds
+    """
+    background_jobs_total.labels(job_type=job_type, outcome=outcome).inc()
+    background_job_duration_seconds.labels(job_type=job_type).observe(duration_seconds)
+
+
+def record_pipeline_stage(stage: str, duration_seconds: float):
+    """
+    Record the duration of one request pipeline stage.
+
+    Args:
+        stage: Stage (span) name, e.g. "intent" or "agent.parallel"
+        duration_seconds: Time spent in the stage
+    """
+    pipeline_stage_duration_seconds.labels(stage=stage).observe(duration_seconds)
@@ -0,0 +1,340 @@
+"""
+Database Query Statistics
+=========================
+
+Opt-in per-statement instrumentation for the SQLAlchemy engine, in the
+spirit of pg_stat_statements but visible from the application side.
+
+Features:
+- SQLAlchemy before/after_cursor_execute event hooks (no code changes in
+  database_operations)
+- Statement fingerprinting: literals and bind parameters replaced by ?,
+  IN-lists and multi-row VALUES collapsed, whitespace normalized
+- Per fingerprint: calls, total/avg/max/p99 latency, rows returned
+- Prometheus export via monitoring.prometheus_metrics
+- EXPLAIN (ANALYZE, BUFFERS) of the top-N statements using the last
+  captured parameters (staging only, SELECT only, rolled back)
+
+Enable with DB_QUERY_STATS=true; database.get_db_engine() attaches the
+hooks when the engine is created.
+
+NO MOCKING - Timings come from real cursor executions.
+"""
+
+import re
+import time
+import hashlib
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import Engine, event
+
+from monitoring.prometheus_metrics import record_db_query
+
+logger = logging.getLogger(__name__)
+
+
+# Fingerprints tracked before new statements are folded into OTHER_FINGERPRINT
+MAX_FINGERPRINTS = 500
+
+# Recent latencies kept per fingerprint for percentile estimation
+LATENCY_SAMPLE_SIZE = 1024
+
+OTHER_FINGERPRINT = 'other'
+
+ORDER_BY_FIELDS = ('total_ms', 'avg_ms', 'p99_ms', 'calls', 'rows')
+
+
+# ============================================================================
+# FINGERPRINTING
+# ============================================================================
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_BIND_PARAM = re.compile(r"%\(\w+\)s|%s|(?<![:\w]):\w+\b|\$\d+")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES\s*(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+",
+                          re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape
+
+    Example:
+        >>> normalize_statement("SELECT * FROM outlets WHERE name ILIKE '%abc%' LIMIT 5")
+        'SELECT * FROM outlets WHERE name ILIKE ? LIMIT ?'
+    """
+    normalized = _STRING_LITERAL.sub('?', statement)
+    normalized = _BIND_PARAM.sub('?', normalized)
+    normalized = _NUMBER.sub('?', normalized)
+    normalized = _IN_LIST.sub('IN (...)', normalized)
+    normalized = _VALUES_LIST.sub(r'VALUES \1, ...', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+def fingerprint_id(normalized: str) -> str:
+    """Short stable identifier for a normalized statement (Prometheus label)"""
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:12]
+
+
+# ============================================================================
+# STATISTICS
+# ============================================================================
+
+@dataclass
+class StatementStats:
+    """
+    Accumulated statistics for one statement fingerprint
+
+    Attributes:
+        fingerprint: Short identifier (sha1 prefix of normalized SQL)
+        normalized: Normalized statement text
+        calls: Number of executions
+        total_ms: Total execution time
+        max_ms: Slowest execution
+        rows: Total rows returned or affected
+        sample_statement: Last raw statement (DB-API paramstyle)
+        sample_parameters: Parameters of the last execution
+    """
+    fingerprint: str
+    normalized: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    sample_statement: Optional[str] = None
+    sample_parameters: Any = None
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLE_SIZE))
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    @property
+    def p99_ms(self) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (samples excluded)"""
+        return {
+            'fingerprint': self.fingerprint,
+            'statement': self.normalized,
+            'calls': self.calls,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.avg_ms, 3),
+            'p99_ms': round(self.p99_ms, 3),
+            'max_ms': round(self.max_ms, 3),
+            'rows': self.rows,
+        }
+
+
+class QueryStatsCollector:
+    """
+    Thread-safe per-fingerprint statement statistics
+
+    Usage:
+        collector = get_query_stats_collector()
+        collector.instrument(engine)
+        ...
+        collector.top(10, order_by='total_ms')
+    """
+
+    def __init__(self, max_fingerprints: int = MAX_FINGERPRINTS):
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, StatementStats] = {}
+        self._normalized_cache: Dict[str, StatementStats] = {}
+        self._lock = threading.Lock()
+        self._engines: List[Engine] = []
+
+    # ------------------------------------------------------------------
+    # Engine hooks
+    # ------------------------------------------------------------------
+
+    def instrument(self, engine: Engine) -> None:
+        """Attach cursor execution hooks to engine (idempotent)"""
+        if engine in self._engines:
+            return
+
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+        self._engines.append(engine)
+        logger.info("Query statistics enabled on database engine")
+
+    def uninstrument(self, engine: Engine) -> None:
+        """Detach hooks from engine"""
+        if engine not in self._engines:
+            return
+
+        event.remove(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.remove(engine, 'after_cursor_execute', self._after_cursor_execute)
+        self._engines.remove(engine)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_stats_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('query_stats_start')
+        if not starts:
+            return
+        duration_ms = (time.perf_counter() - starts.pop()) * 1000
+        rows = cursor.rowcount if cursor.rowcount and cursor.rowcount > 0 else 0
+
+        try:
+            self.record(statement, duration_ms, rows, parameters=None if executemany else parameters)
+        except Exception as e:
+            # Instrumentation must never break a query
+            logger.debug(f"Failed to record query statistics: {e}")
+
+    # ------------------------------------------------------------------
+    # Recording and reporting
+    # ------------------------------------------------------------------
+
+    def record(self, statement: str, duration_ms: float, rows: int = 0, parameters: Any = None) -> StatementStats:
+        """
+        Record one statement execution
+
+        Args:
+            statement: Raw SQL as sent to the driver
+            duration_ms: Execution time in milliseconds
+            rows: Rows returned or affected
+            parameters: Bound parameters (kept as the EXPLAIN sample)
+
+        Returns:
+            Updated StatementStats
+        """
+        with self._lock:
+            stats = self._normalized_cache.get(statement)
+            if stats is None:
+                normalized = normalize_statement(statement)
+                fingerprint = fingerprint_id(normalized)
+                stats = self._stats.get(fingerprint)
+                if stats is None:
+                    if len(self._stats) >= self.max_fingerprints:
+                        fingerprint, normalized = OTHER_FINGERPRINT, OTHER_FINGERPRINT
+                        stats = self._stats.get(fingerprint)
+                    if stats is None:
+                        stats = StatementStats(fingerprint=fingerprint, normalized=normalized)
+                        self._stats[fingerprint] = stats
+                if len(self._normalized_cache) < self.max_fingerprints * 4:
+                    self._normalized_cache[statement] = stats
+
+            stats.calls += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.rows += rows
+            stats.latencies.append(duration_ms)
+            if stats.fingerprint != OTHER_FINGERPRINT:
+                stats.sample_statement = statement
+                stats.sample_parameters = parameters
+
+        record_db_query(stats.fingerprint, duration_ms / 1000, rows)
+        return stats
+
+    def top(self, limit: int = 20, order_by: str = 'total_ms') -> List[StatementStats]:
+        """
+        Most expensive statements
+
+        Args:
+            limit: Number of statements to return
+            order_by: One of total_ms, avg_ms, p99_ms, calls, rows
+
+        Raises:
+            ValueError: If order_by is not a supported field
+        """
+        if order_by not in ORDER_BY_FIELDS:
+            raise ValueError(f"Invalid order_by '{order_by}'. Allowed: {list(ORDER_BY_FIELDS)}")
+
+        with self._lock:
+            snapshot = list(self._stats.values())
+        return sorted(snapshot, key=lambda s: getattr(s, order_by), reverse=True)[:limit]
+
+    def get(self, fingerprint: str) -> Optional[StatementStats]:
+        """Statistics for one fingerprint"""
+        with self._lock:
+            return self._stats.get(fingerprint)
+
+    def reset(self) -> None:
+        """Clear all statistics"""
+        with self._lock:
+            self._stats.clear()
+            self._normalized_cache.clear()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._engines)
+
+
+# ============================================================================
+# EXPLAIN
+# ============================================================================
+
+def explain_statement(engine: Engine, stats: StatementStats, timeout_ms: int = 10000) -> Dict[str, Any]:
+    """
+    Run EXPLAIN (ANALYZE, BUFFERS) for the last captured execution
+
+    ANALYZE executes the statement, so only SELECT/WITH statements are
+    explained and the transaction is always rolled back.
+
+    Args:
+        engine: Engine to run EXPLAIN on
+        stats: Statement statistics with a captured sample
+        timeout_ms: statement_timeout for the EXPLAIN
+
+    Returns:
+        Dictionary with fingerprint, statement and plan (or error)
+    """
+    result = {'fingerprint': stats.fingerprint, 'statement': stats.normalized}
+
+    sample = stats.sample_statement
+    if not sample:
+        result['error'] = 'No sample captured'
+        return result
+    if not sample.lstrip().upper().startswith(('SELECT', 'WITH')) or \
+            re.search(r'\b(INSERT|UPDATE|DELETE)\b', sample, re.IGNORECASE):
+        result['error'] = 'Only read-only SELECT statements are explained'
+        return result
+
+    raw_connection = engine.raw_connection()
+    try:
+        cursor = raw_connection.cursor()
+        cursor.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+        cursor.execute(
+            f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sample}",
+            stats.sample_parameters or None
+        )
+        plan = cursor.fetchone()[0]
+        result['plan'] = plan[0] if isinstance(plan, list) and plan else plan
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        raw_connection.rollback()
+        raw_connection.close()
+
+    return result
+
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+_global_collector: Optional[QueryStatsCollector] = None
+
+
+def get_query_stats_collector() -> QueryStatsCollector:
+    """
+    Get or create global query statistics collector
+
+    Returns:
+        QueryStatsCollector instance
+    """
+    global _global_collector
+    if _global_collector is None:
+        _global_collector = QueryStatsCollector()
+    return _global_collector
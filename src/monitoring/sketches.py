@@ -0,0 +1,287 @@
+"""
+Quantile Sketches
+=================
+
+Mergeable, fixed-size latency percentile summaries (DDSketch).
+
+A DDSketch counts values in logarithmic buckets whose width is chosen so
+every quantile it reports is within `relative_accuracy` of the true value
+(1% by default). Memory is bounded by `max_buckets` no matter how many
+values are added, a quantile read walks at most that many buckets, and two
+sketches with the same accuracy merge by adding bucket counts - so sketches
+from several API workers combine into a fleet-wide p99 with the same
+accuracy guarantee.
+
+WindowedSketch keeps one sketch per time slice (10s by default) for the
+retention period; a window query merges the slices it covers.
+
+Reference: Masson, Rim, Lee - "DDSketch: A Fast and Fully-Mergeable
+Quantile Sketch with Relative-Error Guarantees" (VLDB 2019).
+
+NO MOCKING - Real measurements.
+"""
+
+import math
+import time
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Bucket limit per sign; 2048 buckets at 1% cover ~18 orders of magnitude
+DEFAULT_MAX_BUCKETS = 2048
+
+# Values closer to zero than this are counted as zero
+MIN_INDEXABLE_VALUE = 1e-9
+
+
+class DDSketch:
+    """
+    Quantile sketch with relative-error guarantees
+
+    Example:
+        >>> sketch = DDSketch()
+        >>> for latency_ms in (12.0, 15.5, 230.0):
+        ...     sketch.add(latency_ms)
+        >>> p99 = sketch.quantile(0.99)  # within 1% of 230.0
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a value (count times)"""
+        if value > MIN_INDEXABLE_VALUE:
+            self._add_to(self.positive, self._key(value), count)
+        elif value < -MIN_INDEXABLE_VALUE:
+            self._add_to(self.negative, self._key(-value), count)
+        else:
+            self.zero_count += count
+
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "DDSketch") -> None:
+        """Add another sketch's counts into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if not other.count:
+            return
+
+        for key, count in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+        self._collapse(self.positive)
+        self._collapse(self.negative)
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Value at quantile q (0..1), within relative_accuracy
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        if not self.count:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1")
+
+        rank = q * (self.count - 1)
+        seen = 0
+
+        # Most negative values first: largest magnitude keys
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return self._clamp(-self._value(key))
+
+        seen += self.zero_count
+        if seen > rank:
+            return self._clamp(0.0)
+
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._clamp(self._value(key))
+
+        return self.max
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[float]]:
+        return [self.quantile(q) for q in qs]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable, fixed-size representation"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'zero_count': self.zero_count,
+            'positive': {str(key): count for key, count in self.positive.items()},
+            'negative': {str(key): count for key, count in self.negative.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_buckets: int = DEFAULT_MAX_BUCKETS) -> "DDSketch":
+        sketch = cls(relative_accuracy=data['relative_accuracy'], max_buckets=max_buckets)
+        sketch.positive = {int(key): count for key, count in data.get('positive', {}).items()}
+        sketch.negative = {int(key): count for key, count in data.get('negative', {}).items()}
+        sketch.zero_count = data.get('zero_count', 0)
+        sketch.count = data.get('count', 0)
+        sketch.sum = data.get('sum', 0.0)
+        if sketch.count:
+            sketch.min = data['min']
+            sketch.max = data['max']
+        return sketch
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _key(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        # Midpoint (in relative terms) of bucket (gamma^(key-1), gamma^key]
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def _clamp(self, value: float) -> float:
+        return min(max(value, self.min), self.max)
+
+    def _add_to(self, buckets: Dict[int, int], key: int, count: int) -> None:
+        if key in buckets:
+            buckets[key] += count
+        else:
+            buckets[key] = count
+            self._collapse(buckets)
+
+    def _collapse(self, buckets: Dict[int, int]) -> None:
+        """Fold the smallest-magnitude buckets together beyond max_buckets"""
+        excess = len(buckets) - self.max_buckets
+        if excess <= 0:
+            return
+        keys = sorted(buckets)
+        target = keys[excess]
+        for key in keys[:excess]:
+            buckets[target] += buckets.pop(key)
+
+
+class WindowedSketch:
+    """
+    Time-sliced DDSketch for one metric
+
+    Keeps one sketch per `slice_seconds` slice for `retention_seconds`;
+    window queries merge the covered slices (accurate to one slice).
+    """
+
+    def __init__(
+        self,
+        retention_seconds: float = 3600,
+        slice_seconds: float = 10,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+    ):
+        self.retention_seconds = retention_seconds
+        self.slice_seconds = slice_seconds
+        self.relative_accuracy = relative_accuracy
+        self.slices: Dict[int, DDSketch] = {}
+        self.lock = threading.Lock()
+
+    def add(self, value: float, timestamp: Optional[float] = None) -> None:
+        slice_id = int((timestamp if timestamp is not None else time.time()) // self.slice_seconds)
+        with self.lock:
+            sketch = self.slices.get(slice_id)
+            if sketch is None:
+                sketch = self.slices[slice_id] = DDSketch(self.relative_accuracy)
+                self._expire(slice_id)
+            sketch.add(value)
+
+    def merged(self, window_seconds: Optional[float] = None, now: Optional[float] = None) -> DDSketch:
+        """Sketch of all values in the last window_seconds (default: retention)"""
+        now = now if now is not None else time.time()
+        first_slice = int((now - (window_seconds or self.retention_seconds)) // self.slice_seconds)
+        result = DDSketch(self.relative_accuracy)
+        with self.lock:
+            for slice_id, sketch in self.slices.items():
+                if slice_id >= first_slice:
+                    result.merge(sketch)
+        return result
+
+    def merge(self, other: "WindowedSketch") -> None:
+        """Add another worker's slices into this one"""
+        with self.lock:
+            for slice_id, sketch in other.slices.items():
+                self.slices.setdefault(slice_id, DDSketch(self.relative_accuracy)).merge(sketch)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'slice_seconds': self.slice_seconds,
+                'retention_seconds': self.retention_seconds,
+                'relative_accuracy': self.relative_accuracy,
+                'slices': {str(slice_id): sketch.to_dict() for slice_id, sketch in self.slices.items()},
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WindowedSketch":
+        windowed = cls(
+            retention_seconds=data['retention_seconds'],
+            slice_seconds=data['slice_seconds'],
+            relative_accuracy=data['relative_accuracy']
+        )
+        windowed.slices = {int(slice_id): DDSketch.from_dict(sketch) for slice_id, sketch in data['slices'].items()}
+        return windowed
+
+    def _expire(self, current_slice: int) -> None:
+        oldest = current_slice - int(self.retention_seconds // self.slice_seconds)
+        for slice_id in [slice_id for slice_id in self.slices if slice_id < oldest]:
+            del self.slices[slice_id]
+
+
+def merge_sketches(sketches: Iterable[DDSketch]) -> DDSketch:
+    """Merge sketches (e.g. from several workers) into a new sketch"""
+    result = None
+    for sketch in sketches:
+        if result is None:
+            result = DDSketch(sketch.relative_accuracy)
+        result.merge(sketch)
+    return result if result is not None else DDSketch()
@@ -0,0 +1,297 @@
+"""
+Time-Series Store
+=================
+
+Compact in-memory storage engine behind MetricsCollector.
+
+Design:
+- One series per (metric name, tag set); tags are folded into a hashable
+  series key, so a write is a dict lookup plus an array store
+- Each series is a numpy ring buffer of (timestamp, value) float64 pairs:
+  O(1) append, capacity doubling up to max_points, oldest point
+  overwritten beyond that
+- Expiry is amortized: points are appended in time order, so expiring
+  means advancing the head past old timestamps, done at most once per
+  series per expiry interval and before reads
+- Queries concatenate matching series and compute summaries and
+  percentiles vectorized (np.partition instead of sorting lists)
+- Counter rates come from SlidingCounter: fixed per-second buckets, so a
+  windowed count costs the same however many increments happened
+
+NO MOCKING - Real measurements, real numpy arithmetic.
+"""
+
+import time
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+# Initial points per series; doubled on demand up to max_points
+INITIAL_CAPACITY = 64
+
+# Points kept per series regardless of retention (oldest overwritten)
+DEFAULT_MAX_POINTS = 65536
+
+
+class RingBuffer:
+    """Fixed-capacity (timestamp, value) ring buffer for one series"""
+
+    __slots__ = ('timestamps', 'values', 'head', 'size', 'max_points', 'next_expiry')
+
+    def __init__(self, max_points: int = DEFAULT_MAX_POINTS, capacity: int = INITIAL_CAPACITY):
+        capacity = min(capacity, max_points)
+        self.timestamps = np.empty(capacity, dtype=np.float64)
+        self.values = np.empty(capacity, dtype=np.float64)
+        self.head = 0  # Index of the oldest point
+        self.size = 0
+        self.max_points = max_points
+        self.next_expiry = 0.0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return len(self.values)
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Append a point, growing or overwriting the oldest when full"""
+        capacity = len(self.values)
+        if self.size == capacity:
+            if capacity < self.max_points:
+                self._grow(min(capacity * 2, self.max_points))
+                capacity = len(self.values)
+            else:
+                # Full at max_points: overwrite the oldest point
+                self.timestamps[self.head] = timestamp
+                self.values[self.head] = value
+                self.head = (self.head + 1) % capacity
+                return
+
+        index = (self.head + self.size) % capacity
+        self.timestamps[index] = timestamp
+        self.values[index] = value
+        self.size += 1
+
+    def expire(self, cutoff: float) -> None:
+        """Drop points with timestamp <= cutoff (from the oldest end)"""
+        if not self.size:
+            return
+        timestamps = self.ordered_timestamps()
+        expired = int(np.searchsorted(timestamps, cutoff, side='right'))
+        if expired:
+            self.head = (self.head + expired) % len(self.values)
+            self.size -= expired
+
+    def ordered_timestamps(self) -> np.ndarray:
+        return self._ordered(self.timestamps)
+
+    def ordered_values(self) -> np.ndarray:
+        return self._ordered(self.values)
+
+    def values_since(self, since: Optional[float] = None) -> np.ndarray:
+        """Values with timestamp >= since (all values if since is None)"""
+        values = self.ordered_values()
+        if since is None:
+            return values
+        start = int(np.searchsorted(self.ordered_timestamps(), since, side='left'))
+        return values[start:]
+
+    def _ordered(self, array: np.ndarray) -> np.ndarray:
+        end = self.head + self.size
+        if end <= len(array):
+            return array[self.head:end]
+        return np.concatenate((array[self.head:], array[:end - len(array)]))
+
+    def _grow(self, capacity: int) -> None:
+        timestamps = np.empty(capacity, dtype=np.float64)
+        values = np.empty(capacity, dtype=np.float64)
+        timestamps[:self.size] = self.ordered_timestamps()
+        values[:self.size] = self.ordered_values()
+        self.timestamps, self.values, self.head = timestamps, values, 0
+
+
+def series_key(name: str, tags: Optional[Dict[str, str]] = None) -> SeriesKey:
+    """Hashable key for a metric name and tag set"""
+    return (name, tuple(sorted(tags.items())) if tags else ())
+
+
+def percentile(values: np.ndarray, pct: float) -> float:
+    """Value at rank int(n * pct / 100) (the rank MetricsCollector has always reported)"""
+    n = len(values)
+    if not n:
+        return 0.0
+    index = min(int(n * pct / 100), n - 1)
+    return float(np.partition(values, index)[index])
+
+
+class TimeSeriesStore:
+    """
+    Thread-safe store of ring-buffered series
+
+    Example:
+        >>> store = TimeSeriesStore(retention_seconds=3600)
+        >>> store.append("response_time_ms", 12.5, {"endpoint": "/chat"})
+        >>> store.values("response_time_ms")
+        array([12.5])
+    """
+
+    def __init__(
+        self,
+        retention_seconds: float = 3600,
+        max_points: int = DEFAULT_MAX_POINTS,
+        expiry_interval_seconds: float = 1.0
+    ):
+        """
+        Args:
+            retention_seconds: Points older than this are dropped
+            max_points: Upper bound on points per series
+            expiry_interval_seconds: Minimum time between expiry passes on a series
+        """
+        self.retention_seconds = retention_seconds
+        self.max_points = max_points
+        self.expiry_interval_seconds = expiry_interval_seconds
+        self.series: Dict[SeriesKey, RingBuffer] = {}
+        self.series_by_name: Dict[str, List[SeriesKey]] = {}
+        self.lock = threading.Lock()
+
+    def append(
+        self,
+        name: str,
+        value: float,
+        tags: Optional[Dict[str, str]] = None,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """Record one point (timestamp defaults to now)"""
+        now = time.time()
+        key = series_key(name, tags)
+
+        with self.lock:
+            buffer = self.series.get(key)
+            if buffer is None:
+                buffer = self._create_series(key)
+            buffer.append(now if timestamp is None else timestamp, value)
+
+            if now >= buffer.next_expiry:
+                buffer.expire(now - self.retention_seconds)
+                buffer.next_expiry = now + self.expiry_interval_seconds
+
+    def names(self) -> List[str]:
+        """Metric names with at least one live point"""
+        with self.lock:
+            self._expire_all()
+            return [
+                name for name, keys in self.series_by_name.items()
+                if any(len(self.series[key]) for key in keys)
+            ]
+
+    def values(
+        self,
+        name: str,
+        tags: Optional[Dict[str, str]] = None,
+        since: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Values of every series of a metric whose tags include the given tags
+
+        Args:
+            name: Metric name
+            tags: Tag subset to match (None: all series)
+            since: Unix timestamp lower bound (inclusive)
+
+        Returns:
+            1-D float64 array (copy)
+        """
+        wanted = set(tags.items()) if tags else set()
+        with self.lock:
+            self._expire_all()
+            chunks = [
+                self.series[key].values_since(since)
+                for key in self.series_by_name.get(name, [])
+                if wanted.issubset(key[1])
+            ]
+            # Copy under the lock; the buffers are reused by later appends
+            if not chunks:
+                return np.empty(0, dtype=np.float64)
+            return np.concatenate(chunks) if len(chunks) > 1 else chunks[0].copy()
+
+    def count(self, name: str, since: Optional[float] = None) -> int:
+        """Number of points of a metric (all tag sets)"""
+        return len(self.values(name, since=since))
+
+    def clear(self) -> None:
+        with self.lock:
+            self.series.clear()
+            self.series_by_name.clear()
+
+    def _create_series(self, key: SeriesKey) -> RingBuffer:
+        buffer = RingBuffer(max_points=self.max_points)
+        self.series[key] = buffer
+        self.series_by_name.setdefault(key[0], []).append(key)
+        return buffer
+
+    def _expire_all(self) -> None:
+        """Expire every series and drop empty ones (caller holds the lock)"""
+        cutoff = time.time() - self.retention_seconds
+        empty = []
+        for key, buffer in self.series.items():
+            buffer.expire(cutoff)
+            if not len(buffer):
+                empty.append(key)
+        for key in empty:
+            del self.series[key]
+            keys = self.series_by_name[key[0]]
+            keys.remove(key)
+            if not keys:
+                del self.series_by_name[key[0]]
+
+
+class SlidingCounter:
+    """
+    Counter increments bucketed by time, for windowed counts and rates
+
+    One bucket per `resolution` seconds over `span_seconds`; buckets are
+    reused as time moves on, so memory and query cost are fixed.
+    Not thread-safe on its own (MetricsCollector holds its lock).
+    """
+
+    def __init__(self, span_seconds: float = 3600, resolution: float = 1.0):
+        self.resolution = resolution
+        self.size = max(1, int(np.ceil(span_seconds / resolution)))
+        self.counts = np.zeros(self.size, dtype=np.int64)
+        self.bucket_ids = np.full(self.size, -1, dtype=np.int64)
+
+    def add(self, count: int = 1, timestamp: Optional[float] = None) -> None:
+        bucket_id = int((timestamp if timestamp is not None else time.time()) // self.resolution)
+        index = bucket_id % self.size
+        if self.bucket_ids[index] != bucket_id:
+            self.bucket_ids[index] = bucket_id
+            self.counts[index] = 0
+        self.counts[index] += count
+
+    def total(self, window_seconds: float, now: Optional[float] = None) -> int:
+        """Sum of increments in the last window_seconds (capped at the span)"""
+        current = int((now if now is not None else time.time()) // self.resolution)
+        buckets = min(self.size, max(1, int(np.ceil(window_seconds / self.resolution))))
+        live = (self.bucket_ids > current - buckets) & (self.bucket_ids <= current)
+        return int(self.counts[live].sum())
+
+
+def summarize(values: Iterable[float]) -> Dict[str, float]:
+    """count/min/max/mean/median/p95/p99 of values, vectorized"""
+    array = np.asarray(values, dtype=np.float64)
+    if not len(array):
+        return {}
+    return {
+        'count': int(len(array)),
+        'min': float(array.min()),
+        'max': float(array.max()),
+        'mean': float(array.mean()),
+        'median': float(np.median(array)),
+        'p95': percentile(array, 95),
+        'p99': percentile(array, 99),
+    }
@@ -0,0 +1,934 @@
+"""
+Distributed Tracing
+===================
+
+OpenTelemetry-compatible tracing of external calls, keyed by correlation
+ID.
+
+- Every HTTP request gets a correlation ID (X-Correlation-ID request
+  header, the trace ID of an incoming W3C traceparent, or a new UUID). It
+  is held in a ContextVar, returned as X-Correlation-ID, added to
+  structured logs and carried into background jobs
+- The correlation ID is the trace ID: a UUID's 32 hex digits are used
+  as-is, any other ID is hashed to 32 hex digits. Searching the tracing
+  backend for a correlation ID from a log line finds the whole trace
+- CLIENT spans for every external call:
+  - OpenAI: httpx transport (openai_http_client()), which also sends
+    traceparent and X-Correlation-ID
+  - Postgres: SQLAlchemy cursor hooks (instrument_engine())
+  - Redis and Xero: client proxies (trace_calls())
+  - ChromaDB: explicit trace_span() around collection queries
+- Spans nest through a ContextVar, so they follow awaits, asyncio tasks
+  and asyncio.to_thread() calls
+- Exporters:
+  - InMemorySpanExporter: keeps finished spans in process (tests)
+  - OTLPSpanExporter: batches spans to an OTLP/HTTP collector as JSON
+    (OTEL_EXPORTER_OTLP_ENDPOINT) from a background thread
+- Sampling is per trace (TRACING_SAMPLE_RATE, default 1.0), decided from
+  the trace ID so that every process keeps or drops the same traces
+
+Configuration: TRACING_EXPORTER (none | memory | otlp; default otlp when
+an OTLP endpoint is set, otherwise none), OTEL_SERVICE_NAME,
+OTEL_EXPORTER_OTLP_ENDPOINT / OTEL_EXPORTER_OTLP_TRACES_ENDPOINT,
+OTEL_EXPORTER_OTLP_HEADERS. Without an exporter no spans are created;
+correlation IDs still propagate.
+
+NO MOCKING - Real spans, real OTLP/HTTP export.
+"""
+
+import os
+import re
+import json
+import queue
+import atexit
+import hashlib
+import inspect
+import logging
+import secrets
+import threading
+import time
+import uuid
+import functools
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import requests
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    REQUESTS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+SPAN_KIND_INTERNAL = "internal"
+SPAN_KIND_SERVER = "server"
+SPAN_KIND_CLIENT = "client"
+SPAN_KIND_CONSUMER = "consumer"
+
+# OTLP SpanKind / StatusCode values
+_OTLP_KINDS = {SPAN_KIND_INTERNAL: 1, SPAN_KIND_SERVER: 2, SPAN_KIND_CLIENT: 3, SPAN_KIND_CONSUMER: 5}
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+CORRELATION_HEADER = "x-correlation-id"
+
+# Job payload key carrying the correlation ID into background jobs
+CORRELATION_PAYLOAD_KEY = "correlation_id"
+
+DEFAULT_SERVICE_NAME = "tria-aibpo"
+
+_HEX_TRACE_ID = re.compile(r"^[0-9a-f]{32}$")
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+# Client-supplied correlation IDs: printable, no separators that break headers/logs
+_VALID_CORRELATION_ID = re.compile(r"^[A-Za-z0-9._:\-]{1,128}$")
+
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+_current_span: ContextVar[Optional["TraceSpan"]] = ContextVar("trace_span", default=None)
+
+
+# ============================================================================
+# CORRELATION IDS
+# ============================================================================
+
+def new_correlation_id() -> str:
+    return str(uuid.uuid4())
+
+
+def get_correlation_id() -> Optional[str]:
+    """Correlation ID of the current request or job (None outside one)"""
+    return _correlation_id.get()
+
+
+@contextmanager
+def correlation_scope(correlation_id: Optional[str] = None) -> Iterator[str]:
+    """
+    Run a block under a correlation ID (a new one if None)
+
+    Example:
+        >>> with correlation_scope(payload.get("correlation_id")) as correlation_id:
+        ...     run_job(payload)
+    """
+    correlation_id = correlation_id or new_correlation_id()
+    token = _correlation_id.set(correlation_id)
+    try:
+        yield correlation_id
+    finally:
+        _correlation_id.reset(token)
+
+
+def trace_id_for(correlation_id: str) -> str:
+    """32-hex-digit trace ID for a correlation ID (UUIDs map to their own digits)"""
+    digits = correlation_id.replace("-", "").lower()
+    if _HEX_TRACE_ID.match(digits) and digits != "0" * 32:
+        return digits
+    return hashlib.sha256(correlation_id.encode("utf-8")).hexdigest()[:32]
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str]]:
+    """(trace_id, parent_span_id) from a W3C traceparent header, None if invalid"""
+    if not value:
+        return None
+    match = _TRACEPARENT.match(value.strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2)
+
+
+# ============================================================================
+# SPANS
+# ============================================================================
+
+class TraceSpan:
+    """One operation in a trace (OpenTelemetry span data model)"""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns",
+        "attributes", "status", "status_message", "_tracer"
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        kind: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        attributes: Dict[str, Any]
+    ):
+        self._tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"[:500]
+        self.attributes["error.type"] = type(error).__name__
+
+    def end(self) -> None:
+        """Finish the span and hand it to the exporter (idempotent)"""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        self._tracer._export(self)
+
+    def traceparent(self) -> str:
+        """W3C traceparent header value naming this span as the parent"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": dict(self.attributes),
+            "status": self.status,
+            "status_message": self.status_message,
+        }
+
+
+class Tracer:
+    """
+    Creates spans and passes finished ones to an exporter
+
+    Example:
+        >>> exporter = InMemorySpanExporter()
+        >>> configure_tracing(exporter)
+        >>> with trace_span("chroma query", attributes={"db.system": "chroma"}):
+        ...     collection.query(...)
+        >>> exporter.get_finished_spans()
+    """
+
+    def __init__(
+        self,
+        exporter: Optional["SpanExporter"] = None,
+        service_name: Optional[str] = None,
+        sample_rate: Optional[float] = None
+    ):
+        """
+        Args:
+            exporter: Destination for finished spans (None = tracing off)
+            service_name: service.name resource attribute (default:
+                OTEL_SERVICE_NAME or tria-aibpo)
+            sample_rate: Fraction of traces recorded (default:
+                TRACING_SAMPLE_RATE or 1.0)
+        """
+        self.exporter = exporter
+        self.service_name = service_name or os.getenv("OTEL_SERVICE_NAME") or DEFAULT_SERVICE_NAME
+        self.sample_rate = (
+            sample_rate if sample_rate is not None
+            else float(os.getenv("TRACING_SAMPLE_RATE", "1.0"))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def sampled(self, trace_id: str) -> bool:
+        """Sampling decision, the same for every span of a trace"""
+        if self.sample_rate >= 1.0:
+            return True
+        return int(trace_id[-8:], 16) / 0xFFFFFFFF < self.sample_rate
+
+    def start_span(
+        self,
+        name: str,
+        kind: str = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+        remote_parent: Optional[Tuple[str, str]] = None
+    ) -> Optional[TraceSpan]:
+        """
+        Start a span under the current span (or a new trace root)
+
+        The span is not made current; use trace_span() for that.
+
+        Args:
+            name: Span name, e.g. "redis get"
+            kind: SPAN_KIND_* constant
+            attributes: OpenTelemetry attributes
+            remote_parent: (trace_id, span_id) from an incoming traceparent
+
+        Returns:
+            Span to end(), or None if tracing is off or the trace is not sampled
+        """
+        if self.exporter is None:
+            return None
+
+        correlation_id = _correlation_id.get()
+        parent = _current_span.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        elif correlation_id is not None:
+            trace_id = trace_id_for(correlation_id)
+            parent_id = remote_parent[1] if remote_parent and remote_parent[0] == trace_id else None
+        elif remote_parent is not None:
+            trace_id, parent_id = remote_parent
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+
+        if not self.sampled(trace_id):
+            return None
+
+        attributes = dict(attributes) if attributes else {}
+        if correlation_id is not None:
+            attributes["correlation.id"] = correlation_id
+        return TraceSpan(self, name, kind, trace_id, parent_id, attributes)
+
+    def _export(self, span: TraceSpan) -> None:
+        try:
+            self.exporter.export(span)
+        except Exception as e:
+            # Tracing must never break the traced call
+            logger.debug(f"Span export failed: {e}")
+
+
+@contextmanager
+def trace_span(
+    name: str,
+    kind: str = SPAN_KIND_CLIENT,
+    attributes: Optional[Dict[str, Any]] = None
+) -> Iterator[Optional[TraceSpan]]:
+    """
+    Trace a block as a span; spans started inside it become its children
+
+    Yields None when tracing is off, so callers can guard set_attribute().
+    """
+    span = _tracer.start_span(name, kind, attributes)
+    if span is None:
+        yield None
+        return
+
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        span.end()
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            pass
+
+
+def traced(name: str, kind: str = SPAN_KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None) -> Callable:
+    """Decorator form of trace_span() for sync and async functions"""
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with trace_span(name, kind, attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(name, kind, attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span() -> Optional[TraceSpan]:
+    return _current_span.get()
+
+
+def propagation_headers() -> Dict[str, str]:
+    """traceparent / X-Correlation-ID headers for an outgoing request"""
+    headers = {}
+    correlation_id = _correlation_id.get()
+    if correlation_id is not None:
+        headers["X-Correlation-ID"] = correlation_id
+    span = _current_span.get()
+    if span is not None:
+        headers["traceparent"] = span.traceparent()
+    return headers
+
+
+# ============================================================================
+# EXPORTERS
+# ============================================================================
+
+class SpanExporter:
+    """Receives finished spans"""
+
+    def export(self, span: TraceSpan) -> None:
+        raise NotImplementedError
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        return True
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps finished spans in memory (tests and local debugging)"""
+
+    def __init__(self, max_spans: int = 10000):
+        self.max_spans = max_spans
+        self._spans: List[TraceSpan] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: TraceSpan) -> None:
+        with self._lock:
+            self._spans.append(span)
+            if len(self._spans) > self.max_spans:
+                del self._spans[:len(self._spans) - self.max_spans]
+
+    def get_finished_spans(self, trace_id: Optional[str] = None) -> List[TraceSpan]:
+        with self._lock:
+            return [span for span in self._spans if trace_id is None or span.trace_id == trace_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+_STOP = object()
+_FLUSH = object()
+
+
+class OTLPSpanExporter(SpanExporter):
+    """
+    Batches spans to an OTLP/HTTP collector (JSON encoding)
+
+    Spans are queued and sent by a background thread every
+    TRACING_EXPORT_INTERVAL_SECONDS (default 5) or once max_batch spans
+    are waiting. When TRACING_EXPORT_QUEUE_SIZE (default 2048) spans are
+    queued, new spans are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        service_name: Optional[str] = None,
+        interval_seconds: Optional[float] = None,
+        queue_size: Optional[int] = None,
+        max_batch: int = 512,
+        timeout: float = 10.0
+    ):
+        """
+        Args:
+            endpoint: Traces URL (default: OTEL_EXPORTER_OTLP_TRACES_ENDPOINT,
+                or OTEL_EXPORTER_OTLP_ENDPOINT + /v1/traces)
+            headers: Extra request headers (default: OTEL_EXPORTER_OTLP_HEADERS,
+                "key=value,key2=value2")
+            service_name: service.name resource attribute
+            interval_seconds: Maximum delay before queued spans are sent
+            queue_size: Maximum queued spans
+            max_batch: Spans per request
+            timeout: HTTP timeout in seconds
+        """
+        if endpoint is None:
+            endpoint = os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT")
+        if endpoint is None and os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT").rstrip("/") + "/v1/traces"
+        if not endpoint:
+            raise ValueError("OTLP endpoint not configured (set OTEL_EXPORTER_OTLP_ENDPOINT)")
+        if not REQUESTS_AVAILABLE:
+            raise RuntimeError("OTLP export requires the requests package")
+
+        self.endpoint = endpoint
+        self.headers = {"Content-Type": "application/json", **(headers or _parse_headers(os.getenv("OTEL_EXPORTER_OTLP_HEADERS", "")))}
+        self.service_name = service_name or os.getenv("OTEL_SERVICE_NAME") or DEFAULT_SERVICE_NAME
+        self.interval_seconds = (
+            interval_seconds if interval_seconds is not None
+            else float(os.getenv("TRACING_EXPORT_INTERVAL_SECONDS", "5"))
+        )
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size or int(os.getenv("TRACING_EXPORT_QUEUE_SIZE", "2048")))
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+        self.exported = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def export(self, span: TraceSpan) -> None:
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(f"Span export queue full; {self.dropped} spans dropped so far")
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put((_FLUSH, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def shutdown(self) -> None:
+        self.flush(5.0)
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._queue.put(_STOP)
+            self._thread.join(5.0)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        # Also restarts the worker in forked API worker processes
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                self._queue = queue.Queue(maxsize=self._queue.maxsize)
+            else:
+                atexit.register(self.shutdown)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        batch: List[TraceSpan] = []
+        deadline = time.monotonic() + self.interval_seconds
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._send(batch)
+                return
+            if isinstance(item, tuple) and item[0] is _FLUSH:
+                self._send(batch)
+                batch = []
+                item[1].set()
+                continue
+            if item is not None:
+                batch.append(item)
+
+            if len(batch) >= self.max_batch or time.monotonic() >= deadline:
+                self._send(batch)
+                batch = []
+                deadline = time.monotonic() + self.interval_seconds
+
+    def _send(self, batch: List[TraceSpan]) -> None:
+        if not batch:
+            return
+        try:
+            response = requests.post(
+                self.endpoint,
+                data=json.dumps(encode_otlp(batch, self.service_name)),
+                headers=self.headers,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            self.exported += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.warning(f"OTLP export of {len(batch)} spans to {self.endpoint} failed: {e}")
+
+
+def _parse_headers(value: str) -> Dict[str, str]:
+    headers = {}
+    for pair in value.split(","):
+        if "=" in pair:
+            key, _, header_value = pair.partition("=")
+            headers[key.strip()] = header_value.strip()
+    return headers
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def encode_otlp(spans: List[TraceSpan], service_name: str) -> Dict[str, Any]:
+    """OTLP/JSON ExportTraceServiceRequest for spans"""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{
+                "scope": {"name": "tria.monitoring.tracing"},
+                "spans": [
+                    {
+                        "traceId": span.trace_id,
+                        "spanId": span.span_id,
+                        "parentSpanId": span.parent_id or "",
+                        "name": span.name,
+                        "kind": _OTLP_KINDS.get(span.kind, 1),
+                        "startTimeUnixNano": str(span.start_ns),
+                        "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                        "attributes": [
+                            {"key": key, "value": _otlp_value(value)}
+                            for key, value in span.attributes.items() if value is not None
+                        ],
+                        "status": {"code": span.status, "message": span.status_message},
+                    }
+                    for span in spans
+                ],
+            }],
+        }]
+    }
+
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+
+class _TracedProxy:
+    """Wraps a client so each public method call is a CLIENT span"""
+
+    __slots__ = ("_target", "_component", "_attributes")
+
+    def __init__(self, target: Any, component: str, attributes: Dict[str, Any]):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_component", component)
+        object.__setattr__(self, "_attributes", attributes)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        component, attributes = self._component, self._attributes
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            span = _tracer.start_span(f"{component} {name}", SPAN_KIND_CLIENT, attributes)
+            if span is None:
+                return attr(*args, **kwargs)
+            try:
+                result = attr(*args, **kwargs)
+            except BaseException as e:
+                span.record_error(e)
+                span.end()
+                raise
+            if inspect.isawaitable(result):
+                return _end_after(span, result)
+            span.end()
+            return result
+        return call
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._target, name, value)
+
+
+async def _end_after(span: TraceSpan, awaitable: Any) -> Any:
+    try:
+        return await awaitable
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        span.end()
+
+
+def trace_calls(target: Any, component: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Trace every public method call on a client (sync or async)
+
+    Returns target itself when tracing is off, so wrap after
+    configure_tracing().
+
+    Example:
+        >>> self.redis_client = trace_calls(redis.Redis(...), "redis", {"db.system": "redis"})
+        >>> self.redis_client.get(key)    # span "redis get"
+    """
+    if not _tracer.enabled:
+        return target
+    return _TracedProxy(target, component, {"peer.service": component, **(attributes or {})})
+
+
+def _http_span(request: Any, peer_service: str) -> Optional[TraceSpan]:
+    span = _tracer.start_span(
+        f"{peer_service} {request.method} {request.url.path}",
+        SPAN_KIND_CLIENT,
+        {
+            "peer.service": peer_service,
+            "http.request.method": request.method,
+            "server.address": request.url.host,
+            "url.path": request.url.path,
+        }
+    )
+    if span is not None:
+        request.headers["traceparent"] = span.traceparent()
+        request.headers["X-Correlation-ID"] = span.attributes.get("correlation.id", span.trace_id)
+    return span
+
+
+def _end_http_span(span: TraceSpan, status_code: int) -> None:
+    span.set_attribute("http.response.status_code", status_code)
+    if status_code >= 500:
+        span.status = STATUS_ERROR
+    span.end()
+
+
+if HTTPX_AVAILABLE:
+    class TracingTransport(httpx.BaseTransport):
+        """httpx transport adding a CLIENT span (to response headers) per request"""
+
+        def __init__(self, transport: httpx.BaseTransport, peer_service: str):
+            self.transport = transport
+            self.peer_service = peer_service
+
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            span = _http_span(request, self.peer_service)
+            if span is None:
+                return self.transport.handle_request(request)
+            try:
+                response = self.transport.handle_request(request)
+            except BaseException as e:
+                span.record_error(e)
+                span.end()
+                raise
+            _end_http_span(span, response.status_code)
+            return response
+
+        def close(self) -> None:
+            self.transport.close()
+
+    class AsyncTracingTransport(httpx.AsyncBaseTransport):
+        """Async counterpart of TracingTransport"""
+
+        def __init__(self, transport: httpx.AsyncBaseTransport, peer_service: str):
+            self.transport = transport
+            self.peer_service = peer_service
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            span = _http_span(request, self.peer_service)
+            if span is None:
+                return await self.transport.handle_async_request(request)
+            try:
+                response = await self.transport.handle_async_request(request)
+            except BaseException as e:
+                span.record_error(e)
+                span.end()
+                raise
+            _end_http_span(span, response.status_code)
+            return response
+
+        async def aclose(self) -> None:
+            await self.transport.aclose()
+
+
+# Connection limits of the OpenAI SDK's default httpx client
+_OPENAI_LIMITS = dict(max_connections=1000, max_keepalive_connections=100)
+
+
+def openai_http_client(async_client: bool = False) -> Any:
+    """
+    httpx client for OpenAI(http_client=...) that traces every API call
+
+    Returns None when tracing is off (the SDK then uses its default client).
+    """
+    if not HTTPX_AVAILABLE or not _tracer.enabled:
+        return None
+    from openai import DefaultHttpxClient, DefaultAsyncHttpxClient
+
+    limits = httpx.Limits(**_OPENAI_LIMITS)
+    if async_client:
+        return DefaultAsyncHttpxClient(transport=AsyncTracingTransport(httpx.AsyncHTTPTransport(limits=limits), "openai"))
+    return DefaultHttpxClient(transport=TracingTransport(httpx.HTTPTransport(limits=limits), "openai"))
+
+
+_instrumented_engines: List[Any] = []
+
+
+def instrument_engine(engine: Any) -> None:
+    """Trace every statement executed on a SQLAlchemy engine (idempotent)"""
+    if not _tracer.enabled or engine in _instrumented_engines:
+        return
+    from sqlalchemy import event
+    from monitoring.query_stats import normalize_statement
+
+    db_system = engine.dialect.name
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "QUERY"
+        span = _tracer.start_span(
+            f"{db_system} {operation}",
+            SPAN_KIND_CLIENT,
+            {"db.system": db_system, "db.operation": operation, "db.statement": normalize_statement(statement)}
+        )
+        conn.info.setdefault("trace_spans", []).append(span)
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        span = spans.pop() if spans else None
+        if span is not None:
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rows", cursor.rowcount)
+            span.end()
+
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("trace_spans") if conn is not None else None
+        span = spans.pop() if spans else None
+        if span is not None:
+            span.record_error(exception_context.original_exception)
+            span.end()
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+    _instrumented_engines.append(engine)
+
+
+# ============================================================================
+# ASGI MIDDLEWARE
+# ============================================================================
+
+class TracingMiddleware:
+    """
+    Assign a correlation ID to every HTTP request and trace it as a SERVER span
+
+    Usage:
+        from monitoring.tracing import TracingMiddleware
+
+        app.add_middleware(TracingMiddleware)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        remote_parent = parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        correlation_id = headers.get(CORRELATION_HEADER.encode(), b"").decode("latin-1").strip()
+        if not _VALID_CORRELATION_ID.match(correlation_id):
+            correlation_id = remote_parent[0] if remote_parent else new_correlation_id()
+
+        with correlation_scope(correlation_id):
+            method = scope.get("method", "")
+            span = _tracer.start_span(
+                f"{method} {scope.get('path', '')}",
+                SPAN_KIND_SERVER,
+                {"http.request.method": method, "url.path": scope.get("path", "")},
+                remote_parent=remote_parent
+            )
+            token = _current_span.set(span) if span is not None else None
+
+            async def send_with_correlation(message):
+                if message["type"] == "http.response.start":
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (CORRELATION_HEADER.encode(), correlation_id.encode("latin-1"))],
+                    }
+                    if span is not None:
+                        span.set_attribute("http.response.status_code", message["status"])
+                        if message["status"] >= 500:
+                            span.status = STATUS_ERROR
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_correlation)
+            except BaseException as e:
+                if span is not None:
+                    span.record_error(e)
+                raise
+            finally:
+                if span is not None:
+                    from monitoring.prometheus_metrics import route_template
+                    route = route_template(scope)
+                    if route:
+                        span.name = f"{method} {route}"
+                        span.set_attribute("http.route", route)
+                    span.end()
+                    _current_span.reset(token)
+
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+
+def _exporter_from_env() -> Optional[SpanExporter]:
+    otlp_configured = bool(os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT") or os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"))
+    name = os.getenv("TRACING_EXPORTER", "otlp" if otlp_configured else "none").lower()
+    if name == "memory":
+        return InMemorySpanExporter()
+    if name == "otlp":
+        try:
+            return OTLPSpanExporter()
+        except Exception as e:
+            logger.error(f"Tracing disabled: {e}")
+            return None
+    if name != "none":
+        logger.error(f"Unknown TRACING_EXPORTER {name!r}; tracing disabled")
+    return None
+
+
+_tracer = Tracer(_exporter_from_env())
+
+
+def get_tracer() -> Tracer:
+    """Get the global tracer"""
+    return _tracer
+
+
+def configure_tracing(
+    exporter: Optional[SpanExporter] = None,
+    service_name: Optional[str] = None,
+    sample_rate: Optional[float] = None
+) -> Tracer:
+    """
+    Replace the global tracer (exporter=None turns tracing off)
+
+    Clients wrapped while tracing was off stay untraced.
+    """
+    global _tracer
+    _tracer = Tracer(exporter, service_name, sample_rate)
+    return _tracer
+
+
+def flush_tracing(timeout: Optional[float] = 10.0) -> bool:
+    """Send spans still queued for export"""
+    if _tracer.exporter is None:
+        return True
+    return _tracer.exporter.flush(timeout)
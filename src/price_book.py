@@ -0,0 +1,245 @@
+"""
+Versioned Price Book
+====================
+
+In-memory snapshot of catalog pricing used for order totals and invoice
+stamping, loaded once and refreshed when the catalog changes.
+
+Features:
+- Exact Decimal prices straight from products.unit_price (no float round
+  trip), plus integer-cent prices for a vectorized totals fast path
+- Content version (hash of SKU, price, min order qty); orders are stamped
+  with the version and per-line unit prices, so invoices can be
+  regenerated exactly without re-querying products
+- Cheap catalog fingerprint query (count, newest change, price sum) at
+  most every PRICE_BOOK_REFRESH_SECONDS; the snapshot is reloaded only
+  when it changes
+- Immutable snapshots swapped atomically, safe to share across threads
+
+Usage:
+    from price_book import get_price_book
+
+    price_book = get_price_book()
+    totals = price_book.totals(line_items, tax_rate=Decimal("0.09"))
+    parsed_order = price_book.stamp(parsed_order)
+
+NO MOCKING - Real PostgreSQL product catalog.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from database import get_db_engine
+
+logger = logging.getLogger(__name__)
+
+
+# All catalog products are standard-rated; the rate itself is TAX_RATE
+DEFAULT_TAX_CLASS = 'standard'
+
+CENT = Decimal('0.01')
+
+
+@dataclass(frozen=True)
+class PriceEntry:
+    """Price book entry for one SKU"""
+    sku: str
+    unit_price: Decimal
+    tax_class: str = DEFAULT_TAX_CLASS
+    min_order_qty: int = 1
+
+
+class PriceBook:
+    """
+    Immutable pricing snapshot
+
+    Build with PriceBook(entries) or PriceBook.load(); never modified
+    after construction.
+    """
+
+    def __init__(self, entries: List[PriceEntry], loaded_at: Optional[float] = None):
+        self.entries: Dict[str, PriceEntry] = {entry.sku: entry for entry in entries}
+        self.loaded_at = loaded_at or time.time()
+
+        # Integer cents, indexed by position, for the totals fast path
+        self._index = {sku: position for position, sku in enumerate(self.entries)}
+        self._cents = np.array(
+            [int((entry.unit_price / CENT).to_integral_value()) for entry in self.entries.values()],
+            dtype=np.int64
+        )
+        # Prices with sub-cent precision cannot use the integer path
+        self._exact_cents = all(entry.unit_price == entry.unit_price.quantize(CENT) for entry in self.entries.values())
+
+        fingerprint = "\n".join(
+            f"{entry.sku}|{entry.unit_price}|{entry.tax_class}|{entry.min_order_qty}"
+            for entry in sorted(self.entries.values(), key=lambda entry: entry.sku)
+        )
+        self.version = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, sku: str) -> bool:
+        return sku in self.entries
+
+    def get(self, sku: str) -> Optional[PriceEntry]:
+        return self.entries.get(sku)
+
+    def price(self, sku: str) -> Optional[Decimal]:
+        entry = self.entries.get(sku)
+        return entry.unit_price if entry else None
+
+    # ------------------------------------------------------------------
+    # Totals
+    # ------------------------------------------------------------------
+
+    def subtotal(self, line_items: List[Dict[str, Any]]) -> Decimal:
+        """
+        Sum of unit price x quantity; SKUs not in the price book are skipped
+
+        Integer quantities use a vectorized integer-cent dot product;
+        anything else falls back to Decimal arithmetic.
+        """
+        if not line_items:
+            return Decimal('0.00')
+
+        quantities = [item.get('quantity', 0) for item in line_items]
+        if self._exact_cents and all(isinstance(quantity, int) and not isinstance(quantity, bool) for quantity in quantities):
+            positions = np.fromiter(
+                (self._index.get(item.get('sku'), -1) for item in line_items),
+                dtype=np.int64, count=len(line_items)
+            )
+            known = positions >= 0
+            cents = int(np.dot(self._cents[positions[known]], np.asarray(quantities, dtype=np.int64)[known]))
+            return Decimal(cents) * CENT
+
+        subtotal = Decimal('0.00')
+        for item, quantity in zip(line_items, quantities):
+            entry = self.entries.get(item.get('sku'))
+            if entry:
+                subtotal += entry.unit_price * Decimal(str(quantity))
+        return subtotal
+
+    def totals(self, line_items: List[Dict[str, Any]], tax_rate: Decimal) -> Dict[str, Decimal]:
+        """
+        Subtotal, tax and total for line items
+
+        Returns:
+            {'subtotal', 'tax', 'total'} as in calculate_order_total
+        """
+        subtotal = self.subtotal(line_items)
+        tax = subtotal * tax_rate
+        return {'subtotal': subtotal, 'tax': tax, 'total': subtotal + tax}
+
+    # ------------------------------------------------------------------
+    # Stamping
+    # ------------------------------------------------------------------
+
+    def stamp(self, parsed_order: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy of parsed_order with the price book version and the unit price
+        of every known line item, for deterministic invoice regeneration
+
+        Args:
+            parsed_order: {"outlet_name": ..., "line_items": [...], ...}
+
+        Returns:
+            Stamped copy (the input is not modified)
+        """
+        line_items = []
+        for item in parsed_order.get('line_items', []):
+            entry = self.entries.get(item.get('sku'))
+            line_items.append({**item, 'unit_price': str(entry.unit_price)} if entry else dict(item))
+
+        return {**parsed_order, 'line_items': line_items, 'price_book_version': self.version}
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def load(cls, engine=None) -> "PriceBook":
+        """Load active products from the catalog"""
+        engine = engine or get_db_engine()
+        with engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT sku, unit_price, min_order_qty
+                FROM products
+                WHERE is_active = :is_active
+            """), {'is_active': True}).all()
+
+        return cls([
+            PriceEntry(sku=str(row[0]), unit_price=Decimal(row[1]), min_order_qty=int(row[2] or 1))
+            for row in rows
+        ])
+
+
+def catalog_fingerprint(engine=None) -> Tuple[Any, ...]:
+    """Cheap summary of the products table that changes when prices do"""
+    engine = engine or get_db_engine()
+    with engine.connect() as conn:
+        return tuple(conn.execute(text("""
+            SELECT count(*), max(coalesce(updated_at, created_at)), sum(unit_price), sum(min_order_qty)
+            FROM products
+            WHERE is_active = :is_active
+        """), {'is_active': True}).one())
+
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+_global_price_book: Optional[PriceBook] = None
+_global_fingerprint: Optional[Tuple[Any, ...]] = None
+_last_check = 0.0
+_refresh_lock = threading.Lock()
+
+
+def get_price_book(force_refresh: bool = False) -> PriceBook:
+    """
+    Get the current price book, reloading it if the catalog changed
+
+    The catalog fingerprint is checked at most every
+    PRICE_BOOK_REFRESH_SECONDS (default 60).
+
+    Raises:
+        Exception: Database errors when no snapshot has been loaded yet
+    """
+    global _global_price_book, _global_fingerprint, _last_check
+
+    refresh_seconds = float(os.getenv('PRICE_BOOK_REFRESH_SECONDS', '60'))
+    if not force_refresh and _global_price_book is not None and time.time() - _last_check < refresh_seconds:
+        return _global_price_book
+
+    with _refresh_lock:
+        if not force_refresh and _global_price_book is not None and time.time() - _last_check < refresh_seconds:
+            return _global_price_book
+
+        try:
+            fingerprint = catalog_fingerprint()
+            if force_refresh or _global_price_book is None or fingerprint != _global_fingerprint:
+                _global_price_book = PriceBook.load()
+                _global_fingerprint = fingerprint
+                logger.info(f"Price book {_global_price_book.version} loaded ({len(_global_price_book)} SKUs)")
+        except Exception as e:
+            if _global_price_book is None:
+                raise
+            # Keep serving the last snapshot; retry after the next interval
+            logger.warning(f"Price book refresh failed, using version {_global_price_book.version}: {e}")
+        _last_check = time.time()
+
+    return _global_price_book
+
+
+def invalidate_price_book() -> None:
+    """Force a fingerprint check on the next get_price_book() call"""
+    global _last_check
+    _last_check = 0.0
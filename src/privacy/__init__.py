@@ -8,12 +8,19 @@ NO MOCKING - Production-ready privacy controls.
 """
 
 from .pii_scrubber import scrub_pii, PIIType, PIIMetadata
-from .data_retention import cleanup_old_conversations, anonymize_old_summaries
+from .data_retention import (
+    cleanup_old_conversations,
+    drop_expired_conversation_partitions,
+    anonymize_old_summaries,
+)
+from .partition_manager import ensure_future_partitions
 
 __all__ = [
     'scrub_pii',
     'PIIType',
     'PIIMetadata',
     'cleanup_old_conversations',
+    'drop_expired_conversation_partitions',
     'anonymize_old_summaries',
+    'ensure_future_partitions',
 ]
@@ -6,6 +6,7 @@ Production-ready data retention policy enforcement for TRIA AI-BPO.
 
 Features:
 - Automatic cleanup of conversations older than 90 days
+- Partition-drop retention for monthly-partitioned conversation tables
 - Anonymization of user summaries older than 2 years
 - Audit logging of all cleanup actions
 - Dry-run mode for testing
@@ -20,6 +21,14 @@ from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 import hashlib
 
+from .partition_manager import (
+    is_partitioned,
+    list_partitions,
+    expired_partitions,
+    count_partition_rows,
+    drop_partition,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +41,7 @@ class CleanupResult:
         conversations_deleted: Number of conversation sessions deleted
         messages_deleted: Number of individual messages deleted
         summaries_anonymized: Number of user summaries anonymized
+        partitions_dropped: Names of expired partitions detached and dropped
         errors: List of error messages encountered
         dry_run: Whether this was a dry run
         started_at: When cleanup started
@@ -40,6 +50,7 @@ class CleanupResult:
     conversations_deleted: int = 0
     messages_deleted: int = 0
     summaries_anonymized: int = 0
+    partitions_dropped: list = field(default_factory=list)
     errors: list = field(default_factory=list)
     dry_run: bool = False
     started_at: Optional[datetime] = None
@@ -51,6 +62,7 @@ class CleanupResult:
             'conversations_deleted': self.conversations_deleted,
             'messages_deleted': self.messages_deleted,
             'summaries_anonymized': self.summaries_anonymized,
+            'partitions_dropped': self.partitions_dropped,
             'errors': self.errors,
             'dry_run': self.dry_run,
             'started_at': self.started_at.isoformat() if self.started_at else None,
@@ -71,7 +83,9 @@ def cleanup_old_conversations(
     db_connection,
     retention_days: int = 90,
     dry_run: bool = False,
-    batch_size: int = 1000
+    batch_size: int = 1000,
+    start_time_from: Optional[datetime] = None,
+    start_time_to: Optional[datetime] = None
 ) -> CleanupResult:
     """
     Delete conversation data older than retention period
@@ -89,6 +103,9 @@ def cleanup_old_conversations(
         retention_days: Number of days to retain conversations (default: 90)
         dry_run: If True, report what would be deleted without deleting
         batch_size: Number of records to delete per batch
+        start_time_from: Optional inclusive lower bound on session start_time
+        start_time_to: Optional exclusive upper bound on session start_time
+                       (used to limit row deletes to one partition's range)
 
     Returns:
         CleanupResult with deletion statistics
@@ -118,13 +135,22 @@ def cleanup_old_conversations(
         # ====================================================================
         # STEP 1: Find conversations to delete
         # ====================================================================
-        cursor.execute("""
+        query = """
             SELECT session_id, end_time
             FROM conversation_sessions
-            WHERE end_time < %s
-            OR (end_time IS NULL AND start_time < %s)
-            ORDER BY end_time ASC
-        """, (cutoff_date, cutoff_date))
+            WHERE (end_time < %s
+            OR (end_time IS NULL AND start_time < %s))
+        """
+        params = [cutoff_date, cutoff_date]
+        if start_time_from:
+            query += " AND start_time >= %s"
+            params.append(start_time_from)
+        if start_time_to:
+            query += " AND start_time < %s"
+            params.append(start_time_to)
+        query += " ORDER BY end_time ASC"
+
+        cursor.execute(query, tuple(params))
 
         sessions_to_delete = cursor.fetchall()
         result.conversations_deleted = len(sessions_to_delete)
@@ -216,6 +242,170 @@ def cleanup_old_conversations(
     return result
 
 
+def drop_expired_conversation_partitions(
+    db_connection,
+    retention_days: int = 90,
+    dry_run: bool = False
+) -> CleanupResult:
+    """
+    Enforce conversation retention by dropping whole monthly partitions
+
+    Requires conversation_messages and conversation_sessions to be
+    range-partitioned (see scripts/migrate_conversation_partitions.py).
+
+    Process:
+    1. Drop message partitions whose month ends before the cutoff and
+       whose messages all belong to expired sessions (oldest first,
+       stopping at the first month with messages of a live session)
+    2. Drop session partitions whose month ends before the cutoff.
+       Messages of those sessions in newer partitions are deleted first.
+       A month containing a session that ended after the cutoff is kept
+       and only its expired sessions are row-deleted.
+    3. Row-delete the remaining expired sessions in the boundary month via
+       cleanup_old_conversations (at most ~one month of data)
+    4. Log all drops for audit trail
+
+    Args:
+        db_connection: PostgreSQL database connection (psycopg2)
+        retention_days: Number of days to retain conversations (default: 90)
+        dry_run: If True, report what would be dropped without dropping
+
+    Returns:
+        CleanupResult with deletion statistics and dropped partition names
+    """
+    result = CleanupResult(
+        dry_run=dry_run,
+        started_at=datetime.utcnow()
+    )
+
+    try:
+        cursor = db_connection.cursor()
+        cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
+
+        logger.info(
+            f"{'[DRY RUN] ' if dry_run else ''}Starting partition-drop conversation cleanup "
+            f"(retention: {retention_days} days, cutoff: {cutoff_date.isoformat()})"
+        )
+
+        # ====================================================================
+        # STEP 1: Drop expired message partitions
+        # ====================================================================
+        # Retention follows the session, not the message: a month of
+        # messages is only dropped once every session with messages in
+        # it has expired. Stop at the first month still holding messages
+        # of a live session (its expired sessions are row-deleted below).
+        # Messages from this point on live in partitions that are kept
+        retained_messages_from = None
+        for partition in expired_partitions(list_partitions(cursor, 'conversation_messages'), cutoff_date):
+            cursor.execute(f"""
+                SELECT 1 FROM {partition.name} m
+                JOIN conversation_sessions s ON s.session_id = m.session_id
+                WHERE COALESCE(s.end_time, s.start_time) >= %s
+                LIMIT 1
+            """, (cutoff_date,))
+            if cursor.fetchone() is not None:
+                logger.info(f"Keeping {partition.name}: contains messages of sessions active after cutoff")
+                break
+
+            retained_messages_from = partition.range_end
+            result.messages_deleted += count_partition_rows(cursor, partition)
+            if not dry_run:
+                drop_partition(cursor, partition)
+                db_connection.commit()
+            result.partitions_dropped.append(partition.name)
+
+        # ====================================================================
+        # STEP 2: Drop expired session partitions
+        # ====================================================================
+        boundary_start = retained_messages_from
+        for partition in expired_partitions(list_partitions(cursor, 'conversation_sessions'), cutoff_date):
+            boundary_start = partition.range_end
+
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {partition.name} WHERE end_time >= %s",
+                (cutoff_date,)
+            )
+            if cursor.fetchone()[0] > 0:
+                # A long-running session ended after the cutoff: row-delete
+                # only the expired sessions of this month, drop it later
+                logger.info(f"Keeping {partition.name}: contains sessions that ended after cutoff")
+                _merge_cleanup_result(result, cleanup_old_conversations(
+                    db_connection,
+                    retention_days=retention_days,
+                    dry_run=dry_run,
+                    start_time_from=partition.range_start,
+                    start_time_to=partition.range_end
+                ))
+                continue
+
+            result.conversations_deleted += count_partition_rows(cursor, partition)
+
+            # Sessions may have messages in months that are not yet expired
+            cursor.execute(f"""
+                SELECT COUNT(*) FROM conversation_messages
+                WHERE session_id IN (SELECT session_id FROM {partition.name})
+                AND timestamp >= %s
+            """, (retained_messages_from or partition.range_start,))
+            result.messages_deleted += cursor.fetchone()[0]
+
+            if not dry_run:
+                cursor.execute(f"""
+                    DELETE FROM conversation_messages
+                    WHERE session_id IN (SELECT session_id FROM {partition.name})
+                """)
+                drop_partition(cursor, partition)
+                db_connection.commit()
+            result.partitions_dropped.append(partition.name)
+
+        # ====================================================================
+        # STEP 3: Row-delete remaining expired sessions (boundary month)
+        # ====================================================================
+        _merge_cleanup_result(result, cleanup_old_conversations(
+            db_connection,
+            retention_days=retention_days,
+            dry_run=dry_run,
+            start_time_from=boundary_start
+        ))
+
+        # ====================================================================
+        # STEP 4: Log audit trail
+        # ====================================================================
+        audit_log = {
+            'action': 'drop_expired_conversation_partitions',
+            'dry_run': dry_run,
+            'retention_days': retention_days,
+            'cutoff_date': cutoff_date.isoformat(),
+            'partitions_dropped': result.partitions_dropped,
+            'conversations_deleted': result.conversations_deleted,
+            'messages_deleted': result.messages_deleted,
+            'timestamp': datetime.utcnow().isoformat(),
+        }
+
+        if not dry_run and result.partitions_dropped:
+            _log_cleanup_action(cursor, audit_log)
+            db_connection.commit()
+
+        logger.info(
+            f"{'[DRY RUN] Would drop' if dry_run else 'Dropped'} "
+            f"{len(result.partitions_dropped)} partitions "
+            f"({result.conversations_deleted} conversations, "
+            f"{result.messages_deleted} messages in total)"
+        )
+
+    except Exception as e:
+        error_msg = f"Error during partition-drop cleanup: {str(e)}"
+        logger.error(error_msg)
+        result.errors.append(error_msg)
+
+        if not dry_run:
+            db_connection.rollback()
+
+    finally:
+        result.completed_at = datetime.utcnow()
+
+    return result
+
+
 # ============================================================================
 # USER SUMMARY ANONYMIZATION (2-YEAR RETENTION)
 # ============================================================================
@@ -350,7 +540,8 @@ def run_full_cleanup(
     db_connection,
     conversation_retention_days: int = 90,
     summary_retention_days: int = 730,
-    dry_run: bool = False
+    dry_run: bool = False,
+    strategy: str = 'auto'
 ) -> Dict[str, CleanupResult]:
     """
     Run complete data retention cleanup
@@ -363,6 +554,10 @@ def run_full_cleanup(
         conversation_retention_days: Days to retain conversations (default: 90)
         summary_retention_days: Days before anonymizing summaries (default: 730)
         dry_run: If True, report actions without executing
+        strategy: Conversation cleanup strategy
+            - 'auto': 'partition' if conversation_messages is partitioned, else 'delete'
+            - 'partition': drop_expired_conversation_partitions
+            - 'delete': cleanup_old_conversations (batched row deletes)
 
     Returns:
         Dictionary with 'conversations' and 'summaries' CleanupResult objects
@@ -381,13 +576,27 @@ def run_full_cleanup(
 
     results = {}
 
+    if strategy not in ('auto', 'partition', 'delete'):
+        raise ValueError(f"Unknown cleanup strategy '{strategy}'. Allowed: auto, partition, delete")
+
+    if strategy == 'auto':
+        partitioned = is_partitioned(db_connection.cursor(), 'conversation_messages')
+        strategy = 'partition' if partitioned else 'delete'
+
     # Run conversation cleanup
-    logger.info("\n[1/2] Cleaning up old conversations...")
-    results['conversations'] = cleanup_old_conversations(
-        db_connection,
-        retention_days=conversation_retention_days,
-        dry_run=dry_run
-    )
+    logger.info(f"\n[1/2] Cleaning up old conversations (strategy: {strategy})...")
+    if strategy == 'partition':
+        results['conversations'] = drop_expired_conversation_partitions(
+            db_connection,
+            retention_days=conversation_retention_days,
+            dry_run=dry_run
+        )
+    else:
+        results['conversations'] = cleanup_old_conversations(
+            db_connection,
+            retention_days=conversation_retention_days,
+            dry_run=dry_run
+        )
 
     # Run user summary anonymization
     logger.info("\n[2/2] Anonymizing old user summaries...")
@@ -405,6 +614,8 @@ def run_full_cleanup(
     logger.info(f"\nConversations:")
     logger.info(f"  - Sessions deleted: {results['conversations'].conversations_deleted}")
     logger.info(f"  - Messages deleted: {results['conversations'].messages_deleted}")
+    if results['conversations'].partitions_dropped:
+        logger.info(f"  - Partitions dropped: {', '.join(results['conversations'].partitions_dropped)}")
     logger.info(f"\nUser Summaries:")
     logger.info(f"  - Summaries anonymized: {results['summaries'].summaries_anonymized}")
     logger.info(f"\nErrors:")
@@ -444,6 +655,15 @@ def _generate_anonymous_id(user_id: str) -> str:
     return f"ANON_{hash_hex[:32]}"
 
 
+def _merge_cleanup_result(target: CleanupResult, other: CleanupResult) -> None:
+    """Add the counts and errors of other into target"""
+    target.conversations_deleted += other.conversations_deleted
+    target.messages_deleted += other.messages_deleted
+    target.summaries_anonymized += other.summaries_anonymized
+    target.partitions_dropped.extend(other.partitions_dropped)
+    target.errors.extend(other.errors)
+
+
 def _log_cleanup_action(cursor, audit_log: dict):
     """
     Log cleanup action to audit trail
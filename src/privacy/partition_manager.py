@@ -0,0 +1,245 @@
+"""
+Monthly Range Partitions for Conversation Tables
+=================================================
+
+Partition maintenance that lets data retention drop whole months of
+conversation data instead of deleting rows.
+
+Layout:
+- conversation_messages: PARTITION BY RANGE (timestamp)
+- conversation_sessions: PARTITION BY RANGE (start_time)
+- One partition per calendar month (UTC), named <table>_pYYYYMM
+
+Why:
+- DELETE of tens of millions of rows causes long transactions, table
+  bloat and autovacuum pressure
+- DETACH + DROP of an expired partition is a metadata operation that
+  returns the space to the OS immediately
+
+Operational notes:
+- There is no DEFAULT partition; ensure_future_partitions() must run
+  ahead of time (startup hook + daily cleanup job create 3 months ahead)
+- On the partitioned tables the primary key is (id, <partition column>)
+  and session_id uniqueness is (session_id, start_time); session IDs
+  are UUID4 so this does not change behaviour in practice
+
+All functions take a DB-API (psycopg2) connection or cursor, matching
+privacy.data_retention.
+
+NO MOCKING - Uses real PostgreSQL declarative partitioning.
+"""
+
+import re
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES: Dict[str, str] = {
+    'conversation_messages': 'timestamp',
+    'conversation_sessions': 'start_time',
+}
+
+DEFAULT_MONTHS_AHEAD = 3
+
+_PARTITION_SUFFIX = re.compile(r'_p(\d{4})(\d{2})$')
+
+
+@dataclass
+class PartitionInfo:
+    """
+    A monthly partition of a partitioned table
+
+    Attributes:
+        table: Parent table name
+        name: Partition table name
+        range_start: Inclusive lower bound (first instant of the month, UTC)
+        range_end: Exclusive upper bound (first instant of next month, UTC)
+    """
+    table: str
+    name: str
+    range_start: datetime
+    range_end: datetime
+
+
+# ============================================================================
+# NAMING AND BOUNDS
+# ============================================================================
+
+def month_start(value: datetime) -> datetime:
+    """First instant of the month containing value, as aware UTC"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift a month-start datetime by a number of months"""
+    index = value.year * 12 + (value.month - 1) + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    """Partition table name for the month starting at start"""
+    return f"{table}_p{start.year:04d}{start.month:02d}"
+
+
+def parse_partition_name(table: str, name: str) -> Optional[PartitionInfo]:
+    """
+    Recover partition bounds from a <table>_pYYYYMM name
+
+    Returns:
+        PartitionInfo, or None if the name does not follow the convention
+    """
+    if not name.startswith(f"{table}_p"):
+        return None
+    match = _PARTITION_SUFFIX.search(name)
+    if not match:
+        return None
+
+    start = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+    return PartitionInfo(table=table, name=name, range_start=start, range_end=add_months(start, 1))
+
+
+def _check_table(table: str) -> str:
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"Unknown partitioned table '{table}'. Allowed: {list(PARTITIONED_TABLES)}")
+    return table
+
+
+# ============================================================================
+# CATALOG QUERIES
+# ============================================================================
+
+def is_partitioned(cursor, table: str) -> bool:
+    """Check whether table is a declaratively partitioned parent table"""
+    cursor.execute("""
+        SELECT 1
+        FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        WHERE c.relname = %s
+    """, (table,))
+    return cursor.fetchone() is not None
+
+
+def list_partitions(cursor, table: str) -> List[PartitionInfo]:
+    """
+    List monthly partitions attached to table, oldest first
+
+    Partitions that do not follow the <table>_pYYYYMM convention are ignored.
+    """
+    _check_table(table)
+    cursor.execute("""
+        SELECT child.relname
+        FROM pg_inherits i
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_class child ON child.oid = i.inhrelid
+        WHERE parent.relname = %s
+    """, (table,))
+
+    partitions = []
+    for (name,) in cursor.fetchall():
+        info = parse_partition_name(table, name)
+        if info:
+            partitions.append(info)
+
+    return sorted(partitions, key=lambda p: p.range_start)
+
+
+def expired_partitions(
+    partitions: List[PartitionInfo],
+    cutoff: datetime
+) -> List[PartitionInfo]:
+    """Partitions whose entire range lies before cutoff"""
+    if cutoff.tzinfo is None:
+        cutoff = cutoff.replace(tzinfo=timezone.utc)
+    return [p for p in partitions if p.range_end <= cutoff]
+
+
+# ============================================================================
+# MAINTENANCE
+# ============================================================================
+
+def create_partition(cursor, table: str, start: datetime) -> str:
+    """
+    Create the monthly partition of table starting at start (idempotent)
+
+    Returns:
+        Partition table name
+    """
+    _check_table(table)
+    start = month_start(start)
+    name = partition_name(table, start)
+
+    # Identifiers come from PARTITIONED_TABLES / partition_name, not user input
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+        f"FOR VALUES FROM (%s) TO (%s)",
+        (start, add_months(start, 1))
+    )
+    return name
+
+
+def ensure_future_partitions(
+    db_connection,
+    months_ahead: int = DEFAULT_MONTHS_AHEAD,
+    now: Optional[datetime] = None
+) -> List[str]:
+    """
+    Make sure partitions exist for the current month and months_ahead after it
+
+    Tables that are not partitioned (migration not yet run) are skipped.
+
+    Args:
+        db_connection: PostgreSQL connection (psycopg2)
+        months_ahead: Number of future months to pre-create
+        now: Reference time (defaults to current UTC time)
+
+    Returns:
+        Names of partitions that exist for the covered range
+    """
+    cursor = db_connection.cursor()
+    current = month_start(now or datetime.now(timezone.utc))
+    ensured = []
+
+    try:
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(cursor, table):
+                logger.debug(f"{table} is not partitioned; skipping partition creation")
+                continue
+            for offset in range(months_ahead + 1):
+                ensured.append(create_partition(cursor, table, add_months(current, offset)))
+
+        db_connection.commit()
+    except Exception:
+        db_connection.rollback()
+        raise
+
+    if ensured:
+        logger.info(f"Ensured {len(ensured)} conversation partitions through "
+                    f"{add_months(current, months_ahead).strftime('%Y-%m')}")
+    return ensured
+
+
+def count_partition_rows(cursor, partition: PartitionInfo) -> int:
+    """Exact row count of a single partition"""
+    cursor.execute(f"SELECT COUNT(*) FROM {partition.name}")
+    return cursor.fetchone()[0]
+
+
+def drop_partition(cursor, partition: PartitionInfo) -> None:
+    """
+    Detach and drop a partition
+
+    DETACH only touches the catalog; DROP releases the files. Neither
+    scans rows or produces dead tuples.
+    """
+    cursor.execute(f"ALTER TABLE {partition.table} DETACH PARTITION {partition.name}")
+    cursor.execute(f"DROP TABLE {partition.name}")
+    logger.info(f"Dropped partition {partition.name} "
+                f"[{partition.range_start.date()} - {partition.range_end.date()})")
@@ -15,12 +15,13 @@ import os
 import json
 import time
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from decimal import Decimal
 from sqlalchemy import text
 
 # Import centralized database connection
 from database import get_db_engine
+from price_book import PriceBook
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -211,16 +212,21 @@ def extract_json_from_llm_response(response_content: str) -> Dict:
     )
 
 
-def calculate_order_total(line_items: List[Dict], products_map: Dict[str, Dict]) -> Dict[str, Decimal]:
+def calculate_order_total(
+    line_items: List[Dict],
+    products_map: Optional[Dict[str, Dict]] = None,
+    price_book: Optional[PriceBook] = None
+) -> Dict[str, Decimal]:
     """
     Calculate order totals from line items using catalog pricing
 
+    Prices come from the price book when given (exact Decimal prices,
+    integer-cent fast path), otherwise from products_map.
+
     Raises:
         ValueError: If TAX_RATE environment variable is not configured
     """
 
-    subtotal = Decimal('0.00')
-
     # NO HARDCODING, NO FALLBACKS - TAX_RATE must be configured
     tax_rate_str = os.getenv('TAX_RATE')
     if not tax_rate_str:
@@ -230,6 +236,12 @@ def calculate_order_total(line_items: List[Dict], products_map: Dict[str, Dict])
         )
     tax_rate = Decimal(str(tax_rate_str))
 
+    if price_book is not None:
+        return price_book.totals(line_items, tax_rate)
+
+    subtotal = Decimal('0.00')
+    products_map = products_map or {}
+
     for item in line_items:
         sku = item.get('sku')
         quantity = item.get('quantity', 0)
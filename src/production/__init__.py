@@ -11,6 +11,7 @@ This module provides production-grade reliability, resilience, and observability
 - Input validation and sanitization
 - Error tracking and monitoring
 - Rate limiting for external APIs
+- Durable background job queue
 """
 
 from .transactions import transactional, TransactionManager
@@ -25,7 +26,21 @@ from .validation import (
     ValidationError
 )
 from .error_tracking import init_error_tracking, track_error
-from .rate_limiting import XeroRateLimiter, rate_limit_xero, RateLimitExceeded
+from .rate_limiting import (
+    XeroRateLimiter,
+    XeroPriority,
+    rate_limit_xero,
+    xero_priority,
+    with_xero_priority,
+    RateLimitExceeded
+)
+from .job_queue import (
+    JobQueue,
+    JobWorker,
+    PermanentJobError,
+    get_job_queue,
+    register_job_handler
+)
 
 __all__ = [
     # Transaction management
@@ -51,6 +66,15 @@ __all__ = [
     'track_error',
     # Rate limiting
     'XeroRateLimiter',
+    'XeroPriority',
     'rate_limit_xero',
+    'xero_priority',
+    'with_xero_priority',
     'RateLimitExceeded',
+    # Background jobs
+    'JobQueue',
+    'JobWorker',
+    'PermanentJobError',
+    'get_job_queue',
+    'register_job_handler',
 ]
@@ -0,0 +1,635 @@
+"""
+Durable Background Job Queue
+============================
+
+PostgreSQL-backed job queue for work that should not run inside an HTTP
+request: posting invoices to Xero and finalizing orders.
+
+Features:
+- Durable: jobs live in the background_jobs table and survive restarts
+- Idempotent enqueue: one job per idempotency_key (repeat calls return it)
+- Concurrent workers: claims use SELECT ... FOR UPDATE SKIP LOCKED, so any
+  number of worker processes can poll the same table without contention
+- Exponential retry with jitter, capped; PermanentJobError skips retries
+- Dead-letter: jobs out of attempts stay in the table with status 'dead'
+  and can be re-queued with JobQueue.retry()
+- Leases: a crashed worker's job is re-queued once locked_until passes;
+  a live worker renews its lease while the handler runs
+- Tracing: the enqueuing request's correlation ID travels in the payload,
+  and the job runs (and is traced) under it
+
+Usage:
+    from production.job_queue import get_job_queue, register_job_handler
+
+    @register_job_handler("xero.post_invoice")
+    def post_invoice(payload):
+        ...
+        return {"invoice_id": "..."}
+
+    job = get_job_queue().enqueue(
+        "xero.post_invoice", {"order_id": 42}, idempotency_key="xero.post_invoice:42"
+    )
+
+    # Worker process: python scripts/run_job_worker.py
+
+NO MOCKING - Real PostgreSQL row locking.
+"""
+
+import os
+import json
+import time
+import random
+import socket
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import Engine, text, select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from database import get_db_engine
+from models.order_orm import BackgroundJob
+from monitoring.prometheus_metrics import record_background_job
+from monitoring.tracing import (
+    CORRELATION_PAYLOAD_KEY,
+    SPAN_KIND_CONSUMER,
+    correlation_scope,
+    get_correlation_id,
+    trace_span,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Job statuses
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_DEAD = 'dead'
+
+JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JOB_DEAD)
+
+DEFAULT_MAX_ATTEMPTS = 8
+
+# Retry delay: BACKOFF_BASE_SECONDS * 2^(attempt-1), capped, +/- jitter
+BACKOFF_BASE_SECONDS = 5.0
+BACKOFF_MAX_SECONDS = 900.0
+BACKOFF_JITTER = 0.2
+
+# Longest error message stored on the job row
+MAX_ERROR_LENGTH = 2000
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot succeed (job goes straight to dead)"""
+    pass
+
+
+# ============================================================================
+# BACKOFF
+# ============================================================================
+
+def compute_backoff(
+    attempt: int,
+    base_seconds: float = BACKOFF_BASE_SECONDS,
+    max_seconds: float = BACKOFF_MAX_SECONDS,
+    jitter: float = BACKOFF_JITTER,
+    rand: Callable[[], float] = random.random
+) -> float:
+    """
+    Delay before the next attempt after a failure
+
+    Args:
+        attempt: Number of the attempt that just failed (1-based)
+        base_seconds: Delay after the first failure
+        max_seconds: Upper bound before jitter
+        jitter: Fractional jitter (0.2 = +/-20%) to spread retries
+        rand: Random source returning [0, 1)
+
+    Returns:
+        Delay in seconds
+    """
+    delay = min(max_seconds, base_seconds * (2 ** max(0, attempt - 1)))
+    return max(0.0, delay * (1 + jitter * (2 * rand() - 1)))
+
+
+def default_idempotency_key(job_type: str, payload: Dict[str, Any]) -> str:
+    """Idempotency key derived from job type and canonical payload JSON"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return f"{job_type}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]}"
+
+
+# ============================================================================
+# HANDLER REGISTRY
+# ============================================================================
+
+JobHandler = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+_job_handlers: Dict[str, JobHandler] = {}
+
+
+def register_job_handler(job_type: str):
+    """
+    Register a handler for a job type
+
+    The handler receives the job payload and returns a JSON-serializable
+    result (stored on the job) or None. Exceptions trigger a retry;
+    PermanentJobError dead-letters the job immediately.
+
+    Example:
+        @register_job_handler("xero.order_workflow")
+        def run_order_workflow(payload):
+            ...
+    """
+    def decorator(handler: JobHandler) -> JobHandler:
+        _job_handlers[job_type] = handler
+        return handler
+    return decorator
+
+
+def get_job_handler(job_type: str) -> Optional[JobHandler]:
+    """Handler registered for job_type, if any"""
+    return _job_handlers.get(job_type)
+
+
+def registered_job_types() -> List[str]:
+    """All job types with a registered handler"""
+    return sorted(_job_handlers)
+
+
+# ============================================================================
+# QUEUE
+# ============================================================================
+
+@dataclass
+class ClaimedJob:
+    """A job leased to a worker"""
+    id: int
+    job_type: str
+    idempotency_key: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+_CLAIM_SQL = """
+    UPDATE background_jobs
+    SET status = 'running',
+        attempts = attempts + 1,
+        locked_by = :worker_id,
+        locked_until = now() + make_interval(secs => :lease_seconds),
+        updated_at = now()
+    WHERE id IN (
+        SELECT id FROM background_jobs
+        WHERE status = 'queued'
+          AND run_after <= now()
+          {type_filter}
+        ORDER BY priority, run_after, id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, job_type, idempotency_key, payload, attempts, max_attempts
+"""
+
+_REQUEUE_EXPIRED_SQL = text("""
+    UPDATE background_jobs
+    SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+        finished_at = CASE WHEN attempts >= max_attempts THEN now() ELSE NULL END,
+        last_error = 'Lease expired (worker ' || coalesce(locked_by, '?') || ' stopped responding)',
+        locked_by = NULL,
+        locked_until = NULL,
+        run_after = now(),
+        updated_at = now()
+    WHERE status = 'running' AND locked_until < now()
+""")
+
+
+class JobQueue:
+    """
+    Enqueue, claim and settle background jobs
+
+    Usage:
+        queue = get_job_queue()
+        job = queue.enqueue("xero.post_invoice", {"order_id": 42})
+        queue.get(job['id'])['status']
+    """
+
+    def __init__(self, engine: Optional[Engine] = None, lease_seconds: float = 300.0):
+        """
+        Initialize queue
+
+        Args:
+            engine: SQLAlchemy engine (defaults to the global engine)
+            lease_seconds: How long a claimed job stays locked to its worker
+        """
+        self.engine = engine or get_db_engine()
+        self.lease_seconds = lease_seconds
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        delay_seconds: float = 0.0
+    ) -> Dict[str, Any]:
+        """
+        Add a job unless one with the same idempotency key exists
+
+        Args:
+            job_type: Registered job type
+            payload: JSON-serializable handler input
+            idempotency_key: Deduplication key (defaults to a payload hash)
+            priority: Lower values are claimed first
+            max_attempts: Attempts before the job is dead-lettered
+            delay_seconds: Earliest start, relative to now
+
+        Returns:
+            Job dictionary with 'created' False when an existing job was returned
+        """
+        key = idempotency_key or default_idempotency_key(job_type, payload)
+        correlation_id = get_correlation_id()
+        if correlation_id and CORRELATION_PAYLOAD_KEY not in payload:
+            payload = {**payload, CORRELATION_PAYLOAD_KEY: correlation_id}
+
+        statement = pg_insert(BackgroundJob.__table__).values(
+            job_type=job_type,
+            idempotency_key=key,
+            payload=payload,
+            status=JOB_QUEUED,
+            priority=priority,
+            attempts=0,
+            max_attempts=max_attempts,
+            run_after=func.now() + func.make_interval(0, 0, 0, 0, 0, 0, float(delay_seconds)),
+        ).on_conflict_do_nothing(index_elements=['idempotency_key']).returning(BackgroundJob.__table__.c.id)
+
+        with self.engine.begin() as conn:
+            created = conn.execute(statement).scalar() is not None
+
+        job = self.get_by_key(key)
+        job['created'] = created
+        if created:
+            logger.info(f"[JOBS] Enqueued {job_type} #{job['id']} ({key})")
+        return job
+
+    def retry(self, job_id: int) -> bool:
+        """
+        Re-queue a dead job with a fresh attempt budget
+
+        Returns:
+            True if the job was dead and is queued again
+        """
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                text("""
+                    UPDATE background_jobs
+                    SET status = 'queued', attempts = 0, run_after = now(),
+                        last_error = NULL, finished_at = NULL, updated_at = now()
+                    WHERE id = :job_id AND status = 'dead'
+                """),
+                {'job_id': job_id}
+            )
+        return result.rowcount == 1
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def claim(self, worker_id: str, job_types: Optional[List[str]] = None, limit: int = 1) -> List[ClaimedJob]:
+        """
+        Lease up to limit runnable jobs to worker_id
+
+        Rows locked by another worker's claim are skipped, not waited on.
+        """
+        params = {'worker_id': worker_id, 'lease_seconds': self.lease_seconds, 'limit': limit}
+        type_filter = ''
+        if job_types:
+            type_filter = 'AND job_type = ANY(:job_types)'
+            params['job_types'] = list(job_types)
+
+        with self.engine.begin() as conn:
+            rows = conn.execute(text(_CLAIM_SQL.format(type_filter=type_filter)), params).mappings().all()
+
+        return [ClaimedJob(**row) for row in rows]
+
+    def renew_lease(self, job: ClaimedJob, worker_id: str) -> bool:
+        """
+        Extend a running job's lease by lease_seconds from now
+
+        Returns:
+            False if the lease was already lost
+        """
+        with self.engine.begin() as conn:
+            updated = conn.execute(
+                text("""
+                    UPDATE background_jobs
+                    SET locked_until = now() + make_interval(secs => :lease_seconds), updated_at = now()
+                    WHERE id = :job_id AND status = 'running' AND locked_by = :worker_id
+                """),
+                {'job_id': job.id, 'worker_id': worker_id, 'lease_seconds': self.lease_seconds}
+            )
+        return updated.rowcount == 1
+
+    def complete(self, job: ClaimedJob, worker_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Mark a claimed job succeeded
+
+        Returns:
+            False if the lease was lost (job re-queued or taken by another worker)
+        """
+        with self.engine.begin() as conn:
+            updated = conn.execute(
+                text("""
+                    UPDATE background_jobs
+                    SET status = 'succeeded', result = CAST(:result AS jsonb), last_error = NULL,
+                        locked_by = NULL, locked_until = NULL,
+                        finished_at = now(), updated_at = now()
+                    WHERE id = :job_id AND status = 'running' AND locked_by = :worker_id
+                """),
+                {'job_id': job.id, 'worker_id': worker_id,
+                 'result': json.dumps(result, default=str) if result is not None else None}
+            )
+        return updated.rowcount == 1
+
+    def fail(self, job: ClaimedJob, worker_id: str, error: str, permanent: bool = False) -> str:
+        """
+        Record a failed attempt: re-queue with backoff or dead-letter
+
+        Returns:
+            New job status ('queued' or 'dead'), or 'lost' if the lease was lost
+        """
+        dead = permanent or job.attempts >= job.max_attempts
+        delay = 0.0 if dead else compute_backoff(job.attempts)
+
+        with self.engine.begin() as conn:
+            updated = conn.execute(
+                text("""
+                    UPDATE background_jobs
+                    SET status = :status, last_error = :error,
+                        run_after = now() + make_interval(secs => :delay),
+                        locked_by = NULL, locked_until = NULL,
+                        finished_at = CASE WHEN :status = 'dead' THEN now() ELSE NULL END,
+                        updated_at = now()
+                    WHERE id = :job_id AND status = 'running' AND locked_by = :worker_id
+                """),
+                {'job_id': job.id, 'worker_id': worker_id, 'delay': delay,
+                 'status': JOB_DEAD if dead else JOB_QUEUED, 'error': error[:MAX_ERROR_LENGTH]}
+            )
+
+        if updated.rowcount != 1:
+            return 'lost'
+        if dead:
+            logger.error(f"[JOBS] {job.job_type} #{job.id} dead after {job.attempts} attempt(s): {error}")
+            return JOB_DEAD
+        logger.warning(
+            f"[JOBS] {job.job_type} #{job.id} attempt {job.attempts}/{job.max_attempts} failed, "
+            f"retrying in {delay:.0f}s: {error}"
+        )
+        return JOB_QUEUED
+
+    def requeue_expired(self) -> int:
+        """Re-queue (or dead-letter) running jobs whose lease has expired"""
+        with self.engine.begin() as conn:
+            result = conn.execute(_REQUEUE_EXPIRED_SQL)
+        if result.rowcount:
+            logger.warning(f"[JOBS] Recovered {result.rowcount} job(s) with expired leases")
+        return result.rowcount
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Job by id"""
+        return self._fetch_one(BackgroundJob.__table__.c.id == job_id)
+
+    def get_by_key(self, idempotency_key: str) -> Optional[Dict[str, Any]]:
+        """Job by idempotency key"""
+        return self._fetch_one(BackgroundJob.__table__.c.idempotency_key == idempotency_key)
+
+    def list_jobs(
+        self,
+        status: Optional[str] = None,
+        job_type: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Most recently updated jobs, optionally filtered"""
+        table = BackgroundJob.__table__
+        query = select(table).order_by(table.c.updated_at.desc(), table.c.id.desc()).limit(limit)
+        if status:
+            query = query.where(table.c.status == status)
+        if job_type:
+            query = query.where(table.c.job_type == job_type)
+
+        with self.engine.connect() as conn:
+            return [_row_to_dict(row) for row in conn.execute(query).mappings()]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT status, count(*) FROM background_jobs GROUP BY status")
+            ).all()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def _fetch_one(self, condition) -> Optional[Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            row = conn.execute(select(BackgroundJob.__table__).where(condition)).mappings().first()
+        return _row_to_dict(row) if row else None
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    job = dict(row)
+    for column in ('run_after', 'locked_until', 'created_at', 'updated_at', 'finished_at'):
+        if job.get(column) is not None:
+            job[column] = job[column].isoformat()
+    return job
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+class JobWorker:
+    """
+    Poll the queue and run registered handlers
+
+    Each worker runs one job at a time; scale out with more processes
+    (scripts/run_job_worker.py) rather than threads, since Xero calls are
+    paced by the shared rate limiter anyway.
+
+    Usage:
+        worker = JobWorker()
+        worker.run_once()     # Process available jobs, then return
+        worker.start()        # Or poll in a background thread
+    """
+
+    def __init__(
+        self,
+        queue: Optional["JobQueue"] = None,
+        worker_id: Optional[str] = None,
+        job_types: Optional[List[str]] = None,
+        poll_interval: float = 1.0,
+        lease_check_interval: float = 60.0
+    ):
+        """
+        Initialize worker
+
+        Args:
+            queue: Job queue (defaults to the global queue)
+            worker_id: Identifier stored in locked_by (defaults to host:pid)
+            job_types: Only claim these types (defaults to all registered)
+            poll_interval: Sleep when no job is runnable
+            lease_check_interval: Seconds between expired-lease sweeps
+        """
+        self.queue = queue or get_job_queue()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.job_types = job_types
+        self.poll_interval = poll_interval
+        self.lease_check_interval = lease_check_interval
+
+        self._last_lease_check = 0.0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {'succeeded': 0, 'retried': 0, 'dead': 0, 'lost': 0}
+
+    def run_once(self, max_jobs: Optional[int] = None) -> int:
+        """
+        Process runnable jobs until none are left (or max_jobs reached)
+
+        Returns:
+            Number of jobs processed
+        """
+        now = time.monotonic()
+        if now - self._last_lease_check >= self.lease_check_interval:
+            self._last_lease_check = now
+            self.queue.requeue_expired()
+
+        processed = 0
+        while not self._stop_event.is_set() and (max_jobs is None or processed < max_jobs):
+            jobs = self.queue.claim(self.worker_id, self.job_types or registered_job_types())
+            if not jobs:
+                break
+            self._execute(jobs[0])
+            processed += 1
+        return processed
+
+    def _execute(self, job: ClaimedJob) -> None:
+        handler = get_job_handler(job.job_type)
+        started = time.perf_counter()
+
+        if handler is None:
+            outcome = self.queue.fail(job, self.worker_id, f"No handler registered for {job.job_type}",
+                                      permanent=True)
+        else:
+            try:
+                with self._lease_heartbeat(job), correlation_scope(
+                    job.payload.get(CORRELATION_PAYLOAD_KEY)
+                ), trace_span(
+                    f"job {job.job_type}",
+                    SPAN_KIND_CONSUMER,
+                    {"job.id": job.id, "job.type": job.job_type, "job.attempt": job.attempts}
+                ):
+                    result = handler(job.payload)
+                outcome = JOB_SUCCEEDED if self.queue.complete(job, self.worker_id, result) else 'lost'
+            except PermanentJobError as e:
+                outcome = self.queue.fail(job, self.worker_id, str(e), permanent=True)
+            except Exception as e:
+                outcome = self.queue.fail(job, self.worker_id, f"{type(e).__name__}: {e}")
+
+        outcome = {JOB_SUCCEEDED: 'succeeded', JOB_QUEUED: 'retried'}.get(outcome, outcome)
+        self.stats[outcome] += 1
+        record_background_job(job.job_type, outcome, time.perf_counter() - started)
+        if outcome == 'succeeded':
+            logger.info(f"[JOBS] {job.job_type} #{job.id} succeeded (attempt {job.attempts})")
+
+    @contextmanager
+    def _lease_heartbeat(self, job: ClaimedJob):
+        """
+        Renew the job's lease every lease_seconds / 3 while the handler runs
+
+        Without this, a handler slower than the lease (e.g. waiting on the
+        Xero rate limiter) would be re-queued and run a second time.
+        """
+        done = threading.Event()
+        interval = self.queue.lease_seconds / 3
+
+        def beat():
+            while not done.wait(interval):
+                try:
+                    if not self.queue.renew_lease(job, self.worker_id):
+                        logger.warning(f"[JOBS] {job.job_type} #{job.id} lease lost while running")
+                        return
+                except Exception as e:
+                    logger.error(f"[JOBS] Lease renewal failed for #{job.id}: {e}")
+
+        thread = threading.Thread(target=beat, name=f"job-lease-{job.id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+
+    # ------------------------------------------------------------------
+    # Background thread
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start polling in a background thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="job-worker", daemon=True)
+        self._thread.start()
+        logger.info(f"[JOBS] Worker {self.worker_id} started")
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Finish the current job, then stop"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info(f"[JOBS] Worker {self.worker_id} stopped")
+
+    def run_forever(self) -> None:
+        """Poll until stop() is called"""
+        while not self._stop_event.is_set():
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                logger.error(f"[JOBS] Worker poll failed: {e}")
+                processed = 0
+            if not processed:
+                self._stop_event.wait(self.poll_interval)
+
+
+# ============================================================================
+# GLOBAL INSTANCE
+# ============================================================================
+_global_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get or create global job queue
+
+    Returns:
+        JobQueue instance
+    """
+    global _global_queue
+    if _global_queue is None:
+        _global_queue = JobQueue()
+    return _global_queue
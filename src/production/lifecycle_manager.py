@@ -205,6 +205,32 @@ async def cancel_background_tasks():
         logger.error(f"Failed to cancel background tasks: {e}")
 
 
+async def flush_log_sinks():
+    """Write and fsync queued audit, cost and analytics log records"""
+    try:
+        from monitoring.log_sink import flush_log_sinks as flush_sinks
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, flush_sinks):
+            logger.info("✓ Log sinks flushed")
+        else:
+            logger.warning("Log sink flush timed out; some records may not be on disk yet")
+    except Exception as e:
+        logger.error(f"Failed to flush log sinks: {e}")
+
+
+async def flush_tracing():
+    """Send spans still queued for the tracing exporter"""
+    try:
+        from monitoring.tracing import flush_tracing as flush_spans
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, flush_spans):
+            logger.info("✓ Traces flushed")
+        else:
+            logger.warning("Trace flush timed out; some spans may not be exported")
+    except Exception as e:
+        logger.error(f"Failed to flush traces: {e}")
+
+
 # Global lifecycle manager instance
 _lifecycle_manager: Optional[LifecycleManager] = None
 
@@ -214,4 +240,7 @@ def get_lifecycle_manager() -> LifecycleManager:
     global _lifecycle_manager
     if _lifecycle_manager is None:
         _lifecycle_manager = LifecycleManager()
+        # Runs after the other shutdown hooks, which may still log
+        _lifecycle_manager.add_shutdown_hook("log_sinks", flush_log_sinks, priority=-100)
+        _lifecycle_manager.add_shutdown_hook("tracing", flush_tracing, priority=-100)
     return _lifecycle_manager
@@ -5,109 +5,516 @@ Rate Limiting for External API Calls
 Implements rate limiting to comply with external API quotas and prevent throttling.
 Specifically designed for Xero API's 60 requests/minute limit.
 
-Usage:
-    from production.rate_limiting import XeroRateLimiter
+Design:
+- Token bucket shared by every worker process through Redis (atomic Lua
+  script, Redis server clock); in-process bucket when Redis is unavailable
+- Bucket capacity is small (default 5) so that burst + refill can never
+  exceed Xero's 60 calls in any 60 second window
+- Priority classes: lower classes must leave a reserve of tokens in the
+  bucket, so under contention order finalization is served before
+  webhook backfill, which is served before health checks
+- Waiters in a process queue by priority; only the head of the queue
+  polls the bucket. Nothing sleeps while holding a lock.
+- Sync callers sleep in their own thread; async callers use acquire(),
+  which awaits instead of blocking the event loop
+- Daily limit enforced with a per-UTC-day counter
 
-    rate_limiter = XeroRateLimiter()
+Usage:
+    from production.rate_limiting import rate_limit_xero, xero_priority, XeroPriority
 
-    @rate_limiter.limit
+    @rate_limit_xero
     def call_xero_api():
         response = requests.get("https://api.xero.com/...")
         return response
+
+    with xero_priority(XeroPriority.ORDER):
+        call_xero_api()
+
+    # Async code
+    await xero_rate_limiter.acquire(XeroPriority.BACKFILL)
 """
 
+import os
 import time
+import asyncio
+import bisect
+import itertools
 import threading
+import contextvars
+from contextlib import contextmanager
+from enum import IntEnum
 from functools import wraps
-from datetime import datetime, timedelta
-from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import redis
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    logger.warning("redis not installed - Xero rate limiting is per-process only")
+
+try:
+    from monitoring.prometheus_metrics import (
+        xero_rate_limit_queue_depth,
+        xero_rate_limit_wait_seconds,
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+
+class XeroPriority(IntEnum):
+    """Priority classes for Xero API calls (lower value = served first)"""
+    ORDER = 0          # Order workflow: customer, inventory, draft, finalize, invoice
+    STANDARD = 1       # Interactive lookups and anything unclassified
+    BACKFILL = 2       # Mirror sync, webhook-driven refreshes
+    HEALTH_CHECK = 3   # Connectivity probes
+
+
+# Fraction of bucket capacity a class must leave untouched
+PRIORITY_RESERVE_FRACTION: Dict[XeroPriority, float] = {
+    XeroPriority.ORDER: 0.0,
+    XeroPriority.STANDARD: 0.2,
+    XeroPriority.BACKFILL: 0.4,
+    XeroPriority.HEALTH_CHECK: 0.6,
+}
+
+# Longest single sleep between bucket polls
+MAX_POLL_INTERVAL = 1.0
+
+
+class RateLimitExceeded(Exception):
+    """Raised when daily rate limit is exceeded or a wait budget cannot be met"""
+    pass
+
+
+# ============================================================================
+# PRIORITY CONTEXT
+# ============================================================================
+
+_current_priority: contextvars.ContextVar[XeroPriority] = contextvars.ContextVar(
+    'xero_priority', default=XeroPriority.STANDARD
+)
+_current_max_wait: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    'xero_max_wait', default=None
+)
+
+
+@contextmanager
+def xero_priority(priority: XeroPriority, max_wait: Optional[float] = None):
+    """
+    Set the priority (and optional wait budget) for Xero calls in this context.
+
+    Propagates into asyncio tasks and asyncio.to_thread() workers.
+
+    Args:
+        priority: Priority class for calls made inside the block
+        max_wait: Fail fast with RateLimitExceeded if the estimated wait is longer
+    """
+    priority_token = _current_priority.set(priority)
+    wait_token = _current_max_wait.set(max_wait)
+    try:
+        yield
+    finally:
+        _current_priority.reset(priority_token)
+        _current_max_wait.reset(wait_token)
+
+
+def with_xero_priority(priority: XeroPriority, max_wait: Optional[float] = None):
+    """
+    Decorator form of xero_priority() for functions that make Xero calls.
+
+    Usage:
+        @with_xero_priority(XeroPriority.BACKFILL)
+        def sync_items(self):
+            ...
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with xero_priority(priority, max_wait):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ============================================================================
+# TOKEN BUCKETS
+# ============================================================================
+
+# KEYS[1] bucket hash, KEYS[2] daily counter
+# ARGV: rate (tokens/s), capacity, reserve, day_limit, consume (1/0)
+# Returns {status, wait_seconds}: status 1 granted, 0 wait, -1 daily limit
+_TOKEN_BUCKET_LUA = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+local day_limit = tonumber(ARGV[4])
+local consume = tonumber(ARGV[5])
+
+local day_count = tonumber(redis.call('GET', KEYS[2]) or '0')
+if day_count >= day_limit then
+    local seconds_today = now % 86400
+    return {-1, tostring(86400 - seconds_today)}
+end
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local status = 0
+local wait = 0
+if tokens - 1 >= reserve then
+    if consume == 1 then
+        tokens = tokens - 1
+        if redis.call('INCR', KEYS[2]) == 1 then
+            redis.call('EXPIRE', KEYS[2], 90000)
+        end
+    end
+    status = 1
+else
+    wait = (reserve + 1 - tokens) / rate
+end
+
+if consume == 1 then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+end
+return {status, tostring(wait)}
+"""
+
+
+class _LocalTokenBucket:
+    """In-process token bucket with the same semantics as the Redis script"""
+
+    def __init__(self, rate: float, capacity: float, day_limit: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.day_limit = day_limit
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.day = datetime.now(timezone.utc).date()
+        self.day_count = 0
+        self.lock = threading.Lock()
+
+    def take(self, reserve: float, consume: bool = True) -> Tuple[int, float]:
+        with self.lock:
+            today = datetime.now(timezone.utc).date()
+            if today != self.day:
+                self.day, self.day_count = today, 0
+            if self.day_count >= self.day_limit:
+                midnight = datetime.combine(today + timedelta(days=1), datetime.min.time(), timezone.utc)
+                return -1, (midnight - datetime.now(timezone.utc)).total_seconds()
+
+            now = time.monotonic()
+            tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            if tokens - 1 >= reserve:
+                if consume:
+                    self.tokens, self.updated = tokens - 1, now
+                    self.day_count += 1
+                return 1, 0.0
+            if consume:
+                self.tokens, self.updated = tokens, now
+            return 0, (reserve + 1 - tokens) / self.rate
+
+    def stats(self) -> Dict[str, float]:
+        with self.lock:
+            tokens = min(self.capacity, self.tokens + (time.monotonic() - self.updated) * self.rate)
+            return {'tokens': round(tokens, 3), 'calls_today': self.day_count}
+
+
+class _PriorityWaitQueue:
+    """Process-local waiters ordered by (priority, arrival)"""
+
+    def __init__(self):
+        self._entries = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def enter(self, priority: XeroPriority) -> Tuple[int, int]:
+        ticket = (int(priority), next(self._counter))
+        with self._lock:
+            bisect.insort(self._entries, ticket)
+        return ticket
+
+    def leave(self, ticket: Tuple[int, int]) -> None:
+        with self._lock:
+            index = bisect.bisect_left(self._entries, ticket)
+            if index < len(self._entries) and self._entries[index] == ticket:
+                del self._entries[index]
+
+    def is_head(self, ticket: Tuple[int, int]) -> bool:
+        with self._lock:
+            return bool(self._entries) and self._entries[0] == ticket
+
+    def ahead_of(self, priority: XeroPriority) -> int:
+        with self._lock:
+            return bisect.bisect_right(self._entries, (int(priority), float('inf')))
+
+    def depth_by_priority(self) -> Dict[str, int]:
+        with self._lock:
+            depth = {p.name.lower(): 0 for p in XeroPriority}
+            for priority, _ in self._entries:
+                depth[XeroPriority(priority).name.lower()] += 1
+            return depth
+
+
+# ============================================================================
+# XERO RATE LIMITER
+# ============================================================================
 
 class XeroRateLimiter:
     """
     Rate limiter for Xero API calls.
 
     Xero limits: 60 requests per minute, 5000 requests per day.
-    This implementation enforces the per-minute limit with a sliding window.
+    Enforced with a token bucket shared across workers via Redis.
     """
 
-    def __init__(self, max_calls_per_minute: int = 55, max_calls_per_day: int = 4500):
+    def __init__(
+        self,
+        max_calls_per_minute: int = 55,
+        max_calls_per_day: int = 4500,
+        burst_capacity: int = 5,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "ratelimit:xero",
+        use_redis: bool = True
+    ):
         """
         Initialize rate limiter.
 
         Args:
             max_calls_per_minute: Maximum API calls per minute (default 55, below Xero's 60 limit for safety)
             max_calls_per_day: Maximum API calls per day (default 4500, below Xero's 5000 limit for safety)
+            burst_capacity: Token bucket size (burst + refill must stay under Xero's 60/min)
+            redis_url: Redis URL (default: REDIS_URL or REDIS_HOST/PORT/PASSWORD)
+            key_prefix: Redis key prefix (one bucket per Xero app)
+            use_redis: Share the bucket across workers via Redis (False: per-process only)
         """
         self.max_calls_per_minute = max_calls_per_minute
         self.max_calls_per_day = max_calls_per_day
+        self.capacity = float(burst_capacity)
+        self.rate = max_calls_per_minute / 60.0
+        self.key_prefix = key_prefix
+        self.redis_url = redis_url or self._default_redis_url()
+        self.use_redis = use_redis and REDIS_AVAILABLE
+
+        self._local_bucket = _LocalTokenBucket(self.rate, self.capacity, max_calls_per_day)
+        self._queue = _PriorityWaitQueue()
+
+        self._redis = None
+        self._async_redis = None
+        self._script = None
+        self._redis_disabled_until = 0.0
+
+        self.stats = {
+            'granted': 0,
+            'waited': 0,
+            'total_wait_seconds': 0.0,
+            'rejected': 0,
+            'redis_errors': 0,
+        }
+
+    @staticmethod
+    def _default_redis_url() -> str:
+        if os.getenv('REDIS_URL'):
+            return os.getenv('REDIS_URL')
+        host = os.getenv('REDIS_HOST', 'localhost')
+        port = os.getenv('REDIS_PORT', '6379')
+        password = os.getenv('REDIS_PASSWORD', '')
+        return f"redis://:{password}@{host}:{port}" if password else f"redis://{host}:{port}"
+
+    def _reserve(self, priority: XeroPriority) -> float:
+        return self.capacity * PRIORITY_RESERVE_FRACTION[priority]
+
+    def _keys(self):
+        day = datetime.now(timezone.utc).strftime('%Y%m%d')
+        return [f"{self.key_prefix}:bucket", f"{self.key_prefix}:day:{day}"]
+
+    def _script_args(self, priority: XeroPriority, consume: bool):
+        return [self.rate, self.capacity, self._reserve(priority), self.max_calls_per_day, 1 if consume else 0]
+
+    def _redis_usable(self) -> bool:
+        return self.use_redis and time.monotonic() >= self._redis_disabled_until
+
+    def _on_redis_error(self, e: Exception) -> None:
+        # Back off from Redis for a while; the local bucket keeps us under quota per process
+        self.stats['redis_errors'] += 1
+        self._redis_disabled_until = time.monotonic() + 30
+        logger.warning(f"Redis rate limiter unavailable, using in-process bucket for 30s: {e}")
+
+    # ------------------------------------------------------------------
+    # Bucket access (never sleeps)
+    # ------------------------------------------------------------------
+
+    def _take(self, priority: XeroPriority, consume: bool = True) -> Tuple[int, float]:
+        if self._redis_usable():
+            try:
+                if self._redis is None:
+                    self._redis = redis.Redis.from_url(self.redis_url, socket_timeout=1)
+                    self._script = self._redis.register_script(_TOKEN_BUCKET_LUA)
+                status, wait = self._script(keys=self._keys(), args=self._script_args(priority, consume))
+                return int(status), float(wait)
+            except Exception as e:
+                self._on_redis_error(e)
+        return self._local_bucket.take(self._reserve(priority), consume)
+
+    async def _take_async(self, priority: XeroPriority, consume: bool = True) -> Tuple[int, float]:
+        if self._redis_usable():
+            try:
+                if self._async_redis is None:
+                    self._async_redis = aioredis.from_url(self.redis_url, socket_timeout=1)
+                result = await self._async_redis.eval(
+                    _TOKEN_BUCKET_LUA, 2, *self._keys(), *self._script_args(priority, consume)
+                )
+                return int(result[0]), float(result[1])
+            except Exception as e:
+                self._on_redis_error(e)
+        return self._local_bucket.take(self._reserve(priority), consume)
+
+    # ------------------------------------------------------------------
+    # Acquire
+    # ------------------------------------------------------------------
+
+    def _check_budget(self, estimate: float, max_wait: float) -> None:
+        if estimate > max_wait:
+            self.stats['rejected'] += 1
+            raise RateLimitExceeded(
+                f"Xero rate limit: estimated wait {estimate:.1f}s exceeds budget {max_wait:.1f}s"
+            )
+
+    def _finish(self, status: int, wait: float, priority: XeroPriority, waited: float) -> bool:
+        """Handle a bucket result; returns True when granted"""
+        if status == -1:
+            self.stats['rejected'] += 1
+            logger.error(
+                f"Daily Xero rate limit reached ({self.max_calls_per_day} calls). "
+                f"Next call available in {wait/3600:.1f} hours"
+            )
+            raise RateLimitExceeded(f"Daily Xero API limit reached. Retry after {wait/3600:.1f} hours")
+        if status == 1:
+            self.stats['granted'] += 1
+            if waited > 0:
+                self.stats['waited'] += 1
+                self.stats['total_wait_seconds'] += waited
+            if PROMETHEUS_AVAILABLE:
+                xero_rate_limit_wait_seconds.labels(priority=priority.name.lower()).observe(waited)
+            return True
+        return False
+
+    def _update_queue_gauge(self) -> None:
+        if PROMETHEUS_AVAILABLE:
+            for name, depth in self._queue.depth_by_priority().items():
+                xero_rate_limit_queue_depth.labels(priority=name).set(depth)
+
+    def acquire_sync(self, priority: Optional[XeroPriority] = None, max_wait: Optional[float] = None) -> float:
+        """
+        Block the calling thread until a token is granted.
 
-        # Sliding window for minute-level tracking
-        self.call_times_minute = deque()
-        # Sliding window for day-level tracking
-        self.call_times_day = deque()
+        Args:
+            priority: Priority class (default: current xero_priority context)
+            max_wait: Raise RateLimitExceeded instead of waiting longer than this
 
-        # Thread lock for concurrent access
-        self.lock = threading.Lock()
+        Returns:
+            Seconds spent waiting
+        """
+        priority = _current_priority.get() if priority is None else priority
+        max_wait = _current_max_wait.get() if max_wait is None else max_wait
+        if max_wait is not None:
+            self._check_budget(self.estimate_wait(priority), max_wait)
+
+        started = time.monotonic()
+        ticket = self._queue.enter(priority)
+        self._update_queue_gauge()
+        try:
+            while True:
+                wait = MAX_POLL_INTERVAL / 10
+                if self._queue.is_head(ticket):
+                    status, wait = self._take(priority)
+                    if self._finish(status, wait, priority, time.monotonic() - started):
+                        return time.monotonic() - started
+                    if wait > 1:
+                        logger.warning(
+                            f"Xero rate limit: {priority.name} call waiting {wait:.1f}s "
+                            f"({self._queue.ahead_of(priority)} queued locally)"
+                        )
+                time.sleep(min(max(wait, 0.01), MAX_POLL_INTERVAL))
+        finally:
+            self._queue.leave(ticket)
+            self._update_queue_gauge()
+
+    async def acquire(self, priority: Optional[XeroPriority] = None, max_wait: Optional[float] = None) -> float:
+        """
+        Await a token without blocking the event loop.
 
-    def _clean_old_calls(self):
-        """Remove calls outside the tracking windows"""
-        now = datetime.now()
-        one_minute_ago = now - timedelta(minutes=1)
-        one_day_ago = now - timedelta(days=1)
+        Args:
+            priority: Priority class (default: current xero_priority context)
+            max_wait: Raise RateLimitExceeded instead of waiting longer than this
 
-        # Clean minute window
-        while self.call_times_minute and self.call_times_minute[0] < one_minute_ago:
-            self.call_times_minute.popleft()
+        Returns:
+            Seconds spent waiting
+        """
+        priority = _current_priority.get() if priority is None else priority
+        max_wait = _current_max_wait.get() if max_wait is None else max_wait
+        if max_wait is not None:
+            self._check_budget(await self.estimate_wait_async(priority), max_wait)
+
+        started = time.monotonic()
+        ticket = self._queue.enter(priority)
+        self._update_queue_gauge()
+        try:
+            while True:
+                wait = MAX_POLL_INTERVAL / 10
+                if self._queue.is_head(ticket):
+                    status, wait = await self._take_async(priority)
+                    if self._finish(status, wait, priority, time.monotonic() - started):
+                        return time.monotonic() - started
+                await asyncio.sleep(min(max(wait, 0.01), MAX_POLL_INTERVAL))
+        finally:
+            self._queue.leave(ticket)
+            self._update_queue_gauge()
+
+    def estimate_wait(self, priority: XeroPriority = XeroPriority.STANDARD) -> float:
+        """
+        Estimate seconds until a call of this priority would be granted.
 
-        # Clean day window
-        while self.call_times_day and self.call_times_day[0] < one_day_ago:
-            self.call_times_day.popleft()
+        Counts local waiters of equal or higher priority plus the time for
+        the shared bucket to refill past this class's reserve.
 
-    def _wait_if_needed(self):
-        """Wait if rate limit would be exceeded"""
-        with self.lock:
-            self._clean_old_calls()
-
-            # Check minute limit
-            if len(self.call_times_minute) >= self.max_calls_per_minute:
-                oldest_call = self.call_times_minute[0]
-                wait_time = 60 - (datetime.now() - oldest_call).total_seconds()
-
-                if wait_time > 0:
-                    logger.warning(
-                        f"Rate limit approaching: {len(self.call_times_minute)}/{self.max_calls_per_minute} "
-                        f"calls in last minute. Waiting {wait_time:.1f}s"
-                    )
-                    time.sleep(wait_time + 0.1)  # Add small buffer
-                    self._clean_old_calls()
-
-            # Check day limit
-            if len(self.call_times_day) >= self.max_calls_per_day:
-                oldest_call = self.call_times_day[0]
-                wait_time = 86400 - (datetime.now() - oldest_call).total_seconds()
-
-                if wait_time > 0:
-                    logger.error(
-                        f"Daily rate limit reached: {len(self.call_times_day)}/{self.max_calls_per_day} "
-                        f"calls today. Next call available in {wait_time/3600:.1f} hours"
-                    )
-                    raise RateLimitExceeded(
-                        f"Daily Xero API limit reached. Retry after {wait_time/3600:.1f} hours"
-                    )
-
-            # Record this call
-            now = datetime.now()
-            self.call_times_minute.append(now)
-            self.call_times_day.append(now)
+        Returns:
+            Estimated wait in seconds (inf if the daily limit is reached)
+        """
+        status, wait = self._take(priority, consume=False)
+        return self._estimate(status, wait, priority)
+
+    async def estimate_wait_async(self, priority: XeroPriority = XeroPriority.STANDARD) -> float:
+        """estimate_wait() for async callers (asyncio Redis client, no blocking I/O)"""
+        status, wait = await self._take_async(priority, consume=False)
+        return self._estimate(status, wait, priority)
+
+    def _estimate(self, status: int, wait: float, priority: XeroPriority) -> float:
+        if status == -1:
+            return float('inf')
+        return wait + self._queue.ahead_of(priority) / self.rate
 
     def limit(self, func):
         """
         Decorator to apply rate limiting to a function.
 
+        The priority comes from the surrounding xero_priority() context.
+
         Usage:
             rate_limiter = XeroRateLimiter()
 
@@ -115,9 +522,16 @@ class XeroRateLimiter:
             def call_xero_api():
                 return requests.get("https://api.xero.com/...")
         """
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                await self.acquire()
+                return await func(*args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            self._wait_if_needed()
+            self.acquire_sync()
             return func(*args, **kwargs)
         return wrapper
 
@@ -125,24 +539,31 @@ class XeroRateLimiter:
         """
         Get current rate limiting statistics.
 
+        Makes blocking Redis calls; use get_stats_async() on the event loop.
+
         Returns:
-            dict: Current usage statistics
+            dict: Current usage statistics, queue depths and wait estimates
         """
-        with self.lock:
-            self._clean_old_calls()
-            return {
-                'calls_last_minute': len(self.call_times_minute),
-                'calls_today': len(self.call_times_day),
-                'minute_limit': self.max_calls_per_minute,
-                'day_limit': self.max_calls_per_day,
-                'minute_remaining': self.max_calls_per_minute - len(self.call_times_minute),
-                'day_remaining': self.max_calls_per_day - len(self.call_times_day)
-            }
-
-
-class RateLimitExceeded(Exception):
-    """Raised when daily rate limit is exceeded"""
-    pass
+        return self._stats_dict({p: self.estimate_wait(p) for p in XeroPriority})
+
+    async def get_stats_async(self):
+        """get_stats() for async callers"""
+        return self._stats_dict({p: await self.estimate_wait_async(p) for p in XeroPriority})
+
+    def _stats_dict(self, estimates: Dict[XeroPriority, float]) -> Dict[str, Any]:
+        using_redis = self._redis is not None or self._async_redis is not None
+        return {
+            'backend': 'redis' if self._redis_usable() and using_redis else 'local',
+            'minute_limit': self.max_calls_per_minute,
+            'day_limit': self.max_calls_per_day,
+            'burst_capacity': self.capacity,
+            'local_bucket': self._local_bucket.stats(),
+            'queue_depth': self._queue.depth_by_priority(),
+            'estimated_wait_seconds': {
+                p.name.lower(): round(estimate, 3) for p, estimate in estimates.items()
+            },
+            **self.stats,
+        }
 
 
 # Global instance for Xero API
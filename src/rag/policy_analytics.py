@@ -12,11 +12,14 @@ NO MOCKING - Production-ready analytics
 
 import os
 import json
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from collections import defaultdict
 
+from monitoring.log_sink import LogSink, get_log_sink
+from .usage_rollups import PolicyUsageRollups
+
 
 class PolicyUsageTracker:
     """
@@ -26,15 +29,19 @@ class PolicyUsageTracker:
     - Logs every policy retrieval
     - Tracks which collections are used
     - Records intent-to-policy mappings
-    - Generates usage reports
+    - Keeps daily rollups next to the log
+    - Generates usage reports for any window of days
     """
 
-    def __init__(self, log_file: Optional[Path] = None):
+    def __init__(self, log_file: Optional[Path] = None, sink: Optional[LogSink] = None):
         """
         Initialize policy usage tracker
 
         Args:
             log_file: Optional path to log file (defaults to data/policy_usage.jsonl)
+            sink: Background writer for the log file (default: global log
+                sink; events are dropped rather than delay requests when
+                it is backed up, per LOG_SINK_OVERFLOW)
         """
         if log_file is None:
             project_root = Path(__file__).parent.parent.parent
@@ -43,6 +50,9 @@ class PolicyUsageTracker:
             log_file = log_dir / "policy_usage.jsonl"
 
         self.log_file = log_file
+        self.sink = sink or get_log_sink()
+        # Daily rollups, folded from the log tail by the sink's writer thread
+        self.rollups = PolicyUsageRollups(self.log_file)
         self.session_stats = defaultdict(int)
 
     def log_retrieval(
@@ -75,10 +85,9 @@ class PolicyUsageTracker:
             "metadata": metadata or {}
         }
 
-        # Append to log file (JSONL format)
+        # Append to log file (JSONL format, written in the background)
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(event) + '\n')
+            self._append(event)
 
             # Update session stats
             self.session_stats[f"{collection}_{intent}"] += 1
@@ -113,8 +122,7 @@ class PolicyUsageTracker:
         }
 
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(event) + '\n')
+            self._append(event)
         except Exception as e:
             print(f"[WARNING] Failed to log tone retrieval: {e}")
 
@@ -147,11 +155,15 @@ class PolicyUsageTracker:
         }
 
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(event) + '\n')
+            self._append(event)
         except Exception as e:
             print(f"[WARNING] Failed to log validation: {e}")
 
+    def _append(self, event: Dict[str, Any]):
+        """Queue an event for the log; the writer thread then folds it into the rollups"""
+        self.sink.write_line(self.log_file, json.dumps(event) + '\n')
+        self.sink.submit(self.rollups.maybe_update, None)
+
     def get_session_summary(self) -> Dict[str, Any]:
         """
         Get summary of current session usage
@@ -164,109 +176,50 @@ class PolicyUsageTracker:
     def generate_usage_report(
         self,
         days: int = 7,
-        output_file: Optional[Path] = None
+        output_file: Optional[Path] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
     ) -> Dict[str, Any]:
         """
-        Generate usage report from log file
+        Generate usage report from the daily rollups
+
+        Only log lines appended since the last rollup update are read; the
+        report merges the rollups of the requested days.
 
         Args:
-            days: Number of days to analyze
+            days: Number of days to analyze, today included (ignored when
+                start_date is given)
             output_file: Optional file to save report
+            start_date: First day of a custom window
+            end_date: Last day of a custom window (default: today)
 
         Returns:
             Dictionary with usage statistics
         """
-        if not self.log_file.exists():
+        # Include events still queued in the log sink
+        self.sink.flush(fsync=False)
+
+        if not self.log_file.exists() and not self.rollups.state_file.exists():
             return {
                 "error": "No usage data available",
                 "log_file": str(self.log_file)
             }
 
-        # Read all events
-        events = []
         try:
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        events.append(json.loads(line))
+            self.rollups.update()
         except Exception as e:
             return {"error": f"Failed to read log file: {e}"}
 
-        # Filter by date range
-        cutoff = datetime.now().timestamp() - (days * 24 * 60 * 60)
-        recent_events = [
-            e for e in events
-            if datetime.fromisoformat(e['timestamp']).timestamp() > cutoff
-        ]
+        end_date = end_date or datetime.now().date()
+        start_date = start_date or end_date - timedelta(days=days - 1)
 
-        # Analyze events
         report = {
-            "period_days": days,
-            "total_events": len(recent_events),
-            "by_collection": defaultdict(int),
-            "by_intent": defaultdict(int),
-            "by_type": defaultdict(int),
-            "avg_similarity": [],
-            "avg_results_count": [],
-            "validation_stats": {
-                "total": 0,
-                "passed": 0,
-                "failed": 0,
-                "avg_confidence": []
-            }
+            "period_days": (end_date - start_date).days + 1,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            **self.rollups.window(start_date, end_date).to_report()
         }
 
-        for event in recent_events:
-            # Count by collection
-            if 'collection' in event:
-                report['by_collection'][event['collection']] += 1
-
-            # Count by intent
-            if 'intent' in event:
-                report['by_intent'][event['intent']] += 1
-
-            # Count by type
-            event_type = event.get('type', 'retrieval')
-            report['by_type'][event_type] += 1
-
-            # Similarity scores
-            if 'top_similarity' in event and event['top_similarity'] is not None:
-                report['avg_similarity'].append(event['top_similarity'])
-
-            # Results counts
-            if 'results_count' in event:
-                report['avg_results_count'].append(event['results_count'])
-
-            # Validation stats
-            if event_type == 'validation':
-                report['validation_stats']['total'] += 1
-                if event.get('validation_passed'):
-                    report['validation_stats']['passed'] += 1
-                else:
-                    report['validation_stats']['failed'] += 1
-                if 'confidence' in event:
-                    report['validation_stats']['avg_confidence'].append(event['confidence'])
-
-        # Calculate averages
-        if report['avg_similarity']:
-            report['avg_similarity_score'] = sum(report['avg_similarity']) / len(report['avg_similarity'])
-            del report['avg_similarity']
-
-        if report['avg_results_count']:
-            report['avg_results_per_query'] = sum(report['avg_results_count']) / len(report['avg_results_count'])
-            del report['avg_results_count']
-
-        if report['validation_stats']['avg_confidence']:
-            report['validation_stats']['avg_confidence_score'] = sum(
-                report['validation_stats']['avg_confidence']
-            ) / len(report['validation_stats']['avg_confidence'])
-            del report['validation_stats']['avg_confidence']
-
-        # Convert defaultdicts to regular dicts
-        report['by_collection'] = dict(report['by_collection'])
-        report['by_intent'] = dict(report['by_intent'])
-        report['by_type'] = dict(report['by_type'])
-
         # Save report if requested
         if output_file:
             with open(output_file, 'w', encoding='utf-8') as f:
@@ -25,6 +25,7 @@ from typing import List, Dict, Optional
 from openai import OpenAI
 
 from .chroma_client import get_chroma_client, get_or_create_collection
+from monitoring.tracing import trace_span
 
 
 def search_knowledge_base(
@@ -84,11 +85,16 @@ def search_knowledge_base(
     # ChromaDB handles embedding generation automatically
     # Just pass the query text and it will use the collection's embedding function
     try:
-        results = collection.query(
-            query_texts=[query],
-            n_results=top_n,
-            include=['documents', 'metadatas', 'distances']
-        )
+        # Includes embedding the query (OpenAI call made by the collection)
+        with trace_span(
+            "chroma query",
+            attributes={"db.system": "chroma", "db.collection.name": collection_name, "db.chroma.n_results": top_n}
+        ):
+            results = collection.query(
+                query_texts=[query],
+                n_results=top_n,
+                include=['documents', 'metadatas', 'distances']
+            )
     except Exception as e:
         raise RuntimeError(
             f"Failed to search collection '{collection_name}'. "
@@ -0,0 +1,312 @@
+"""
+Policy Usage Rollups
+====================
+
+Per-day aggregates of the policy usage log (data/policy_usage.jsonl),
+behind PolicyUsageTracker.generate_usage_report.
+
+- Each day keeps counts by collection, intent and event type, a top
+  similarity histogram, results-count totals and validation stats
+- Rollups are folded from the tail of the log: only lines appended since
+  the last update are read (streamed, one line at a time), so the log is
+  never re-parsed and events from every API worker are included
+- State (log offset + daily rollups) lives next to the log in
+  policy_usage.rollup.json, replaced atomically; a lock file serializes
+  workers updating it
+- Reports for any window merge the covered days' rollups
+
+Existing logs are folded by scripts/backfill_policy_rollups.py.
+
+NO MOCKING - Real files on disk.
+"""
+
+import os
+import json
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+
+# Top similarity histogram: SIMILARITY_BINS equal bins over [0, 1]
+SIMILARITY_BINS = 10
+
+# Minimum seconds between background updates (reports always update)
+DEFAULT_UPDATE_SECONDS = 5.0
+
+
+def similarity_bin(similarity: float) -> int:
+    return min(max(int(similarity * SIMILARITY_BINS), 0), SIMILARITY_BINS - 1)
+
+
+def similarity_bin_label(index: int) -> str:
+    return f"{index / SIMILARITY_BINS:.1f}-{(index + 1) / SIMILARITY_BINS:.1f}"
+
+
+@dataclass
+class UsageRollup:
+    """Aggregated policy usage events (one day, or a merged window)"""
+    events: int = 0
+    by_collection: Dict[str, int] = field(default_factory=dict)
+    by_intent: Dict[str, int] = field(default_factory=dict)
+    by_type: Dict[str, int] = field(default_factory=dict)
+    similarity_sum: float = 0.0
+    similarity_count: int = 0
+    similarity_histogram: List[int] = field(default_factory=lambda: [0] * SIMILARITY_BINS)
+    results_sum: int = 0
+    results_count: int = 0
+    validation_total: int = 0
+    validation_passed: int = 0
+    confidence_sum: float = 0.0
+    confidence_count: int = 0
+
+    def add(self, event: Dict[str, Any]) -> None:
+        """Fold one log event in"""
+        self.events += 1
+        if 'collection' in event:
+            self.by_collection[event['collection']] = self.by_collection.get(event['collection'], 0) + 1
+        if 'intent' in event:
+            self.by_intent[event['intent']] = self.by_intent.get(event['intent'], 0) + 1
+
+        event_type = event.get('type', 'retrieval')
+        self.by_type[event_type] = self.by_type.get(event_type, 0) + 1
+
+        if event.get('top_similarity') is not None:
+            self.similarity_sum += event['top_similarity']
+            self.similarity_count += 1
+            self.similarity_histogram[similarity_bin(event['top_similarity'])] += 1
+
+        if 'results_count' in event:
+            self.results_sum += event['results_count']
+            self.results_count += 1
+
+        if event_type == 'validation':
+            self.validation_total += 1
+            if event.get('validation_passed'):
+                self.validation_passed += 1
+            if 'confidence' in event:
+                self.confidence_sum += event['confidence']
+                self.confidence_count += 1
+
+    def merge(self, other: "UsageRollup") -> None:
+        self.events += other.events
+        for mine, theirs in (
+            (self.by_collection, other.by_collection),
+            (self.by_intent, other.by_intent),
+            (self.by_type, other.by_type),
+        ):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        self.similarity_sum += other.similarity_sum
+        self.similarity_count += other.similarity_count
+        self.similarity_histogram = [a + b for a, b in zip(self.similarity_histogram, other.similarity_histogram)]
+        self.results_sum += other.results_sum
+        self.results_count += other.results_count
+        self.validation_total += other.validation_total
+        self.validation_passed += other.validation_passed
+        self.confidence_sum += other.confidence_sum
+        self.confidence_count += other.confidence_count
+
+    def to_report(self) -> Dict[str, Any]:
+        """Report fields, as generate_usage_report has always returned them"""
+        report: Dict[str, Any] = {
+            "total_events": self.events,
+            "by_collection": dict(self.by_collection),
+            "by_intent": dict(self.by_intent),
+            "by_type": dict(self.by_type),
+            "similarity_histogram": {
+                similarity_bin_label(index): count for index, count in enumerate(self.similarity_histogram)
+            },
+            "validation_stats": {
+                "total": self.validation_total,
+                "passed": self.validation_passed,
+                "failed": self.validation_total - self.validation_passed,
+            },
+        }
+        if self.similarity_count:
+            report["avg_similarity_score"] = self.similarity_sum / self.similarity_count
+        if self.results_count:
+            report["avg_results_per_query"] = self.results_sum / self.results_count
+        if self.confidence_count:
+            report["validation_stats"]["avg_confidence_score"] = self.confidence_sum / self.confidence_count
+        return report
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UsageRollup":
+        return cls(**data)
+
+
+class PolicyUsageRollups:
+    """
+    Daily rollups folded incrementally from a policy usage log
+
+    Example:
+        >>> rollups = PolicyUsageRollups(Path("data/policy_usage.jsonl"))
+        >>> rollups.update()
+        >>> week = rollups.window(date(2025, 11, 3), date(2025, 11, 9))
+        >>> week.to_report()["by_collection"]
+    """
+
+    def __init__(self, log_file: Path, update_seconds: float = DEFAULT_UPDATE_SECONDS):
+        """
+        Args:
+            log_file: Policy usage JSONL log
+            update_seconds: Minimum interval between maybe_update() folds
+        """
+        self.log_file = Path(log_file)
+        self.state_file = self.log_file.with_name(self.log_file.stem + ".rollup.json")
+        self.lock_file = self.log_file.with_name(self.log_file.stem + ".rollup.lock")
+        self.update_seconds = update_seconds
+
+        self.days: Dict[str, UsageRollup] = {}
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self.lock = threading.Lock()
+        self._last_update = 0.0
+        self._state_mtime: Optional[tuple] = None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(self) -> int:
+        """
+        Fold log lines appended since the last update into the rollups
+
+        Returns:
+            Number of events folded
+        """
+        with self.lock, self._file_lock():
+            self._load_state()
+            folded = self._fold_tail()
+            if folded or not self.state_file.exists():
+                self._save_state()
+            self._last_update = time.monotonic()
+            return folded
+
+    def maybe_update(self, *_: Any) -> None:
+        """update() at most every update_seconds (log sink batch handler)"""
+        if time.monotonic() - self._last_update >= self.update_seconds:
+            self.update()
+
+    def rebuild(self) -> int:
+        """Discard the rollups and fold the whole log again"""
+        with self.lock:
+            self.days, self.offset, self.inode = {}, 0, None
+            with self._file_lock():
+                self._save_state()
+        return self.update()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def window(self, start: date, end: date) -> UsageRollup:
+        """Merged rollup of days start..end (inclusive)"""
+        result = UsageRollup()
+        first, last = start.isoformat(), end.isoformat()
+        with self.lock:
+            for day, rollup in self.days.items():
+                if first <= day <= last:
+                    result.merge(rollup)
+        return result
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _fold_tail(self) -> int:
+        if not self.log_file.exists():
+            return 0
+
+        stat = self.log_file.stat()
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            # New or rotated log: earlier days keep their rollups
+            self.inode, self.offset = stat.st_ino, 0
+
+        folded = 0
+        for line in self._read_lines():
+            text = line.strip()
+            if not text:
+                continue
+            try:
+                event = json.loads(text)
+            except json.JSONDecodeError:
+                continue
+            # ISO timestamps start with the date; no datetime parsing needed
+            day = event.get('timestamp', '')[:10]
+            if day not in self.days:
+                self.days[day] = UsageRollup()
+            self.days[day].add(event)
+            folded += 1
+        return folded
+
+    def _read_lines(self) -> Iterator[bytes]:
+        """Complete lines after self.offset, advancing it as they are read"""
+        with open(self.log_file, "rb") as f:
+            f.seek(self.offset)
+            for line in f:
+                # A writer may be mid-line; leave it for the next update
+                if not line.endswith(b"\n"):
+                    break
+                self.offset += len(line)
+                yield line
+
+    def _load_state(self) -> None:
+        if not self.state_file.exists():
+            return
+        stat = self.state_file.stat()
+        mtime = (stat.st_mtime_ns, stat.st_size)
+        if mtime == self._state_mtime:
+            return
+        with open(self.state_file, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        self.offset = state.get("log_offset", 0)
+        self.inode = state.get("log_inode")
+        self.days = {day: UsageRollup.from_dict(data) for day, data in state.get("days", {}).items()}
+        self._state_mtime = mtime
+
+    def _save_state(self) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    "log_file": self.log_file.name,
+                    "log_offset": self.offset,
+                    "log_inode": self.inode,
+                    "days": {day: rollup.to_dict() for day, rollup in sorted(self.days.items())},
+                }, f)
+            os.replace(tmp_path, self.state_file)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        stat = self.state_file.stat()
+        self._state_mtime = (stat.st_mtime_ns, stat.st_size)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Serialize updates across worker processes (no-op without fcntl)"""
+        if not FCNTL_AVAILABLE:
+            yield
+            return
+        self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_file, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
@@ -27,16 +27,23 @@ import os
 import json
 import numpy as np
 import logging
+import threading
 from typing import List, Dict, Optional
 from sqlalchemy import text
 from openai import OpenAI
 
 # Import centralized database connection
 from database import get_db_engine
+from monitoring.tracing import openai_http_client
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# One traced OpenAI client (and connection pool) per API key, reused by
+# every query embedding instead of a new pool per call
+_openai_clients: Dict[str, OpenAI] = {}
+_openai_clients_lock = threading.Lock()
+
 
 def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
     """
@@ -59,6 +66,18 @@ def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
     return dot_product / (norm1 * norm2)
 
 
+def get_openai_client(api_key: str) -> OpenAI:
+    """Shared OpenAI client for api_key (created once, traced when tracing is on)"""
+    client = _openai_clients.get(api_key)
+    if client is None:
+        with _openai_clients_lock:
+            client = _openai_clients.get(api_key)
+            if client is None:
+                client = OpenAI(api_key=api_key, http_client=openai_http_client())
+                _openai_clients[api_key] = client
+    return client
+
+
 def generate_query_embedding(message: str, api_key: str, model: str = "text-embedding-3-small") -> List[float]:
     """
     Generate embedding for customer message using OpenAI API
@@ -74,7 +93,7 @@ def generate_query_embedding(message: str, api_key: str, model: str = "text-embe
     Raises:
         RuntimeError: If OpenAI API call fails
     """
-    client = OpenAI(api_key=api_key)
+    client = get_openai_client(api_key)
 
     try:
         response = client.embeddings.create(
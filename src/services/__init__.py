@@ -7,15 +7,20 @@ Shared services for the Tria AIBPO system.
 Modules:
 - multilevel_cache: 4-tier caching system for maximum cache hit rate
 - streaming_service: SSE streaming for progressive response rendering
+- bulk_export: Constant-memory NDJSON/CSV/Parquet exports via server-side cursors
 """
 
 from .multilevel_cache import MultiLevelCache, CacheMetrics
 from .streaming_service import StreamingService, StreamEvent, stream_chat_message
+from .bulk_export import stream_export, EXPORT_ENTITIES, EXPORT_FORMATS
 
 __all__ = [
     'MultiLevelCache',
     'CacheMetrics',
     'StreamingService',
     'StreamEvent',
-    'stream_chat_message'
+    'stream_chat_message',
+    'stream_export',
+    'EXPORT_ENTITIES',
+    'EXPORT_FORMATS'
 ]
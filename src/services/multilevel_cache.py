@@ -36,6 +36,8 @@ from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from monitoring.tracing import trace_calls
+
 logger = logging.getLogger(__name__)
 
 # Redis for L1, L3, L4 caches
@@ -279,10 +281,14 @@ class MultiLevelCache:
         # Initialize Redis for L1, L3, L4
         if REDIS_AVAILABLE:
             try:
-                self.redis_client = await aioredis.from_url(
-                    self.redis_url,
-                    encoding="utf-8",
-                    decode_responses=True
+                self.redis_client = trace_calls(
+                    await aioredis.from_url(
+                        self.redis_url,
+                        encoding="utf-8",
+                        decode_responses=True
+                    ),
+                    "redis",
+                    {"db.system": "redis"}
                 )
                 # Test connection
                 await self.redis_client.ping()
@@ -309,9 +315,13 @@ class MultiLevelCache:
                 )
 
                 # Get or create cache collection
-                self.chroma_collection = self.chroma_client.get_or_create_collection(
-                    name="response_cache_l2",
-                    metadata={"hnsw:space": "cosine"}
+                self.chroma_collection = trace_calls(
+                    self.chroma_client.get_or_create_collection(
+                        name="response_cache_l2",
+                        metadata={"hnsw:space": "cosine"}
+                    ),
+                    "chroma",
+                    {"db.system": "chroma", "db.collection.name": "response_cache_l2"}
                 )
                 logger.info(f"ChromaDB L2 cache initialized: {CHROMA_CACHE_DIR}")
             except Exception as e:
@@ -35,6 +35,8 @@ from prompts.system_prompts import (
     CUSTOMER_SERVICE_PROMPT,
     build_rag_qa_prompt
 )
+from monitoring.profiler import stage, metadata_timings
+from monitoring.tracing import openai_http_client
 
 
 # Configure logging
@@ -112,7 +114,7 @@ class StreamingService:
         self.enable_rag = enable_rag
 
         # Initialize async OpenAI client
-        self.openai_client = AsyncOpenAI(api_key=api_key, timeout=timeout)
+        self.openai_client = AsyncOpenAI(api_key=api_key, timeout=timeout, http_client=openai_http_client(async_client=True))
 
         # Initialize intent classifier (synchronous, will run in executor)
         self.intent_classifier = IntentClassifier(
@@ -170,14 +172,14 @@ class StreamingService:
                 timestamp=datetime.now()
             ).to_sse()
 
-            # Run synchronous intent classification in executor
-            loop = asyncio.get_event_loop()
-            intent_result = await loop.run_in_executor(
-                None,
-                self.intent_classifier.classify_intent,
-                message,
-                conversation_history or []
-            )
+            # Run synchronous intent classification in a thread
+            # (to_thread carries the correlation ID and trace context along)
+            with stage("intent"):
+                intent_result = await asyncio.to_thread(
+                    self.intent_classifier.classify_intent,
+                    message,
+                    conversation_history or []
+                )
 
             logger.info(
                 f"[STREAMING] Intent: {intent_result.intent} "
@@ -210,26 +212,26 @@ class StreamingService:
 
                 # Retrieve knowledge asynchronously
                 if intent_result.intent == "policy_question":
-                    # Run synchronous search in executor
-                    policy_results = await loop.run_in_executor(
-                        None,
-                        search_policies,
-                        message,
-                        self.api_key,
-                        3
-                    )
+                    # Run synchronous search in a thread
+                    with stage("rag_retrieval"):
+                        policy_results = await asyncio.to_thread(
+                            search_policies,
+                            message,
+                            self.api_key,
+                            3
+                        )
                     knowledge_chunks = policy_results
                     knowledge_text = format_results_for_llm(policy_results, "POLICIES")
 
                 elif intent_result.intent == "product_inquiry":
-                    # Run synchronous search in executor
-                    faq_results = await loop.run_in_executor(
-                        None,
-                        search_faqs,
-                        message,
-                        self.api_key,
-                        3
-                    )
+                    # Run synchronous search in a thread
+                    with stage("rag_retrieval"):
+                        faq_results = await asyncio.to_thread(
+                            search_faqs,
+                            message,
+                            self.api_key,
+                            3
+                        )
                     knowledge_chunks = faq_results
                     knowledge_text = format_results_for_llm(faq_results, "FAQs")
 
@@ -271,19 +273,20 @@ class StreamingService:
             # Stream GPT-4 response
             full_response = ""
 
-            async for chunk_text in self._stream_openai_response(
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                conversation_history=conversation_history
-            ):
-                full_response += chunk_text
-
-                # Emit chunk
-                yield StreamEvent(
-                    event_type="chunk",
-                    data={"chunk": chunk_text},
-                    timestamp=datetime.now()
-                ).to_sse()
+            with stage("generation"):
+                async for chunk_text in self._stream_openai_response(
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    conversation_history=conversation_history
+                ):
+                    full_response += chunk_text
+
+                    # Emit chunk
+                    yield StreamEvent(
+                        event_type="chunk",
+                        data={"chunk": chunk_text},
+                        timestamp=datetime.now()
+                    ).to_sse()
 
             # ================================================================
             # PHASE 5: COMPLETE
@@ -295,18 +298,24 @@ class StreamingService:
                 f"({len(full_response)} chars, {len(knowledge_chunks)} citations)"
             )
 
+            metadata = {
+                "intent": intent_result.intent,
+                "confidence": intent_result.confidence,
+                "citations_count": len(knowledge_chunks),
+                "response_length": len(full_response),
+                "processing_time": f"{total_time:.2f}s"
+            }
+            # Headers went out with the first event; timings travel here instead
+            timings = metadata_timings()
+            if timings:
+                metadata["timings"] = timings
+
             yield StreamEvent(
                 event_type="complete",
                 data={
                     "status": "complete",
                     "message": "Response complete",
-                    "metadata": {
-                        "intent": intent_result.intent,
-                        "confidence": intent_result.confidence,
-                        "citations_count": len(knowledge_chunks),
-                        "response_length": len(full_response),
-                        "processing_time": f"{total_time:.2f}s"
-                    }
+                    "metadata": metadata
                 },
                 timestamp=datetime.now()
             ).to_sse()
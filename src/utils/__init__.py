@@ -12,11 +12,20 @@ from .compensating_transactions import (
     CompensatingAction
 )
 
+from .stage_graph import (
+    Stage,
+    StageFailure,
+    run_stage_graph
+)
+
 __all__ = [
     'execute_with_timeout',
     'with_timeout',
     'WorkflowTimeoutError',
     'DEFAULT_WORKFLOW_TIMEOUT',
     'CompensatingTransactionManager',
-    'CompensatingAction'
+    'CompensatingAction',
+    'Stage',
+    'StageFailure',
+    'run_stage_graph'
 ]
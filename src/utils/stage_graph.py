@@ -0,0 +1,203 @@
+"""
+Dependency-ordered stage execution for multi-step workflows.
+
+Runs the stages of a workflow as a DAG: every stage starts as soon as the
+stages it depends on have completed, so independent stages (e.g. Xero
+customer verification and inventory checks) run concurrently.
+
+SEMANTICS:
+- Fail fast: after the first failure no new stages start; stages already
+  running are allowed to finish so their side effects are known
+- on_complete is called in the caller's thread for every successful stage,
+  which is where compensating actions should be registered
+  (CompensatingTransactionManager is not thread-safe)
+- When several stages fail, the one declared first is reported, so results
+  match a sequential run in declaration order
+- contextvars (e.g. the Xero rate-limit priority) propagate into stage threads
+"""
+
+import time
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StageFailure(Exception):
+    """
+    Expected business failure of a stage (e.g. customer not found).
+
+    The message is the workflow error; unlike other exceptions it is not
+    logged as an unexpected error.
+    """
+    pass
+
+
+@dataclass
+class Stage:
+    """
+    One workflow stage.
+
+    func receives a dict of results of the completed stages it may read
+    (at least its dependencies) and returns this stage's result.
+    """
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class StageTiming:
+    """Wall-clock timing of one stage"""
+    name: str
+    status: str  # completed, failed
+    started_at: float  # Epoch seconds
+    duration_ms: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'stage': self.name,
+            'status': self.status,
+            'started_at': self.started_at,
+            'duration_ms': round(self.duration_ms, 1),
+        }
+
+
+@dataclass
+class StageGraphResult:
+    """Outcome of run_stage_graph"""
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings: List[StageTiming] = field(default_factory=list)
+    failed_stage: Optional[str] = None
+    error: Optional[Exception] = None
+    total_ms: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def validate_stage_graph(stages: Sequence[Stage]) -> None:
+    """
+    Check names are unique, dependencies exist and there are no cycles.
+
+    Raises:
+        ValueError: If the graph is invalid
+    """
+    names = [stage.name for stage in stages]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate stage names: {names}")
+
+    known = set(names)
+    for stage in stages:
+        unknown = set(stage.depends_on) - known
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {sorted(unknown)}")
+
+    resolved = set()
+    pending = list(stages)
+    while pending:
+        ready = [stage for stage in pending if set(stage.depends_on) <= resolved]
+        if not ready:
+            raise ValueError(f"Dependency cycle among stages: {[stage.name for stage in pending]}")
+        resolved.update(stage.name for stage in ready)
+        pending = [stage for stage in pending if stage.name not in resolved]
+
+
+def run_stage_graph(
+    stages: Sequence[Stage],
+    max_concurrency: int = 2,
+    on_complete: Optional[Callable[[str, Any], None]] = None,
+    on_finish: Optional[Callable[[StageTiming], None]] = None
+) -> StageGraphResult:
+    """
+    Execute stages in dependency order, running independent stages concurrently.
+
+    Args:
+        stages: Stages in preferred (sequential) order
+        max_concurrency: Maximum stages running at once
+        on_complete: Called as on_complete(stage_name, result) in the caller's
+            thread after each successful stage
+        on_finish: Called as on_finish(timing) in the caller's thread after
+            every stage, successful or not (after on_complete)
+
+    Returns:
+        StageGraphResult with per-stage results and timings, and the first
+        failure (by declaration order) if any stage failed
+
+    Raises:
+        ValueError: If the stage graph is invalid
+    """
+    validate_stage_graph(stages)
+
+    order = {stage.name: index for index, stage in enumerate(stages)}
+    graph_result = StageGraphResult()
+    failures: Dict[str, Exception] = {}
+    not_started = list(stages)
+    running = {}
+    graph_start = time.perf_counter()
+
+    def execute(stage: Stage, inputs: Dict[str, Any]):
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            result, error = stage.func(inputs), None
+        except Exception as e:
+            result, error = None, e
+        return result, error, started_at, (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="stage") as executor:
+        while not_started or running:
+            # Start every stage whose dependencies are satisfied
+            if not failures:
+                for stage in list(not_started):
+                    if len(running) >= max_concurrency:
+                        break
+                    if all(dep in graph_result.results for dep in stage.depends_on):
+                        not_started.remove(stage)
+                        context = contextvars.copy_context()
+                        future = executor.submit(context.run, execute, stage, dict(graph_result.results))
+                        running[future] = stage
+
+            if not running:
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                result, error, started_at, duration_ms = future.result()
+
+                timing = StageTiming(
+                    name=stage.name,
+                    status='failed' if error else 'completed',
+                    started_at=started_at,
+                    duration_ms=duration_ms
+                )
+                graph_result.timings.append(timing)
+
+                if error is not None:
+                    failures[stage.name] = error
+                else:
+                    graph_result.results[stage.name] = result
+                    if on_complete:
+                        try:
+                            on_complete(stage.name, result)
+                        except Exception as e:
+                            failures[stage.name] = e
+
+                if on_finish:
+                    try:
+                        on_finish(timing)
+                    except Exception as e:
+                        logger.error(f"on_finish failed for stage {stage.name}: {e}")
+
+    if failures:
+        graph_result.failed_stage = min(failures, key=order.get)
+        graph_result.error = failures[graph_result.failed_stage]
+
+    graph_result.timings.sort(key=lambda timing: (timing.started_at, order[timing.name]))
+    graph_result.total_ms = (time.perf_counter() - graph_start) * 1000
+    return graph_result
@@ -0,0 +1,69 @@
+"""
+Order Pagination Unit Tests
+===========================
+
+Tests for the keyset cursor helpers behind GET /api/v1/orders.
+
+Tests cover:
+- Cursor round-trip (timezone-aware timestamps, large ids)
+- Malformed cursor rejection
+- include_fields validation
+"""
+
+import sys
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from database_operations import (
+    encode_order_cursor,
+    decode_order_cursor,
+    list_orders_page,
+)
+
+
+class TestOrderCursor:
+    """Test keyset cursor encoding"""
+
+    def test_round_trip_utc(self):
+        """Cursor decodes to the same (created_at, id)"""
+        created_at = datetime(2025, 1, 15, 14, 30, 22, 123456, tzinfo=timezone.utc)
+        cursor = encode_order_cursor(created_at, 42)
+
+        assert decode_order_cursor(cursor) == (created_at, 42)
+
+    def test_round_trip_offset_timezone(self):
+        """Non-UTC offsets survive the round trip"""
+        created_at = datetime(2025, 3, 1, 9, 0, tzinfo=timezone(timedelta(hours=8)))
+        cursor = encode_order_cursor(created_at, 987654321)
+
+        decoded_at, decoded_id = decode_order_cursor(cursor)
+        assert decoded_at == created_at
+        assert decoded_at.utcoffset() == timedelta(hours=8)
+        assert decoded_id == 987654321
+
+    def test_cursor_is_url_safe(self):
+        """Cursor can be passed as a query parameter without escaping"""
+        cursor = encode_order_cursor(datetime(2025, 1, 1, tzinfo=timezone.utc), 1)
+
+        assert "=" not in cursor
+        assert "+" not in cursor
+        assert "/" not in cursor
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "bm9waXBl", "!!!"])
+    def test_malformed_cursor_raises(self, cursor):
+        """Malformed cursors raise ValueError (mapped to HTTP 400)"""
+        with pytest.raises(ValueError):
+            decode_order_cursor(cursor)
+
+
+class TestIncludeFields:
+    """Test column projection validation"""
+
+    def test_unknown_include_field_raises(self):
+        """Only whatsapp_message and parsed_items may be requested"""
+        with pytest.raises(ValueError, match="Unknown include fields"):
+            list_orders_page(None, include_fields=["total_amount; DROP TABLE orders"])
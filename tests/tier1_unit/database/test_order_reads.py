@@ -0,0 +1,45 @@
+"""
+Order Read Unit Tests
+=====================
+
+Tests for the joined order + outlet read used by document endpoints.
+
+Tests cover:
+- Read cache hits skip the database
+- Cache invalidation
+
+NO MOCKING - Cache hits are served without a session; no database required.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+import database_operations
+from database_operations import get_order_with_outlet, invalidate_order_read_cache
+
+
+class TestOrderReadCache:
+    """Test the short-TTL order + outlet read cache"""
+
+    def setup_method(self):
+        invalidate_order_read_cache()
+
+    def teardown_method(self):
+        invalidate_order_read_cache()
+
+    def test_cache_hit_needs_no_session(self):
+        row = ({'id': 5, 'outlet_id': 1}, {'id': 1, 'name': 'Store 1'})
+        database_operations._order_read_cache.put('5', row)
+
+        assert get_order_with_outlet(None, 5, use_cache=True) is row
+
+    def test_invalidate_single_order(self):
+        database_operations._order_read_cache.put('5', ({'id': 5}, None))
+        database_operations._order_read_cache.put('6', ({'id': 6}, None))
+
+        invalidate_order_read_cache(5)
+
+        assert database_operations._order_read_cache.get('5') is None
+        assert database_operations._order_read_cache.get('6') is not None
@@ -0,0 +1,101 @@
+"""
+Delivery Order Renderer Unit Tests
+==================================
+
+Tests for Delivery Order validation and rendering from the cached template.
+
+Tests cover:
+- Order/outlet validation and DO numbering
+- Template cells for line items and totals
+- Repeated renders from the cached template stay independent
+- Zip packing
+
+NO MOCKING - Real openpyxl rendering of data/templates/DO_Template.xlsx.
+"""
+
+import io
+import sys
+import zipfile
+from datetime import date
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from documents.delivery_order import (
+    DocumentDataError,
+    DO_TEMPLATE_PATH,
+    build_delivery_order,
+    build_delivery_orders,
+    build_zip,
+    delivery_order_cells,
+    render_delivery_order,
+)
+
+
+OUTLET = {'name': 'Store 1', 'address': '1 Main Road'}
+
+
+def make_order(order_id=7, items=None):
+    return {
+        'id': order_id,
+        'outlet_id': 1,
+        'parsed_items': {'line_items': items if items is not None else [
+            {'description': 'Pizza Box 10"', 'quantity': 5},
+            {'description': 'Pizza Box 12"', 'quantity': 3},
+        ]}
+    }
+
+
+class TestBuildDeliveryOrder:
+    """Test DO validation"""
+
+    def test_do_number_and_filename(self):
+        document = build_delivery_order(make_order(), OUTLET, delivery_date=date(2025, 1, 15))
+
+        assert document.do_number == 'DO-20250115-00007'
+        assert document.filename == 'DO_Store_1_2025-01-15.xlsx'
+        assert document.total_quantity == 8
+
+    def test_missing_outlet_address(self):
+        with pytest.raises(DocumentDataError, match="address missing"):
+            build_delivery_order(make_order(), {'name': 'Store 1', 'address': ''})
+
+    def test_batch_reports_bad_orders(self):
+        rows = [(make_order(1), OUTLET), (make_order(2, [{'quantity': 1}]), OUTLET), (make_order(3), None)]
+
+        documents, errors = build_delivery_orders(rows)
+
+        assert [document.order_id for document in documents] == [1]
+        assert len(errors) == 2 and errors[0].startswith('Order 2:')
+
+
+class TestRendering:
+    """Test cell layout and cached template rendering"""
+
+    def test_cells(self):
+        cells = delivery_order_cells(build_delivery_order(make_order(), OUTLET))
+
+        assert cells['A4'] == 'Customer: Store 1'
+        assert cells['A8'] == 'Pizza Box 10": 5 units'
+        assert cells['A10'] == 'Total: 8 items'
+
+    @pytest.mark.skipif(not DO_TEMPLATE_PATH.exists(), reason="DO template not available")
+    def test_renders_restore_template(self):
+        render_delivery_order(build_delivery_order(make_order(1), OUTLET))
+        content = render_delivery_order(build_delivery_order(
+            make_order(2, [{'description': 'Napkins', 'quantity': 2}]), OUTLET
+        ))
+
+        sheet = openpyxl.load_workbook(io.BytesIO(content)).worksheets[0]
+        assert sheet['A2'].value.endswith('-00002')
+        assert sheet['A8'].value == 'Napkins: 2 units'
+        assert sheet['A9'].value == 'Total: 2 items'
+        # Second line of the first render must not leak into the second
+        assert sheet['A10'].value is None
+
+    def test_build_zip(self):
+        archive = zipfile.ZipFile(io.BytesIO(build_zip([('a.xlsx', b'1'), ('ERRORS.txt', b'x')])))
+        assert archive.namelist() == ['a.xlsx', 'ERRORS.txt']
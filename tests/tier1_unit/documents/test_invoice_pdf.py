@@ -0,0 +1,122 @@
+"""
+Invoice PDF Renderer Unit Tests
+===============================
+
+Tests for invoice building, content-addressed caching and ETag handling.
+
+Tests cover:
+- Catalog pricing, tax and stable invoice numbering
+- Revision changes only when printed content changes
+- Deterministic PDF output
+- Document cache round-trip and key validation
+- If-None-Match matching
+
+NO MOCKING - Real ReportLab rendering and filesystem cache.
+"""
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from documents.document_cache import DocumentCache, etag_matches
+from documents.invoice_pdf import (
+    MissingProductError,
+    build_invoice,
+    build_invoices,
+    render_invoice_pdf,
+)
+
+
+OUTLET = {'name': 'Store 1', 'address': '1 Main Road'}
+PRODUCTS = {'BOX-10': {'unit_price': 1.25}, 'BOX-12': {'unit_price': '2.00'}}
+TAX_RATE = Decimal('0.09')
+
+
+def make_order(order_id=3, quantity=10):
+    return {
+        'id': order_id,
+        'outlet_id': 1,
+        'created_at': '2025-01-15T10:00:00+00:00',
+        'parsed_items': {'line_items': [
+            {'sku': 'BOX-10', 'description': 'Pizza Box 10"', 'quantity': quantity},
+            {'sku': 'BOX-12', 'description': 'Pizza Box 12"', 'quantity': 5},
+        ]}
+    }
+
+
+class TestBuildInvoice:
+    """Test invoice amounts and numbering"""
+
+    def test_amounts(self):
+        invoice = build_invoice(make_order(), OUTLET, PRODUCTS, TAX_RATE)
+
+        assert invoice.subtotal == Decimal('22.50')
+        assert invoice.tax == Decimal('22.50') * TAX_RATE
+        assert invoice.total == invoice.subtotal + invoice.tax
+
+    def test_number_from_order_date_or_recorded_invoice(self):
+        assert build_invoice(make_order(), OUTLET, PRODUCTS, TAX_RATE).invoice_number == 'INV-20250115-00003'
+
+        recorded = {'invoice_number': 'INV-0042', 'created_at': '2025-01-16T09:00:00+00:00'}
+        invoice = build_invoice(make_order(), OUTLET, PRODUCTS, TAX_RATE, recorded)
+        assert invoice.invoice_number == 'INV-0042'
+        assert invoice.invoice_date == '2025-01-16'
+
+    def test_unknown_sku(self):
+        with pytest.raises(MissingProductError):
+            build_invoice(make_order(), OUTLET, {'BOX-10': {'unit_price': 1}}, TAX_RATE)
+
+    def test_batch_reports_bad_orders(self):
+        documents, errors = build_invoices(
+            [(make_order(1), OUTLET, None), (make_order(2), None, None)], PRODUCTS, TAX_RATE
+        )
+        assert [document.order_id for document in documents] == [1]
+        assert errors[0].startswith('Order 2:')
+
+
+class TestRevision:
+    """Test content-addressed revisions"""
+
+    def test_stable_for_same_content(self):
+        first = build_invoice(make_order(), OUTLET, PRODUCTS, TAX_RATE)
+        second = build_invoice(make_order(), OUTLET, PRODUCTS, TAX_RATE)
+        assert first.revision == second.revision
+        assert first.cache_key == f"invoices/3/{first.revision}.pdf"
+
+    def test_changes_with_content(self):
+        original = build_invoice(make_order(), OUTLET, PRODUCTS, TAX_RATE)
+        assert build_invoice(make_order(quantity=11), OUTLET, PRODUCTS, TAX_RATE).revision != original.revision
+        assert build_invoice(make_order(), OUTLET, PRODUCTS, Decimal('0.08')).revision != original.revision
+
+    def test_pdf_is_deterministic(self):
+        invoice = build_invoice(make_order(), OUTLET, PRODUCTS, TAX_RATE)
+        content = render_invoice_pdf(invoice)
+        assert content.startswith(b'%PDF')
+        assert render_invoice_pdf(invoice) == content
+
+
+class TestDocumentCache:
+    """Test on-disk cache and ETag matching"""
+
+    def test_round_trip(self, tmp_path):
+        cache = DocumentCache(tmp_path)
+        assert cache.get('invoices/3/abc.pdf') is None
+
+        cache.put('invoices/3/abc.pdf', b'%PDF-1.4')
+        assert cache.get('invoices/3/abc.pdf') == b'%PDF-1.4'
+        assert not list(tmp_path.rglob('*.tmp'))
+
+    def test_rejects_keys_outside_root(self, tmp_path):
+        with pytest.raises(ValueError):
+            DocumentCache(tmp_path).get('../outside.pdf')
+
+    def test_etag_matches(self):
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc", "def"', '"abc"')
+        assert etag_matches('*', '"abc"')
+        assert not etag_matches('"def"', '"abc"')
+        assert not etag_matches(None, '"abc"')
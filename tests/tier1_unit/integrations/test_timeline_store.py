@@ -0,0 +1,78 @@
+"""
+Agent Timeline Store Unit Tests
+===============================
+
+Tests for the pure parts of the persistent agent timeline store.
+
+Tests cover:
+- Mapping in-memory timeline entries to event rows
+- Rollup increments per (date, category, status)
+
+NO MOCKING - Pure functions, no database required.
+"""
+
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from integrations.timeline_store import timeline_entry_to_row, rollup_deltas
+
+
+def make_entry(**overrides):
+    entry = {
+        'agent_name': '💰 Finance Controller',
+        'status': 'completed',
+        'progress': 100,
+        'current_task': 'Invoice INV-001 posted',
+        'details': ['✓ Posted'],
+        'category': 'finance',
+        'date': '2025-01-15',
+        'started_at': '2025-01-15T14:30:22',
+        'completed_at': '2025-01-15T14:30:23',
+        'metadata': {'invoice_number': 'INV-001', 'total_amount': 109.0},
+        'stage': 'post_invoice',
+        'duration_ms': 812.5,
+    }
+    entry.update(overrides)
+    return entry
+
+
+class TestTimelineEntryToRow:
+    """Test entry to row mapping"""
+
+    def test_maps_indexed_columns(self):
+        row = timeline_entry_to_row(make_entry(), workflow_id='wf-1', order_ref='Store 1')
+
+        assert row['workflow_id'] == 'wf-1'
+        assert row['order_ref'] == 'Store 1'
+        assert row['event_date'] == date(2025, 1, 15)
+        assert row['started_at'] == datetime(2025, 1, 15, 14, 30, 22)
+        assert row['invoice_number'] == 'INV-001'
+        assert row['do_number'] is None
+        assert row['duration_ms'] == 812.5
+
+    def test_unknown_category_and_blank_task(self):
+        row = timeline_entry_to_row(make_entry(category='billing', current_task=''), workflow_id='wf-1')
+
+        assert row['category'] == 'general'
+        assert row['current_task'] is None
+
+
+class TestRollupDeltas:
+    """Test rollup aggregation"""
+
+    def test_groups_by_date_category_status(self):
+        rows = [
+            timeline_entry_to_row(make_entry(), 'wf-1'),
+            timeline_entry_to_row(make_entry(duration_ms=200.0), 'wf-2'),
+            timeline_entry_to_row(make_entry(status='error', duration_ms=None), 'wf-3'),
+        ]
+
+        deltas = {(d['category'], d['status']): d for d in rollup_deltas(rows)}
+
+        assert deltas[('finance', 'completed')]['event_count'] == 2
+        assert deltas[('finance', 'completed')]['total_duration_ms'] == 1012.5
+        assert deltas[('finance', 'error')]['event_count'] == 1
+        assert deltas[('finance', 'error')]['total_duration_ms'] == 0.0
@@ -0,0 +1,75 @@
+"""
+Xero Bulk Inventory Lookup Unit Tests
+=====================================
+
+Tests for the pure helpers behind XeroClient.check_inventory_bulk.
+
+Tests cover:
+- OR-clause building and chunking to the URL length limit
+- Rejection of a single value that cannot fit in a clause
+- Case- and whitespace-insensitive matching of returned items
+
+NO MOCKING - Pure functions, no Xero API calls.
+"""
+
+import sys
+from pathlib import Path
+from urllib.parse import quote
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from integrations.xero_client import (
+    XeroProduct,
+    build_or_where_clauses,
+    match_products_by_code,
+    normalize_item_code,
+)
+
+
+def product(code):
+    return XeroProduct(item_id=f"id-{code}", code=code, name=f"Item {code}")
+
+
+class TestBuildOrWhereClauses:
+    """Test WHERE clause building"""
+
+    def test_single_clause(self):
+        assert build_or_where_clauses("Code", ["A", "B"]) == ['Code=="A" OR Code=="B"']
+
+    def test_empty(self):
+        assert build_or_where_clauses("Code", []) == []
+
+    def test_chunks_respect_max_length(self):
+        codes = [f"SKU-{n:04d}" for n in range(200)]
+        clauses = build_or_where_clauses("Code", codes, max_encoded_length=300)
+
+        assert len(clauses) > 1
+        assert all(len(quote(clause)) <= 300 for clause in clauses)
+        # Every code appears exactly once, in order
+        terms = [term for clause in clauses for term in clause.split(" OR ")]
+        assert terms == [f'Code=="{code}"' for code in codes]
+
+    def test_value_too_long(self):
+        with pytest.raises(ValueError, match="too long"):
+            build_or_where_clauses("Code", ["X" * 100], max_encoded_length=50)
+
+
+class TestMatchProductsByCode:
+    """Test mapping returned items back to requested codes"""
+
+    def test_case_insensitive(self):
+        results = match_products_by_code(["abc-1", "ABC-2"], [product("ABC-1"), product("abc-2")])
+
+        assert results["abc-1"].code == "ABC-1"
+        assert results["ABC-2"].code == "abc-2"
+
+    def test_whitespace_and_missing(self):
+        results = match_products_by_code([" ABC-1 ", "NOPE"], [product("ABC-1")])
+
+        assert results[" ABC-1 "].item_id == "id-ABC-1"
+        assert results["NOPE"] is None
+
+    def test_normalize_item_code(self):
+        assert normalize_item_code("  ctn-10a ") == "CTN-10A"
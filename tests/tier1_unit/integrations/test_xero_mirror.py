@@ -0,0 +1,147 @@
+"""
+Xero Mirror Unit Tests
+======================
+
+Tests for the sync scheduling and merge logic of the local Xero mirror.
+
+Tests cover:
+- Sync planning from persisted state (full, delta, nothing due)
+- Item upserts: write-through rows keep the synced UpdatedDateUTC,
+  a code moving to a new ItemID replaces the old row
+- Sync state merge: modified_since only moves forward, delta syncs keep
+  last_full_sync_at
+- Trust window for mirror hits
+
+NO MOCKING - Real SQLAlchemy upserts against in-memory SQLite.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from models.order_orm import XeroItemMirror, XeroContactMirror, XeroSyncState
+from integrations.xero_client import XeroProduct
+from integrations.xero_mirror import (
+    ITEMS_RESOURCE,
+    CONTACTS_RESOURCE,
+    XeroMirror,
+    plan_sync,
+)
+
+NOW = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def ago(**kwargs):
+    return NOW - timedelta(**kwargs)
+
+
+@pytest.fixture
+def mirror():
+    engine = create_engine("sqlite://")
+    for model in (XeroItemMirror, XeroContactMirror, XeroSyncState):
+        model.__table__.create(engine)
+    return XeroMirror(engine=engine, max_age_seconds=900)
+
+
+def product(item_id, code, price=1.0):
+    return XeroProduct(item_id=item_id, code=code, name=f"Item {code}", unit_price=price)
+
+
+def items(mirror):
+    table = XeroItemMirror.__table__
+    with mirror.engine.connect() as conn:
+        return {row['item_id']: row for row in conn.execute(select(table)).mappings()}
+
+
+class TestPlanSync:
+    """Test which sync a cycle runs"""
+
+    def plan(self, items_state, contacts_state):
+        return plan_sync(
+            {ITEMS_RESOURCE: items_state, CONTACTS_RESOURCE: contacts_state},
+            NOW, sync_interval_seconds=300, full_sync_interval_seconds=86400,
+        )
+
+    def test_never_synced_is_full(self):
+        assert self.plan({}, {}) is True
+
+    def test_stale_full_sync(self):
+        fresh = {'last_synced_at': ago(seconds=10), 'last_full_sync_at': ago(hours=1)}
+        stale = {'last_synced_at': ago(seconds=10), 'last_full_sync_at': ago(days=2)}
+        assert self.plan(fresh, stale) is True
+
+    def test_delta_due(self):
+        state = {'last_synced_at': ago(minutes=6), 'last_full_sync_at': ago(hours=1)}
+        assert self.plan(state, state) is False
+
+    def test_nothing_due_after_restart(self):
+        # A worker restarting right after another worker's sync does not sync again
+        state = {'last_synced_at': ago(seconds=30), 'last_full_sync_at': ago(hours=3)}
+        assert self.plan(state, state) is None
+
+
+class TestItemMerge:
+    """Test item upserts"""
+
+    def test_write_through_keeps_synced_updated_at(self, mirror):
+        synced = mirror._product_row(product("id-1", "SKU-1"), ago(days=1))
+        with mirror.engine.begin() as conn:
+            mirror._upsert_items(conn, [synced])
+
+        mirror.store_products([product("id-1", "SKU-1", price=2.5)])
+
+        row = items(mirror)["id-1"]
+        assert float(row['unit_price']) == 2.5
+        assert row['xero_updated_at'] is not None
+
+    def test_code_moved_to_new_item(self, mirror):
+        mirror.store_products([product("id-old", "SKU-1"), product("id-2", "SKU-2")])
+        mirror.store_products([product("id-new", "SKU-1")])
+
+        assert set(items(mirror)) == {"id-new", "id-2"}
+
+
+class TestSyncStateMerge:
+    """Test xero_sync_state updates"""
+
+    def save(self, mirror, updated_at, started_at, full):
+        rows = [{'xero_updated_at': updated_at}]
+        with mirror.engine.begin() as conn:
+            mirror._save_state(conn, ITEMS_RESOURCE, rows, started_at, full)
+        return mirror._get_state(ITEMS_RESOURCE)
+
+    def test_modified_since_only_moves_forward(self, mirror):
+        self.save(mirror, ago(hours=1), ago(minutes=10), full=True)
+        state = self.save(mirror, ago(hours=5), ago(minutes=5), full=False)
+
+        assert state['modified_since'].replace(tzinfo=timezone.utc) == ago(hours=1)
+
+    def test_delta_keeps_last_full_sync(self, mirror):
+        self.save(mirror, None, ago(minutes=10), full=True)
+        state = self.save(mirror, ago(minutes=7), ago(minutes=5), full=False)
+
+        assert state['last_full_sync_at'].replace(tzinfo=timezone.utc) == ago(minutes=10)
+        assert state['last_synced_at'].replace(tzinfo=timezone.utc) == ago(minutes=5)
+        assert state['modified_since'].replace(tzinfo=timezone.utc) == ago(minutes=7)
+
+
+class TestTrustWindow:
+    """Test which mirror rows are served"""
+
+    def test_recent_write_through_is_a_hit(self, mirror):
+        mirror.store_products([product("id-1", "SKU-1")])
+
+        assert set(mirror.get_items(["SKU-1", "SKU-2"])) == {"SKU-1"}
+
+    def test_stale_rows_are_misses(self, mirror):
+        stale = mirror._product_row(product("id-1", "SKU-1"), None)
+        stale['synced_at'] = datetime.now(timezone.utc) - timedelta(hours=1)
+        with mirror.engine.begin() as conn:
+            mirror._upsert_items(conn, [stale])
+
+        assert mirror.get_items(["SKU-1"]) == {}
@@ -0,0 +1,93 @@
+"""
+User Analytics Aggregation Unit Tests
+=====================================
+
+Tests for folding conversation sessions and messages into per-user
+summary deltas before they are upserted.
+
+Tests cover:
+- Counter accumulation per user
+- Intent counting (placeholder intents ignored)
+- First/last interaction bounds
+- Upsert row shape
+
+NO MOCKING - Pure data folding, no database required.
+"""
+
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from memory.user_analytics import fold_events, SummaryDelta
+
+
+def ts(day: int) -> datetime:
+    return datetime(2025, 1, day, tzinfo=timezone.utc)
+
+
+class TestFoldEvents:
+    """Test folding of raw rows into deltas"""
+
+    def test_counts_per_user(self):
+        sessions = [
+            {'user_id': 'u1', 'outlet_id': 3, 'language': 'en', 'start_time': ts(2)},
+            {'user_id': 'u1', 'outlet_id': None, 'language': 'zh', 'start_time': ts(5)},
+            {'user_id': 'u2', 'outlet_id': 7, 'language': 'ms', 'start_time': ts(3)},
+        ]
+        messages = [
+            {'user_id': 'u1', 'intent': 'pending', 'timestamp': ts(2)},
+            {'user_id': 'u1', 'intent': 'order_placement', 'timestamp': ts(6)},
+            {'user_id': 'u2', 'intent': 'policy_question', 'timestamp': ts(3)},
+        ]
+
+        deltas = fold_events(sessions, messages)
+
+        assert deltas['u1'].conversations == 2
+        assert deltas['u1'].messages == 2
+        assert deltas['u1'].outlet_id == 3  # None does not override a known outlet
+        assert deltas['u1'].language == 'zh'
+        assert deltas['u2'].conversations == 1
+        assert deltas['u2'].outlet_id == 7
+
+    def test_pending_intent_ignored(self):
+        messages = [
+            {'user_id': 'u1', 'intent': 'pending', 'timestamp': ts(1)},
+            {'user_id': 'u1', 'intent': 'order_placement', 'timestamp': ts(1)},
+            {'user_id': 'u1', 'intent': 'order_placement', 'timestamp': ts(1)},
+            {'user_id': 'u1', 'intent': None, 'timestamp': ts(1)},
+        ]
+
+        delta = fold_events([], messages)['u1']
+
+        assert delta.messages == 4
+        assert dict(delta.intents) == {'order_placement': 2}
+
+    def test_interaction_bounds(self):
+        sessions = [{'user_id': 'u1', 'outlet_id': None, 'language': 'en', 'start_time': ts(10)}]
+        messages = [
+            {'user_id': 'u1', 'intent': None, 'timestamp': ts(12)},
+            {'user_id': 'u1', 'intent': None, 'timestamp': ts(4)},
+        ]
+
+        delta = fold_events(sessions, messages)['u1']
+
+        assert delta.first_interaction == ts(4)
+        assert delta.last_interaction == ts(12)
+
+
+class TestSummaryDelta:
+    """Test upsert row generation"""
+
+    def test_message_only_delta_row(self):
+        delta = SummaryDelta(user_id='u1')
+        delta.add_message('order_placement', ts(1))
+
+        row = delta.to_row()
+
+        assert row['total_conversations'] == 0
+        assert row['total_messages'] == 1
+        assert row['common_intents'] == {'order_placement': 1}
+        assert row['preferred_language'] == 'en'
+        assert row['outlet_id'] is None
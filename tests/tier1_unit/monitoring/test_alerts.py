@@ -0,0 +1,159 @@
+"""
+Alerting Unit Tests
+===================
+
+Tests for streaming alert evaluation and the notification dispatcher.
+
+Tests cover:
+- Rules evaluated when the metrics they read are written
+- Cooldown and per-rule evaluation throttling
+- Success rate counts finished requests only (not in-flight ones)
+- Notifications batched per channel and retried on failure
+- Partially delivered batches retry only the undelivered alerts
+
+NO MOCKING - Real collectors, real background threads.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from monitoring.metrics import MetricsCollector
+from monitoring.alerts import AlertManager, AlertRule, AlertSeverity, ComparisonOperator
+from monitoring.alert_dispatcher import NotificationDispatcher, PartialSendError
+
+
+def error_rate_manager(collector: MetricsCollector, threshold: float = 2.0) -> AlertManager:
+    manager = AlertManager(collector=collector)
+    for rule_name in list(manager.rules):
+        manager.remove_rule(rule_name)
+    manager.add_rule(AlertRule(
+        name="errors",
+        metric="error_rate_per_minute",
+        threshold=threshold,
+        comparison=ComparisonOperator.GREATER_THAN,
+        severity=AlertSeverity.ERROR
+    ))
+    manager.eval_interval_seconds = 0
+    return manager
+
+
+def test_rule_fires_on_metric_write():
+    collector = MetricsCollector()
+    manager = error_rate_manager(collector)
+    manager.attach()
+
+    for _ in range(3):
+        collector.increment_counter("errors_total")
+
+    [alert] = manager.get_alert_history()
+    assert alert.rule_name == "errors"
+    assert alert.value == 3.0
+
+    # Cooldown: further errors don't re-trigger
+    collector.increment_counter("errors_total")
+    assert len(manager.get_alert_history()) == 1
+    manager.detach()
+
+
+def test_unrelated_metrics_do_not_evaluate():
+    collector = MetricsCollector()
+    manager = error_rate_manager(collector)
+    manager.attach()
+
+    collector.record_metric("response_time_ms", 10.0)
+    assert manager.last_evaluated == {}
+    manager.detach()
+
+
+def test_evaluation_throttled():
+    collector = MetricsCollector()
+    manager = error_rate_manager(collector, threshold=1000)
+    manager.eval_interval_seconds = 60
+    manager.attach()
+
+    collector.increment_counter("errors_total")
+    first = manager.last_evaluated["errors"]
+    collector.increment_counter("errors_total")
+    assert manager.last_evaluated["errors"] == first
+    manager.detach()
+
+
+def test_success_rate_ignores_in_flight_requests():
+    collector = MetricsCollector()
+    manager = AlertManager(collector=collector)
+    for rule_name in list(manager.rules):
+        if rule_name != "low_success_rate":
+            manager.remove_rule(rule_name)
+    manager.eval_interval_seconds = 0
+    manager.attach()
+
+    # Counted at request start: no alert before the request finishes
+    collector.increment_counter("requests_total")
+    assert manager.get_alert_history() == []
+
+    collector.increment_counter("requests_succeeded")
+    collector.increment_counter("requests_total")
+    collector.increment_counter("requests_failed")
+
+    [alert] = manager.get_alert_history()
+    assert alert.rule_name == "low_success_rate"
+    assert alert.value == 50.0
+    manager.detach()
+
+
+def test_dispatcher_batches_and_retries():
+    calls = []
+
+    def flaky_sender(alerts):
+        calls.append(list(alerts))
+        if len(calls) == 1:
+            raise ConnectionError("channel down")
+
+    dispatcher = NotificationDispatcher(
+        {"test": flaky_sender}, batch_seconds=0.2, max_retries=2, retry_base_seconds=0
+    )
+    for alert in ("a", "b", "c"):
+        assert dispatcher.dispatch(alert)
+    assert dispatcher.flush(5)
+
+    assert calls == [["a", "b", "c"], ["a", "b", "c"]]
+    assert (dispatcher.sent, dispatcher.failed) == (3, 0)
+    dispatcher.close()
+
+
+def test_dispatcher_retries_only_undelivered_alerts():
+    delivered = []
+
+    def one_at_a_time(alerts):
+        for sent, alert in enumerate(alerts):
+            if alert == "b" and "b-failed" not in delivered:
+                delivered.append("b-failed")
+                raise PartialSendError(sent, ConnectionError("channel down"))
+            delivered.append(alert)
+
+    dispatcher = NotificationDispatcher(
+        {"test": one_at_a_time}, batch_seconds=0.2, max_retries=2, retry_base_seconds=0
+    )
+    for alert in ("a", "b", "c"):
+        dispatcher.dispatch(alert)
+    assert dispatcher.flush(5)
+
+    assert delivered == ["a", "b-failed", "b", "c"]
+    assert (dispatcher.sent, dispatcher.failed) == (3, 0)
+    dispatcher.close()
+
+
+def test_dispatcher_gives_up_after_retries():
+    def broken_sender(alerts):
+        raise ConnectionError("channel down")
+
+    dispatcher = NotificationDispatcher(
+        {"test": broken_sender}, batch_seconds=0, max_retries=1, retry_base_seconds=0
+    )
+    dispatcher.dispatch("a")
+    assert dispatcher.flush(5)
+
+    assert (dispatcher.sent, dispatcher.failed) == (0, 1)
+    dispatcher.close()
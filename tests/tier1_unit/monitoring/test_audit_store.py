@@ -0,0 +1,108 @@
+"""
+Audit Store Unit Tests
+======================
+
+Tests for the time-partitioned audit event store behind query_audit_logs.
+
+Tests cover:
+- Monthly partitions and filtered, newest-first queries
+- Reverse-chronological cursor pagination across partitions
+- Partition rotation
+- AuditLogger writes (PII scrubbed) reaching the store
+
+NO MOCKING - Real SQLite partitions in a temporary directory.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from monitoring.audit_store import AuditStore
+from monitoring.audit_logger import AuditLogger, AuditEvent
+
+
+def event(timestamp: datetime, event_type: str = "order_created", user_id: str = "user1"):
+    return {
+        "event_type": event_type,
+        "user_id": user_id,
+        "resource": "order",
+        "action": "create",
+        "success": True,
+        "details": {},
+        "ip_address_hash": None,
+        "timestamp_utc": timestamp.isoformat(),
+        "environment": "test",
+    }
+
+
+def test_filters_and_newest_first(tmp_path):
+    store = AuditStore(tmp_path)
+    store.append(event(datetime(2026, 8, 5, 9)))
+    store.append(event(datetime(2026, 9, 2, 9)))
+    store.append(event(datetime(2026, 9, 20, 9), user_id="user2"))
+    store.append(event(datetime(2026, 9, 21, 9), event_type="auth_login"))
+
+    assert store.partitions() == [(2026, 9), (2026, 8)]
+
+    page = store.query(
+        event_type="order_created", user_id="user1",
+        start=datetime(2026, 9, 1), end=datetime(2026, 9, 30, 23, 59, 59)
+    )
+    assert [record["timestamp_utc"] for record in page["data"]] == ["2026-09-02T09:00:00"]
+    assert page["next_cursor"] is None
+
+    newest = store.query(limit=10)["data"]
+    assert [record["timestamp_utc"][:10] for record in newest] == [
+        "2026-09-21", "2026-09-20", "2026-09-02", "2026-08-05"
+    ]
+
+
+def test_cursor_pages_across_partitions(tmp_path):
+    store = AuditStore(tmp_path)
+    timestamps = [datetime(2026, month, day, 12) for month in (7, 8, 9) for day in (1, 15)]
+    for timestamp in timestamps:
+        store.append(event(timestamp))
+
+    seen, cursor = [], None
+    while True:
+        page = store.query(event_type="order_created", limit=4, cursor=cursor)
+        seen.extend(record["timestamp_utc"] for record in page["data"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [timestamp.isoformat() for timestamp in reversed(timestamps)]
+    with pytest.raises(ValueError):
+        store.query(cursor="not-a-cursor")
+
+
+def test_rotation_drops_old_partitions(tmp_path):
+    store = AuditStore(tmp_path, retention_months=2)
+    store.append(event(datetime(2026, 6, 1)))
+    store.append(event(datetime(2026, 7, 1)))
+    store.append(event(datetime(2026, 8, 1)))
+
+    assert store.partitions() == [(2026, 8), (2026, 7)]
+
+
+def test_audit_logger_writes_scrubbed_records(tmp_path):
+    store = AuditStore(tmp_path / "audit")
+    audit_logger = AuditLogger(log_file=str(tmp_path / "audit.log"), store=store)
+
+    audit_logger.log(
+        event_type=AuditEvent.ORDER_CREATED,
+        user_id="buyer@example.com",
+        resource="order",
+        action="create",
+        details={"order_id": 7, "email": "buyer@example.com"}
+    )
+    audit_logger.flush()
+
+    [record] = store.query(event_type="order_created")["data"]
+    assert record["user_id"] != "buyer@example.com"
+    assert record["details"]["order_id"] == 7
+    assert record["details"]["email"] != "buyer@example.com"
@@ -0,0 +1,145 @@
+"""
+Cost Ledger Unit Tests
+======================
+
+Tests for the append-only cost ledger behind CostTracker.
+
+Tests cover:
+- Running today/month totals and per-operation/model breakdowns
+- Calls appended by another worker picked up from the file tail
+- Own calls counted at append time, not again when written
+- Closed days compacted into the monthly rollup file
+- Closing a day recomputes it from the file (other workers' late lines)
+- Malformed ledger lines skipped
+
+NO MOCKING - Real files in a temporary directory.
+"""
+
+import sys
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from monitoring.cost_ledger import CostLedger
+from monitoring.cost_tracking import CostTracker
+
+
+def record(timestamp: datetime, cost: float, operation: str = "rag_qa", model: str = "gpt-4"):
+    return {
+        "timestamp": timestamp.isoformat(),
+        "operation": operation,
+        "model": model,
+        "input_tokens": 100,
+        "output_tokens": 50,
+        "cost": cost,
+        "metadata": {},
+    }
+
+
+def test_tracker_totals_and_breakdown(tmp_path):
+    tracker = CostTracker(data_dir=str(tmp_path))
+    tracker.track_api_call("intent_classification", "gpt-4-turbo-preview", 1000, 0)
+    tracker.track_api_call("rag_qa", "gpt-4-turbo-preview", 0, 1000)
+
+    summary = tracker.get_cost_summary()
+    assert summary["total_calls"] == 2
+    assert summary["total_cost"] == pytest.approx(0.04)
+    assert summary["by_operation"]["rag_qa"]["cost"] == pytest.approx(0.03)
+    assert summary["by_model"]["gpt-4-turbo-preview"]["tokens"] == 2000
+    assert tracker.get_today_cost() == pytest.approx(0.04)
+    assert len(tracker.calls) == 2
+
+
+def test_other_workers_calls_are_counted(tmp_path):
+    ledger = CostLedger(tmp_path)
+    other_worker = CostLedger(tmp_path)
+
+    other_worker.append(record(datetime.now(), 1.5))
+    other_worker.sink.flush()
+    ledger.sync()
+
+    assert ledger.today_cost() == pytest.approx(1.5)
+    assert ledger.today_aggregate.calls == 1
+
+
+def test_own_queued_calls_counted_once(tmp_path):
+    ledger = CostLedger(tmp_path)
+
+    ledger.append(record(datetime.now(), 1.0))
+    ledger.append(record(datetime.now(), 1.0))
+    assert ledger.today_aggregate.calls == 2
+
+    ledger.sink.flush()
+    ledger.sync()
+    assert ledger.today_aggregate.calls == 2
+    assert ledger.today_cost() == pytest.approx(2.0)
+    assert len(ledger.day_path(ledger.today).read_text().splitlines()) == 2
+
+
+def closed_day_this_month(today: datetime) -> datetime:
+    earlier = today - timedelta(days=1)
+    if earlier.month != today.month:
+        earlier = today.replace(day=1)
+        if earlier.date() == today.date():
+            pytest.skip("No closed day in this month yet")
+    return earlier
+
+
+def test_closed_days_rolled_up(tmp_path):
+    today = datetime.now()
+    earlier = closed_day_this_month(today)
+
+    day_path = tmp_path / f"costs_{earlier.date().isoformat()}.jsonl"
+    day_path.write_text(
+        json.dumps(record(earlier, 2.0)) + "\n" + json.dumps(record(earlier, 0.5, operation="intent")) + "\n"
+    )
+
+    ledger = CostLedger(tmp_path)
+    ledger.append(record(today, 1.0))
+
+    assert ledger.month_cost() == pytest.approx(3.5)
+    rollup = json.loads((tmp_path / f"costs_{today.strftime('%Y-%m')}.rollup.json").read_text())
+    assert rollup["days"][earlier.date().isoformat()]["calls"] == 2
+
+    # Rollup is used on restart, even if the raw file is gone
+    ledger.sink.flush()
+    day_path.unlink()
+    assert CostLedger(tmp_path).month_cost() == pytest.approx(3.5)
+
+    # Partial-day ranges read raw records; whole days use aggregates
+    start = datetime.combine(earlier.date(), datetime.min.time())
+    assert ledger.aggregate(start, today).calls == 3
+
+
+def test_close_day_recomputes_from_file(tmp_path):
+    today = datetime.now()
+    earlier = closed_day_this_month(today)
+    day_path = tmp_path / f"costs_{earlier.date().isoformat()}.jsonl"
+    day_path.write_text(json.dumps(record(earlier, 2.0)) + "\n")
+
+    ledger = CostLedger(tmp_path)
+
+    # Another worker's queued line reaches the file after this one compacted the day
+    with open(day_path, "a") as f:
+        f.write(json.dumps(record(earlier, 0.5)) + "\n")
+    ledger._close_day(earlier.date())
+
+    rollup = json.loads((tmp_path / f"costs_{today.strftime('%Y-%m')}.rollup.json").read_text())
+    assert rollup["days"][earlier.date().isoformat()]["calls"] == 2
+    assert rollup["days"][earlier.date().isoformat()]["cost"] == pytest.approx(2.5)
+
+
+def test_malformed_lines_skipped(tmp_path):
+    ledger = CostLedger(tmp_path)
+    with open(ledger.day_path(ledger.today), "a") as f:
+        f.write(json.dumps(record(datetime.now(), 1.0)) + "\n")
+        f.write('{"timestamp": "torn\n')
+        f.write(json.dumps(record(datetime.now(), 2.0)) + "\n")
+    ledger.sync()
+
+    assert ledger.today_aggregate.calls == 2
+    assert ledger.today_cost() == pytest.approx(3.0)
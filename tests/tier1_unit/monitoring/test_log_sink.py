@@ -0,0 +1,76 @@
+"""
+Log Sink Unit Tests
+===================
+
+Tests for the asynchronous, batched log writer shared by the audit,
+cost and analytics logs.
+
+Tests cover:
+- Lines written in order and visible after flush
+- Batch handlers receiving queued items as lists
+- Drop policy when the queue is full
+- Writes after close still reaching the file
+
+NO MOCKING - Real files in a temporary directory.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from monitoring.log_sink import LogSink, OVERFLOW_BLOCK
+
+
+def test_lines_written_in_order(tmp_path):
+    sink = LogSink(fsync_seconds=0)
+    path = tmp_path / "events.jsonl"
+
+    for i in range(500):
+        assert sink.write_line(path, f"{i}\n")
+    assert sink.flush()
+
+    assert path.read_text().splitlines() == [str(i) for i in range(500)]
+    assert sink.stats()["written"] == 500
+    sink.close()
+
+
+def test_handler_receives_batches(tmp_path):
+    sink = LogSink()
+    received = []
+
+    for i in range(100):
+        sink.submit(received.append, i)
+    sink.flush()
+
+    assert [item for batch in received for item in batch] == list(range(100))
+    assert all(isinstance(batch, list) for batch in received)
+    sink.close()
+
+
+def test_full_queue_drops(tmp_path):
+    sink = LogSink(queue_size=2, overflow="drop")
+    release = threading.Event()
+
+    # Hold the writer inside a handler so the queue fills up
+    sink.submit(lambda items: release.wait(5), None)
+    results = [sink.write_line(tmp_path / "a.log", "x\n") for _ in range(10)]
+    release.set()
+    sink.flush()
+
+    assert not all(results)
+    assert sink.dropped == results.count(False)
+    assert len((tmp_path / "a.log").read_text().splitlines()) == results.count(True)
+    sink.close()
+
+
+def test_writes_after_close_reach_file(tmp_path):
+    sink = LogSink()
+    path = tmp_path / "late.log"
+    sink.write_line(path, "before\n")
+    sink.close()
+
+    assert sink.write_line(path, "after\n", overflow=OVERFLOW_BLOCK)
+    assert path.read_text().splitlines() == ["before", "after"]
+
@@ -0,0 +1,140 @@
+"""
+Request Stage Profiler Unit Tests
+=================================
+
+Tests for span-based request stage timing.
+
+Tests cover:
+- Nested stages forming a span tree
+- Span propagation into asyncio.gather() tasks
+- No-op behaviour outside a profile and when disabled
+- Server-Timing header format
+- Slow request log with the span tree
+- Server-Timing header added by the ASGI middleware
+
+NO MOCKING - Real clocks, real files in a temporary directory.
+"""
+
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from monitoring.log_sink import LogSink
+from monitoring.profiler import (
+    ProfilingMiddleware,
+    SlowRequestLog,
+    current_timings,
+    profiled,
+    stage,
+    start_profile,
+)
+
+
+def _quiet_log(tmp_path):
+    return SlowRequestLog(tmp_path / "slow.jsonl", threshold_ms=10_000, sink=LogSink())
+
+
+def test_nested_stages(tmp_path):
+    profile = start_profile("POST /api/chatbot", enabled=True)
+    with stage("response_logging"):
+        with stage("log_message", role="assistant"):
+            pass
+    with stage("intent"):
+        pass
+    profile.finish(slow_log=_quiet_log(tmp_path))
+
+    tree = profile.root.to_dict()
+    assert [child["name"] for child in tree["children"]] == ["response_logging", "intent"]
+    assert tree["children"][0]["children"][0]["attrs"] == {"role": "assistant"}
+    assert set(profile.timings()) == {"response_logging", "log_message", "intent", "total"}
+    # The profile is no longer current
+    assert current_timings() == {}
+
+
+def test_spans_propagate_into_gather_tasks(tmp_path):
+    @profiled("agent.intent")
+    async def classify():
+        await asyncio.sleep(0.01)
+
+    @profiled("agent.knowledge")
+    async def retrieve():
+        with stage("agent.knowledge.search"):
+            await asyncio.sleep(0.01)
+
+    async def handle():
+        profile = start_profile("request", enabled=True)
+        with stage("agent.parallel"):
+            await asyncio.gather(classify(), retrieve())
+        profile.finish(slow_log=_quiet_log(tmp_path))
+        return profile
+
+    profile = asyncio.run(handle())
+
+    parallel = profile.root.children[0]
+    assert parallel.name == "agent.parallel"
+    assert sorted(child.name for child in parallel.children) == ["agent.intent", "agent.knowledge"]
+    knowledge = next(child for child in parallel.children if child.name == "agent.knowledge")
+    assert [child.name for child in knowledge.children] == ["agent.knowledge.search"]
+    assert profile.timings()["agent.parallel"] >= 10
+
+
+def test_stage_is_noop_without_profile():
+    with stage("intent") as span:
+        assert span is None
+    assert start_profile("request", enabled=False) is None
+    assert current_timings() == {}
+
+
+def test_server_timing_header(tmp_path):
+    profile = start_profile("request", enabled=True)
+    with stage("cache_check"):
+        pass
+    header = profile.server_timing()
+    profile.finish(slow_log=_quiet_log(tmp_path))
+
+    entries = [entry.split(";dur=") for entry in header.split(", ")]
+    assert [name for name, _ in entries] == ["cache_check", "total"]
+    assert all(float(duration) >= 0 for _, duration in entries)
+
+
+def test_slow_request_logged_with_span_tree(tmp_path):
+    sink = LogSink()
+    slow_log = SlowRequestLog(tmp_path / "slow.jsonl", threshold_ms=0, sample_rate=1.0, sink=sink)
+
+    profile = start_profile("POST /api/chatbot", enabled=True)
+    with stage("history_fetch"):
+        pass
+    profile.finish(slow_log=slow_log, route="/api/chatbot", status=200)
+    sink.flush()
+
+    entry = json.loads((tmp_path / "slow.jsonl").read_text())
+    assert entry["name"] == "POST /api/chatbot"
+    assert entry["spans"]["attrs"] == {"route": "/api/chatbot", "status": 200}
+    assert entry["spans"]["children"][0]["name"] == "history_fetch"
+    assert "history_fetch" in entry["timings"]
+    sink.close()
+
+
+def test_middleware_adds_server_timing_header():
+    async def app(scope, receive, send):
+        with stage("intent"):
+            await asyncio.sleep(0)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    scope = {"type": "http", "method": "GET", "path": "/api/health"}
+    asyncio.run(ProfilingMiddleware(app, enabled=True)(scope, receive, send))
+
+    headers = dict(sent[0]["headers"])
+    assert headers[b"server-timing"].decode().startswith("intent;dur=")
@@ -0,0 +1,106 @@
+"""
+Query Statistics Unit Tests
+===========================
+
+Tests for statement fingerprinting and per-fingerprint aggregation used
+by the opt-in database instrumentation.
+
+Tests cover:
+- Literal, bind parameter, IN-list and VALUES normalization
+- Aggregation of calls, latency and rows per fingerprint
+- Event hooks on a real (SQLite) engine
+
+NO MOCKING - Real SQLAlchemy engine events.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from monitoring.query_stats import (
+    QueryStatsCollector,
+    normalize_statement,
+    fingerprint_id,
+    OTHER_FINGERPRINT,
+)
+
+
+class TestNormalizeStatement:
+    """Test statement fingerprinting"""
+
+    def test_literals_and_params(self):
+        assert normalize_statement(
+            "SELECT * FROM outlets WHERE name ILIKE '%Cafe%' LIMIT 5"
+        ) == "SELECT * FROM outlets WHERE name ILIKE ? LIMIT ?"
+        assert normalize_statement(
+            "SELECT id FROM orders WHERE id = %(id_1)s AND status = :status"
+        ) == "SELECT id FROM orders WHERE id = ? AND status = ?"
+
+    def test_casts_and_identifiers_kept(self):
+        assert normalize_statement(
+            "SELECT '{}'::jsonb FROM conversation_messages_p202501"
+        ) == "SELECT ?::jsonb FROM conversation_messages_p202501"
+
+    def test_in_list_and_values_collapsed(self):
+        assert normalize_statement("SELECT 1 FROM t WHERE id IN (1, 2, 3)") == \
+            normalize_statement("SELECT 1 FROM t WHERE id IN (7)")
+        assert normalize_statement("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)") == \
+            "INSERT INTO t (a, b) VALUES (?, ?), ..."
+
+    def test_same_shape_same_fingerprint(self):
+        a = normalize_statement("SELECT * FROM t WHERE x = 1")
+        b = normalize_statement("SELECT *\n  FROM t\n WHERE x = 42")
+        assert fingerprint_id(a) == fingerprint_id(b)
+
+
+class TestQueryStatsCollector:
+    """Test aggregation and engine hooks"""
+
+    def test_aggregates_per_fingerprint(self):
+        collector = QueryStatsCollector()
+        collector.record("SELECT * FROM t WHERE x = 1", 10.0, rows=1)
+        collector.record("SELECT * FROM t WHERE x = 2", 30.0, rows=2)
+        collector.record("SELECT * FROM u", 5.0)
+
+        top = collector.top(10, order_by='total_ms')
+
+        assert top[0].calls == 2
+        assert top[0].total_ms == 40.0
+        assert top[0].avg_ms == 20.0
+        assert top[0].max_ms == 30.0
+        assert top[0].rows == 3
+        assert top[1].normalized == "SELECT * FROM u"
+
+    def test_invalid_order_by(self):
+        with pytest.raises(ValueError):
+            QueryStatsCollector().top(5, order_by='bogus')
+
+    def test_fingerprint_limit_folds_into_other(self):
+        collector = QueryStatsCollector(max_fingerprints=2)
+        collector.record("SELECT a FROM t", 1.0)
+        collector.record("SELECT b FROM t", 1.0)
+        stats = collector.record("SELECT c FROM t", 1.0)
+
+        assert stats.fingerprint == OTHER_FINGERPRINT
+        assert stats.sample_statement is None
+
+    def test_engine_hooks(self):
+        engine = create_engine("sqlite://")
+        collector = QueryStatsCollector()
+        collector.instrument(engine)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT :x"), {'x': 1})
+            conn.execute(text("SELECT :x"), {'x': 2})
+
+        collector.uninstrument(engine)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT :x"), {'x': 3})
+
+        stats = [s for s in collector.top(10, order_by='calls') if s.normalized == "SELECT ?"]
+        assert stats and stats[0].calls == 2
+        assert stats[0].sample_parameters == (2,)
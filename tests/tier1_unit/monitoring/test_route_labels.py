@@ -0,0 +1,89 @@
+"""
+HTTP Route Label Unit Tests
+===========================
+
+Tests for the bounded-cardinality endpoint labels of the Prometheus HTTP
+metrics.
+
+Tests cover:
+- Route templates resolved from the matched FastAPI route (with router prefixes)
+- Unmatched requests share one label
+- Cap on distinct labels with an overflow label
+
+NO MOCKING - Real FastAPI app and prometheus_client registry.
+"""
+
+import sys
+from pathlib import Path
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from starlette.middleware.base import BaseHTTPMiddleware
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from monitoring.prometheus_metrics import (
+    RouteLabels,
+    record_http_request,
+    route_template,
+    OTHER_ROUTE,
+    UNMATCHED_ROUTE,
+)
+
+
+def request_count(endpoint: str, status: str = "200") -> float:
+    return REGISTRY.get_sample_value(
+        "http_requests_total", {"method": "GET", "endpoint": endpoint, "status": status}
+    ) or 0.0
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    router = APIRouter(prefix="/documents")
+
+    @app.get("/api/download_invoice/{order_id}")
+    async def download_invoice(order_id: int):
+        return {"order_id": order_id}
+
+    @router.get("/orders/{order_id}/lines")
+    async def order_lines(order_id: int):
+        return []
+
+    app.include_router(router, prefix="/api/v1")
+
+    class Middleware(BaseHTTPMiddleware):
+        async def dispatch(self, request: Request, call_next):
+            response = await call_next(request)
+            record_http_request(request.method, route_template(request.scope), response.status_code, 0.01)
+            return response
+
+    app.add_middleware(Middleware)
+    return app
+
+
+def test_requests_labelled_by_route_template():
+    client = TestClient(build_app())
+    invoice_before = request_count("/api/download_invoice/{order_id}")
+    lines_before = request_count("/api/v1/documents/orders/{order_id}/lines")
+    unmatched_before = request_count(UNMATCHED_ROUTE, "404")
+
+    for order_id in (123, 124, 125):
+        client.get(f"/api/download_invoice/{order_id}")
+    client.get("/api/v1/documents/orders/7/lines")
+    client.get("/wp-login.php")
+
+    assert request_count("/api/download_invoice/{order_id}") == invoice_before + 3
+    assert request_count("/api/download_invoice/123") == 0
+    assert request_count("/api/v1/documents/orders/{order_id}/lines") == lines_before + 1
+    assert request_count(UNMATCHED_ROUTE, "404") == unmatched_before + 1
+
+
+def test_label_cap_overflows_to_other():
+    labels = RouteLabels(max_labels=2)
+
+    assert labels.label("/a") == "/a"
+    assert labels.label("/b") == "/b"
+    assert labels.label("/c") == OTHER_ROUTE
+    assert labels.label("/a") == "/a"
+    assert labels.label(None) == UNMATCHED_ROUTE
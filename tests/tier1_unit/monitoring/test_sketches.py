@@ -0,0 +1,113 @@
+"""
+Quantile Sketch Unit Tests
+==========================
+
+Tests for the DDSketch latency percentile summaries.
+
+Tests cover:
+- Relative-accuracy guarantee against exact percentiles
+- Merging sketches from several workers
+- Serialization round trip and bounded size
+- Time-sliced windows and MetricsCollector integration
+
+NO MOCKING - Real values, compared against exact numpy percentiles.
+"""
+
+import sys
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from monitoring.sketches import DDSketch, WindowedSketch, merge_sketches
+from monitoring.metrics import MetricsCollector
+
+
+def exact_quantile(values, q):
+    return float(np.sort(values)[int(q * (len(values) - 1))])
+
+
+def lognormal_latencies(count, seed):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(4, 1) for _ in range(count)]
+
+
+class TestDDSketch:
+    """Test sketch accuracy, merging and persistence"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        values = lognormal_latencies(20000, seed=1)
+        sketch = DDSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=0.01)
+        assert sketch.min == min(values)
+        assert sketch.max == max(values)
+        assert sketch.quantile(1.0) == max(values)
+
+    def test_merge_matches_single_sketch(self):
+        workers = [lognormal_latencies(5000, seed=seed) for seed in range(3)]
+        sketches = []
+        for values in workers:
+            sketch = DDSketch()
+            for value in values:
+                sketch.add(value)
+            sketches.append(sketch)
+
+        merged = merge_sketches(sketches)
+        everything = [value for values in workers for value in values]
+
+        assert merged.count == len(everything)
+        assert merged.quantile(0.99) == pytest.approx(exact_quantile(everything, 0.99), rel=0.01)
+
+    def test_round_trip_and_bounded_size(self):
+        sketch = DDSketch(max_buckets=64)
+        for value in np.geomspace(0.001, 1e6, 10000):
+            sketch.add(float(value))
+        sketch.add(0.0)
+        sketch.add(-5.0)
+
+        assert len(sketch.positive) <= 64
+        restored = DDSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        assert restored.quantiles((0.0, 0.5, 0.99)) == sketch.quantiles((0.0, 0.5, 0.99))
+        assert restored.quantile(0.0) == -5.0
+
+    def test_empty_and_mismatched(self):
+        assert DDSketch().quantile(0.5) is None
+        with pytest.raises(ValueError):
+            DDSketch(0.01).merge(DDSketch(0.02))
+
+
+class TestWindowedSketch:
+    """Test time-sliced windows"""
+
+    def test_window_covers_recent_slices(self):
+        windowed = WindowedSketch(retention_seconds=600, slice_seconds=10)
+        windowed.add(1000.0, timestamp=1000.0)
+        windowed.add(5.0, timestamp=1290.0)
+
+        assert windowed.merged(window_seconds=60, now=1295.0).count == 1
+        assert windowed.merged(now=1295.0).count == 2
+
+        windowed.add(7.0, timestamp=1700.0)
+        assert 100 not in windowed.slices
+
+    def test_collector_sketch_summary_and_merge(self):
+        worker_a, worker_b = MetricsCollector(), MetricsCollector()
+        for value in range(1, 101):
+            worker_a.record_metric("response_time_ms", float(value))
+            worker_b.record_metric("response_time_ms", float(value + 100))
+
+        worker_a.merge_sketches(json.loads(json.dumps(worker_b.export_sketches())))
+        summary = worker_a.get_sketch_summary("response_time_ms", window_seconds=300)
+
+        assert summary.count == 200
+        assert (summary.min_value, summary.max_value) == (1.0, 200.0)
+        assert summary.p99_value == pytest.approx(198.0, rel=0.01)
+        assert worker_a.get_sketch_summary("missing") is None
@@ -0,0 +1,124 @@
+"""
+Time-Series Store Unit Tests
+============================
+
+Tests for the ring-buffer storage behind MetricsCollector.
+
+Tests cover:
+- Ring buffer growth, wrap-around and overwrite at capacity
+- Retention expiry and tag-subset queries
+- MetricsCollector summaries and percentiles
+- Sliding counter windows behind counter rates
+
+NO MOCKING - Real numpy buffers and real timestamps.
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from monitoring.timeseries import RingBuffer, SlidingCounter, TimeSeriesStore, summarize
+from monitoring.metrics import MetricsCollector
+
+
+class TestRingBuffer:
+    """Test per-series ring buffers"""
+
+    def test_grows_then_overwrites_oldest(self):
+        buffer = RingBuffer(max_points=8, capacity=2)
+        for i in range(12):
+            buffer.append(float(i), float(i * 10))
+
+        assert buffer.capacity == 8
+        assert len(buffer) == 8
+        assert buffer.ordered_timestamps().tolist() == [float(i) for i in range(4, 12)]
+
+    def test_expire_and_since_across_wrap(self):
+        buffer = RingBuffer(max_points=4, capacity=4)
+        for i in range(6):
+            buffer.append(float(i), float(i))
+
+        assert buffer.values_since(4.0).tolist() == [4.0, 5.0]
+        buffer.expire(3.0)
+        assert buffer.ordered_values().tolist() == [4.0, 5.0]
+
+
+class TestTimeSeriesStore:
+    """Test series keys, tag filtering and retention"""
+
+    def test_tag_subset_queries(self):
+        store = TimeSeriesStore()
+        store.append("latency", 1.0, {"endpoint": "/chat", "method": "POST"})
+        store.append("latency", 2.0, {"method": "POST", "endpoint": "/chat"})
+        store.append("latency", 3.0, {"endpoint": "/health", "method": "GET"})
+
+        assert len(store.series) == 2
+        assert sorted(store.values("latency").tolist()) == [1.0, 2.0, 3.0]
+        assert store.values("latency", tags={"endpoint": "/chat"}).tolist() == [1.0, 2.0]
+        assert store.values("missing").size == 0
+
+    def test_retention_drops_old_series(self):
+        store = TimeSeriesStore(retention_seconds=60)
+        store.append("old", 1.0, timestamp=time.time() - 120)
+        store.append("new", 1.0)
+
+        assert store.names() == ["new"]
+        assert "old" not in store.series_by_name
+
+
+class TestMetricsCollector:
+    """Test summaries computed from the store"""
+
+    def test_summary_matches_previous_definitions(self):
+        collector = MetricsCollector()
+        for value in range(1, 101):
+            collector.record_metric("response_time_ms", float(value), {"endpoint": "/chat"})
+
+        summary = collector.get_summary("response_time_ms")
+        assert summary.count == 100
+        assert (summary.min_value, summary.max_value) == (1.0, 100.0)
+        assert summary.mean_value == 50.5
+        assert summary.median_value == 50.5
+        assert summary.p95_value == 96.0
+        assert summary.p99_value == 100.0
+
+        assert collector.get_summary("response_time_ms", since=datetime.now() + timedelta(seconds=5)) is None
+        assert set(collector.get_all_summaries()) == {"response_time_ms"}
+
+    def test_summarize_empty(self):
+        assert summarize(np.empty(0)) == {}
+
+
+class TestSlidingCounter:
+    """Test windowed counter increments"""
+
+    def test_window_totals(self):
+        counter = SlidingCounter(span_seconds=60)
+        counter.add(2, timestamp=101.0)
+        counter.add(3, timestamp=130.5)
+        counter.add(1, timestamp=159.9)
+
+        assert counter.total(10, now=160.0) == 1
+        assert counter.total(40, now=160.0) == 4
+        assert counter.total(60, now=160.0) == 6
+        assert counter.total(60, now=200.0) == 1
+
+    def test_buckets_reused_after_span(self):
+        counter = SlidingCounter(span_seconds=10)
+        counter.add(5, timestamp=0.0)
+        counter.add(1, timestamp=10.0)  # same slot, next lap
+
+        assert counter.total(10, now=10.0) == 1
+
+    def test_collector_rate_from_counter(self):
+        collector = MetricsCollector()
+        for _ in range(30):
+            collector.increment_counter("errors_total")
+
+        assert collector.get_rate("errors_total", 60) == 0.5
+        assert collector.get_rate("unknown", 60) == 0.0
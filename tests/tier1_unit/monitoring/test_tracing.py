@@ -0,0 +1,227 @@
+"""
+Tracing Unit Tests
+==================
+
+Tests for correlation IDs and OpenTelemetry-compatible spans.
+
+Tests cover:
+- Correlation ID to trace ID mapping and traceparent parsing
+- Span nesting under a correlation scope, error status
+- Correlation scopes restore the outer ID (nothing leaks between calls)
+- Client proxies for sync and async clients
+- SQLAlchemy statement spans
+- httpx transport spans with traceparent propagation
+- OTLP/HTTP JSON export to a real local collector endpoint
+- ASGI middleware: correlation header and SERVER span
+
+NO MOCKING - Real spans, SQLite engine and local HTTP server.
+"""
+
+import sys
+import json
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from monitoring.tracing import (
+    STATUS_ERROR,
+    InMemorySpanExporter,
+    OTLPSpanExporter,
+    TracingMiddleware,
+    TracingTransport,
+    configure_tracing,
+    correlation_scope,
+    get_correlation_id,
+    instrument_engine,
+    parse_traceparent,
+    trace_calls,
+    trace_id_for,
+    trace_span,
+)
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    configure_tracing(exporter)
+    yield exporter
+    configure_tracing(None)
+
+
+@pytest.fixture
+def collector():
+    """Local HTTP server recording request headers and JSON bodies"""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            received.append((dict(self.headers), json.loads(body) if body else None))
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", received
+    server.shutdown()
+
+
+def test_trace_ids():
+    correlation_id = "0b8a3f52-6c1e-4d7a-9f00-5e2b7c9d1a34"
+    assert trace_id_for(correlation_id) == "0b8a3f526c1e4d7a9f005e2b7c9d1a34"
+    assert len(trace_id_for("order-42")) == 32
+
+    trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+    assert parse_traceparent(f"00-{trace_id}-{parent_id}-01") == (trace_id, parent_id)
+    assert parse_traceparent("garbage") is None
+
+
+def test_spans_nest_under_correlation_id(exporter):
+    with correlation_scope("0b8a3f52-6c1e-4d7a-9f00-5e2b7c9d1a34") as correlation_id:
+        with trace_span("job xero.order_workflow", "consumer") as parent:
+            with pytest.raises(RuntimeError):
+                with trace_span("xero get_items"):
+                    raise RuntimeError("Xero unavailable")
+
+    child, root = exporter.get_finished_spans()
+    assert root.trace_id == child.trace_id == trace_id_for(correlation_id)
+    assert child.parent_id == parent.span_id and root.parent_id is None
+    assert child.status == STATUS_ERROR
+    assert child.attributes["correlation.id"] == correlation_id
+
+
+def test_correlation_scope_is_restored():
+    async def handle(correlation_id=None):
+        with correlation_scope(correlation_id or get_correlation_id()) as bound:
+            await asyncio.sleep(0)
+            return bound
+
+    async def calls():
+        first, second = await handle(), await handle()
+        with correlation_scope("request-1"):
+            explicit = await handle("explicit")
+            after = get_correlation_id()
+        return first, second, explicit, after
+
+    first, second, explicit, after = asyncio.run(calls())
+    assert first != second
+    assert explicit == "explicit" and after == "request-1"
+    assert get_correlation_id() is None
+
+
+def test_trace_calls_sync_and_async(exporter):
+    class Client:
+        def get(self, key):
+            return key.upper()
+
+        async def setex(self, key, ttl, value):
+            return True
+
+    client = trace_calls(Client(), "redis", {"db.system": "redis"})
+    assert client.get("a") == "A"
+    assert asyncio.run(client.setex("a", 60, "b")) is True
+
+    assert [span.name for span in exporter.get_finished_spans()] == ["redis get", "redis setex"]
+    assert exporter.get_finished_spans()[0].attributes["db.system"] == "redis"
+
+
+def test_trace_calls_returns_client_when_disabled():
+    configure_tracing(None)
+    client = object()
+    assert trace_calls(client, "redis") is client
+
+
+def test_sqlalchemy_statement_spans(exporter):
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1 WHERE 'secret' = 'secret'"))
+
+    span = exporter.get_finished_spans()[-1]
+    assert span.name == "sqlite SELECT"
+    assert "secret" not in span.attributes["db.statement"]
+
+
+def test_http_transport_propagates_trace(exporter, collector):
+    url, received = collector
+    client = httpx.Client(transport=TracingTransport(httpx.HTTPTransport(), "openai"))
+
+    with correlation_scope() as correlation_id:
+        client.post(f"{url}/v1/chat/completions", json={})
+
+    span = exporter.get_finished_spans()[-1]
+    headers = {key.lower(): value for key, value in received[0][0].items()}
+    assert span.name == "openai POST /v1/chat/completions"
+    assert span.attributes["http.response.status_code"] == 200
+    assert headers["traceparent"] == span.traceparent()
+    assert headers["x-correlation-id"] == correlation_id
+
+
+def test_otlp_export(collector):
+    url, received = collector
+    otlp = OTLPSpanExporter(endpoint=f"{url}/v1/traces", service_name="test-service", interval_seconds=0.05)
+    configure_tracing(otlp)
+    try:
+        with correlation_scope():
+            with trace_span("chroma query", attributes={"db.system": "chroma", "db.chroma.n_results": 3}):
+                pass
+        assert otlp.flush(5.0)
+    finally:
+        configure_tracing(None)
+        otlp.shutdown()
+
+    request = received[0][1]
+    resource_spans = request["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"][0]["value"]["stringValue"] == "test-service"
+    span = resource_spans["scopeSpans"][0]["spans"][0]
+    assert span["name"] == "chroma query"
+    assert span["kind"] == 3
+    assert len(span["traceId"]) == 32 and len(span["spanId"]) == 16
+    assert {"key": "db.chroma.n_results", "value": {"intValue": "3"}} in span["attributes"]
+    assert otlp.exported == 1
+
+
+def test_middleware_sets_correlation_id(exporter):
+    trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+
+    async def app(scope, receive, send):
+        with trace_span("redis get"):
+            pass
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/chatbot",
+        "headers": [(b"traceparent", f"00-{trace_id}-{parent_id}-01".encode())],
+    }
+    asyncio.run(TracingMiddleware(app)(scope, receive, send))
+
+    client, server = exporter.get_finished_spans()
+    assert dict(sent[0]["headers"])[b"x-correlation-id"] == trace_id.encode()
+    assert server.trace_id == trace_id and server.parent_id == parent_id
+    assert client.parent_id == server.span_id
+    assert server.attributes["http.response.status_code"] == 200
@@ -0,0 +1,81 @@
+"""
+Price Book Unit Tests
+=====================
+
+Tests for the versioned price book used for order totals and invoice
+stamping.
+
+Tests cover:
+- Integer-cent totals match Decimal arithmetic
+- Decimal fallback for fractional quantities
+- Version changes only when prices change
+- Order stamping and invoices built from stamped prices
+
+NO MOCKING - Price books are built from in-memory entries; no database required.
+"""
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from price_book import PriceBook, PriceEntry
+from documents.invoice_pdf import build_invoice, unpriced_skus
+
+
+ENTRIES = [
+    PriceEntry(sku="CUP-8OZ", unit_price=Decimal("0.12")),
+    PriceEntry(sku="BOX-L", unit_price=Decimal("1.35"), min_order_qty=10),
+]
+
+
+def test_totals_match_decimal_arithmetic():
+    book = PriceBook(ENTRIES)
+    line_items = [
+        {"sku": "CUP-8OZ", "quantity": 1000},
+        {"sku": "BOX-L", "quantity": 7},
+        {"sku": "UNKNOWN", "quantity": 3},
+    ]
+
+    totals = book.totals(line_items, Decimal("0.09"))
+
+    assert totals["subtotal"] == Decimal("129.45")
+    assert totals["tax"] == Decimal("129.45") * Decimal("0.09")
+    assert totals["total"] == totals["subtotal"] + totals["tax"]
+
+
+def test_fractional_quantities_use_decimal_path():
+    book = PriceBook(ENTRIES)
+
+    assert book.subtotal([{"sku": "BOX-L", "quantity": 2.5}]) == Decimal("3.375")
+    assert book.subtotal([]) == Decimal("0.00")
+
+
+def test_version_tracks_prices():
+    book = PriceBook(ENTRIES)
+
+    assert PriceBook(list(reversed(ENTRIES))).version == book.version
+    repriced = [ENTRIES[0], PriceEntry(sku="BOX-L", unit_price=Decimal("1.40"), min_order_qty=10)]
+    assert PriceBook(repriced).version != book.version
+
+
+def test_stamped_order_regenerates_invoice_without_catalog():
+    book = PriceBook(ENTRIES)
+    parsed_order = {
+        "outlet_name": "Canadian Pizza",
+        "line_items": [{"sku": "BOX-L", "description": "Large box", "quantity": 4}],
+    }
+
+    stamped = book.stamp(parsed_order)
+
+    assert "unit_price" not in parsed_order["line_items"][0]
+    assert stamped["price_book_version"] == book.version
+    assert stamped["line_items"][0]["unit_price"] == "1.35"
+
+    order = {"id": 7, "outlet_id": 1, "created_at": "2026-01-05T10:00:00", "parsed_items": stamped}
+    outlet = {"name": "Canadian Pizza", "address": "1 Main St"}
+    assert unpriced_skus([order]) == []
+
+    document = build_invoice(order, outlet, {}, Decimal("0.09"))
+    assert document.subtotal == Decimal("5.40")
@@ -0,0 +1,95 @@
+"""
+Partition Manager Unit Tests
+============================
+
+Tests for monthly partition naming and bound calculation used by
+partition-drop data retention.
+
+Tests cover:
+- Month arithmetic across year boundaries
+- Partition name round-trip
+- Expired partition selection against a retention cutoff
+
+NO MOCKING - Pure date arithmetic, no database required.
+"""
+
+from datetime import datetime, timezone, timedelta
+
+import pytest
+from src.privacy.partition_manager import (
+    month_start,
+    add_months,
+    partition_name,
+    parse_partition_name,
+    expired_partitions,
+)
+
+
+class TestMonthArithmetic:
+    """Test month start and month shifting"""
+
+    def test_month_start_naive_is_utc(self):
+        """Naive datetimes are treated as UTC"""
+        assert month_start(datetime(2025, 3, 17, 13, 45)) == datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+    def test_month_start_converts_to_utc(self):
+        """Singapore midnight on the 1st still belongs to the previous UTC month"""
+        sgt = timezone(timedelta(hours=8))
+        assert month_start(datetime(2025, 3, 1, 2, 0, tzinfo=sgt)) == datetime(2025, 2, 1, tzinfo=timezone.utc)
+
+    @pytest.mark.parametrize("start,months,expected", [
+        (datetime(2025, 11, 1, tzinfo=timezone.utc), 2, datetime(2026, 1, 1, tzinfo=timezone.utc)),
+        (datetime(2025, 1, 1, tzinfo=timezone.utc), -1, datetime(2024, 12, 1, tzinfo=timezone.utc)),
+        (datetime(2025, 12, 1, tzinfo=timezone.utc), 12, datetime(2026, 12, 1, tzinfo=timezone.utc)),
+    ])
+    def test_add_months(self, start, months, expected):
+        """Month shifts wrap across year boundaries"""
+        assert add_months(start, months) == expected
+
+
+class TestPartitionNames:
+    """Test partition naming convention"""
+
+    def test_name_round_trip(self):
+        """Bounds can be recovered from the partition name"""
+        start = datetime(2025, 2, 1, tzinfo=timezone.utc)
+        name = partition_name('conversation_messages', start)
+        info = parse_partition_name('conversation_messages', name)
+
+        assert name == 'conversation_messages_p202502'
+        assert info.range_start == start
+        assert info.range_end == datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+    @pytest.mark.parametrize("name", [
+        'conversation_messages_legacy',
+        'conversation_messages_default',
+        'conversation_sessions_p202502',
+    ])
+    def test_foreign_names_ignored(self, name):
+        """Non-conforming or other-table partitions are not parsed"""
+        assert parse_partition_name('conversation_messages', name) is None
+
+
+class TestExpiredPartitions:
+    """Test retention cutoff selection"""
+
+    def _partitions(self):
+        return [
+            parse_partition_name('conversation_messages', f'conversation_messages_p2025{m:02d}')
+            for m in range(1, 6)
+        ]
+
+    def test_only_fully_expired_months(self):
+        """A month is dropped only once its whole range is before the cutoff"""
+        expired = expired_partitions(self._partitions(), datetime(2025, 3, 15))
+
+        assert [p.name for p in expired] == [
+            'conversation_messages_p202501',
+            'conversation_messages_p202502',
+        ]
+
+    def test_cutoff_on_month_boundary(self):
+        """Cutoff exactly at a month start expires the previous month"""
+        expired = expired_partitions(self._partitions(), datetime(2025, 2, 1, tzinfo=timezone.utc))
+
+        assert [p.name for p in expired] == ['conversation_messages_p202501']
@@ -0,0 +1,67 @@
+"""
+Background Job Queue Unit Tests
+===============================
+
+Tests for the pure parts of the durable job queue.
+
+Tests cover:
+- Exponential retry backoff (growth, cap, jitter bounds)
+- Default idempotency keys (stable, payload-sensitive)
+- Handler registration
+
+NO MOCKING - Pure functions, no database required.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from production.job_queue import (
+    compute_backoff,
+    default_idempotency_key,
+    register_job_handler,
+    get_job_handler,
+    registered_job_types,
+)
+
+
+class TestComputeBackoff:
+    """Test retry delay schedule"""
+
+    def test_doubles_per_attempt(self):
+        delays = [compute_backoff(n, base_seconds=5, jitter=0) for n in range(1, 5)]
+        assert delays == [5, 10, 20, 40]
+
+    def test_capped(self):
+        assert compute_backoff(30, base_seconds=5, max_seconds=900, jitter=0) == 900
+
+    def test_jitter_bounds(self):
+        assert compute_backoff(3, base_seconds=5, jitter=0.2, rand=lambda: 0.0) == 16.0
+        assert compute_backoff(3, base_seconds=5, jitter=0.2, rand=lambda: 0.999999) <= 24.0
+
+
+class TestIdempotencyKey:
+    """Test payload-derived idempotency keys"""
+
+    def test_key_order_independent(self):
+        assert default_idempotency_key("t", {"a": 1, "b": 2}) == default_idempotency_key("t", {"b": 2, "a": 1})
+
+    def test_key_differs_by_payload_and_type(self):
+        key = default_idempotency_key("t", {"order_id": 1})
+        assert key != default_idempotency_key("t", {"order_id": 2})
+        assert key != default_idempotency_key("u", {"order_id": 1})
+        assert key.startswith("t:")
+
+
+class TestHandlerRegistry:
+    """Test job handler registration"""
+
+    def test_register_and_lookup(self):
+        @register_job_handler("test.echo")
+        def echo(payload):
+            return payload
+
+        assert get_job_handler("test.echo") is echo
+        assert "test.echo" in registered_job_types()
+        assert get_job_handler("test.missing") is None
@@ -0,0 +1,160 @@
+"""
+Xero Rate Limiter Unit Tests
+============================
+
+Tests for the priority-aware token bucket used for Xero API calls.
+
+Tests cover:
+- Burst capacity and refill
+- Priority reserves (lower classes leave tokens for higher ones)
+- Local priority queue ordering
+- Async acquire does not block the event loop
+- Daily limit and wait budgets (sync and async)
+
+NO MOCKING - Real in-process token bucket (Redis disabled).
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from production.rate_limiting import (
+    XeroRateLimiter,
+    XeroPriority,
+    RateLimitExceeded,
+    xero_priority,
+    _LocalTokenBucket,
+    _PriorityWaitQueue,
+)
+
+
+class TestLocalTokenBucket:
+    """Test token bucket arithmetic"""
+
+    def test_burst_then_wait(self):
+        bucket = _LocalTokenBucket(rate=1.0, capacity=3, day_limit=100)
+
+        assert [bucket.take(reserve=0)[0] for _ in range(3)] == [1, 1, 1]
+        status, wait = bucket.take(reserve=0)
+        assert status == 0
+        assert 0 < wait <= 1.0
+
+    def test_reserve_blocks_lower_priority(self):
+        bucket = _LocalTokenBucket(rate=0.001, capacity=5, day_limit=100)
+
+        # Reserve 2: only 3 of the 5 tokens are usable
+        assert [bucket.take(reserve=2)[0] for _ in range(4)] == [1, 1, 1, 0]
+        # Reserve 0 (order priority) can still use the remaining tokens
+        assert bucket.take(reserve=0)[0] == 1
+
+    def test_peek_does_not_consume(self):
+        bucket = _LocalTokenBucket(rate=0.001, capacity=1, day_limit=100)
+
+        assert bucket.take(reserve=0, consume=False)[0] == 1
+        assert bucket.take(reserve=0)[0] == 1
+        assert bucket.take(reserve=0)[0] == 0
+
+    def test_daily_limit(self):
+        bucket = _LocalTokenBucket(rate=100.0, capacity=10, day_limit=2)
+
+        bucket.take(reserve=0)
+        bucket.take(reserve=0)
+        status, wait = bucket.take(reserve=0)
+        assert status == -1
+        assert wait > 0
+
+
+class TestPriorityWaitQueue:
+    """Test waiter ordering"""
+
+    def test_head_is_highest_priority_then_fifo(self):
+        queue = _PriorityWaitQueue()
+        backfill = queue.enter(XeroPriority.BACKFILL)
+        order_1 = queue.enter(XeroPriority.ORDER)
+        order_2 = queue.enter(XeroPriority.ORDER)
+
+        assert queue.is_head(order_1)
+        queue.leave(order_1)
+        assert queue.is_head(order_2)
+        queue.leave(order_2)
+        assert queue.is_head(backfill)
+
+    def test_depth_and_ahead(self):
+        queue = _PriorityWaitQueue()
+        queue.enter(XeroPriority.ORDER)
+        queue.enter(XeroPriority.BACKFILL)
+        queue.enter(XeroPriority.HEALTH_CHECK)
+
+        assert queue.ahead_of(XeroPriority.BACKFILL) == 2
+        assert queue.depth_by_priority()['order'] == 1
+        assert queue.depth_by_priority()['standard'] == 0
+
+
+class TestXeroRateLimiter:
+    """Test limiter acquire paths"""
+
+    def test_decorator_uses_context_priority(self):
+        limiter = XeroRateLimiter(max_calls_per_minute=6000, burst_capacity=5, use_redis=False)
+        calls = []
+
+        @limiter.limit
+        def call():
+            calls.append(1)
+
+        with xero_priority(XeroPriority.ORDER):
+            for _ in range(5):
+                call()
+
+        assert len(calls) == 5
+        assert limiter.stats['granted'] == 5
+
+    def test_wait_budget_fails_fast(self):
+        limiter = XeroRateLimiter(max_calls_per_minute=1, burst_capacity=1, use_redis=False)
+        limiter.acquire_sync(XeroPriority.ORDER)
+
+        started = time.monotonic()
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire_sync(XeroPriority.HEALTH_CHECK, max_wait=0)
+        assert time.monotonic() - started < 0.5
+
+    def test_async_acquire_does_not_block_loop(self):
+        # 1 token, refill every 0.1s
+        limiter = XeroRateLimiter(max_calls_per_minute=600, burst_capacity=1, use_redis=False)
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(ticker())
+            await limiter.acquire(XeroPriority.ORDER)
+            waited = await limiter.acquire(XeroPriority.ORDER)
+            task.cancel()
+            return waited, ticks
+
+        waited, ticks = asyncio.run(scenario())
+        assert waited > 0.05
+        assert ticks >= 3
+
+    def test_async_wait_budget_and_stats(self):
+        limiter = XeroRateLimiter(max_calls_per_minute=1, burst_capacity=1, use_redis=False)
+
+        async def scenario():
+            await limiter.acquire(XeroPriority.ORDER)
+            with pytest.raises(RateLimitExceeded):
+                await limiter.acquire(XeroPriority.HEALTH_CHECK, max_wait=0)
+            return await limiter.get_stats_async()
+
+        stats = asyncio.run(scenario())
+        assert stats['backend'] == 'local'
+        assert stats['estimated_wait_seconds']['order'] > 0
+        assert stats['rejected'] == 1
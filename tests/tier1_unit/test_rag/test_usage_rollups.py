@@ -0,0 +1,116 @@
+"""
+Policy Usage Rollup Unit Tests
+==============================
+
+Tests for the daily rollups behind PolicyUsageTracker.generate_usage_report.
+
+Tests cover:
+- Only lines appended since the last update are folded
+- Windows merge the covered days
+- Rollups persisted next to the log and reloaded
+- Incomplete trailing lines left for the next update
+
+NO MOCKING - Real files in a temporary directory.
+"""
+
+import sys
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+# The rag package imports the ChromaDB client on import
+pytest.importorskip("chromadb")
+
+from rag.usage_rollups import PolicyUsageRollups
+
+
+def write_events(path: Path, *events):
+    with open(path, "a", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+def retrieval(day: str, collection: str = "policies_en", similarity: float = 0.85):
+    return {
+        "timestamp": f"{day}T10:00:00",
+        "intent": "policy_question",
+        "query": "refunds",
+        "collection": collection,
+        "results_count": 3,
+        "top_similarity": similarity,
+        "metadata": {}
+    }
+
+
+def validation(day: str, passed: bool):
+    return {
+        "timestamp": f"{day}T10:00:01",
+        "type": "validation",
+        "intent": "policy_question",
+        "validation_passed": passed,
+        "confidence": 0.5,
+        "issues_count": 0,
+        "metadata": {}
+    }
+
+
+def test_incremental_folding(tmp_path):
+    log_file = tmp_path / "policy_usage.jsonl"
+    rollups = PolicyUsageRollups(log_file)
+
+    write_events(log_file, retrieval("2026-03-01"), retrieval("2026-03-01", "faqs_en"))
+    assert rollups.update() == 2
+
+    write_events(log_file, validation("2026-03-01", True))
+    assert rollups.update() == 1
+    assert rollups.update() == 0
+
+    report = rollups.window(date(2026, 3, 1), date(2026, 3, 1)).to_report()
+    assert report["total_events"] == 3
+    assert report["by_collection"] == {"policies_en": 1, "faqs_en": 1}
+    assert report["by_type"] == {"retrieval": 2, "validation": 1}
+    assert report["similarity_histogram"]["0.8-0.9"] == 2
+    assert report["validation_stats"] == {"total": 1, "passed": 1, "failed": 0, "avg_confidence_score": 0.5}
+
+
+def test_window_merges_days(tmp_path):
+    log_file = tmp_path / "policy_usage.jsonl"
+    write_events(
+        log_file,
+        retrieval("2026-03-01", similarity=0.2),
+        retrieval("2026-03-02", similarity=0.4),
+        retrieval("2026-03-05", similarity=0.6),
+    )
+    rollups = PolicyUsageRollups(log_file)
+    rollups.update()
+
+    window = rollups.window(date(2026, 3, 1), date(2026, 3, 2))
+    assert window.events == 2
+    assert window.to_report()["avg_similarity_score"] == pytest.approx(0.3)
+
+
+def test_state_reloaded_without_rereading(tmp_path):
+    log_file = tmp_path / "policy_usage.jsonl"
+    write_events(log_file, retrieval("2026-03-01"))
+    PolicyUsageRollups(log_file).update()
+
+    reloaded = PolicyUsageRollups(log_file)
+    assert reloaded.update() == 0
+    assert reloaded.days["2026-03-01"].events == 1
+
+
+def test_partial_line_waits(tmp_path):
+    log_file = tmp_path / "policy_usage.jsonl"
+    line = json.dumps(retrieval("2026-03-01"))
+    with open(log_file, "w", encoding="utf-8") as f:
+        f.write(line[:20])
+    rollups = PolicyUsageRollups(log_file)
+    assert rollups.update() == 0
+
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(line[20:] + "\n")
+    assert rollups.update() == 1
@@ -0,0 +1,133 @@
+"""
+Stage Graph Unit Tests
+======================
+
+Tests for dependency-ordered workflow stage execution.
+
+Tests cover:
+- Independent stages run concurrently, dependents wait
+- Fail fast: no new stages after a failure, running stages finish
+- Failure reporting in declaration order
+- on_complete runs in the caller's thread
+- on_finish sees every finished stage, including failures
+- contextvars propagate into stage threads
+- Graph validation (unknown dependencies, cycles)
+
+NO MOCKING - Real threads and timings.
+"""
+
+import sys
+import time
+import threading
+import contextvars
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent / "src"))
+
+from utils.stage_graph import Stage, StageFailure, run_stage_graph, validate_stage_graph
+
+
+def sleeper(seconds, value=None):
+    def run(results):
+        time.sleep(seconds)
+        return value
+    return run
+
+
+def raiser(error):
+    def run(results):
+        raise error
+    return run
+
+
+class TestRunStageGraph:
+    """Test stage scheduling"""
+
+    def test_independent_stages_overlap(self):
+        stages = [
+            Stage('a', sleeper(0.2, 1)),
+            Stage('b', sleeper(0.2, 2)),
+            Stage('c', lambda r: r['a'] + r['b'], depends_on=('a', 'b')),
+        ]
+        result = run_stage_graph(stages, max_concurrency=2)
+
+        assert result.succeeded
+        assert result.results == {'a': 1, 'b': 2, 'c': 3}
+        assert result.total_ms < 350
+        assert [t.name for t in result.timings][-1] == 'c'
+
+    def test_concurrency_limit(self):
+        stages = [Stage(name, sleeper(0.1)) for name in ('a', 'b', 'c')]
+        result = run_stage_graph(stages, max_concurrency=1)
+        assert result.total_ms >= 300
+
+    def test_failure_stops_new_stages_but_running_finish(self):
+        completed = []
+        stages = [
+            Stage('fails', raiser(StageFailure("nope"))),
+            Stage('slow', sleeper(0.1, 'done')),
+            Stage('after', lambda r: 'never', depends_on=('slow',)),
+        ]
+        result = run_stage_graph(stages, max_concurrency=2,
+                                 on_complete=lambda name, value: completed.append(name))
+
+        assert not result.succeeded
+        assert result.failed_stage == 'fails'
+        assert str(result.error) == "nope"
+        assert completed == ['slow']
+        assert 'after' not in result.results
+
+    def test_first_declared_failure_reported(self):
+        def fail_later(results):
+            time.sleep(0.05)
+            raise StageFailure("first")
+
+        stages = [
+            Stage('first', fail_later),
+            Stage('second', raiser(RuntimeError("second"))),
+        ]
+        result = run_stage_graph(stages, max_concurrency=2)
+        assert result.failed_stage == 'first'
+
+    def test_on_complete_in_caller_thread_and_context_propagates(self):
+        caller = threading.get_ident()
+        callback_threads = []
+        priority = contextvars.ContextVar('priority', default='standard')
+        priority.set('order')
+
+        stages = [Stage('a', lambda r: priority.get())]
+        result = run_stage_graph(
+            stages, on_complete=lambda name, value: callback_threads.append(threading.get_ident())
+        )
+
+        assert result.results['a'] == 'order'
+        assert callback_threads == [caller]
+
+    def test_on_finish_reports_failed_stages(self):
+        finished = []
+        stages = [
+            Stage('ok', sleeper(0.01, 'done')),
+            Stage('fails', raiser(StageFailure("nope")), depends_on=('ok',)),
+            Stage('after', lambda r: 'never', depends_on=('fails',)),
+        ]
+        result = run_stage_graph(stages, on_finish=lambda timing: finished.append((timing.name, timing.status)))
+
+        assert result.failed_stage == 'fails'
+        assert finished == [('ok', 'completed'), ('fails', 'failed')]
+
+
+class TestValidateStageGraph:
+    """Test graph validation"""
+
+    def test_unknown_dependency(self):
+        with pytest.raises(ValueError):
+            validate_stage_graph([Stage('a', lambda r: None, depends_on=('missing',))])
+
+    def test_cycle(self):
+        with pytest.raises(ValueError):
+            validate_stage_graph([
+                Stage('a', lambda r: None, depends_on=('b',)),
+                Stage('b', lambda r: None, depends_on=('a',)),
+            ])